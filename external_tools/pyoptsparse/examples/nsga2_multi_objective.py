@@ -29,3 +29,9 @@ opt = NSGA2(options=options)
 sol = opt(optProb)
 
 print(sol)
+
+# The non-dominated points of all evaluations, updated during the run
+front = opt.paretoArchive.front()
+print(opt.paretoArchive.summary_str())
+for f, x in zip(front["objectives"][::10], front["x"][::10]):
+    print(f"obj1 = {f[0]:8.4f}  obj2 = {f[1]:8.4f}  x = {x[0]:7.4f}  y = {x[1]:7.4f}")
@@ -0,0 +1,100 @@
+"""
+Surrogate pre-screening for the population-based optimizers: ALPSO (and NSGA2, if
+compiled) with and without the surrogate option on the small test problems, reporting
+the true function evaluations each run needed and the objective it found.
+"""
+
+# Standard Python modules
+import argparse
+import time
+
+# External modules
+import numpy as np
+
+# First party modules
+from pyoptsparse import OPT, Optimization
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--trueFraction", help="fraction of each generation evaluated", type=float, default=0.25)
+parser.add_argument("--maxOuterIter", help="ALPSO outer iterations", type=int, default=30)
+parser.add_argument("--maxGen", help="NSGA2 generations", type=int, default=100)
+args = parser.parse_args()
+
+
+def sphere():
+    def objfunc(xdict):
+        x = xdict["xvars"]
+        return {"obj": np.dot(x, x)}, False
+
+    optProb = Optimization("Sphere", objfunc)
+    optProb.addVarGroup("xvars", 4, lower=-10.0, upper=10.0, value=[1.3, 0.7, -1.5, 0.2])
+    optProb.addObj("obj")
+    return optProb
+
+
+def rosenbrock():
+    def objfunc(xdict):
+        x = xdict["xvars"]
+        return {"obj": 100 * (x[1] - x[0] ** 2) ** 2 + (1 - x[0]) ** 2}, False
+
+    optProb = Optimization("Rosenbrock", objfunc)
+    optProb.addVarGroup("xvars", 2, lower=-2.0, upper=2.0, value=[-1.0, 1.0])
+    optProb.addObj("obj")
+    return optProb
+
+
+def hs015():
+    def objfunc(xdict):
+        x = xdict["xvars"]
+        funcs = {}
+        funcs["obj"] = 100 * (x[1] - x[0] ** 2) ** 2 + (1 - x[0]) ** 2
+        funcs["con"] = [x[0] * x[1], x[0] + x[1] ** 2]
+        return funcs, False
+
+    optProb = Optimization("HS15", objfunc)
+    optProb.addVarGroup("xvars", 2, lower=[-5.0, -5.0], upper=[0.5, 5.0], value=[-2, 1.0])
+    optProb.addConGroup("con", 2, lower=[1.0, 0.0], upper=None)
+    optProb.addObj("obj")
+    return optProb
+
+
+def twoObjectives():
+    def objfunc(xdict):
+        x, y = xdict["x"], xdict["y"]
+        return {"obj1": x**2 + y**2, "obj2": (x - 1.0) ** 2 + (y - 1.0) ** 2}, False
+
+    optProb = Optimization("Two objectives", objfunc)
+    optProb.addVar("x", "c", value=0, lower=-10, upper=10)
+    optProb.addVar("y", "c", value=0, lower=-10, upper=10)
+    optProb.addObj("obj1")
+    optProb.addObj("obj2")
+    return optProb
+
+
+runs = [
+    ("ALPSO", sphere, {"SwarmSize": 20, "maxOuterIter": args.maxOuterIter, "stopCriteria": 0, "seed": 1235}),
+    ("ALPSO", rosenbrock, {"SwarmSize": 20, "maxOuterIter": args.maxOuterIter, "stopCriteria": 0, "seed": 1235}),
+    ("ALPSO", hs015, {"SwarmSize": 20, "maxOuterIter": args.maxOuterIter, "stopCriteria": 0, "seed": 1235}),
+    ("NSGA2", twoObjectives, {"PopSize": 40, "maxGen": args.maxGen, "seed": 0.5, "PrintOut": 0}),
+]
+
+print(f"{'optimizer':<10} {'problem':<16} {'true evals':>22} {'saved':>7} {'fStar':>24}")
+for optName, problem, options in runs:
+    try:
+        OPT(optName)
+    except ImportError:
+        print(f"{optName:<10} {problem.__name__:<16} (not available)")
+        continue
+    if optName == "ALPSO":
+        options = {**options, "fileout": 0}
+    results = []
+    for surrogate in [False, True]:
+        opt = OPT(optName, options={**options, "surrogate": surrogate, "surrogateTrueFraction": args.trueFraction})
+        timeA = time.time()
+        sol = opt(problem())
+        results.append((sol.userObjCalls, sol.fStar, time.time() - timeA))
+    (calls, fStar, _), (callsSur, fStarSur, _) = results
+    print(
+        f"{optName:<10} {problem.__name__:<16} {calls:>10d} -> {callsSur:>9d} {100 * (1 - callsSur / calls):>6.1f}% "
+        + f"{np.array2string(np.atleast_1d(fStar), precision=4):>11} -> {np.array2string(np.atleast_1d(fStarSur), precision=4)}"
+    )
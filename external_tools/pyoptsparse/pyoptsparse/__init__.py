@@ -8,17 +8,40 @@ from .pyOpt_objective import Objective
 from .pyOpt_optimization import Optimization
 from .pyOpt_optimizer import Optimizer, OPT, Optimizers, list_optimizers
 from .pyOpt_solution import Solution
+from .pyOpt_multistart import MultiStart
+from .pyOpt_evalstore import EvaluationStore
+from .pyOpt_pareto import ParetoArchive
+
+# The individual optimizers are imported on first access (module __getattr__, PEP 562),
+# since each wrapper probes for its compiled extension module at import time.
+# OPT(name) imports only the optimizer it creates as well.
+_OPTIMIZER_MODULES = {
+    "SNOPT": ".pySNOPT.pySNOPT",
+    "IPOPT": ".pyIPOPT.pyIPOPT",
+    "SLSQP": ".pySLSQP.pySLSQP",
+    "CONMIN": ".pyCONMIN.pyCONMIN",
+    "PSQP": ".pyPSQP.pyPSQP",
+    "NLPQLP": ".pyNLPQLP.pyNLPQLP",
+    "NSGA2": ".pyNSGA2.pyNSGA2",
+    "ALPSO": ".pyALPSO.pyALPSO",
+    "ParOpt": ".pyParOpt.ParOpt",
+}
+
+
+def __getattr__(name):
+    if name in _OPTIMIZER_MODULES:
+        # Standard Python modules
+        import importlib
+
+        optimizer = getattr(importlib.import_module(_OPTIMIZER_MODULES[name], __name__), name)
+        globals()[name] = optimizer  # later accesses skip __getattr__
+        return optimizer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_OPTIMIZER_MODULES))
 
-# Now import all the individual optimizers
-from .pySNOPT.pySNOPT import SNOPT
-from .pyIPOPT.pyIPOPT import IPOPT
-from .pySLSQP.pySLSQP import SLSQP
-from .pyCONMIN.pyCONMIN import CONMIN
-from .pyPSQP.pyPSQP import PSQP
-from .pyNLPQLP.pyNLPQLP import NLPQLP
-from .pyNSGA2.pyNSGA2 import NSGA2
-from .pyALPSO.pyALPSO import ALPSO
-from .pyParOpt.ParOpt import ParOpt
 
 __all__ = [
     "History",
@@ -31,6 +54,9 @@ __all__ = [
     "OPT",
     "Optimizers",
     "Solution",
+    "MultiStart",
+    "EvaluationStore",
+    "ParetoArchive",
     "SNOPT",
     "IPOPT",
     "SLSQP",
@@ -39,6 +39,25 @@ eps *= 2.0
 # eps = math.ldexp(1,-52)
 
 
+# ==============================================================================
+# Particle positions in the design space
+# ==============================================================================
+def _positions(x_k, scale, space_halflen, space_centre, discrete_i):
+    """Unscaled positions of all particles with discrete variables rounded, as objfunc gets them"""
+    X = np.zeros(x_k.shape)
+    for i in range(x_k.shape[0]):
+        if scale == 1:
+            xtmp = (x_k[i, :] * space_halflen) + space_centre
+        else:
+            xtmp = x_k[i, :]
+
+        for m in discrete_i:
+            xtmp[m] = floor(xtmp[m] + 0.5)
+
+        X[i, :] = xtmp
+    return X
+
+
 # ==============================================================================
 # alpso function
 # ==============================================================================
@@ -46,12 +65,18 @@ eps *= 2.0
 def alpso(dimensions, constraints, neqcons, xtype, x0, xmin, xmax, swarmsize, nhn,
           nhm, maxOutIter, maxInnIter, minInnIter, stopCriteria, stopIters, etol,
           itol, rtol, atol, dtol, prtOutIter, prtInnIter, r0, vinit, vmax, c1, c2, w1, w2,
-          ns, nf, vcrazy, fileout, filename, logfile, hstfile, rseed, scale, nhs, objfunc):
+          ns, nf, vcrazy, fileout, filename, logfile, hstfile, rseed, scale, nhs, objfunc,
+          batchfunc=None):
 # fmt: on # noqa: E115
     """
     Python Version of the Augmented Lagrangian Particle Swarm Optimizer
 
     Documentation last updated:  April. 29, 2008 - Ruben E. Perez
+
+    If batchfunc is given, each swarm is evaluated with one call batchfunc(X), X being
+    the (swarmsize, dimensions) particle positions, returning the objective (swarmsize,)
+    and constraint (swarmsize, constraints) values, instead of one objfunc call per
+    particle.
     """
 
     #
@@ -213,6 +238,9 @@ def alpso(dimensions, constraints, neqcons, xtype, x0, xmin, xmax, swarmsize, nh
         [vals, hist_end] = hstfile.read([], ident=["obj", "con"])
         f = vals["obj"][0]
         g = vals["con"][0].reshape(g.shape)
+    elif batchfunc is not None:
+        [f[:], g[:, :]] = batchfunc(_positions(x_k, scale, space_halflen, space_centre, discrete_i))
+        nfevals += swarmsize
     else:
         for i in range(swarmsize):
 
@@ -558,7 +586,10 @@ def alpso(dimensions, constraints, neqcons, xtype, x0, xmin, xmax, swarmsize, nh
                     h_start = False
                     hstfile.close()
 
-            if not h_start:
+            if not h_start and batchfunc is not None:
+                [f[:], g[:, :]] = batchfunc(_positions(x_k, scale, space_halflen, space_centre, discrete_i))
+                nfevals += swarmsize
+            elif not h_start:
                 for i in range(swarmsize):
 
                     # Evaluate Ojective Function
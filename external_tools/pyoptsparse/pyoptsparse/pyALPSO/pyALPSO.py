@@ -12,7 +12,9 @@ import numpy as np
 
 # Local modules
 from . import alpso
+from ..pyOpt_error import pyOptSparseWarning
 from ..pyOpt_optimizer import Optimizer
+from ..pyOpt_surrogate import SurrogateScreen
 
 # isort: off
 
@@ -77,6 +79,11 @@ class ALPSO(Optimizer):
             "HoodSelf": [int, 1],
             "Scaling": [int, 1],
             "parallelType": [str, [None, "EXT"]],
+            "surrogate": [bool, False],
+            "surrogateTrueFraction": [float, 0.25],
+            "surrogateMinSamples": [int, 0],
+            "surrogateMaxSamples": [int, 500],
+            "surrogateKernel": [str, "thin_plate_spline"],
         }
         return defOpts
 
@@ -117,8 +124,24 @@ class ALPSO(Optimizer):
 
         def objconfunc(x):
             fobj, fcon, fail = self._masterFunc(x, ["fobj", "fcon"])
+            if self.surrogate is not None and not fail:
+                self.surrogate.add(x, fobj, fcon)
             return fobj, fcon
 
+        # ======================================================================
+        # ALPSO - Swarm Evaluation with Surrogate Pre-screening
+        # ======================================================================
+        def batchfunc(X):
+            mask, fpred, gpred = self.surrogate.select(X)
+            f = np.zeros(len(X))
+            g = np.zeros((len(X), m))
+            for i in range(len(X)):
+                if mask[i]:
+                    f[i], g[i, :] = objconfunc(X[i])
+                else:
+                    f[i], g[i, :] = fpred[i, 0], gpred[i]
+            return f, g
+
         # Save the optimization problem and finalize constraint
         # Jacobian, in general can only do on root proc
         self.optProb = optProb
@@ -151,6 +174,20 @@ class ALPSO(Optimizer):
             indices, __, __, __ = self.optProb.getOrdering(["ne", "le"], oneSided=oneSided, noEquality=False)
             me = len(indices)
 
+        self.surrogate = None
+        if self.getOption("surrogate"):
+            if self.getOption("parallelType") is not None:
+                raise ValueError("pyALPSO: the surrogate option is not available with parallelType 'EXT'")
+            self.surrogate = SurrogateScreen(
+                xl,
+                xu,
+                trueFraction=self.getOption("surrogateTrueFraction"),
+                minSamples=self.getOption("surrogateMinSamples"),
+                maxSamples=self.getOption("surrogateMaxSamples"),
+                kernel=self.getOption("surrogateKernel"),
+                nEq=me,
+            )
+
         if self.optProb.comm.rank == 0:
             # Setup argument list values
             opt = self.getOption
@@ -177,8 +214,27 @@ class ALPSO(Optimizer):
                 opt('vinit'), opt('vmax'), opt('c1'), opt('c2'), opt('w1'),
                 opt('w2'), opt('ns'), opt('nf'), opt('vcrazy'), opt('fileout'),
                 opt('filename'), None, None, opt('seed'),
-                opt('Scaling'), opt('HoodSelf'), objconfunc)
+                opt('Scaling'), opt('HoodSelf'), objconfunc,
+                batchfunc=batchfunc if self.surrogate is not None else None)
             # fmt: on
+            predicted = False
+            if self.surrogate is not None:
+                # The best particle may only have a predicted value: evaluate it
+                stored = self.surrogate.lookup(opt_x)
+                if stored is None:
+                    objconfunc(np.array(opt_x, dtype=float))
+                    stored = self.surrogate.lookup(opt_x)
+                if stored is not None:
+                    opt_f = stored[0][0]
+                else:
+                    # Its evaluation failed, so it never entered the archive: keep ALPSO's value
+                    predicted = True
+                    pyOptSparseWarning(
+                        "The evaluation of the best particle failed. "
+                        + "Its objective value is the one ALPSO has for it, possibly a surrogate prediction."
+                    )
+                if opt("printOuterIters") > 0:
+                    print(self.surrogate.summary_str())
             optTime = time.time() - t0
 
             if self.storeHistory:
@@ -192,6 +248,8 @@ class ALPSO(Optimizer):
 
             # Store Results
             sol_inform = {"value": "", "text": ""}
+            if predicted:
+                sol_inform["text"] = "Evaluation of the best point failed; fStar may be a surrogate prediction"
 
             # Create the optimization solution
             sol = self._createSolution(optTime, sol_inform, opt_f, opt_x)
@@ -11,7 +11,9 @@ import time
 import numpy as np
 
 # Local modules
+from ..pyOpt_error import pyOptSparseWarning
 from ..pyOpt_optimizer import Optimizer
+from ..pyOpt_surrogate import SurrogateScreen
 from ..pyOpt_utils import try_import_compiled_module_from_path
 
 # import the compiled module
@@ -56,6 +58,11 @@ class NSGA2(Optimizer):
             "PrintOut": [int, 1],
             "seed": [int, 0],
             "xinit": [int, 0],
+            "surrogate": [bool, False],
+            "surrogateTrueFraction": [float, 0.25],
+            "surrogateMinSamples": [int, 0],
+            "surrogateMaxSamples": [int, 500],
+            "surrogateKernel": [str, "thin_plate_spline"],
         }
         return defOpts
 
@@ -95,7 +102,16 @@ class NSGA2(Optimizer):
         # ======================================================================
         def objconfunc(nreal, nobj, ncon, x, f, g):
             xx = np.array(x)
-            fobj, fcon, fail = self._masterFunc(xx, ["fobj", "fcon"])
+            prediction = None
+            if self.surrogate is not None:
+                prediction = self.surrogate.screen(xx, self.getOption("PopSize"))
+            if prediction is not None:
+                # Screened out: the individual gets the surrogate prediction
+                fobj, fcon = prediction
+            else:
+                fobj, fcon, fail = self._masterFunc(xx, ["fobj", "fcon"])
+                if self.surrogate is not None and not fail:
+                    self.surrogate.add(xx, fobj, fcon)
             fobj = np.atleast_1d(fobj)
             f[0:nobj] = fobj
             g[0:ncon] = -fcon[0:ncon]
@@ -141,6 +157,17 @@ class NSGA2(Optimizer):
             self.optProb.fact = fact
             self.optProb.offset = buc
 
+        self.surrogate = None
+        if self.getOption("surrogate"):
+            self.surrogate = SurrogateScreen(
+                blx,
+                bux,
+                trueFraction=self.getOption("surrogateTrueFraction"),
+                minSamples=self.getOption("surrogateMinSamples"),
+                maxSamples=self.getOption("surrogateMaxSamples"),
+                kernel=self.getOption("surrogateKernel"),
+            )
+
         g = nsga2.new_doubleArray(m)
         len_ff = len(np.atleast_1d(ff))
         f = nsga2.new_doubleArray(len_ff)
@@ -196,6 +223,25 @@ class NSGA2(Optimizer):
             else:
                 fStar = nsga2.doubleArray_getitem(f, 0)
 
+            if self.surrogate is not None:
+                # The returned individual may only have a predicted value: evaluate it
+                if self.surrogate.lookup(xstar) is None:
+                    fobj, fcon, fail = self._masterFunc(np.array(xstar), ["fobj", "fcon"])
+                    if not fail:
+                        self.surrogate.add(xstar, fobj, fcon)
+                if self.surrogate.lookup(xstar) is not None:
+                    fobj = self.surrogate.lookup(xstar)[0]
+                    fStar = fobj if len_ff > 1 else fobj[0]
+                else:
+                    # Its evaluation failed, so it never entered the archive: keep NSGA2's value
+                    pyOptSparseWarning(
+                        "The evaluation of the returned individual failed. "
+                        + "Its objective value is the one NSGA2 has for it, possibly a surrogate prediction."
+                    )
+                    sol_inform["text"] = "Evaluation of the best point failed; fStar may be a surrogate prediction"
+                if printout > 0:
+                    print(self.surrogate.summary_str())
+
             # Create the optimization solution
             sol = self._createSolution(optTime, sol_inform, fStar, xstar)
 
@@ -0,0 +1,197 @@
+"""
+pyOpt_evalstore
+
+Persistent store of objective function evaluations, shared by optimizations and
+processes. Evaluations are keyed by a fingerprint of the problem and the quantized
+design variable vector, so a point evaluated by any earlier run, restart or
+concurrent start of the same problem is read back instead of calling ``objFun``.
+"""
+
+# Standard Python modules
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import time
+from typing import Any, Dict, Optional, Tuple
+
+# External modules
+import numpy as np
+
+
+class EvaluationStore:
+    def __init__(
+        self,
+        fileName: str,
+        modelVersion: str = "",
+        mantissaBits: int = 40,
+        storeFailed: bool = False,
+        timeout: float = 60.0,
+    ):
+        """
+        On-disk store of the ``funcs`` returned by the objective function. It is a
+        SQLite database in write-ahead-log mode, so any number of processes can read
+        and write it at the same time. Assign it to an optimizer before running it::
+
+            store = EvaluationStore("evals.db", modelVersion="wing-v3")
+            opt = OPT("SLSQP")
+            opt.evalStore = store
+            sol = opt(optProb, sens="FD")
+            print(store.summary_str())
+
+        Parameters
+        ----------
+        fileName : str
+            File name of the database; it is created if it does not exist
+
+        modelVersion : str
+            Version of the model behind ``objFun``, part of the problem fingerprint.
+            Change it whenever the model changes, the store cannot detect that.
+
+        mantissaBits : int
+            Bits of the mantissa the design variables are rounded to for the key;
+            the default of 40 matches points that agree to about 12 significant digits
+
+        storeFailed : bool
+            Flag to also store evaluations that returned ``fail``
+
+        timeout : float
+            Seconds to wait for a lock held by another process before raising
+        """
+        self.fileName = fileName
+        self.modelVersion = modelVersion
+        self.mantissaBits = mantissaBits
+        self.storeFailed = storeFailed
+        self.timeout = timeout
+
+        # Counters of this process
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+        self._db = None
+        self._pid = None
+
+    def __getstate__(self):
+        # The connection stays with the process that opened it
+        state = self.__dict__.copy()
+        state["_db"] = None
+        state["_pid"] = None
+        return state
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        """The connection of this process, opened on first use"""
+        if self._db is None or self._pid != os.getpid():
+            db = sqlite3.connect(self.fileName, timeout=self.timeout, isolation_level=None)
+            # Switching a new database to WAL does not wait for the busy timeout when
+            # several processes create it at once, so retry until it is set up
+            start = time.time()
+            while True:
+                try:
+                    db.execute("PRAGMA journal_mode=WAL")
+                    db.execute(
+                        "CREATE TABLE IF NOT EXISTS evals ("
+                        + "fingerprint TEXT NOT NULL, x BLOB NOT NULL, funcs BLOB NOT NULL, fail INTEGER NOT NULL, "
+                        + "created REAL NOT NULL, PRIMARY KEY (fingerprint, x)) WITHOUT ROWID"
+                    )
+                    break
+                except sqlite3.OperationalError:
+                    if time.time() - start > self.timeout:
+                        db.close()
+                        raise
+                    time.sleep(0.01)
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._db = db
+            self._pid = os.getpid()
+        return self._db
+
+    def close(self):
+        """Close the connection of this process"""
+        if self._db is not None and self._pid == os.getpid():
+            self._db.close()
+        self._db = None
+        self._pid = None
+
+    def fingerprint(self, optProb) -> str:
+        """
+        Fingerprint of a finalized problem: the layout of its design variables
+        (names, sizes, types), objectives and nonlinear constraints, and the model
+        version. Bounds and scaling do not change what ``objFun`` returns and are
+        not part of it.
+        """
+        layout = {
+            "modelVersion": self.modelVersion,
+            "variables": [
+                [dvGroup, len(variables), "".join(var.type for var in variables)]
+                for dvGroup, variables in optProb.variables.items()
+            ],
+            "objectives": list(optProb.objectives.keys()),
+            "constraints": [[con.name, con.ncon] for con in optProb.constraints.values() if not con.linear],
+        }
+        return hashlib.sha1(json.dumps(layout).encode()).hexdigest()
+
+    def quantize(self, x: np.ndarray) -> bytes:
+        """
+        Key of the design variable vector (in user space): the mantissa of every
+        value rounded to ``mantissaBits`` bits, and its exponent
+        """
+        mantissa, exponent = np.frexp(np.asarray(x, dtype=float))
+        mantissa = np.rint(np.ldexp(mantissa, self.mantissaBits)).astype(np.int64)
+        # Rounding can carry into the next power of two; renormalize so that both
+        # roundings of the same number give the same key
+        carry = np.abs(mantissa) == (1 << self.mantissaBits)
+        mantissa[carry] //= 2
+        exponent[carry] += 1
+        exponent[mantissa == 0] = 0
+        return mantissa.astype("<i8").tobytes() + exponent.astype("<i4").tobytes()
+
+    def lookup(self, optProb, x: np.ndarray) -> Optional[Tuple[Dict[str, Any], int]]:
+        """
+        The stored ``(funcs, fail)`` of the problem at the user space design
+        variables x, or None if the point was not evaluated yet
+        """
+        row = self.db.execute(
+            "SELECT funcs, fail FROM evals WHERE fingerprint = ? AND x = ?",
+            (self.fingerprint(optProb), self.quantize(x)),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return pickle.loads(row[0]), row[1]
+
+    def record(self, optProb, x: np.ndarray, funcs: Dict[str, Any], fail: int):
+        """
+        Store an evaluation. The first evaluation of a point is kept if several
+        processes record it concurrently.
+        """
+        if fail and not self.storeFailed:
+            return
+        self.db.execute(
+            "INSERT OR IGNORE INTO evals VALUES (?, ?, ?, ?, ?)",
+            (
+                self.fingerprint(optProb),
+                self.quantize(x),
+                pickle.dumps(funcs, protocol=pickle.HIGHEST_PROTOCOL),
+                int(fail),
+                time.time(),
+            ),
+        )
+        self.writes += 1
+
+    def __len__(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM evals").fetchone()[0]
+
+    @property
+    def hitRate(self) -> float:
+        """Fraction of the lookups of this process that were found in the store"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def summary_str(self) -> str:
+        return (
+            f"Evaluation store {self.fileName}: {self.hits} hits, {self.misses} misses "
+            + f"({100.0 * self.hitRate:.1f}% hit rate), {self.writes} evaluations recorded"
+        )
@@ -1,7 +1,10 @@
 # Standard Python modules
 from collections import OrderedDict
 import copy
+import hashlib
 import os
+import pickle
+import zlib
 
 # External modules
 import numpy as np
@@ -12,8 +15,14 @@ from .pyOpt_error import pyOptSparseWarning
 from .pyOpt_utils import EPS
 
 
+# Key marking a packed funcsSens entry, see History._packSens
+SENS_PACKED_KEY = "__packedSens__"
+# Prefix of the history keys holding the sparsity pattern of packed funcsSens entries
+SENS_PATTERN_PREFIX = "sensPattern_"
+
+
 class History:
-    def __init__(self, fileName, optProb=None, temp=False, flag="r"):
+    def __init__(self, fileName, optProb=None, temp=False, flag="r", sensDtype="float64", compressSens=False):
         """
         This class is essentially a thin wrapper around a SqliteDict dictionary to facilitate
         operations with pyOptSparse
@@ -33,8 +42,24 @@ class History:
         flag : str
             String specifying the mode. Similar to what was used in shelve.
             ``n`` for a new database and ``r`` to read an existing one.
+
+        sensDtype : str
+            Floating point type the values of ``funcsSens`` are written with, ``float64``
+            or ``float32``. Only used when writing; ``float32`` halves the size of the
+            stored sensitivities but they are read back rounded.
+
+        compressSens : bool
+            Flag to zlib-compress the values of ``funcsSens`` before writing them.
         """
         self.flag = flag
+        self.sensDtype = np.dtype(sensDtype)
+        self.compressSens = compressSens
+        if self.sensDtype not in (np.float64, np.float32):
+            raise ValueError("sensDtype must be 'float64' or 'float32'.")
+        # Sparsity patterns of funcsSens already in the file: {digest: key} when writing,
+        # {key: pattern} when reading
+        self._sensPatternKeys = {}
+        self._sensPatterns = {}
         if self.flag == "n":
             # If writing, we expliclty remove the file to
             # prevent old keys from "polluting" the new histrory
@@ -88,9 +113,10 @@ class History:
         if self.pointExists(callCounter):
             oldData = self.read(callCounter)
             oldData.update(data)
-            self.db[key] = oldData
-        else:
-            self.db[key] = data
+            data = oldData
+        if "funcsSens" in data:
+            data = dict(data, funcsSens=self._packSens(data["funcsSens"]))
+        self.db[key] = data
         self.db["last"] = key
         self.db.sync()
         self.keys = list(self.db.keys())
@@ -148,9 +174,104 @@ class History:
         if isinstance(key, int):
             key = str(key)
         try:
-            return self.db[key]
+            data = self.db[key]
         except KeyError:
             return None
+        sens = data.get("funcsSens") if isinstance(data, dict) else None
+        if isinstance(sens, dict) and SENS_PACKED_KEY in sens:
+            data = dict(data, funcsSens=self._unpackSens(data["funcsSens"]))
+        return data
+
+    def _packSens(self, funcsSens):
+        """
+        Split ``funcsSens`` into its sparsity pattern and its values. The pattern (the
+        nesting of the dictionary, the shape of every block and the index arrays of sparse
+        blocks) is written to the file once, under its own key, the first time it is seen.
+        Every call counter then only stores the values of all blocks as one contiguous
+        array and the key of its pattern.
+
+        Dense blocks (arrays, lists or scalars) and pyOptSparse ``coo``, ``csr`` and ``csc``
+        dictionaries are packed; any other ``funcsSens`` is returned as it is.
+
+        Parameters
+        ----------
+        funcsSens : dict
+            The sensitivity dictionary returned by the user's sens function.
+
+        Returns
+        -------
+        dict
+            The packed ``funcsSens``, or ``funcsSens`` itself if it cannot be packed.
+        """
+        pattern, values = [], []
+        try:
+            for outer, blocks in funcsSens.items():
+                for inner, block in blocks.items():
+                    if isinstance(block, dict):
+                        fmt = next(f for f in ("coo", "csr", "csc") if f in block)
+                        first, second, data = block[fmt]
+                        data = np.asarray(data, dtype=float).ravel()
+                        indices = (np.asarray(first), np.asarray(second))
+                        pattern.append((outer, inner, fmt, tuple(block["shape"]), indices, data.size))
+                    else:
+                        data = np.asarray(block, dtype=float)
+                        pattern.append((outer, inner, "dense", data.shape, None, data.size))
+                        data = data.ravel()
+                    values.append(data)
+        except (AttributeError, KeyError, StopIteration, TypeError, ValueError):
+            return funcsSens
+
+        patternBytes = pickle.dumps(pattern, protocol=pickle.HIGHEST_PROTOCOL)
+        digest = hashlib.sha1(patternBytes).hexdigest()
+        patternKey = self._sensPatternKeys.get(digest)
+        if patternKey is None:
+            patternKey = f"{SENS_PATTERN_PREFIX}{len(self._sensPatternKeys)}"
+            self.db[patternKey] = pattern
+            self._sensPatternKeys[digest] = patternKey
+            self._sensPatterns[patternKey] = pattern
+
+        values = np.concatenate(values).astype(self.sensDtype) if values else np.zeros(0, self.sensDtype)
+        return {
+            SENS_PACKED_KEY: patternKey,
+            "dtype": values.dtype.str,
+            "values": zlib.compress(values.tobytes(), 1) if self.compressSens else values,
+        }
+
+    def _unpackSens(self, packed):
+        """
+        Rebuild the ``funcsSens`` dictionary of a packed entry (see _packSens). Blocks are
+        float64 views into one array; dense blocks come back as arrays of the original shape
+        and sparse blocks as dictionaries of the original format.
+
+        Parameters
+        ----------
+        packed : dict
+            The packed ``funcsSens`` as stored in the file.
+
+        Returns
+        -------
+        dict
+            The ``funcsSens`` dictionary.
+        """
+        patternKey = packed[SENS_PACKED_KEY]
+        if patternKey not in self._sensPatterns:
+            self._sensPatterns[patternKey] = self.db[patternKey]
+        values = packed["values"]
+        if isinstance(values, bytes):
+            values = np.frombuffer(zlib.decompress(values), dtype=packed["dtype"])
+        values = np.asarray(values, dtype=float)
+
+        funcsSens = {}
+        offset = 0
+        for outer, inner, fmt, shape, indices, size in self._sensPatterns[patternKey]:
+            data = values[offset : offset + size]
+            offset += size
+            if fmt == "dense":
+                block = data.reshape(shape) if shape else float(data[0])
+            else:
+                block = {fmt: [indices[0], indices[1], data], "shape": list(shape)}
+            funcsSens.setdefault(outer, {})[inner] = block
+        return funcsSens
 
     def _searchCallCounter(self, x):
         """
@@ -210,7 +331,7 @@ class History:
         self.iterKeys = set()
         self.extraFuncsNames = set()
         for i in self.callCounters:
-            val = self.read(i)
+            val = self.db[i]
             self.iterKeys.update(val.keys())
             if "funcs" in val.keys():
                 self.extraFuncsNames.update(val["funcs"].keys())
@@ -0,0 +1,336 @@
+"""
+pyOpt_multistart
+
+Runs one optimization problem from many initial design vectors concurrently on a
+local process pool, for multimodal problems where a single start finds a local
+optimum only.
+"""
+
+# Standard Python modules
+import multiprocessing
+import os
+import queue
+import time
+import traceback
+from typing import Any, Callable, Dict, List, Optional, Union
+
+# External modules
+import numpy as np
+
+# Local modules
+from .pyOpt_evalstore import EvaluationStore
+from .pyOpt_optimizer import OPT
+from .pyOpt_solution import Solution
+from .pyOpt_utils import INFINITY
+
+
+# Inform values of a successful exit, for the optimizers that report one
+SUCCESS_INFORMS = {
+    "IPOPT": {0, 1},
+    "NLPQLP": {0},
+    "PSQP": {1, 2, 3, 4},
+    "SLSQP": {0},
+    "SNOPT": {1},
+}
+
+
+def _runStart(optProbFactory, optName, optOptions, x0, histFile, evalStore, callKwargs):
+    """
+    Solve one start in a pool worker. Returns the Solution, without the user callbacks
+    so that it can be pickled back, and the wall time of the start. The Solution gets
+    the attributes ``success``, from the inform value of the optimizer (always True for
+    optimizers without one), and ``violation``, the scaled constraint violation at xStar.
+    """
+    timeA = time.time()
+    optProb = optProbFactory()
+    optProb.setDVs(x0)
+    opt = OPT(optName, options=dict(optOptions))
+    opt.evalStore = evalStore
+    sol = opt(optProb, storeHistory=histFile, **callKwargs)
+
+    informs = SUCCESS_INFORMS.get(optName.upper())
+    sol.success = informs is None or sol.optInform["value"] in informs
+    # The last evaluation is usually at xStar; evaluate it otherwise
+    xuser_vec = optProb.processXtoVec(sol.xStar)
+    if "funcs" in opt.cache and np.allclose(optProb._mapXtoUser(opt.cache["x"]), xuser_vec, rtol=1e-12, atol=1e-12):
+        funcs, fail = opt.cache["funcs"], opt.cache["fail"]
+    else:
+        funcs, fail = opt._evalObjFun(sol.xStar)
+    sol.violation = np.inf if fail else opt._constraintViolation(xuser_vec, funcs)
+
+    sol.objFun = None
+    sol.sens = None
+    return sol, time.time() - timeA
+
+
+class MultiStart:
+    def __init__(
+        self,
+        optProbFactory: Callable,
+        optName: str,
+        optOptions: Optional[Dict[str, Any]] = None,
+        sampler: Union[str, Callable] = "lhs",
+        seed: Optional[int] = None,
+        includeInitial: bool = True,
+        historyDir: Optional[str] = None,
+        evalStore: Optional[EvaluationStore] = None,
+    ):
+        """
+        Multi-start optimization: the problem returned by ``optProbFactory`` is solved
+        from ``nStarts`` initial design vectors sampled in the bounds of its continuous
+        design variables, each start in its own process and with its own optimizer.
+
+        Parameters
+        ----------
+        optProbFactory : callable
+            Function without arguments returning a new, fully set up Optimization.
+            It is called in the worker processes, so it must be picklable, i.e. a
+            module-level function, and so must the objective and sens functions.
+
+        optName : str
+            Name of the optimizer, as for :func:`OPT`
+
+        optOptions : dict
+            Options of the optimizer. Options naming output files are shared by all
+            starts; set them per start with ``historyDir`` instead where possible.
+
+        sampler : str or callable
+            ``lhs`` for a Latin hypercube, ``sobol`` for a scrambled Sobol sequence, or
+            a function ``sampler(n, d, rng)`` returning an (n, d) array in the unit
+            hypercube.
+
+        seed : int
+            Seed of the sampler
+
+        includeInitial : bool
+            Flag to use the initial design variables of the problem as the first start
+
+        historyDir : str
+            Directory for the history files, one per start, named
+            ``<problem name>_start<index>.hst``. No history is written if None.
+
+        evalStore : EvaluationStore
+            Evaluation store shared by all starts, so that a point evaluated by one
+            start is not evaluated again by another one or by a later run
+        """
+        self.optProbFactory = optProbFactory
+        self.optName = optName
+        self.optOptions = optOptions or {}
+        self.sampler = sampler
+        self.seed = seed
+        self.includeInitial = includeInitial
+        self.historyDir = historyDir
+        self.evalStore = evalStore
+        self.stats: Dict[str, Any] = {}
+
+    def sample(self, nStarts: int) -> List[Dict[str, Any]]:
+        """
+        Return the initial design variables of ``nStarts`` starts, as dictionaries for
+        :meth:`Optimization.setDVs`. Only continuous variables are sampled, and these
+        need finite bounds; integer and discrete variables keep their initial value.
+
+        Parameters
+        ----------
+        nStarts : int
+            Number of starts
+
+        Returns
+        -------
+        list of dict
+            The design variables of every start
+        """
+        optProb = self.optProbFactory()
+        x0 = optProb.getDVs()
+        lower, upper, slots = [], [], []
+        for dvGroup, variables in optProb.variables.items():
+            for i, var in enumerate(variables):
+                if var.type != "c":
+                    continue
+                if var.lower <= -INFINITY or var.upper >= INFINITY:
+                    raise ValueError(
+                        f"Design variable {dvGroup}[{i}] has no finite bounds to sample the starts in. "
+                        + "Set lower and upper bounds for all continuous variables."
+                    )
+                lower.append(var.lower / var.scale + var.offset)
+                upper.append(var.upper / var.scale + var.offset)
+                slots.append((dvGroup, i, optProb.dvOffset[dvGroup][2]))
+
+        nSample = nStarts - 1 if self.includeInitial else nStarts
+        unit = self._sampleUnit(max(nSample, 0), len(slots))
+        samples = np.array(lower) + unit * (np.array(upper) - np.array(lower))
+
+        starts = [x0] if self.includeInitial and nStarts > 0 else []
+        for row in samples:
+            x = {dvGroup: np.array(value, dtype=float) for dvGroup, value in x0.items()}
+            for (dvGroup, i, scalar), value in zip(slots, row):
+                if scalar:
+                    x[dvGroup] = value
+                else:
+                    x[dvGroup][i] = value
+            starts.append(x)
+        return starts
+
+    def _sampleUnit(self, n, d):
+        """(n, d) samples in the unit hypercube"""
+        rng = np.random.default_rng(self.seed)
+        if n == 0 or d == 0:
+            return np.zeros((n, d))
+        if callable(self.sampler):
+            return np.asarray(self.sampler(n, d, rng), dtype=float)
+
+        # External modules
+        from scipy.stats import qmc
+
+        if self.sampler.lower() == "lhs":
+            return qmc.LatinHypercube(d, seed=rng).random(n)
+        elif self.sampler.lower() == "sobol":
+            return qmc.Sobol(d, scramble=True, seed=rng).random(n)
+        raise ValueError(f"Unknown sampler '{self.sampler}'. Must be 'lhs', 'sobol' or a function.")
+
+    def __call__(
+        self,
+        nStarts: int,
+        workers: Optional[int] = None,
+        targetObj: Optional[float] = None,
+        maxTime: Optional[float] = None,
+        feasTol: float = 1e-6,
+        **callKwargs,
+    ) -> List[Solution]:
+        """
+        Run the starts and return their solutions, best first: successful starts before
+        failed ones, then by constraint violation, then by objective. Starts still
+        running or queued are cancelled (their worker processes terminated) as soon as
+        a successful, feasible start reaches ``targetObj`` or ``maxTime`` has passed. A
+        start raising an error does not stop the others; its traceback is kept in
+        ``stats["errors"]``.
+
+        Every returned Solution has the additional attributes ``startIndex``, ``x0``
+        (the initial design variables), ``wallTime`` (seconds), ``histFile``,
+        ``success`` (whether the optimizer reported a successful exit) and
+        ``violation`` (sum of the scaled constraint violations at xStar). The
+        statistics of the run are stored in ``self.stats``.
+
+        Parameters
+        ----------
+        nStarts : int
+            Number of starts
+
+        workers : int
+            Number of worker processes, by default the number of CPUs
+
+        targetObj : float
+            Stop once a start converges successfully, with a constraint violation of at
+            most ``feasTol``, to an objective at or below this value
+
+        feasTol : float
+            Largest constraint violation of a start that can meet ``targetObj``
+
+        maxTime : float
+            Wall time budget of the whole run in seconds
+
+        ``**callKwargs``
+            Passed to the optimizer call for every start, e.g. ``sens="FD"``
+
+        Returns
+        -------
+        list of Solution
+            The solutions of the completed starts, ranked
+        """
+        starts = self.sample(nStarts)
+        if self.historyDir is not None:
+            os.makedirs(self.historyDir, exist_ok=True)
+        name = self.optProbFactory().name
+
+        timeA = time.time()
+        done = queue.Queue()
+        pool = multiprocessing.Pool(processes=min(workers or os.cpu_count() or 1, max(len(starts), 1)))
+        for i, x0 in enumerate(starts):
+            histFile = None
+            if self.historyDir is not None:
+                histFile = os.path.join(self.historyDir, f"{name}_start{i:03d}.hst")
+            pool.apply_async(
+                _runStart,
+                (self.optProbFactory, self.optName, self.optOptions, x0, histFile, self.evalStore, callKwargs),
+                callback=lambda result, i=i, x0=x0, histFile=histFile: done.put((i, x0, histFile, result, None)),
+                error_callback=lambda e, i=i: done.put((i, None, None, None, e)),
+            )
+
+        solutions: List[Solution] = []
+        errors: Dict[int, str] = {}
+        stopReason = "completed"
+        try:
+            while len(solutions) + len(errors) < len(starts):
+                timeout = None if maxTime is None else maxTime - (time.time() - timeA)
+                if timeout is not None and timeout <= 0:
+                    stopReason = "maxTime"
+                    break
+                try:
+                    i, x0, histFile, result, error = done.get(timeout=timeout)
+                except queue.Empty:
+                    stopReason = "maxTime"
+                    break
+                if error is not None:
+                    errors[i] = "".join(traceback.format_exception(type(error), error, error.__traceback__))
+                    continue
+                sol, wallTime = result
+                sol.startIndex, sol.x0, sol.wallTime, sol.histFile = i, x0, wallTime, histFile
+                solutions.append(sol)
+                if (
+                    targetObj is not None
+                    and sol.success
+                    and sol.violation <= feasTol
+                    and self._objective(sol) <= targetObj
+                ):
+                    stopReason = "targetObj"
+                    break
+        finally:
+            pool.terminate()
+            pool.join()
+
+        solutions.sort(key=self._rank)
+        wallTimes = np.array([sol.wallTime for sol in solutions])
+        self.stats = {
+            "nStarts": len(starts),
+            "completed": len(solutions),
+            "failed": len(errors),
+            "cancelled": len(starts) - len(solutions) - len(errors),
+            "stopReason": stopReason,
+            "wallTime": time.time() - timeA,
+            "startTimeMean": float(wallTimes.mean()) if len(solutions) else 0.0,
+            "startTimeMax": float(wallTimes.max()) if len(solutions) else 0.0,
+            "userObjCalls": int(sum(sol.userObjCalls for sol in solutions)),
+            "userSensCalls": int(sum(sol.userSensCalls for sol in solutions)),
+            "evalStoreHits": int(sum(sol.evalStoreHits for sol in solutions)),
+            "errors": errors,
+        }
+        return solutions
+
+    @classmethod
+    def _rank(cls, sol):
+        """Sort key of a solution: successful first, then by constraint violation and objective"""
+        return (not sol.success, sol.violation, cls._objective(sol))
+
+    @staticmethod
+    def _objective(sol):
+        """The objective of a solution, the first one for multi-objective problems"""
+        if isinstance(sol.fStar, dict):
+            return float(np.atleast_1d(next(iter(sol.fStar.values())))[0])
+        return float(np.atleast_1d(sol.fStar)[0])
+
+    def summary_str(self) -> str:
+        """Summary of the last run"""
+        s = self.stats
+        if not s:
+            return "MultiStart has not been run"
+        text = (
+            f"Multi-start {self.optName}: {s['completed']}/{s['nStarts']} starts completed, "
+            + f"{s['failed']} failed, {s['cancelled']} cancelled ({s['stopReason']})\n"
+            + f"    Wall time:          {s['wallTime']:10.3f} s\n"
+            + f"    Start time mean:    {s['startTimeMean']:10.3f} s\n"
+            + f"    Start time max:     {s['startTimeMax']:10.3f} s\n"
+            + f"    User obj calls:     {s['userObjCalls']:10d}\n"
+            + f"    User sens calls:    {s['userSensCalls']:10d}\n"
+        )
+        if self.evalStore is not None:
+            text += f"    Eval store hits:    {s['evalStoreHits']:10d}\n"
+        return text
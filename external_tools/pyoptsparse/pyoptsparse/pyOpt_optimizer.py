@@ -17,9 +17,11 @@ from numpy import ndarray
 # Local modules
 from .pyOpt_MPI import MPI
 from .pyOpt_error import pyOptSparseWarning
+from .pyOpt_evalstore import EvaluationStore
 from .pyOpt_gradient import Gradient
 from .pyOpt_history import History
 from .pyOpt_optimization import Optimization
+from .pyOpt_pareto import ParetoArchive
 from .pyOpt_solution import Solution
 from .pyOpt_utils import EPS, IDATA, INFINITY, convertToCOO, convertToDense, extractRows, mapToCSC, scaleRows
 
@@ -79,6 +81,15 @@ class Optimizer(BaseSolver):
         self.userObjCalls: int = 0
         self.userSensCalls: int = 0
         self.storeSens: bool = True
+        # Floating point type and compression of the funcsSens stored in the history file
+        self.sensHistoryDtype: str = "float64"
+        self.compressSensHistory: bool = False
+        # Persistent store of objective evaluations shared across runs, see EvaluationStore
+        self.evalStore: Optional[EvaluationStore] = None
+        self.evalStoreHits: int = 0
+        self.evalStoreMisses: int = 0
+        # Pareto archive of multi-objective problems, saved next to the history file
+        self.paretoArchive: Optional[ParetoArchive] = None
 
         # Cache storage
         self.cache: Dict[str, Any] = {"x": None, "fobj": None, "fcon": None, "gobj": None, "gcon": None, "fail": None}
@@ -101,6 +112,8 @@ class Optimizer(BaseSolver):
         self.interfaceTime = 0.0
         self.userObjCalls = 0
         self.userSensCalls = 0
+        self.evalStoreHits = 0
+        self.evalStoreMisses = 0
 
     def _setSens(self, sens: Union[None, str, Callable], sensStep: float, sensMode: str):
         """
@@ -178,7 +191,13 @@ class Optimizer(BaseSolver):
 
             self.storeHistory = False
             if storeHistory:
-                self.hist = History(storeHistory, flag="n", optProb=self.optProb)
+                self.hist = History(
+                    storeHistory,
+                    flag="n",
+                    optProb=self.optProb,
+                    sensDtype=self.sensHistoryDtype,
+                    compressSens=self.compressSensHistory,
+                )
                 self.storeHistory = True
 
                 if self.hotStart is not None:
@@ -197,6 +216,7 @@ class Optimizer(BaseSolver):
                             self.hist.writeData(key, val)
                     self._setMetadata()
                     self.hist.writeData("metadata", self.metadata)
+        self._setParetoArchive(storeHistory)
         self.optProb.comm.Barrier()
 
     def _masterFunc(self, x: ndarray, evaluate: List[str]):
@@ -267,6 +287,8 @@ class Optimizer(BaseSolver):
 
                         # Process constraints/objectives
                         if funcs is not None:
+                            if self.paretoArchive is not None and not fail:
+                                self._insertPareto(xuser_vec, funcs)
                             self.optProb.evaluateLinearConstraints(xuser_vec, funcs)
                             fcon = self.optProb.processContoVec(funcs)
                             fobj = self.optProb.processObjtoVec(funcs)
@@ -321,6 +343,119 @@ class Optimizer(BaseSolver):
         self.interfaceTime += time.time() - timeA
         return result
 
+    def _callObjFun(self, xuser_vec, xuser):
+        """
+        Evaluate the user objective function at xuser, or read the evaluation
+        from the evaluation store if one is set and it has the point.
+        Returns funcs and the fail flag; cache["fromStore"] tells which it was.
+        """
+        self.cache["fromStore"] = False
+        if self.evalStore is not None:
+            # The root proc decides, so that all procs call objFun together or not at all
+            stored = None
+            if self.optProb.comm.rank == 0:
+                stored = self.evalStore.lookup(self.optProb, xuser_vec)
+            stored = self.optProb.comm.bcast(stored, root=0)
+            if stored is not None:
+                self.evalStoreHits += 1
+                self.cache["fromStore"] = True
+                funcs, fail = stored
+                if self.paretoArchive is not None and self.optProb.comm.rank == 0 and not fail:
+                    self._insertPareto(xuser_vec, funcs)
+                return funcs, fail
+            self.evalStoreMisses += 1
+
+        funcs, fail = self._evalObjFun(xuser)
+
+        if self.evalStore is not None and self.optProb.comm.rank == 0:
+            self.evalStore.record(self.optProb, xuser_vec, funcs, fail)
+
+        if self.paretoArchive is not None and self.optProb.comm.rank == 0 and not fail:
+            self._insertPareto(xuser_vec, funcs)
+
+        return funcs, fail
+
+    def _evalObjFun(self, xuser):
+        """
+        Call the user objective function at xuser. Returns funcs and the fail flag.
+        """
+        timeA = time.time()
+        args = self.optProb.objFun(xuser)
+        if isinstance(args, tuple):
+            funcs = args[0]
+            fail = args[1]
+        elif args is None:
+            raise ValueError(
+                "No return values from user supplied objective function. "
+                + "The function must return 'funcs' or 'funcs, fail'"
+            )
+        else:
+            funcs = args
+            fail = 0
+
+        self.userObjTime += time.time() - timeA
+        self.userObjCalls += 1
+
+        # Make sure the user-defined function does *not* return linear constraint values
+        if self.callCounter == 0:
+            self._checkLinearConstraints(funcs)
+
+        # Discard zero imaginary components in funcs
+        for key, val in funcs.items():
+            funcs[key] = np.real(val)
+
+        return funcs, fail
+
+    def _evalStoredPoint(self, xuser):
+        """
+        Call the user objective function for real at the cached point if its funcs
+        were read from the evaluation store. sens may rely on what objFun leaves
+        behind (an OpenMDAO model run at x, for instance), so it must never follow
+        a store hit directly.
+        """
+        if self.cache.get("fromStore"):
+            self._evalObjFun(xuser)
+            self.cache["fromStore"] = False
+
+    def _setParetoArchive(self, storeHistory: Optional[str]):
+        """
+        Set up the Pareto archive of a multi-objective problem, saved next to the
+        history file if there is one
+        """
+        self.paretoArchive = None
+        if len(self.optProb.objectives) < 2 or self.optProb.comm.rank != 0:
+            return
+        xNames = []
+        for dvGroup, variables in self.optProb.variables.items():
+            if len(variables) == 1:
+                xNames.append(dvGroup)
+            else:
+                xNames.extend(f"{dvGroup}_{i}" for i in range(len(variables)))
+        fileName = None
+        if storeHistory:
+            fileName = os.path.splitext(storeHistory)[0] + ".pareto.npz"
+        self.paretoArchive = ParetoArchive(list(self.optProb.objectives.keys()), xNames, fileName=fileName)
+
+    def _insertPareto(self, xuser_vec, funcs):
+        """Insert an evaluation into the Pareto archive, with its scaled constraint violation"""
+        fobj = [np.real(funcs[objName]) for objName in self.optProb.objectives]
+        self.paretoArchive.insert(fobj, xuser_vec, self.callCounter, self._constraintViolation(xuser_vec, funcs))
+
+    def _constraintViolation(self, xuser_vec, funcs):
+        """Sum of the scaled constraint bound violations of an evaluation, linear constraints included"""
+        funcs = dict(funcs)
+        self.optProb.evaluateLinearConstraints(xuser_vec, funcs)
+        violation = 0.0
+        for conName, con in self.optProb.constraints.items():
+            if conName not in funcs:
+                continue
+            value = np.atleast_1d(np.real(funcs[conName])).astype(float)
+            lower = np.array([-INFINITY if bound is None else bound for bound in con.lower], dtype=float)
+            upper = np.array([INFINITY if bound is None else bound for bound in con.upper], dtype=float)
+            excess = np.maximum(lower - value, 0.0) + np.maximum(value - upper, 0.0)
+            violation += float(np.sum(excess * np.abs(con.scale)))
+        return violation
+
     def _masterFunc2(self, x, evaluate, writeHist=True):
         """
         Another shell function. This function is now actually called
@@ -350,30 +485,7 @@ class Optimizer(BaseSolver):
                 # The previous evaluated point is different than the point requested
                 # OR this is a recursive call to _masterFunc2 from a gradient evaluation that occured
                 # at the beginning of a hot started optimization
-                timeA = time.time()
-                args = self.optProb.objFun(xuser)
-                if isinstance(args, tuple):
-                    funcs = args[0]
-                    fail = args[1]
-                elif args is None:
-                    raise ValueError(
-                        "No return values from user supplied objective function. "
-                        + "The function must return 'funcs' or 'funcs, fail'"
-                    )
-                else:
-                    funcs = args
-                    fail = 0
-
-                self.userObjTime += time.time() - timeA
-                self.userObjCalls += 1
-
-                # Make sure the user-defined function does *not* return linear constraint values
-                if self.callCounter == 0:
-                    self._checkLinearConstraints(funcs)
-
-                # Discard zero imaginary components in funcs
-                for key, val in funcs.items():
-                    funcs[key] = np.real(val)
+                funcs, fail = self._callObjFun(xuser_vec, xuser)
 
                 # Store user values
                 self.cache["funcs"] = copy.deepcopy(funcs)
@@ -403,31 +515,7 @@ class Optimizer(BaseSolver):
                 # The previous evaluated point is different than the point requested
                 # OR this is a recursive call to _masterFunc2 from a gradient evaluation that occured
                 # at the beginning of a hot started optimization
-                timeA = time.time()
-
-                args = self.optProb.objFun(xuser)
-                if isinstance(args, tuple):
-                    funcs = args[0]
-                    fail = args[1]
-                elif args is None:
-                    raise ValueError(
-                        "No return values from user supplied objective function. "
-                        + "The function must return 'funcs' *OR* 'funcs, fail'"
-                    )
-                else:
-                    funcs = args
-                    fail = 0
-
-                self.userObjTime += time.time() - timeA
-                self.userObjCalls += 1
-
-                # Make sure the user-defined function does *not* return linear constraint values
-                if self.callCounter == 0:
-                    self._checkLinearConstraints(funcs)
-
-                # Discard zero imaginary components in funcs
-                for key, val in funcs.items():
-                    funcs[key] = np.real(val)
+                funcs, fail = self._callObjFun(xuser_vec, xuser)
 
                 # Store user values
                 self.cache["funcs"] = copy.deepcopy(funcs)
@@ -468,6 +556,7 @@ class Optimizer(BaseSolver):
             # determine if we have to run the sens calc:
 
             if self.cache["gobj"] is None:
+                self._evalStoredPoint(xuser)
                 timeA = time.time()
                 args = self.sens(xuser, self.cache["funcs"])
 
@@ -526,6 +615,7 @@ class Optimizer(BaseSolver):
             # Now, the point has been evaluated correctly so we
             # determine if we have to run the sens calc:
             if self.cache["gcon"] is None:
+                self._evalStoredPoint(xuser)
                 timeA = time.time()
 
                 args = self.sens(xuser, self.cache["funcs"])
@@ -814,6 +904,9 @@ class Optimizer(BaseSolver):
                 obj = list(self.optProb.objectives.keys())[0]
                 for con in multipliers.keys():
                     multipliers[con] /= self.optProb.objectives[obj].scale
+        if self.paretoArchive is not None:
+            self.paretoArchive.flush()
+
         # construct info dict
         info = {
             "optTime": optTime,
@@ -821,6 +914,8 @@ class Optimizer(BaseSolver):
             "userSensTime": self.userSensTime,
             "userObjCalls": self.userObjCalls,
             "userSensCalls": self.userSensCalls,
+            "evalStoreHits": self.evalStoreHits,
+            "evalStoreMisses": self.evalStoreMisses,
             "interfaceTime": self.interfaceTime - self.userSensTime - self.userObjTime,
             "optCodeTime": optTime - self.interfaceTime,
         }
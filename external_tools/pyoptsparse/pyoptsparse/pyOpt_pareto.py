@@ -0,0 +1,235 @@
+"""
+pyOpt_pareto
+
+Incremental archive of the non-dominated feasible evaluations of a multi-objective
+problem. Every evaluation is inserted as it happens, so the current Pareto front is
+available at any time during a run without sorting the whole history.
+"""
+
+# Standard Python modules
+import bisect
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+# External modules
+import numpy as np
+
+
+class ParetoArchive:
+    def __init__(
+        self,
+        objNames: List[str],
+        xNames: Optional[List[str]] = None,
+        fileName: Optional[str] = None,
+        feasTol: float = 1e-6,
+        saveInterval: float = 1.0,
+    ):
+        """
+        Archive of the non-dominated points seen so far, all objectives minimized.
+        A point is inserted only if no archived point is at least as good in every
+        objective, and it removes the archived points it dominates.
+
+        With two objectives the front is kept sorted by the first objective (the
+        second one then decreases along it), so an insertion costs a binary search
+        plus the removal of the points it dominates. With more objectives a point
+        is compared with the current front only, not with all evaluations.
+
+        Parameters
+        ----------
+        objNames : list of str
+            Names of the objectives
+
+        xNames : list of str
+            Names of the entries of the design variable vectors
+
+        fileName : str
+            File the archive is saved to (``numpy.savez`` format) whenever the front
+            changes, at most every ``saveInterval`` seconds, and when
+            :meth:`save` is called. Not saved if None.
+
+        feasTol : float
+            Largest (scaled) constraint violation of a point considered feasible;
+            infeasible points are not archived
+
+        saveInterval : float
+            Minimum time between two saves of a changing front in seconds
+        """
+        self.objNames = list(objNames)
+        self.xNames = list(xNames) if xNames is not None else None
+        self.fileName = fileName
+        self.feasTol = feasTol
+        self.saveInterval = saveInterval
+        self.nObj = len(self.objNames)
+
+        # Archived points. For two objectives they are sorted by the first one and
+        # self._f1 mirrors the first column for bisect.
+        self._F: List[np.ndarray] = []
+        self._X: List[np.ndarray] = []
+        self._callCounters: List[int] = []
+        self._f1: List[float] = []
+        # For more than two objectives, the objectives of the front as one matrix,
+        # one row per objective so the comparisons run along contiguous rows
+        self._Fmat = np.zeros((self.nObj, 0))
+
+        # Counters
+        self.nInserted = 0
+        self.nAccepted = 0
+        self.nInfeasible = 0
+
+        self._lastSave = 0.0
+        self._unsaved = False
+
+    def __len__(self) -> int:
+        return len(self._F)
+
+    def insert(self, fobj, x=None, callCounter: int = -1, violation: float = 0.0) -> bool:
+        """
+        Insert an evaluation.
+
+        Parameters
+        ----------
+        fobj : array
+            Objective values, in the order of ``objNames``
+
+        x : array
+            Design variables of the point
+
+        callCounter : int
+            Call counter of the evaluation in the history file
+
+        violation : float
+            Constraint violation of the point
+
+        Returns
+        -------
+        bool
+            True if the point is now on the front
+        """
+        self.nInserted += 1
+        self._unsaved = True
+        if violation > self.feasTol:
+            self.nInfeasible += 1
+            return False
+        f = np.asarray(fobj, dtype=float).reshape(self.nObj)
+        if not np.all(np.isfinite(f)):
+            return False
+        x = np.zeros(0) if x is None else np.asarray(x, dtype=float).ravel().copy()
+
+        if self.nObj == 2:
+            accepted = self._insert2(f, x, callCounter)
+        else:
+            accepted = self._insertN(f, x, callCounter)
+
+        if accepted:
+            self.nAccepted += 1
+            if self.fileName is not None and time.time() - self._lastSave >= self.saveInterval:
+                self.save()
+        return accepted
+
+    def _insert2(self, f, x, callCounter):
+        # Points [0, i) have a smaller first objective; the last of them has the
+        # smallest second objective among them
+        i = bisect.bisect_left(self._f1, f[0])
+        if i > 0 and self._F[i - 1][1] <= f[1]:
+            return False
+        if i < len(self._F) and self._f1[i] == f[0] and self._F[i][1] <= f[1]:
+            return False
+        # The points from i on with a second objective not better than f[1] are dominated
+        j = i
+        while j < len(self._F) and self._F[j][1] >= f[1]:
+            j += 1
+        self._F[i:j] = [f]
+        self._X[i:j] = [x]
+        self._callCounters[i:j] = [callCounter]
+        self._f1[i:j] = [f[0]]
+        return True
+
+    def _insertN(self, f, x, callCounter):
+        F = self._Fmat
+        if F.shape[1]:
+            dominates, dominated = F[0] <= f[0], F[0] >= f[0]
+            for k in range(1, self.nObj):
+                dominates &= F[k] <= f[k]
+                dominated &= F[k] >= f[k]
+            if dominates.any():
+                return False
+            if dominated.any():
+                remove = np.flatnonzero(dominated)
+                F = np.delete(F, remove, axis=1)
+                for k in remove[::-1]:
+                    del self._F[k], self._X[k], self._callCounters[k]
+        self._Fmat = np.hstack([F, f[:, None]])
+        self._F.append(f)
+        self._X.append(x)
+        self._callCounters.append(callCounter)
+        return True
+
+    def front(self) -> Dict[str, Any]:
+        """
+        The current front, sorted by the first objective: a dictionary with the
+        objectives (n, nObj), the design variables (n, nx) and the call counters (n,)
+        of the points
+        """
+        order = np.argsort([f[0] for f in self._F], kind="stable")
+        F = np.array(self._F).reshape(-1, self.nObj)[order]
+        nx = len(self._X[0]) if self._X else len(self.xNames or [])
+        X = np.array(self._X).reshape(len(self._X), nx)[order]
+        return {
+            "objectives": F,
+            "x": X,
+            "callCounters": np.array(self._callCounters, dtype=int)[order],
+        }
+
+    def merge(self, other: "ParetoArchive"):
+        """Insert the front of another archive of the same problem, e.g. of another start"""
+        if other.objNames != self.objNames:
+            raise ValueError(f"Cannot merge archives of objectives {other.objNames} into {self.objNames}")
+        for f, x, callCounter in zip(other._F, other._X, other._callCounters):
+            self.insert(f, x, callCounter)
+
+    def save(self, fileName: Optional[str] = None):
+        """
+        Write the archive to fileName, by default the file given at construction.
+        The file is replaced atomically, so another process reading it during a run
+        always sees a complete front.
+        """
+        fileName = fileName or self.fileName
+        if fileName is None:
+            raise ValueError("No file name given to save the Pareto archive to")
+        front = self.front()
+        tmp = f"{fileName}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                objNames=np.array(self.objNames),
+                xNames=np.array(self.xNames if self.xNames is not None else []),
+                counters=np.array([self.nInserted, self.nAccepted, self.nInfeasible]),
+                feasTol=self.feasTol,
+                **front,
+            )
+        os.replace(tmp, fileName)
+        self._lastSave = time.time()
+        self._unsaved = False
+
+    def flush(self):
+        """Save the archive if points were inserted since the last save"""
+        if self._unsaved and self.fileName is not None:
+            self.save()
+
+    @classmethod
+    def load(cls, fileName: str) -> "ParetoArchive":
+        """Read an archive saved by :meth:`save`, also while its run is still going"""
+        with np.load(fileName) as data:
+            xNames = [str(name) for name in data["xNames"]]
+            archive = cls([str(name) for name in data["objNames"]], xNames or None, feasTol=float(data["feasTol"]))
+            for f, x, callCounter in zip(data["objectives"], data["x"], data["callCounters"]):
+                archive.insert(f, x, int(callCounter))
+            archive.nInserted, archive.nAccepted, archive.nInfeasible = (int(n) for n in data["counters"])
+        return archive
+
+    def summary_str(self) -> str:
+        return (
+            f"Pareto archive: {len(self)} points on the front, {self.nInserted} evaluations inserted "
+            + f"({self.nInfeasible} infeasible)"
+        )
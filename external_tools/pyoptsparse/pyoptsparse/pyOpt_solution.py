@@ -64,6 +64,8 @@ class Solution(Optimization):
         self.userSensTime = info["userSensTime"]
         self.userObjCalls = info["userObjCalls"]
         self.userSensCalls = info["userSensCalls"]
+        self.evalStoreHits = info.get("evalStoreHits", 0)
+        self.evalStoreMisses = info.get("evalStoreMisses", 0)
         self.interfaceTime = info["interfaceTime"]
         self.optCodeTime = info["optCodeTime"]
         self.optInform = optInform
@@ -91,6 +93,8 @@ class Solution(Optimization):
         text1 += f"       Opt Solver Time:        {self.optCodeTime:10.4f}\n"
         text1 += f"    Calls to Objective Function : {self.userObjCalls:7}\n"
         text1 += f"    Calls to Sens Function :      {self.userSensCalls:7}\n"
+        if self.evalStoreHits + self.evalStoreMisses > 0:
+            text1 += f"    Evaluation Store Hits :       {self.evalStoreHits:7}\n"
 
         for i in range(5, len(lines)):
             text1 += lines[i] + "\n"
@@ -0,0 +1,189 @@
+"""
+pyOpt_surrogate
+
+Surrogate pre-screening of candidate points for the population-based optimizers
+(ALPSO, NSGA2). A radial basis function model of the objectives and constraints is
+trained online on every true evaluation; in each generation only the candidates it
+ranks best, up to a budget, go to the true model, and the others get the surrogate
+prediction.
+"""
+
+# Standard Python modules
+import math
+
+# External modules
+import numpy as np
+
+
+class SurrogateScreen:
+    def __init__(
+        self, xl, xu, trueFraction=0.25, minSamples=0, maxSamples=500, kernel="thin_plate_spline", nEq=0
+    ):
+        """
+        Pre-screening model for one optimization.
+
+        Parameters
+        ----------
+        xl, xu : ndarray
+            Bounds of the optimizer's design variables, used to normalize the inputs
+
+        trueFraction : float
+            Fraction of each generation sent to the true model (at least one point)
+
+        minSamples : int
+            Number of true evaluations before screening starts; 0 means 2 * (n + 1)
+
+        maxSamples : int
+            Maximum number of true evaluations the model is fit to, the most recent ones
+
+        kernel : str
+            Kernel of ``scipy.interpolate.RBFInterpolator``
+
+        nEq : int
+            Number of leading equality constraints (``fcon == 0``); the others are
+            inequalities ``fcon <= 0``
+        """
+        self.xl = np.asarray(xl, dtype=float)
+        self.xu = np.asarray(xu, dtype=float)
+        self.span = np.where(self.xu > self.xl, self.xu - self.xl, 1.0)
+        self.trueFraction = trueFraction
+        self.minSamples = minSamples if minSamples > 0 else 2 * (len(self.xl) + 1)
+        self.maxSamples = maxSamples
+        self.kernel = kernel
+        self.nEq = nEq
+
+        # Archive of true evaluations
+        self.X = []
+        self.F = []
+        self.G = []
+        self._model = None
+
+        # Streaming state (screen()): merits seen in the current generation
+        self._genMerits = []
+        self._genTrue = 0
+
+        # Counters
+        self.nTrue = 0
+        self.nScreened = 0
+
+    @property
+    def active(self):
+        """True once enough true evaluations are archived to screen"""
+        return len(self.X) >= self.minSamples
+
+    def add(self, x, fobj, fcon):
+        """Archive a true evaluation; the model is refit on the next prediction"""
+        self.X.append((np.asarray(x, dtype=float) - self.xl) / self.span)
+        self.F.append(np.atleast_1d(np.asarray(fobj, dtype=float)).copy())
+        self.G.append(np.atleast_1d(np.asarray(fcon, dtype=float)).copy())
+        self.nTrue += 1
+        self._model = None
+
+    def lookup(self, x):
+        """The archived true (fobj, fcon) at x, or None if x was not evaluated"""
+        if not self.X:
+            return None
+        xn = (np.asarray(x, dtype=float) - self.xl) / self.span
+        match = np.flatnonzero(np.all(np.isclose(np.array(self.X), xn, rtol=0.0, atol=1e-12), axis=1))
+        if len(match) == 0:
+            return None
+        return self.F[match[-1]], self.G[match[-1]]
+
+    def _fit(self):
+        # External modules
+        from scipy.interpolate import RBFInterpolator
+
+        X = np.array(self.X[-self.maxSamples :])
+        Y = np.hstack([np.array(self.F[-self.maxSamples :]), np.array(self.G[-self.maxSamples :])])
+        # Repeated points make the interpolation matrix singular; keep the last of each
+        _, last = np.unique(X[::-1], axis=0, return_index=True)
+        keep = np.sort(len(X) - 1 - last)
+        self._model = RBFInterpolator(X[keep], Y[keep], kernel=self.kernel, degree=1, smoothing=1e-10)
+        self._nObj = len(self.F[0])
+
+    def predict(self, X):
+        """
+        Predicted objectives and constraints at the points X (n, ndv), as arrays of
+        shape (n, nObj) and (n, nCon)
+        """
+        if self._model is None:
+            self._fit()
+        Y = self._model((np.atleast_2d(X) - self.xl) / self.span)
+        return Y[:, : self._nObj], Y[:, self._nObj :]
+
+    def merit(self, F, G):
+        """
+        Sort keys of predicted points, better first: constraint violation, then the
+        objective (the number of archived points dominating the point, then the sum of
+        the normalized objectives, for several objectives).
+        """
+        violation = np.abs(G[:, : self.nEq]).sum(axis=1) + np.maximum(G[:, self.nEq :], 0.0).sum(axis=1)
+        if F.shape[1] == 1:
+            return violation, F[:, 0]
+        archive = np.array(self.F)
+        low, high = archive.min(axis=0), archive.max(axis=0)
+        dominated = np.array(
+            [np.sum(np.all(archive <= f, axis=1) & np.any(archive < f, axis=1)) for f in F], dtype=float
+        )
+        return violation, dominated + ((F - low) / np.where(high > low, high - low, 1.0)).sum(axis=1) / F.shape[1]
+
+    def select(self, X):
+        """
+        Pick the points of a whole generation X (n, ndv) that go to the true model.
+        Returns a boolean mask and the predicted objectives and constraints of all points.
+        """
+        n = len(X)
+        if not self.active:
+            return np.ones(n, dtype=bool), None, None
+        F, G = self.predict(X)
+        violation, objective = self.merit(F, G)
+        order = np.lexsort((objective, violation))
+        mask = np.zeros(n, dtype=bool)
+        mask[order[: max(1, math.ceil(self.trueFraction * n))]] = True
+        self.nScreened += int(n - mask.sum())
+        return mask, F, G
+
+    def screen(self, x, generationSize):
+        """
+        Streaming version of select() for optimizers that ask for one point at a time
+        (NSGA2). Each consecutive block of generationSize calls is one generation with
+        a budget of trueFraction * generationSize true evaluations. A point is evaluated
+        if its predicted merit ranks in the best trueFraction of the generation so far,
+        and always once the rest of the generation is needed to spend the budget.
+        Returns None if the point should be evaluated, otherwise its predicted
+        (fobj, fcon).
+        """
+        if len(self._genMerits) == generationSize:
+            self._genMerits, self._genTrue = [], 0
+        budget = max(1, math.ceil(self.trueFraction * generationSize))
+        remaining = generationSize - len(self._genMerits)
+
+        prediction = None
+        evaluate = True
+        if self.active:
+            F, G = self.predict(x)
+            violation, objective = self.merit(F, G)
+            merit = (violation[0], objective[0])
+            rank = sum(m < merit for m in self._genMerits)
+            self._genMerits.append(merit)
+            prediction = (F[0], G[0])
+            if self._genTrue >= budget:
+                evaluate = False
+            elif remaining > budget - self._genTrue:
+                evaluate = rank < self.trueFraction * len(self._genMerits)
+        else:
+            self._genMerits.append((0.0, -np.inf))
+
+        if evaluate:
+            self._genTrue += 1
+            return None
+        self.nScreened += 1
+        return prediction
+
+    def summary_str(self):
+        total = self.nTrue + self.nScreened
+        saved = 100.0 * self.nScreened / total if total else 0.0
+        return (
+            f"Surrogate screening: {self.nTrue} true evaluations, {self.nScreened} screened out "
+            + f"({saved:.1f}% of {total} candidate evaluations saved)"
+        )
@@ -0,0 +1,201 @@
+"""Test the persistent evaluation store"""
+
+# Standard Python modules
+import multiprocessing
+import os
+import tempfile
+import unittest
+
+# External modules
+import numpy as np
+
+# First party modules
+from pyoptsparse import OPT, EvaluationStore, MultiStart, Optimization
+
+OPT_OPTIONS = {"SwarmSize": 10, "maxOuterIter": 10, "xinit": 1, "fileout": 0, "seed": 1}
+
+
+def objfunc(xdict):
+    x, y = xdict["x"], xdict["y"]
+    funcs = {"obj": (x - 1.0) ** 2 + (y + 0.5) ** 2, "con": x + y}
+    return funcs, False
+
+
+def failing_objfunc(xdict):
+    funcs, _ = objfunc(xdict)
+    return funcs, True
+
+
+def get_optProb(objFun=objfunc):
+    optProb = Optimization("evalStore", objFun)
+    optProb.addVar("x", lower=-2.0, upper=2.0, value=0.0)
+    optProb.addVar("y", lower=-2.0, upper=2.0, value=0.0)
+    optProb.addObj("obj")
+    optProb.addCon("con", upper=1.0)
+    return optProb
+
+
+def solve(store, optProb=None):
+    opt = OPT("ALPSO", options=OPT_OPTIONS)
+    opt.evalStore = store
+    return opt(optProb or get_optProb())
+
+
+class StatefulModel:
+    """objFun/sens pair like OpenMDAO's: sens linearizes the model at the last point objFun ran"""
+
+    def __init__(self):
+        self.x = None
+
+    def objfunc(self, xdict):
+        self.x = np.array([xdict["x"], xdict["y"]]).ravel()
+        return objfunc(xdict)
+
+    def sens(self, xdict, funcs):
+        x, y = self.x
+        return {"obj": {"x": [2.0 * (x - 1.0)], "y": [2.0 * (y + 0.5)]}, "con": {"x": [1.0], "y": [1.0]}}, False
+
+
+def setup_opt(store, model):
+    """An optimizer set up for direct calls of its evaluation functions"""
+    opt = OPT("ALPSO", options={**OPT_OPTIONS, "maxOuterIter": 1})
+    opt(get_optProb(model.objfunc))
+    opt.evalStore = store
+    opt._setInitialCacheValues()
+    opt._clearTimings()
+    opt._setSens(model.sens, 1e-6, "")
+    # ALPSO never asks for gradients itself; return them like the gradient-based optimizers do
+    opt.jacType = "dense2d"
+    return opt
+
+
+def record_points(fileName, points):
+    store = EvaluationStore(fileName)
+    optProb = get_optProb()
+    optProb.finalize()
+    for x in points:
+        if store.lookup(optProb, x) is None:
+            store.record(optProb, x, objfunc({"x": x[0], "y": x[1]})[0], False)
+    store.close()
+
+
+class TestEvaluationStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpDir = tempfile.TemporaryDirectory()
+        self.fileName = os.path.join(self.tmpDir.name, "evals.db")
+
+    def tearDown(self):
+        self.tmpDir.cleanup()
+
+    def test_quantize(self):
+        store = EvaluationStore(self.fileName)
+        x = np.array([1.0, -3.7, 0.0, 1e-300, 2.5e8])
+        self.assertEqual(store.quantize(x), store.quantize(x * (1 + 1e-15)))
+        self.assertNotEqual(store.quantize(x), store.quantize(x * (1 + 1e-9)))
+        self.assertEqual(store.quantize([0.0]), store.quantize([-0.0]))
+        # values rounding up to the next power of two give the key of that power
+        self.assertEqual(store.quantize([2.0 - 1e-16]), store.quantize([2.0]))
+
+    def test_rerun(self):
+        store = EvaluationStore(self.fileName, modelVersion="v1")
+        sol1 = solve(store)
+        self.assertEqual(sol1.evalStoreHits, 0)
+        self.assertEqual(len(store), sol1.userObjCalls)
+
+        # the same (seeded) optimization again only reads the store
+        store2 = EvaluationStore(self.fileName, modelVersion="v1")
+        sol2 = solve(store2)
+        self.assertEqual(sol2.userObjCalls, 0)
+        self.assertEqual(sol2.evalStoreHits, sol1.userObjCalls)
+        self.assertEqual(store2.hitRate, 1.0)
+        self.assertEqual(sol1.fStar, sol2.fStar)
+        self.assertEqual(sol1.xStar, sol2.xStar)
+        self.assertIn("100.0% hit rate", store2.summary_str())
+        store.close()
+        store2.close()
+
+    def test_fingerprint(self):
+        store = EvaluationStore(self.fileName, modelVersion="v1")
+        solve(store)
+        # a new model version does not see the evaluations of the old one
+        newVersion = EvaluationStore(self.fileName, modelVersion="v2")
+        sol = solve(newVersion)
+        self.assertEqual(sol.evalStoreHits, 0)
+
+        # nor does a problem with another constraint layout
+        optProb = get_optProb()
+        optProb.addCon("con2", upper=1.0)
+        optProb.objFun = lambda xdict: ({**objfunc(xdict)[0], "con2": xdict["y"]}, False)
+        sol = solve(EvaluationStore(self.fileName, modelVersion="v1"), optProb)
+        self.assertEqual(sol.evalStoreHits, 0)
+
+        # but bounds are not part of the fingerprint
+        a, b = get_optProb(), get_optProb()
+        b.variables["x"][0].upper = 1.0
+        a.finalize()
+        b.finalize()
+        self.assertEqual(store.fingerprint(a), store.fingerprint(b))
+        store.close()
+        newVersion.close()
+
+    def test_sens_after_hit(self):
+        store = EvaluationStore(self.fileName)
+        x = np.array([0.3, -1.2])
+        setup_opt(store, StatefulModel())._masterFunc(x, ["fobj", "fcon"])
+
+        # funcs come from the store, but sens must not see a model that never ran at x
+        model = StatefulModel()
+        opt = setup_opt(store, model)
+        opt._masterFunc(x, ["fobj", "fcon"])
+        self.assertEqual(opt.evalStoreHits, 1)
+        self.assertEqual(opt.userObjCalls, 0)
+        gobj, gcon, fail = opt._masterFunc(x, ["gobj", "gcon"])
+        self.assertEqual(opt.userObjCalls, 1)
+        np.testing.assert_allclose(gobj, [2.0 * (x[0] - 1.0), 2.0 * (x[1] + 0.5)])
+        self.assertFalse(fail)
+
+        # a point objFun already ran at needs no second evaluation
+        opt._masterFunc(x + 0.1, ["fobj", "fcon", "gobj", "gcon"])
+        self.assertEqual(opt.userObjCalls, 2)
+        store.close()
+
+    def test_failed(self):
+        store = EvaluationStore(self.fileName)
+        solve(store, get_optProb(failing_objfunc))
+        self.assertEqual(len(store), 0)
+        store.storeFailed = True
+        sol = solve(store, get_optProb(failing_objfunc))
+        self.assertEqual(len(store), sol.userObjCalls)
+        store.close()
+
+    def test_concurrent(self):
+        # processes recording overlapping points at the same time
+        rng = np.random.default_rng(0)
+        points = np.round(rng.uniform(-2.0, 2.0, (50, 2)), 1)
+        chunks = [points[i : i + 30] for i in range(0, 50, 10)]
+        with multiprocessing.Pool(4) as pool:
+            pool.starmap(record_points, [(self.fileName, chunk) for chunk in chunks])
+        store = EvaluationStore(self.fileName)
+        self.assertEqual(len(store), len(np.unique(points, axis=0)))
+        optProb = get_optProb()
+        optProb.finalize()
+        funcs, fail = store.lookup(optProb, points[7])
+        self.assertEqual(funcs["obj"], objfunc({"x": points[7][0], "y": points[7][1]})[0]["obj"])
+        self.assertFalse(fail)
+        store.close()
+
+    def test_multistart(self):
+        store = EvaluationStore(self.fileName)
+        ms = MultiStart(get_optProb, "ALPSO", optOptions=OPT_OPTIONS, seed=0, evalStore=store)
+        ms(3, workers=3)
+        self.assertGreater(len(store), 0)
+        # the same starts again are answered by the store
+        ms(3, workers=3)
+        self.assertEqual(ms.stats["userObjCalls"], 0)
+        self.assertGreater(ms.stats["evalStoreHits"], 0)
+        self.assertIn("Eval store hits", ms.summary_str())
+        store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
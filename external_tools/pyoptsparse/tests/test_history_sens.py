@@ -0,0 +1,143 @@
+"""Test the packed storage of funcsSens in the history file"""
+
+# Standard Python modules
+import os
+import tempfile
+import unittest
+
+# External modules
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+from sqlitedict import SqliteDict
+
+# First party modules
+from pyoptsparse import History, Optimization, __version__
+from pyoptsparse.pyOpt_history import SENS_PATTERN_PREFIX
+
+N_ITER = 20
+
+
+def get_funcsSens(i):
+    """Collocation-like sensitivities: a dense objective gradient and banded sparse constraint blocks"""
+    rng = np.random.default_rng(i)
+    n = 200
+    rows = np.repeat(np.arange(n), 3)
+    cols = np.clip(rows + np.tile([-1, 0, 1], n), 0, n - 1)
+    csrRowp = np.arange(0, 2 * n + 1, 2)
+    csrCols = np.column_stack([np.arange(n), (np.arange(n) + 1) % n]).ravel()
+    return {
+        "obj": {"x": rng.random(n), "t": 1.0 + i},
+        "defect": {
+            "x": {"coo": [rows, cols, rng.random(rows.size)], "shape": [n, n]},
+            "t": rng.random((n, 1)),
+        },
+        "path": {"x": {"csr": [csrRowp, csrCols, rng.random(csrCols.size)], "shape": [n, n]}},
+    }
+
+
+class TestHistorySens(unittest.TestCase):
+    def setUp(self):
+        self.tmpDir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpDir.cleanup)
+
+    def new_history(self, name, **kwargs):
+        """A history file with the metadata an optimizer writes at the first call"""
+        optProb = Optimization("sens", None)
+        optProb.addVarGroup("x", 200)
+        optProb.addVarGroup("t", 1)
+        optProb.addConGroup("defect", 200, lower=0.0, upper=0.0)
+        optProb.addConGroup("path", 200, upper=0.0)
+        optProb.addObj("obj")
+
+        hist = History(os.path.join(self.tmpDir.name, name), flag="n", optProb=optProb, **kwargs)
+        hist.writeData("metadata", {"version": __version__, "optimizer": "SLSQP"})
+        hist.writeData("varInfo", {"x": {}, "t": {}})
+        hist.writeData("conInfo", {"defect": {}, "path": {}})
+        hist.writeData("objInfo", {"obj": {}})
+        hist.writeData("optProb", optProb)
+        return hist
+
+    def write_history(self, name, **kwargs):
+        hist = self.new_history(name, **kwargs)
+        fileName = hist.fileName
+        for i in range(N_ITER):
+            hist.write(i, {"xuser": {"x": np.zeros(200), "t": np.zeros(1)}, "funcsSens": get_funcsSens(i)})
+        hist.close()
+        return fileName
+
+    def assert_funcsSens_equal(self, actual, desired, rtol=0.0):
+        self.assertEqual(actual.keys(), desired.keys())
+        for outer in desired:
+            self.assertEqual(actual[outer].keys(), desired[outer].keys())
+            for inner, block in desired[outer].items():
+                if isinstance(block, dict):
+                    fmt = next(f for f in ("coo", "csr", "csc") if f in block)
+                    self.assertEqual(list(actual[outer][inner]["shape"]), list(block["shape"]))
+                    assert_array_equal(actual[outer][inner][fmt][0], block[fmt][0])
+                    assert_array_equal(actual[outer][inner][fmt][1], block[fmt][1])
+                    assert_allclose(actual[outer][inner][fmt][2], block[fmt][2], rtol=rtol, atol=0.0)
+                else:
+                    self.assertEqual(np.shape(actual[outer][inner]), np.shape(block))
+                    assert_allclose(actual[outer][inner], block, rtol=rtol, atol=0.0)
+
+    def test_round_trip(self):
+        hist = History(self.write_history("sens.hst"))
+        for i in range(N_ITER):
+            self.assert_funcsSens_equal(hist.read(i)["funcsSens"], get_funcsSens(i))
+        self.assertIn("funcsSens", hist.getIterKeys())
+
+    def test_pattern_written_once(self):
+        fileName = self.write_history("sens.hst")
+        with SqliteDict(fileName) as db:
+            patterns = [key for key in db.keys() if key.startswith(SENS_PATTERN_PREFIX)]
+            self.assertEqual(patterns, [f"{SENS_PATTERN_PREFIX}0"])
+            # per call counter, only one array of values is stored
+            self.assertIsInstance(db["0"]["funcsSens"]["values"], np.ndarray)
+
+        # a raw pickled history of the same sensitivities is larger
+        rawName = os.path.join(self.tmpDir.name, "raw.hst")
+        with SqliteDict(rawName) as db:
+            for i in range(N_ITER):
+                db[str(i)] = {"funcsSens": get_funcsSens(i)}
+            db.commit()
+        self.assertLess(os.path.getsize(fileName), os.path.getsize(rawName))
+
+    def test_new_pattern(self):
+        hist = self.new_history("sens.hst")
+        funcsSens = [get_funcsSens(0), get_funcsSens(1)]
+        funcsSens[1]["defect"]["x"]["coo"][1] = funcsSens[1]["defect"]["x"]["coo"][1][::-1].copy()
+        for i, sens in enumerate(funcsSens):
+            hist.write(i, {"funcsSens": sens})
+        for i, sens in enumerate(funcsSens):
+            self.assert_funcsSens_equal(hist.read(i)["funcsSens"], sens)
+        self.assertEqual(sum(key.startswith(SENS_PATTERN_PREFIX) for key in hist.keys), 2)
+        hist.close()
+
+    def test_float32_and_compression(self):
+        full = os.path.getsize(self.write_history("float64.hst"))
+        for name, kwargs in [
+            ("float32.hst", {"sensDtype": "float32"}),
+            ("compressed.hst", {"compressSens": True}),
+            ("both.hst", {"sensDtype": "float32", "compressSens": True}),
+        ]:
+            with self.subTest(name):
+                fileName = self.write_history(name, **kwargs)
+                self.assertLess(os.path.getsize(fileName), full)
+                hist = History(fileName)
+                rtol = 1e-6 if kwargs.get("sensDtype") == "float32" else 0.0
+                for i in range(N_ITER):
+                    self.assert_funcsSens_equal(hist.read(i)["funcsSens"], get_funcsSens(i), rtol=rtol)
+
+    def test_unpackable_sens(self):
+        hist = self.new_history("sens.hst")
+        hist.write(0, {"funcsSens": {"obj": {"x": "not a number"}}})
+        self.assertEqual(hist.read(0)["funcsSens"], {"obj": {"x": "not a number"}})
+        hist.close()
+
+    def test_invalid_dtype(self):
+        with self.assertRaises(ValueError):
+            History(os.path.join(self.tmpDir.name, "sens.hst"), flag="n", sensDtype="float16")
+
+
+if __name__ == "__main__":
+    unittest.main()
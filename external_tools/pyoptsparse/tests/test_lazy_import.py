@@ -0,0 +1,73 @@
+"""Test that importing pyoptsparse does not import the optimizers"""
+
+# Standard Python modules
+import json
+import subprocess
+import sys
+import unittest
+
+# First party modules
+import pyoptsparse
+
+OPTIMIZER_MODULES = [
+    "pyoptsparse.pySNOPT.pySNOPT",
+    "pyoptsparse.pyIPOPT.pyIPOPT",
+    "pyoptsparse.pySLSQP.pySLSQP",
+    "pyoptsparse.pyCONMIN.pyCONMIN",
+    "pyoptsparse.pyPSQP.pyPSQP",
+    "pyoptsparse.pyNLPQLP.pyNLPQLP",
+    "pyoptsparse.pyNSGA2.pyNSGA2",
+    "pyoptsparse.pyALPSO.pyALPSO",
+    "pyoptsparse.pyParOpt.ParOpt",
+]
+
+# Budget for a cold "import pyoptsparse" in a fresh interpreter, in seconds. Almost all of it
+# is numpy and scipy; importing every optimizer wrapper eagerly would count against it too.
+IMPORT_TIME_BUDGET = 2.0
+
+
+def run_python(code):
+    """Run code in a fresh interpreter and return what it prints as JSON"""
+    out = subprocess.run([sys.executable, "-W", "ignore", "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+class TestLazyImport(unittest.TestCase):
+    def test_import_loads_no_optimizer(self):
+        loaded = run_python(
+            "import json, sys; import pyoptsparse; "
+            + f"print(json.dumps([m for m in {OPTIMIZER_MODULES!r} if m in sys.modules]))"
+        )
+        self.assertEqual(loaded, [])
+
+    def test_access_loads_one_optimizer(self):
+        loaded = run_python(
+            "import json, sys; from pyoptsparse import ALPSO; "
+            + f"print(json.dumps([m for m in {OPTIMIZER_MODULES!r} if m in sys.modules]))"
+        )
+        self.assertEqual(loaded, ["pyoptsparse.pyALPSO.pyALPSO"])
+
+    def test_optimizer_attributes(self):
+        # First party modules
+        from pyoptsparse.pyALPSO.pyALPSO import ALPSO
+
+        self.assertIs(pyoptsparse.ALPSO, ALPSO)
+        for name in pyoptsparse.__all__:
+            self.assertIn(name, dir(pyoptsparse))
+            self.assertTrue(hasattr(pyoptsparse, name))
+        with self.assertRaises(AttributeError):
+            pyoptsparse.NOT_AN_OPTIMIZER  # noqa: B018
+
+    def test_import_time(self):
+        times = [
+            run_python(
+                "import json, time; t0 = time.perf_counter(); import pyoptsparse; "
+                + "print(json.dumps(time.perf_counter() - t0))"
+            )
+            for _ in range(3)
+        ]
+        self.assertLess(min(times), IMPORT_TIME_BUDGET)
+
+
+if __name__ == "__main__":
+    unittest.main()
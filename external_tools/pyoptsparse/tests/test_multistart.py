@@ -0,0 +1,140 @@
+"""Test the multi-start runner"""
+
+# Standard Python modules
+import os
+import tempfile
+from types import SimpleNamespace
+import unittest
+
+# External modules
+import numpy as np
+
+# First party modules
+from pyoptsparse import History, MultiStart, Optimization
+
+OPT_OPTIONS = {"SwarmSize": 10, "maxOuterIter": 20, "xinit": 1, "fileout": 0, "seed": 1}
+
+
+def objfunc(xdict):
+    """Two minima, f = -1.45 near x = -1.9 and f = 1.4 near x = 1.9 (y = 0)"""
+    x, y = xdict["x"], xdict["y"]
+    return {"obj": 0.25 * (x**2 - 4.0) ** 2 + 0.75 * x + y**2}, False
+
+
+def failing_objfunc(xdict):
+    if xdict["x"] > 0:
+        raise RuntimeError("cannot evaluate x > 0")
+    return objfunc(xdict)
+
+
+def get_optProb():
+    optProb = Optimization("twoMinima", objfunc)
+    optProb.addVar("x", lower=-3.0, upper=3.0, value=2.0)
+    optProb.addVar("y", lower=-1.0, upper=1.0, value=0.5)
+    optProb.addObj("obj")
+    return optProb
+
+
+def get_failing_optProb():
+    optProb = get_optProb()
+    optProb.objFun = failing_objfunc
+    return optProb
+
+
+def get_infeasible_optProb():
+    optProb = get_optProb()
+    optProb.objFun = lambda xdict: ({**objfunc(xdict)[0], "con": xdict["x"] + xdict["y"]}, False)
+    optProb.addCon("con", lower=10.0)
+    return optProb
+
+
+def get_unbounded_optProb():
+    optProb = Optimization("unbounded", objfunc)
+    optProb.addVar("x", value=2.0)
+    optProb.addVar("y", lower=-1.0, upper=1.0)
+    optProb.addObj("obj")
+    return optProb
+
+
+class TestMultiStart(unittest.TestCase):
+    def test_sample(self):
+        for sampler in ["lhs", "sobol", lambda n, d, rng: rng.random((n, d))]:
+            with self.subTest(sampler=sampler):
+                starts = MultiStart(get_optProb, "ALPSO", sampler=sampler, seed=3).sample(8)
+                self.assertEqual(len(starts), 8)
+                self.assertEqual(starts[0], {"x": 2.0, "y": 0.5})
+                x = np.array([start["x"] for start in starts[1:]])
+                y = np.array([start["y"] for start in starts[1:]])
+                self.assertTrue(np.all((x >= -3.0) & (x <= 3.0)))
+                self.assertTrue(np.all((y >= -1.0) & (y <= 1.0)))
+                # seeded samples are reproducible
+                again = MultiStart(get_optProb, "ALPSO", sampler=sampler, seed=3).sample(8)
+                self.assertEqual([s["x"] for s in starts], [s["x"] for s in again])
+
+        # a Latin hypercube puts exactly one start into every stratum of each variable
+        starts = MultiStart(get_optProb, "ALPSO", includeInitial=False, seed=0).sample(6)
+        strata = np.floor((np.array([start["x"] for start in starts]) + 3.0) / 1.0)
+        self.assertEqual(sorted(strata), list(range(6)))
+
+    def test_unbounded(self):
+        with self.assertRaises(ValueError):
+            MultiStart(get_unbounded_optProb, "ALPSO").sample(4)
+
+    def test_run(self):
+        with tempfile.TemporaryDirectory() as historyDir:
+            ms = MultiStart(get_optProb, "ALPSO", optOptions=OPT_OPTIONS, seed=0, historyDir=historyDir)
+            sols = ms(6, workers=3)
+            self.assertEqual(len(sols), 6)
+            self.assertEqual(ms.stats["completed"], 6)
+            self.assertEqual(ms.stats["stopReason"], "completed")
+            self.assertEqual(sorted(sol.startIndex for sol in sols), list(range(6)))
+            objectives = [sol.fStar for sol in sols]
+            self.assertEqual(objectives, sorted(objectives))
+            self.assertLess(sols[0].fStar, -1.4)
+            self.assertGreater(ms.stats["userObjCalls"], 0)
+            self.assertIn("6/6 starts completed", ms.summary_str())
+            for sol in sols:
+                self.assertTrue(os.path.exists(sol.histFile))
+                hist = History(sol.histFile)
+                self.assertEqual(len(hist.getCallCounters()), sol.userObjCalls)
+
+    def test_target(self):
+        ms = MultiStart(get_optProb, "ALPSO", optOptions=OPT_OPTIONS, seed=0)
+        sols = ms(16, workers=1, targetObj=10.0)
+        self.assertEqual(len(sols), 1)
+        self.assertEqual(ms.stats["stopReason"], "targetObj")
+        self.assertEqual(ms.stats["cancelled"], 15)
+
+    def test_rank(self):
+        sols = [
+            SimpleNamespace(name="failed", success=False, violation=0.0, fStar=-5.0),
+            SimpleNamespace(name="infeasible", success=True, violation=0.5, fStar=-3.0),
+            SimpleNamespace(name="best", success=True, violation=0.0, fStar=1.0),
+            SimpleNamespace(name="worse", success=True, violation=0.0, fStar=2.0),
+        ]
+        ranked = sorted(sols, key=MultiStart._rank)
+        self.assertEqual([sol.name for sol in ranked], ["best", "worse", "infeasible", "failed"])
+
+    def test_target_infeasible(self):
+        # no start can satisfy the constraint, so none meets targetObj however low its objective
+        ms = MultiStart(get_infeasible_optProb, "ALPSO", optOptions=OPT_OPTIONS, seed=0)
+        sols = ms(4, workers=2, targetObj=10.0)
+        self.assertEqual(len(sols), 4)
+        self.assertEqual(ms.stats["stopReason"], "completed")
+        for sol in sols:
+            self.assertTrue(sol.success)
+            self.assertGreater(sol.violation, 0.0)
+        violations = [sol.violation for sol in sols]
+        self.assertEqual(violations, sorted(violations))
+
+    def test_errors(self):
+        ms = MultiStart(get_failing_optProb, "ALPSO", optOptions=OPT_OPTIONS, seed=0)
+        sols = ms(6, workers=2)
+        self.assertEqual(len(sols) + ms.stats["failed"], 6)
+        self.assertGreater(ms.stats["failed"], 0)
+        for error in ms.stats["errors"].values():
+            self.assertIn("cannot evaluate x > 0", error)
+
+
+if __name__ == "__main__":
+    unittest.main()
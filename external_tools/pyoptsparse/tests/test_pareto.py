@@ -0,0 +1,116 @@
+"""Test the incremental Pareto archive"""
+
+# Standard Python modules
+import os
+import tempfile
+import unittest
+
+# External modules
+import numpy as np
+
+# First party modules
+from pyoptsparse import ALPSO, Optimization, ParetoArchive
+
+
+def nondominated(F):
+    """Brute force reference: indices of the points no other point weakly dominates"""
+    keep = []
+    for i, f in enumerate(F):
+        others = np.delete(F, i, axis=0)
+        if not np.any(np.all(others <= f, axis=1) & np.any(others < f, axis=1)):
+            # of duplicates, only the first one is archived
+            if not any(np.array_equal(F[k], f) for k in keep):
+                keep.append(i)
+    return keep
+
+
+def objfunc(xdict):
+    x, y = xdict["x"], xdict["y"]
+    funcs = {"obj1": x**2 + y**2, "obj2": (x - 1.0) ** 2 + (y - 1.0) ** 2, "con": x - y}
+    return funcs, False
+
+
+class TestParetoArchive(unittest.TestCase):
+    def test_front(self):
+        rng = np.random.default_rng(0)
+        for nObj in [2, 3]:
+            with self.subTest(nObj=nObj):
+                # rounded values give ties and duplicates
+                F = np.round(rng.random((400, nObj)), 2)
+                archive = ParetoArchive([f"f{i}" for i in range(nObj)])
+                for i, f in enumerate(F):
+                    archive.insert(f, [i], callCounter=i)
+                front = archive.front()
+                expected = nondominated(F)
+                self.assertEqual(len(archive), len(expected))
+                self.assertEqual(sorted(front["callCounters"]), expected)
+                np.testing.assert_array_equal(front["objectives"], F[front["callCounters"]])
+                np.testing.assert_array_equal(front["x"][:, 0], front["callCounters"])
+                self.assertTrue(np.all(np.diff(front["objectives"][:, 0]) >= 0))
+
+    def test_infeasible(self):
+        archive = ParetoArchive(["f1", "f2"], feasTol=1e-3)
+        self.assertFalse(archive.insert([0.0, 0.0], violation=0.1))
+        self.assertTrue(archive.insert([1.0, 1.0], violation=1e-4))
+        self.assertFalse(archive.insert([np.nan, 0.0]))
+        self.assertEqual(len(archive), 1)
+        self.assertEqual(archive.nInfeasible, 1)
+
+    def test_save_load_merge(self):
+        rng = np.random.default_rng(1)
+        F = rng.random((200, 2))
+        with tempfile.TemporaryDirectory() as tmpDir:
+            fileName = os.path.join(tmpDir, "front.pareto.npz")
+            a = ParetoArchive(["f1", "f2"], ["x"], fileName=fileName, saveInterval=0.0)
+            b = ParetoArchive(["f1", "f2"], ["x"])
+            for i, f in enumerate(F):
+                (a if i % 2 else b).insert(f, [i], callCounter=i)
+            # saved on every change of the front with saveInterval=0
+            loaded = ParetoArchive.load(fileName)
+            np.testing.assert_array_equal(loaded.front()["objectives"], a.front()["objectives"])
+            a.flush()
+            loaded = ParetoArchive.load(fileName)
+            self.assertEqual(loaded.xNames, ["x"])
+            self.assertEqual(loaded.nInserted, a.nInserted)
+
+            loaded.merge(b)
+            self.assertEqual(sorted(loaded.front()["callCounters"]), nondominated(F))
+            with self.assertRaises(ValueError):
+                loaded.merge(ParetoArchive(["f1", "f3"]))
+
+    def test_optimizer(self):
+        # the archive is fed by the function evaluations of an optimizer
+        optProb = Optimization("pareto", objfunc)
+        optProb.addVar("x", lower=-1.0, upper=2.0, value=0.0)
+        optProb.addVar("y", lower=-1.0, upper=2.0, value=0.0)
+        optProb.addObj("obj1")
+        optProb.addObj("obj2")
+        optProb.addCon("con", lower=0.0)
+        opt = ALPSO()
+        opt.optProb = optProb
+        optProb.finalize()
+        indices, _, buc, fact = optProb.getOrdering(["ne", "le", "ni", "li"], oneSided=True, noEquality=False)
+        optProb.jacIndices, optProb.fact, optProb.offset = indices, fact, buc
+        with tempfile.TemporaryDirectory() as tmpDir:
+            histFile = os.path.join(tmpDir, "pareto.hst")
+            opt._setHistory(histFile, None)
+            opt._setInitialCacheValues()
+            opt.startTime = 0.0
+            X = np.random.default_rng(2).uniform(-1.0, 2.0, (100, 2))
+            for x in X:
+                opt._masterFunc(x, ["fobj", "fcon"])
+            opt.paretoArchive.flush()
+            opt.hist.close()
+
+            funcs = [objfunc({"x": x, "y": y})[0] for x, y in X]
+            F = np.array([[f["obj1"], f["obj2"]] for f in funcs])
+            feasible = np.flatnonzero(X[:, 0] >= X[:, 1])
+            expected = feasible[nondominated(F[feasible])]
+            front = ParetoArchive.load(os.path.join(tmpDir, "pareto.pareto.npz")).front()
+            self.assertEqual(sorted(front["callCounters"]), sorted(expected))
+            np.testing.assert_allclose(front["x"], X[front["callCounters"]])
+            self.assertEqual(opt.paretoArchive.xNames, ["x", "y"])
+
+
+if __name__ == "__main__":
+    unittest.main()
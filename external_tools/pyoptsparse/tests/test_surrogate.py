@@ -0,0 +1,124 @@
+"""Test surrogate pre-screening of ALPSO and NSGA2 candidate evaluations"""
+
+# Standard Python modules
+import unittest
+
+# External modules
+import numpy as np
+from numpy.testing import assert_allclose
+
+# First party modules
+from pyoptsparse import OPT, Optimization
+from pyoptsparse.pyOpt_surrogate import SurrogateScreen
+
+ALPSO_OPTIONS = {"SwarmSize": 20, "maxOuterIter": 30, "stopCriteria": 0, "seed": 1235, "fileout": 0}
+
+
+def quadratic(X):
+    X = np.atleast_2d(X)
+    return np.sum((X - 0.3) ** 2, axis=1)
+
+
+class TestSurrogateScreen(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+        self.screen = SurrogateScreen(np.zeros(3), np.ones(3), trueFraction=0.25)
+        for x in self.rng.random((20, 3)):
+            self.screen.add(x, quadratic(x)[0], [x[0] - 0.5])
+
+    def test_predict(self):
+        X = self.rng.random((10, 3)) * 0.6 + 0.2
+        F, G = self.screen.predict(X)
+        assert_allclose(F[:, 0], quadratic(X), atol=0.05)
+        assert_allclose(G[:, 0], X[:, 0] - 0.5, atol=1e-8)
+
+    def test_select(self):
+        X = self.rng.random((40, 3))
+        mask, F, G = self.screen.select(X)
+        self.assertEqual(mask.sum(), 10)
+        self.assertEqual(self.screen.nScreened, 30)
+        # feasible points (x0 <= 0.5) first, the lowest predicted objective among them
+        feasible = X[:, 0] <= 0.5
+        self.assertTrue(np.all(feasible[mask]) or np.all(mask[feasible]))
+        self.assertLessEqual(F[mask, 0].max(), F[~mask & feasible, 0].min() + 1e-12)
+
+    def test_inactive(self):
+        screen = SurrogateScreen(np.zeros(3), np.ones(3))
+        mask, F, G = screen.select(np.zeros((5, 3)))
+        self.assertTrue(np.all(mask))
+        self.assertIsNone(screen.screen(np.zeros(3), 8))
+
+    def test_screen_budget(self):
+        generationSize = 16
+        for _ in range(5):
+            evaluated = 0
+            for x in self.rng.random((generationSize, 3)):
+                if self.screen.screen(x, generationSize) is None:
+                    evaluated += 1
+                    self.screen.add(x, quadratic(x)[0], [x[0] - 0.5])
+            self.assertEqual(evaluated, 4)
+
+    def test_lookup(self):
+        x = self.screen.X[3] * self.screen.span + self.screen.xl
+        assert_allclose(self.screen.lookup(x)[0], self.screen.F[3])
+        self.assertIsNone(self.screen.lookup(np.full(3, 2.0)))
+
+
+class TestALPSOSurrogate(unittest.TestCase):
+    def optimize(self, optProb, surrogate):
+        opt = OPT("ALPSO", options={**ALPSO_OPTIONS, "surrogate": surrogate})
+        return opt, opt(optProb)
+
+    def test_sphere(self):
+        def objfunc(xdict):
+            x = xdict["xvars"]
+            return {"obj": np.dot(x, x)}, False
+
+        def get_optProb():
+            optProb = Optimization("Sphere", objfunc)
+            optProb.addVarGroup("xvars", 4, lower=-10.0, upper=10.0, value=[1.3, 0.7, -1.5, 0.2])
+            optProb.addObj("obj")
+            return optProb
+
+        _, sol = self.optimize(get_optProb(), False)
+        opt, solSurrogate = self.optimize(get_optProb(), True)
+        self.assertLess(solSurrogate.userObjCalls, 0.3 * sol.userObjCalls)
+        self.assertLess(solSurrogate.fStar, 1e-4)
+        self.assertGreater(opt.surrogate.nScreened, 0)
+        assert_allclose(solSurrogate.xStar["xvars"], np.zeros(4), atol=1e-2)
+
+    def test_hs015(self):
+        def objfunc(xdict):
+            x = xdict["xvars"]
+            funcs = {}
+            funcs["obj"] = 100 * (x[1] - x[0] ** 2) ** 2 + (1 - x[0]) ** 2
+            funcs["con"] = [x[0] * x[1], x[0] + x[1] ** 2]
+            return funcs, False
+
+        optProb = Optimization("HS15", objfunc)
+        optProb.addVarGroup("xvars", 2, lower=[-5.0, -5.0], upper=[0.5, 5.0], value=[-2, 1.0])
+        optProb.addConGroup("con", 2, lower=[1.0, 0.0], upper=None)
+        optProb.addObj("obj")
+        _, sol = self.optimize(optProb, True)
+        # the reported objective is a true evaluation
+        x = sol.xStar["xvars"]
+        assert_allclose(sol.fStar, objfunc({"xvars": x})[0]["obj"], rtol=1e-12)
+        assert_allclose(sol.fStar, 306.5, rtol=1e-2)
+
+    def test_failed_best(self):
+        # evaluations near the optimum fail, so the best particle never enters the archive
+        def objfunc(xdict):
+            x = xdict["xvars"]
+            return {"obj": np.dot(x, x)}, bool(np.dot(x, x) < 1.0)
+
+        optProb = Optimization("Sphere", objfunc)
+        optProb.addVarGroup("xvars", 2, lower=-10.0, upper=10.0, value=[5.0, -5.0])
+        optProb.addObj("obj")
+        opt, sol = self.optimize(optProb, True)
+        self.assertIsNone(opt.surrogate.lookup(opt.optProb.processXtoVec(sol.xStar)))
+        self.assertLess(sol.fStar, 1.0)
+        self.assertIn("surrogate prediction", sol.optInform["text"])
+
+
+if __name__ == "__main__":
+    unittest.main()
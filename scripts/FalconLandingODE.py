@@ -1,23 +1,38 @@
 import numpy as np
 import openmdao.api as om
 import dymos as dm
-import matplotlib.pyplot as plt
 import os
+import time
+
+from atmosphere import US76
+from auto_scaling import load_scaling
+from propulsion import load_engine
+from coloring_cache import save_coloring, use_cached_coloring
+from timeseries_store import TimeseriesStore
+from trajectory_sim import print_simulation_error, simulate_phase
+from warm_start import SolutionDatabase, landing_boundary
 
 # --- 1. Define the ODE Component for Falcon 9 Landing ---
 class FalconLandingODE(om.ExplicitComponent):
     """
     ODE for a simplified Falcon 9 booster atmospheric re-entry and powered landing.
-    This is a placeholder and would need to be populated with accurate
-    aerodynamic and propulsion models for a real simulation.
+    Thrust and propellant flow follow the altitude tables of the engine XML
+    (propulsion.py); the aerodynamics is still a constant-Cd placeholder.
     """
     def initialize(self):
         self.options.declare('num_nodes', types=int)
         self.options.declare('g_approx', default=9.80665, desc='Approximate gravitational acceleration (m/s**2)')
-        self.options.declare('Isp', default=300.0, desc='Specific impulse of Merlin 1D engine (s)')
-        self.options.declare('max_thrust_vac', default=845e3, desc='Max vacuum thrust of one Merlin 1D (N)')
+        self.options.declare('engine', default='Merlin1D', types=str, allow_none=True,
+                             desc='Engine XML (name in aircraft/Falcon9Booster or path) for altitude-dependent '
+                                  'thrust and Isp, see propulsion.py; None for the constant Isp/max_thrust_vac')
+        self.options.declare('Isp', default=300.0, desc='Specific impulse of Merlin 1D engine (s), if engine is None')
+        self.options.declare('max_thrust_vac', default=845e3,
+                             desc='Max thrust of one Merlin 1D (N), if engine is None')
         self.options.declare('num_engines', default=1, desc='Number of engines for landing burn (e.g., 1 or 3)')
         self.options.declare('area_ref', default=10.6, desc='Reference area for aerodynamics (m^2, approx for F9)')
+        self.options.declare('cache_intermediates', default=True, types=bool,
+                             desc='Reuse the intermediates of compute in compute_partials when the inputs are unchanged')
+        self._scratch = {}
 
     def setup(self):
         nn = self.options['num_nodes']
@@ -65,6 +80,7 @@ class FalconLandingODE(om.ExplicitComponent):
         self.declare_partials(of='vh_dot', wrt='gimbal_alpha', rows=ar, cols=ar)
         self.declare_partials(of='vh_dot', wrt='gimbal_beta', rows=ar, cols=ar)
         
+        self.declare_partials(of='mass_dot', wrt='h', rows=ar, cols=ar)
         self.declare_partials(of='mass_dot', wrt='throttle', rows=ar, cols=ar)
 
         self.declare_partials(of='dynamic_pressure', wrt='h', rows=ar, cols=ar)
@@ -79,176 +95,203 @@ class FalconLandingODE(om.ExplicitComponent):
         self.declare_partials(of='g_load_axial', wrt='gimbal_alpha', rows=ar, cols=ar)
         self.declare_partials(of='g_load_axial', wrt='gimbal_beta', rows=ar, cols=ar)
 
-    def compute(self, inputs, outputs):
+    def _scratch_for(self, inputs):
+        """
+        Per-evaluation intermediates shared by compute and compute_partials, kept in
+        preallocated buffers. They are recomputed only when the inputs differ from the
+        last evaluation (OpenMDAO linearizes at the point it just computed, so
+        compute_partials normally finds them current).
+        """
         h = inputs['h']
-        vx = inputs['vx']
-        vh = inputs['vh']
-        mass = inputs['mass']
-        throttle = inputs['throttle']
-        gimbal_alpha = inputs['gimbal_alpha'] 
-
-        g_approx = self.options['g_approx'] 
-        Isp = self.options['Isp']
-        max_thrust_per_engine_vac = self.options['max_thrust_vac']
+        n, dtype = h.shape[0], h.dtype
+        scratch = self._scratch.get(dtype)
+        if scratch is None or scratch['key'].shape[1] != n:
+            scratch = {name: np.empty(n, dtype=dtype) for name in _SCRATCH_NAMES}
+            scratch['key'] = np.full((len(_KEY_INPUTS), n), np.nan, dtype=dtype)
+            self._scratch[dtype] = scratch
+
+        key = scratch['key']
+        if self.options['cache_intermediates'] and all(
+                np.array_equal(key[i], inputs[name]) for i, name in enumerate(_KEY_INPUTS)):
+            return scratch
+        for i, name in enumerate(_KEY_INPUTS):
+            key[i] = inputs[name]
+
+        rho, drho_dh = US76.density(h)
+        scratch['rho'][:] = rho
+        scratch['drho_dh'][:] = drho_dh
+
+        vx, vh = inputs['vx'], inputs['vh']
+        v_total = scratch['v_total']
+        np.multiply(vx, vx, out=v_total)
+        v_total += vh * vh
+        v_total += 1e-9
+        np.sqrt(v_total, out=v_total)
+
+        # Full-throttle thrust and propellant flow at each node, and their altitude slopes
         num_engines = self.options['num_engines']
-        area_ref = self.options['area_ref']
+        if self.options['engine'] is None:
+            scratch['thrust_max'][:] = num_engines * self.options['max_thrust_vac']
+            scratch['mdot_max'][:] = scratch['thrust_max'] / (self.options['Isp'] * 9.80665)
+            scratch['dthrust_max_dh'][:] = 0.0
+            scratch['dmdot_max_dh'][:] = 0.0
+        else:
+            perf = load_engine(self.options['engine']).performance(h, num_engines)
+            scratch['thrust_max'][:] = perf['thrust']
+            scratch['mdot_max'][:] = perf['mdot']
+            scratch['dthrust_max_dh'][:] = perf['dthrust_dh']
+            scratch['dmdot_max_dh'][:] = perf['dmdot_dh']
+        np.multiply(inputs['throttle'], scratch['thrust_max'], out=scratch['thrust_mag'])
+        np.sin(inputs['gimbal_alpha'], out=scratch['sin_ga'])
+        np.cos(inputs['gimbal_alpha'], out=scratch['cos_ga'])
+        np.divide(1.0, inputs['mass'], out=scratch['inv_mass'])
+
+        # Drag per unit velocity component: D/|v| = 0.5 * rho * |v| * Cd * S
+        np.multiply(scratch['rho'], v_total, out=scratch['drag_per_v'])
+        scratch['drag_per_v'] *= 0.5 * _CD * self.options['area_ref']
+        return scratch
 
-        # Simplified atmospheric model
-        rho = 1.225 * np.ones_like(h) 
-        idx_tropo = (h >= 0) & (h <= 11000)
-        if np.any(idx_tropo):
-            rho[idx_tropo] = 1.225 * np.maximum(0.001, (1 - h[idx_tropo]/44330.0)**4.256)
-        
-        idx_strato = h > 11000
-        if np.any(idx_strato):
-            rho[idx_strato] = 0.3639 * np.exp(-(h[idx_strato] - 11000.0)/6300.0)
-        
-        rho[h < 0] = 1.225
-
-        v_total = np.sqrt(vx**2 + vh**2 + 1e-9)
-        Cd = 0.5
+    def compute(self, inputs, outputs):
+        vx = inputs['vx']
+        vh = inputs['vh']
+        g_approx = self.options['g_approx']
 
-        thrust_mag = throttle * num_engines * max_thrust_per_engine_vac
-        thrust_x = thrust_mag * np.sin(gimbal_alpha) 
-        thrust_h = thrust_mag * np.cos(gimbal_alpha) 
+        s = self._scratch_for(inputs)
+        inv_mass = s['inv_mass']
 
-        drag_force_mag = 0.5 * rho * v_total**2 * Cd * area_ref
-        drag_x = np.zeros_like(vx)
-        drag_h = np.zeros_like(vh)
-        
-        non_zero_v_total_mask = v_total > 1e-9 
-        if np.any(non_zero_v_total_mask):
-            drag_x[non_zero_v_total_mask] = -drag_force_mag[non_zero_v_total_mask] * (vx[non_zero_v_total_mask] / v_total[non_zero_v_total_mask])
-            drag_h[non_zero_v_total_mask] = -drag_force_mag[non_zero_v_total_mask] * (vh[non_zero_v_total_mask] / v_total[non_zero_v_total_mask])
-        
-        lift_x = 0.0
-        lift_h = 0.0
-        gravity_force = mass * g_approx 
-
-        sum_forces_x = thrust_x + drag_x + lift_x
-        sum_forces_h = thrust_h + drag_h + lift_h - gravity_force 
+        # Drag opposes velocity: drag_x = -D * vx/|v| (|v| >= sqrt(1e-9), so no zero-speed branch)
+        sum_forces_x = s['thrust_mag'] * s['sin_ga'] - s['drag_per_v'] * vx
+        sum_forces_h = s['thrust_mag'] * s['cos_ga'] - s['drag_per_v'] * vh - inputs['mass'] * g_approx
 
         outputs['x_dot'] = vx
-        outputs['h_dot'] = vh 
-        outputs['vx_dot'] = sum_forces_x / mass
-        outputs['vh_dot'] = sum_forces_h / mass
-        outputs['mass_dot'] = -thrust_mag / (Isp * 9.80665)
+        outputs['h_dot'] = vh
+        np.multiply(sum_forces_x, inv_mass, out=outputs['vx_dot'])
+        np.multiply(sum_forces_h, inv_mass, out=outputs['vh_dot'])
+        np.multiply(inputs['throttle'], s['mdot_max'], out=outputs['mass_dot'])
+        outputs['mass_dot'] *= -1.0
 
-        outputs['dynamic_pressure'] = 0.5 * rho * v_total**2
-        outputs['g_load_axial'] = sum_forces_h / mass
+        outputs['dynamic_pressure'] = 0.5 * s['rho'] * s['v_total']**2
+        outputs['g_load_axial'] = outputs['vh_dot']
 
     def compute_partials(self, inputs, partials):
-        nn = self.options['num_nodes']
-        h = inputs['h']
         vx = inputs['vx']
         vh = inputs['vh']
-        mass = inputs['mass']
         throttle = inputs['throttle']
-        gimbal_alpha = inputs['gimbal_alpha']
 
-        g_approx = self.options['g_approx']
-        Isp = self.options['Isp']
-        max_thrust_per_engine_vac = self.options['max_thrust_vac']
-        num_engines = self.options['num_engines']
-        area_ref = self.options['area_ref']
-        
-        rho_for_partials = np.zeros(nn) 
-        d_rho_d_h = np.zeros(nn)
-
-        idx_tropo = (h >= 0) & (h <= 11000) 
-        if np.any(idx_tropo):
-            h_at_idx_tropo = h[idx_tropo] 
-            term_tropo_values_at_idx_tropo = 1.0 - h_at_idx_tropo / 44330.0 
-            safe_term_tropo_values_at_idx_tropo = np.maximum(1e-9, term_tropo_values_at_idx_tropo) 
-            
-            rho_for_partials[idx_tropo] = 1.225 * safe_term_tropo_values_at_idx_tropo**4.256
-            d_rho_d_h[idx_tropo] = 1.225 * 4.256 * (safe_term_tropo_values_at_idx_tropo**3.256) * (-1.0/44330.0)
-            
-            clamped_condition_for_tropo_subset = (term_tropo_values_at_idx_tropo <= 1e-9) 
-            clamped_tropo_mask_global = np.zeros(nn, dtype=bool)
-            clamped_tropo_mask_global[idx_tropo] = clamped_condition_for_tropo_subset
-            
-            if np.any(clamped_tropo_mask_global):
-                 d_rho_d_h[clamped_tropo_mask_global] = 0.0
-
-        idx_strato = h > 11000
-        if np.any(idx_strato):
-            h_at_idx_strato = h[idx_strato]
-            exp_term_strato = np.exp(-(h_at_idx_strato - 11000.0)/6300.0)
-            rho_for_partials[idx_strato] = 0.3639 * exp_term_strato 
-            d_rho_d_h[idx_strato] = 0.3639 * exp_term_strato * (-1.0/6300.0)
-
-        idx_below_zero = h < 0
-        if np.any(idx_below_zero):
-            rho_for_partials[idx_below_zero] = 1.225 
-            d_rho_d_h[idx_below_zero] = 0.0
-        
-        v_total = np.sqrt(vx**2 + vh**2 + 1e-9) 
-        Cd = 0.5 
+        k_drag = 0.5 * _CD * self.options['area_ref']
+
+        s = self._scratch_for(inputs)
+        rho, drho_dh, v_total = s['rho'], s['drho_dh'], s['v_total']
+        thrust_mag, sin_ga, cos_ga = s['thrust_mag'], s['sin_ga'], s['cos_ga']
+        inv_mass, drag_per_v = s['inv_mass'], s['drag_per_v']
+        thrust_per_throttle = s['thrust_max']
+        k_rho_over_v = k_drag * rho / v_total
 
-        thrust_mag = throttle * num_engines * max_thrust_per_engine_vac
-        sin_ga = np.sin(gimbal_alpha)
-        cos_ga = np.cos(gimbal_alpha)
-        
         partials['x_dot', 'vx'] = 1.0
         partials['h_dot', 'vh'] = 1.0
-        partials['mass_dot', 'throttle'] = -num_engines * max_thrust_per_engine_vac / (Isp * 9.80665)
-
-        safe_v_total = np.maximum(1e-9, v_total)
-
-        partials['vx_dot', 'h'] = (-0.5 * d_rho_d_h * vx * safe_v_total * Cd * area_ref) / mass
-        d_drag_x_d_vx = -0.5 * rho_for_partials * Cd * area_ref * ( (vx**2 / safe_v_total) + safe_v_total )
-        partials['vx_dot', 'vx'] = d_drag_x_d_vx / mass
-        d_drag_x_d_vh = -0.5 * rho_for_partials * Cd * area_ref * (vx * vh / safe_v_total)
-        partials['vx_dot', 'vh'] = d_drag_x_d_vh / mass
-        partials['vx_dot', 'mass'] = -(thrust_mag * sin_ga -0.5 * rho_for_partials * vx * safe_v_total * Cd * area_ref) / mass**2
-        partials['vx_dot', 'throttle'] = (num_engines * max_thrust_per_engine_vac * sin_ga) / mass
-        partials['vx_dot', 'gimbal_alpha'] = (thrust_mag * cos_ga) / mass
-        partials['vx_dot', 'gimbal_beta'] = 0.0 
-
-        partials['vh_dot', 'h'] = (-0.5 * d_rho_d_h * vh * safe_v_total * Cd * area_ref) / mass
-        d_drag_h_d_vx = -0.5 * rho_for_partials * Cd * area_ref * (vh * vx / safe_v_total)
-        partials['vh_dot', 'vx'] = d_drag_h_d_vx / mass
-        d_drag_h_d_vh = -0.5 * rho_for_partials * Cd * area_ref * ( (vh**2 / safe_v_total) + safe_v_total )
-        partials['vh_dot', 'vh'] = d_drag_h_d_vh / mass
-        
-        partials['vh_dot', 'mass'] = -(thrust_mag * cos_ga - 0.5 * rho_for_partials * vh * safe_v_total * Cd * area_ref - mass * g_approx) / mass**2
-        
-        partials['vh_dot', 'throttle'] = (num_engines * max_thrust_per_engine_vac * cos_ga) / mass
-        partials['vh_dot', 'gimbal_alpha'] = (-thrust_mag * sin_ga) / mass
+        partials['mass_dot', 'throttle'] = -s['mdot_max']
+        partials['mass_dot', 'h'] = -throttle * s['dmdot_max_dh']
+
+        # Altitude changes drag through density and thrust through the engine tables
+        dvdot_dh = -k_drag * drho_dh * v_total * inv_mass
+        dthrust_dh = throttle * s['dthrust_max_dh'] * inv_mass
+        partials['vx_dot', 'h'] = dvdot_dh * vx + dthrust_dh * sin_ga
+        partials['vx_dot', 'vx'] = -(k_rho_over_v * vx * vx + drag_per_v) * inv_mass
+        partials['vx_dot', 'vh'] = -k_rho_over_v * vx * vh * inv_mass
+        partials['vx_dot', 'mass'] = -(thrust_mag * sin_ga - drag_per_v * vx) * inv_mass**2
+        partials['vx_dot', 'throttle'] = thrust_per_throttle * sin_ga * inv_mass
+        partials['vx_dot', 'gimbal_alpha'] = thrust_mag * cos_ga * inv_mass
+        partials['vx_dot', 'gimbal_beta'] = 0.0
+
+        partials['vh_dot', 'h'] = dvdot_dh * vh + dthrust_dh * cos_ga
+        partials['vh_dot', 'vx'] = partials['vx_dot', 'vh']
+        partials['vh_dot', 'vh'] = -(k_rho_over_v * vh * vh + drag_per_v) * inv_mass
+        # Gravity does not depend on mass once divided by it
+        partials['vh_dot', 'mass'] = -(thrust_mag * cos_ga - drag_per_v * vh) * inv_mass**2
+        partials['vh_dot', 'throttle'] = thrust_per_throttle * cos_ga * inv_mass
+        partials['vh_dot', 'gimbal_alpha'] = -thrust_mag * sin_ga * inv_mass
         partials['vh_dot', 'gimbal_beta'] = 0.0
 
-        partials['dynamic_pressure', 'h'] = 0.5 * d_rho_d_h * safe_v_total**2
-        partials['dynamic_pressure', 'vx'] = rho_for_partials * vx 
-        partials['dynamic_pressure', 'vh'] = rho_for_partials * vh 
-        
-        partials['g_load_axial', 'h'] = partials['vh_dot', 'h']
-        partials['g_load_axial', 'vx'] = partials['vh_dot', 'vx']
-        partials['g_load_axial', 'vh'] = partials['vh_dot', 'vh']
-        partials['g_load_axial', 'mass'] = partials['vh_dot', 'mass']
-        partials['g_load_axial', 'throttle'] = partials['vh_dot', 'throttle']
-        partials['g_load_axial', 'gimbal_alpha'] = partials['vh_dot', 'gimbal_alpha']
-        partials['g_load_axial', 'gimbal_beta'] = partials['vh_dot', 'gimbal_beta']
-
-# --- Main script execution ---
-if __name__ == '__main__':
-    # --- 2. Instantiate OpenMDAO Problem ---
-    p = om.Problem(model=om.Group())
-
-    # --- 3. Configure the Optimizer (Driver) ---
+        partials['dynamic_pressure', 'h'] = 0.5 * drho_dh * v_total**2
+        partials['dynamic_pressure', 'vx'] = rho * vx
+        partials['dynamic_pressure', 'vh'] = rho * vh
+
+        for wrt in ('h', 'vx', 'vh', 'mass', 'throttle', 'gimbal_alpha', 'gimbal_beta'):
+            partials['g_load_axial', wrt] = partials['vh_dot', wrt]
+
+
+_CD = 0.5
+
+# Inputs the cached intermediates depend on, and the scratch buffers holding them
+_KEY_INPUTS = ('h', 'vx', 'vh', 'mass', 'throttle', 'gimbal_alpha')
+_SCRATCH_NAMES = ('rho', 'drho_dh', 'v_total', 'thrust_max', 'dthrust_max_dh', 'mdot_max', 'dmdot_max_dh',
+                  'thrust_mag', 'sin_ga', 'cos_ga', 'inv_mass', 'drag_per_v')
+
+
+# --- Problem construction, shared by this script and the tools that reuse the landing problem ---
+LANDING_ODE_KWARGS = {
+    'g_approx': 9.80665, 'engine': 'Merlin1D',
+    'num_engines': 1, 'area_ref': 10.6
+}
+
+# Entry and touchdown conditions of the default landing guess
+LANDING_INITIAL = {'x': -200000.0, 'h': 80000.0, 'vx': 6000.0, 'vh': -1500.0, 'mass': 70000.0}
+LANDING_FINAL = {'x': 0.0, 'h': 0.0, 'vx': 0.0, 'vh': -1.0}
+
+# Control and state limits of the landing problem
+LANDING_THROTTLE_BOUNDS = (0.0, 1.0)
+LANDING_GIMBAL_LIMIT = 0.2  # rad, thrust angle from vertical
+LANDING_MIN_MASS = 20000.0  # kg
+LANDING_DURATION_BOUNDS = (30.0, 500.0)  # s
+
+# Hand-picked scaling: refs of the state and control design variables, defect and
+# continuity refs of their constraints, and refs of the duration, objective and
+# boundary constraints. build_landing_problem uses the scaling derived by
+# auto_scaling.py from a reference trajectory instead, once one is stored.
+LANDING_SCALING = {
+    'states': {
+        'x': {'ref': 200000.0, 'defect_ref': 20000.0},
+        'h': {'ref': 80000.0, 'defect_ref': 8000.0},
+        'vx': {'ref': 6000.0, 'defect_ref': 600.0},
+        'vh': {'ref': 1500.0, 'defect_ref': 150.0},
+        'mass': {'ref': 70000.0, 'defect_ref': 7000.0},
+    },
+    'controls': {
+        'throttle': {'ref': 1.0},
+        'gimbal_alpha': {'ref': 0.2},
+        'gimbal_beta': {'ref': 0.2},
+    },
+    'duration_ref': 100.0,
+    'objective_ref': -70000.0,  # maximize the final mass
+    'boundary_refs': {'x': 200000.0},
+}
+
+
+# IPOPT options of the landing problem; settings_race.py races alternatives
+LANDING_IPOPT_SETTINGS = {
+    'max_iter': 500,
+    'tol': 1e-6,
+    'mu_init': 1e-3,
+    'mu_strategy': 'adaptive',
+    'nlp_scaling_method': 'gradient-based',
+    'expect_infeasible_problem': 'yes',
+    'required_infeasibility_reduction': 0.5,
+}
+
+
+def configure_driver(p, optimizer='IPOPT', print_level=7, opt_settings=None):
+    """
+    pyOptSparseDriver with IPOPT, or ScipyOptimizeDriver SLSQP when pyOptSparse is not
+    installed. opt_settings override LANDING_IPOPT_SETTINGS (IPOPT only).
+    """
     try:
         p.driver = om.pyOptSparseDriver()
-        p.driver.options['optimizer'] = 'IPOPT'
-        p.driver.opt_settings['max_iter'] = 500 
-        p.driver.opt_settings['tol'] = 1e-6    
-        p.driver.opt_settings['mu_init'] = 1e-3 
-        p.driver.opt_settings['print_level'] = 7 
-        p.driver.opt_settings['mu_strategy'] = 'adaptive' 
-        p.driver.opt_settings['nlp_scaling_method'] = 'gradient-based'
-        p.driver.opt_settings['expect_infeasible_problem'] = 'yes'
-        p.driver.opt_settings['required_infeasibility_reduction'] = 0.5
-        p.driver.declare_coloring()
-        print("--- Using pyOptSparseDriver with IPOPT for Falcon Landing (default linear solver, additional tuning) ---")
+        p.driver.options['optimizer'] = optimizer
+        if optimizer == 'IPOPT':
+            p.driver.opt_settings.update(LANDING_IPOPT_SETTINGS)
+            p.driver.opt_settings['print_level'] = print_level
+        p.driver.opt_settings.update(opt_settings or {})
+        print(f"--- Using pyOptSparseDriver with {optimizer} for Falcon Landing ---")
     except ImportError:
         print("--- pyOptSparseDriver with IPOPT not available. Falling back to ScipyOptimizeDriver with SLSQP ---")
         p.driver = om.ScipyOptimizeDriver()
@@ -257,67 +300,130 @@ if __name__ == '__main__':
         p.driver.options['maxiter'] = 500
         p.driver.options['disp'] = True
 
+
+def add_landing_states(phase, fix_initial=True, fix_final=True, scaling=None):
+    """States of the landing ODE; fix_final fixes the touchdown h, vx and vh"""
+    refs = (scaling or LANDING_SCALING)['states']
+    phase.add_state('x', rate_source='x_dot', units='m', fix_initial=fix_initial, fix_final=False, **refs['x'])
+    phase.add_state('h', rate_source='h_dot', units='m', fix_initial=fix_initial, fix_final=fix_final, lower=0.0, upper=100000.0, **refs['h'])
+    phase.add_state('vx', rate_source='vx_dot', units='m/s', fix_initial=fix_initial, fix_final=fix_final, lower=-100.0, upper=8000.0, **refs['vx'])
+    phase.add_state('vh', rate_source='vh_dot', units='m/s', fix_initial=fix_initial, fix_final=fix_final, lower=-2000.0, upper=100.0, **refs['vh'])
+    phase.add_state('mass', rate_source='mass_dot', units='kg', fix_initial=fix_initial, fix_final=False, lower=LANDING_MIN_MASS, upper=100000.0, **refs['mass'])
+
+
+def add_landing_controls(phase, throttle_bounds=LANDING_THROTTLE_BOUNDS, scaling=None):
+    """Throttle and gimbal controls of the landing ODE"""
+    refs = (scaling or LANDING_SCALING)['controls']
+    throttle_min, throttle_max = throttle_bounds
+    phase.add_control('throttle', units=None, lower=throttle_min, upper=throttle_max, continuity=True, rate_continuity=False, targets=['throttle'], **refs['throttle'])
+    phase.add_control('gimbal_alpha', units='rad', lower=-LANDING_GIMBAL_LIMIT, upper=LANDING_GIMBAL_LIMIT, continuity=True, rate_continuity=True, targets=['gimbal_alpha'], **refs['gimbal_alpha'])
+    phase.add_control('gimbal_beta', units='rad', lower=-LANDING_GIMBAL_LIMIT, upper=LANDING_GIMBAL_LIMIT, continuity=True, rate_continuity=True, targets=['gimbal_beta'], **refs['gimbal_beta'])
+
+
+def build_landing_problem(num_segments=20, order=3, ode_init_kwargs=None, optimizer='IPOPT',
+                          print_level=7, check=True, name=None, duration_bounds=LANDING_DURATION_BOUNDS,
+                          scaling=None, transcription='gauss-lobatto', opt_settings=None):
+    """
+    Set up the landing optimization (driver, trajectory 'traj', phase 'phase0').
+    Returns (p, phase); initial values still have to be set (set_landing_guess).
+    Total coloring is left to coloring_cache.use_cached_coloring. name is the OpenMDAO
+    problem name, which also names its output directory. scaling is a dict like
+    LANDING_SCALING; by default the one stored by auto_scaling.py, or LANDING_SCALING
+    if none is stored. transcription is 'gauss-lobatto' or 'radau'; opt_settings
+    override the IPOPT options (configure_driver).
+    """
+    if scaling is None:
+        scaling = load_scaling() or LANDING_SCALING
+
+    # --- 2. Instantiate OpenMDAO Problem ---
+    p = om.Problem(model=om.Group(), name=name)
+
+    # --- 3. Configure the Optimizer (Driver) ---
+    configure_driver(p, optimizer, print_level, opt_settings)
+
     # --- 4. Instantiate Dymos Trajectory and Phase ---
     traj = dm.Trajectory()
     p.model.add_subsystem('traj', traj)
 
-    tx = dm.GaussLobatto(num_segments=20, order=3, compressed=True)
-    ode_init_kwargs = {
-        'g_approx': 9.80665, 'Isp': 300.0, 'max_thrust_vac': 800e3, 
-        'num_engines': 1, 'area_ref': 10.6 
-    }
-    phase = dm.Phase(ode_class=FalconLandingODE, transcription=tx, ode_init_kwargs=ode_init_kwargs)
+    transcriptions = {'gauss-lobatto': dm.GaussLobatto, 'radau': dm.Radau}
+    if transcription not in transcriptions:
+        raise ValueError(f"Unknown transcription '{transcription}'; use one of {', '.join(transcriptions)}")
+    tx = transcriptions[transcription](num_segments=num_segments, order=order, compressed=True)
+    phase = dm.Phase(ode_class=FalconLandingODE, transcription=tx,
+                     ode_init_kwargs={**LANDING_ODE_KWARGS, **(ode_init_kwargs or {})})
     traj.add_phase('phase0', phase)
 
     # --- 5. Configure Phase ---
-    phase.set_time_options(fix_initial=True, duration_bounds=(30.0, 500.0), units='s', duration_ref=100.0)
+    phase.set_time_options(fix_initial=True, duration_bounds=duration_bounds, units='s',
+                           duration_ref=scaling['duration_ref'])
 
-    phase.add_state('x', rate_source='x_dot', units='m', fix_initial=True, fix_final=False, ref=200000.0, defect_ref=20000.0)
-    phase.add_state('h', rate_source='h_dot', units='m', fix_initial=True, fix_final=True, lower=0.0, upper=100000.0, ref=80000.0, defect_ref=8000.0)
-    phase.add_state('vx', rate_source='vx_dot', units='m/s', fix_initial=True, fix_final=True, lower=-100.0, upper=8000.0, ref=6000.0, defect_ref=600.0)
-    phase.add_state('vh', rate_source='vh_dot', units='m/s', fix_initial=True, fix_final=True, lower=-2000.0, upper=100.0, ref=1500.0, defect_ref=150.0)
-    phase.add_state('mass', rate_source='mass_dot', units='kg', fix_initial=True, fix_final=False, lower=20000.0, upper=100000.0, ref=70000.0, defect_ref=7000.0)
+    add_landing_states(phase, scaling=scaling)
+    add_landing_controls(phase, scaling=scaling)
 
-    phase.add_control('throttle', units=None, lower=0.0, upper=1.0, continuity=True, rate_continuity=False, targets=['throttle'], ref=1.0)
-    phase.add_control('gimbal_alpha', units='rad', lower=-0.2, upper=0.2, continuity=True, rate_continuity=True, targets=['gimbal_alpha'], ref=0.2)
-    phase.add_control('gimbal_beta', units='rad', lower=-0.2, upper=0.2, continuity=True, rate_continuity=True, targets=['gimbal_beta'], ref=0.2)
-
-    phase.add_objective('mass', loc='final', scaler=-1.0/70000.0)
-    phase.add_boundary_constraint('x', loc='final', equals=0, units='m', scaler=1.0/200000.0)
+    phase.add_objective('mass', loc='final', ref=scaling['objective_ref'])
+    phase.add_boundary_constraint('x', loc='final', equals=0, units='m', ref=scaling['boundary_refs']['x'])
 
     # --- 6. Setup the OpenMDAO Problem ---
-    p.setup(check=True, force_alloc_complex=True) 
+    p.setup(check=check, force_alloc_complex=True) 
+    return p, phase
+
+
+def set_landing_guess(p, phase, initial=None, final=None, duration=150.0):
+    """Linear initial guess between the entry and touchdown conditions"""
+    initial = {**LANDING_INITIAL, **(initial or {})}
+    final = {**LANDING_FINAL, **(final or {})}
 
     # --- 7. Set Initial Values and Guesses ---
     p.set_val('traj.phase0.t_initial', 0.0)
-    p.set_val('traj.phase0.t_duration', 150.0) 
+    p.set_val('traj.phase0.t_duration', duration) 
 
-    h_initial, vx_initial, vh_initial, mass_initial, x_initial = 80000.0, 6000.0, -1500.0, 70000.0, -200000.0
-    h_final, vx_final, vh_final, x_final = 0.0, 0.0, -1.0, 0.0
-
-    p.set_val('traj.phase0.states:x', phase.interp(ys=[x_initial, x_final], nodes='state_input'))
-    p.set_val('traj.phase0.states:h', phase.interp(ys=[h_initial, h_final], nodes='state_input'))
-    p.set_val('traj.phase0.states:vx', phase.interp(ys=[vx_initial, vx_final], nodes='state_input'))
-    p.set_val('traj.phase0.states:vh', phase.interp(ys=[vh_initial, vh_final], nodes='state_input'))
-    p.set_val('traj.phase0.states:mass', phase.interp(ys=[mass_initial, mass_initial*0.5], nodes='state_input')) 
+    for state in ('x', 'h', 'vx', 'vh'):
+        p.set_val(f'traj.phase0.states:{state}', phase.interp(ys=[initial[state], final[state]], nodes='state_input'))
+    p.set_val('traj.phase0.states:mass', phase.interp(ys=[initial['mass'], initial['mass']*0.5], nodes='state_input')) 
 
     p.set_val('traj.phase0.controls:throttle', phase.interp(ys=[0.1, 0.8], nodes='control_input')) 
     p.set_val('traj.phase0.controls:gimbal_alpha', phase.interp(ys=[0.0, 0.0], nodes='control_input'))
     p.set_val('traj.phase0.controls:gimbal_beta', phase.interp(ys=[0.0, 0.0], nodes='control_input'))
-    
+
+
+# --- Main script execution ---
+if __name__ == '__main__':
+    import matplotlib.pyplot as plt  # only the script plots; batch tools import this module without it
+    from settings_race import load_best_settings
+
+    # Optimizer and transcription settings of the last settings race, if one was run
+    p, phase = build_landing_problem(**(load_best_settings() or {}))
+    # Seed from the nearest converged solutions in the warm-start database, if any
+    solution_db = SolutionDatabase()
+    boundary = landing_boundary()
+    if solution_db.seed(p, phase, boundary):
+        print(f"--- Warm start from {min(len(solution_db), 3)} stored solutions ---")
+    else:
+        set_landing_guess(p, phase)
+    # Reuse the total coloring of an earlier run with the same problem structure
+    coloring_key = use_cached_coloring(p)
+
     # --- 8. Run the Optimization ---
     output_dir = 'falcon_landing_dymos_out'
     if not os.path.exists(output_dir): os.makedirs(output_dir)
-    solution_file = os.path.join(output_dir, 'falcon_landing_solution.db')
-    simulation_file = os.path.join(output_dir, 'falcon_landing_simulation.db')
+    # Timeseries of every run are appended to one binary store (timeseries_store.py)
+    store = TimeseriesStore(os.path.join(output_dir, 'timeseries'))
+    # The process id keeps the cases of runs started in the same second apart
+    run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
     
     print("--- Starting Falcon Landing Optimization ---")
     print("--- This is a complex problem and may take time or fail to converge without careful tuning and good initial guesses. ---")
     
-    dm.run_problem(p, simulate=True, solution_record_file=solution_file,
-                   simulation_record_file=simulation_file,
-                   make_plots=True, plot_dir=output_dir,
-                   simulate_kwargs={'times_per_seg': 20})
+    result = p.run_driver()
+    save_coloring(p, coloring_key)
+    store.record_phase(p, phase, case=f'{run_id}/solution')
+    # Re-integrate the optimal controls explicitly as a check of the collocation solution
+    sim = simulate_phase(p, phase)
+    print_simulation_error(sim)
+    store.append(f'{run_id}/simulation', {'time': sim['time'][:, None], **sim['states']})
+    print(f"Timeseries stored in {store.directory} (cases {run_id}/solution, {run_id}/simulation)")
+    if result.success:
+        solution_db.add_problem(p, boundary)
 
     # --- 9. Retrieve and Print Key Results ---
     try:
@@ -335,14 +441,16 @@ if __name__ == '__main__':
 
     # --- 10. Custom Plotting with 3D Trajectory and Additional 2D Plot ---
     try:
-        time_sol = p.get_val('traj.phase0.timeseries.time')
-        x_sol = p.get_val('traj.phase0.timeseries.x')
-        h_sol = p.get_val('traj.phase0.timeseries.h')
-        vx_sol = p.get_val('traj.phase0.timeseries.vx')
-        vh_sol = p.get_val('traj.phase0.timeseries.vh')
-        mass_sol = p.get_val('traj.phase0.timeseries.mass')
-        throttle_sol = p.get_val('traj.phase0.timeseries.throttle')
-        gimbal_alpha_sol_deg = np.degrees(p.get_val('traj.phase0.timeseries.gimbal_alpha'))
+        series = store.read_case(f'{run_id}/solution')
+        simulated = store.read_case(f'{run_id}/simulation', names=['time', 'h'])
+        time_sol = series['time']
+        x_sol = series['x']
+        h_sol = series['h']
+        vx_sol = series['vx']
+        vh_sol = series['vh']
+        mass_sol = series['mass']
+        throttle_sol = series['throttle']
+        gimbal_alpha_sol_deg = np.degrees(series['gimbal_alpha'])
 
         # Create figure with mixed 2D and 3D subplots (4x2 grid for 8 subplots)
         fig = plt.figure(figsize=(15, 18))
@@ -360,6 +468,7 @@ if __name__ == '__main__':
         # Plot 2: Altitude vs Time
         ax2 = fig.add_subplot(422)
         ax2.plot(time_sol, h_sol/1000, 'ro-', label='Altitude')
+        ax2.plot(simulated['time'], simulated['h']/1000, 'k--', label='Simulated')
         ax2.set_xlabel('Time (s)')
         ax2.set_ylabel('Altitude, h (km)')
         ax2.set_title('Altitude Profile')
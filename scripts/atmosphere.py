@@ -0,0 +1,232 @@
+"""
+US Standard Atmosphere 1976 as a precomputed lookup table, shared by the trajectory
+ODEs and the batch simulators.
+
+standard_atmosphere_1976() evaluates the model directly: the seven geopotential layers
+up to 86 km, then the 1976 thermosphere temperature profile with pressure and density
+interpolated (log-PCHIP) through the standard's tabulated values up to 120 km.
+AtmosphereTable samples it once on a uniform altitude grid and answers vectorized
+O(1) lookups by cubic Hermite interpolation of the tabulated values and their analytic
+slopes. The returned derivatives are the exact derivatives of the interpolant, so
+values and partials stay consistent for the optimizers.
+
+    rho, drho_dh = US76.density(h)
+    a, da_dh = US76.speed_of_sound(h)
+"""
+import numpy as np
+
+# Model constants (US Standard Atmosphere 1976)
+G0 = 9.80665            # m/s**2
+R_STAR = 8.31432        # J/(mol K)
+M0 = 0.0289644          # kg/mol, sea-level mean molecular weight
+GAMMA = 1.4
+EARTH_RADIUS = 6356766.0  # m, for geopotential altitude
+T0 = 288.15             # K
+P0 = 101325.0           # Pa
+
+# Geopotential layer bases (m) and temperature lapse rates (K/m), up to 86 km geometric
+_LAYER_BASES = np.array([0.0, 11000.0, 20000.0, 32000.0, 47000.0, 51000.0, 71000.0])
+_LAYER_LAPSE = np.array([-0.0065, 0.0, 0.001, 0.0028, 0.0, -0.0028, -0.002])
+Z_86KM = 86000.0
+
+# Tabulated 1976 pressure (Pa) and density (kg/m**3) above 86 km, geometric altitude (m)
+_UPPER_Z = np.array([86000.0, 90000.0, 100000.0, 110000.0, 120000.0])
+_UPPER_P = np.array([3.7338e-1, 1.8359e-1, 3.2011e-2, 7.1042e-3, 2.5382e-3])
+_UPPER_RHO = np.array([6.958e-6, 3.416e-6, 5.604e-7, 9.708e-8, 2.222e-8])
+
+
+def _layer_base_values():
+    temperatures, pressures = [T0], [P0]
+    for k in range(len(_LAYER_BASES) - 1):
+        dh = _LAYER_BASES[k + 1] - _LAYER_BASES[k]
+        t_base, lapse = temperatures[-1], _LAYER_LAPSE[k]
+        t_top = t_base + lapse * dh
+        if lapse == 0.0:
+            p_top = pressures[-1] * np.exp(-G0 * M0 * dh / (R_STAR * t_base))
+        else:
+            p_top = pressures[-1] * (t_base / t_top) ** (G0 * M0 / (R_STAR * lapse))
+        temperatures.append(t_top)
+        pressures.append(p_top)
+    return np.array(temperatures), np.array(pressures)
+
+
+_LAYER_T, _LAYER_P = _layer_base_values()
+
+
+def _thermosphere_temperature(z):
+    """1976 temperature (K) and dT/dz above 86 km: isothermal to 91 km, elliptical to 110 km, linear above"""
+    zk = z / 1000.0
+    t = np.full_like(zk, 186.8673)
+    dt = np.zeros_like(zk)
+
+    # 91-110 km: T = Tc + A sqrt(1 - ((z - 91)/a)**2)
+    tc, a_amp, a_len = 263.1905, -76.3232, -19.9429
+    u = np.clip((zk - 91.0) / a_len, -1.0, 0.0)
+    root = np.sqrt(np.maximum(1.0 - u * u, 1e-12))
+    elliptic = (zk > 91.0) & (zk <= 110.0)
+    t = np.where(elliptic, tc + a_amp * root, t)
+    dt = np.where(elliptic, -a_amp * u / (a_len * root) / 1000.0, dt)
+
+    # 110-120 km: 12 K/km
+    linear = zk > 110.0
+    t = np.where(linear, 240.0 + 12.0 * (zk - 110.0), t)
+    dt = np.where(linear, 0.012, dt)
+    return t, dt
+
+
+def standard_atmosphere_1976(z):
+    """
+    Direct evaluation at geometric altitudes z (m), -5 km to 120 km. Returns a dict of
+    (value, d/dz) pairs: density (kg/m**3), temperature (K), pressure (Pa) and
+    speed_of_sound (m/s). The speed of sound above 86 km assumes sea-level composition.
+    """
+    from scipy.interpolate import PchipInterpolator
+
+    z = np.asarray(z, dtype=float)
+    lower = z <= Z_86KM
+    zl = np.minimum(z, Z_86KM)
+
+    # Lower atmosphere: layer formulas in geopotential altitude
+    h = EARTH_RADIUS * zl / (EARTH_RADIUS + zl)
+    dh_dz = (EARTH_RADIUS / (EARTH_RADIUS + zl)) ** 2
+    k = np.clip(np.searchsorted(_LAYER_BASES, h, side='right') - 1, 0, len(_LAYER_BASES) - 1)
+    t_base, p_base, lapse = _LAYER_T[k], _LAYER_P[k], _LAYER_LAPSE[k]
+    dh = h - _LAYER_BASES[k]
+    t_low = t_base + lapse * dh
+    isothermal = lapse == 0.0
+    safe_lapse = np.where(isothermal, 1.0, lapse)
+    p_low = np.where(isothermal,
+                     p_base * np.exp(-G0 * M0 * dh / (R_STAR * t_base)),
+                     p_base * (t_base / t_low) ** (G0 * M0 / (R_STAR * safe_lapse)))
+    rho_low = p_low * M0 / (R_STAR * t_low)
+    dt_low = lapse * dh_dz
+    dp_low = -rho_low * G0 * dh_dz
+    drho_low = rho_low * (dp_low / p_low - dt_low / t_low)
+
+    # Thermosphere: 1976 temperature profile, tabulated pressure and density
+    zu = np.clip(z, Z_86KM, _UPPER_Z[-1])
+    t_up, dt_up = _thermosphere_temperature(zu)
+    log_p = PchipInterpolator(_UPPER_Z, np.log(_UPPER_P))
+    log_rho = PchipInterpolator(_UPPER_Z, np.log(_UPPER_RHO))
+    p_up = np.exp(log_p(zu))
+    rho_up = np.exp(log_rho(zu))
+    dp_up = p_up * log_p.derivative()(zu)
+    drho_up = rho_up * log_rho.derivative()(zu)
+
+    t = np.where(lower, t_low, t_up)
+    dt = np.where(lower, dt_low, dt_up)
+    a = np.sqrt(GAMMA * R_STAR * t / M0)
+    return {
+        'density': (np.where(lower, rho_low, rho_up), np.where(lower, drho_low, drho_up)),
+        'temperature': (t, dt),
+        'pressure': (np.where(lower, p_low, p_up), np.where(lower, dp_low, dp_up)),
+        'speed_of_sound': (a, a * dt / (2.0 * t)),
+    }
+
+
+class AtmosphereTable:
+    """
+    Uniformly spaced table of standard_atmosphere_1976() with cubic Hermite lookups.
+    Altitudes outside [h_min, h_max] are clamped (constant value, zero slope).
+    """
+
+    FIELDS = ('density', 'temperature', 'pressure', 'speed_of_sound')
+
+    def __init__(self, h_min=-5000.0, h_max=120000.0, step=10.0):
+        self.h_min = float(h_min)
+        self.step = float(step)
+        num = int(round((h_max - h_min) / step)) + 1
+        self.h_max = self.h_min + (num - 1) * self.step
+        self.altitudes = self.h_min + self.step * np.arange(num)
+
+        model = standard_atmosphere_1976(self.altitudes)
+        # Per-cell cubic f(t) = c0 + c1 t + c2 t**2 + c3 t**3 (t in [0, 1)) for the value, and
+        # its derivative in h, f'(t) = (c1 + 2 c2 t + 3 c3 t**2) / step, both in Horner order
+        self._value_coeffs = {}
+        self._slope_coeffs = {}
+        for field in self.FIELDS:
+            f, df = model[field]
+            f0, f1 = f[:-1], f[1:]
+            d0, d1 = df[:-1] * self.step, df[1:] * self.step
+            c2 = 3.0 * (f1 - f0) - 2.0 * d0 - d1
+            c3 = 2.0 * (f0 - f1) + d0 + d1
+            self._value_coeffs[field] = (c3, c2, d0, f0)
+            self._slope_coeffs[field] = (3.0 * c3 / self.step, 2.0 * c2 / self.step, d0 / self.step)
+        self._x_max = num - 1 - 1e-9 * num
+
+    def lookup(self, h, fields=FIELDS):
+        """Dict of field -> (value, d/dh) at altitudes h (m); complex h is complex-step safe"""
+        h = np.asarray(h)
+        if np.iscomplexobj(h):
+            real = self.lookup(h.real, fields)
+            return {field: (value + 1j * h.imag * slope, slope) for field, (value, slope) in real.items()}
+
+        x = (h - self.h_min) * (1.0 / self.step)
+        outside = None
+        if h.size and (h.min() < self.h_min or h.max() > self.h_max):
+            outside = (x < 0.0) | (x > self._x_max)
+        x = np.clip(x, 0.0, self._x_max)
+        cell = x.astype(np.intp)
+        t = x - cell
+
+        result = {}
+        for field in fields:
+            value = _horner(self._value_coeffs[field], cell, t)
+            slope = _horner(self._slope_coeffs[field], cell, t)
+            if outside is not None:
+                slope = np.where(outside, 0.0, slope)
+            result[field] = (value, slope)
+        return result
+
+    def density(self, h):
+        """(rho [kg/m**3], d rho/dh)"""
+        return self.lookup(h, ('density',))['density']
+
+    def temperature(self, h):
+        """(T [K], dT/dh)"""
+        return self.lookup(h, ('temperature',))['temperature']
+
+    def pressure(self, h):
+        """(p [Pa], dp/dh)"""
+        return self.lookup(h, ('pressure',))['pressure']
+
+    def speed_of_sound(self, h):
+        """(a [m/s], da/dh)"""
+        return self.lookup(h, ('speed_of_sound',))['speed_of_sound']
+
+
+def _horner(coeffs, cell, t):
+    """Evaluate the per-cell polynomial (highest power first) gathered at cell"""
+    out = np.take(coeffs[0], cell)
+    for c in coeffs[1:]:
+        out *= t
+        out += np.take(c, cell)
+    return out
+
+
+US76 = AtmosphereTable()
+
+
+if __name__ == '__main__':
+    import time
+
+    z = np.linspace(-5000.0, 120000.0, 100001)
+    exact = standard_atmosphere_1976(z)
+    table = US76.lookup(z)
+
+    print("="*60)
+    print(f"US76 table: {len(US76.altitudes)} points, {US76.step:g} m spacing")
+    print("="*60)
+    for field in AtmosphereTable.FIELDS:
+        (f, df), (g, dg) = exact[field], table[field]
+        rel = np.max(np.abs(g - f) / np.abs(f))
+        print(f"{field:<15} max rel err {rel:.2e}   max slope err {np.max(np.abs(dg - df)):.2e}")
+
+    h = np.random.default_rng(0).uniform(0.0, 80000.0, 6000)
+    for name, fn in (('table lookup', lambda: US76.density(h)),
+                     ('direct 1976 model', lambda: standard_atmosphere_1976(h)['density'])):
+        fn()
+        t0 = time.perf_counter()
+        for _ in range(200):
+            fn()
+        print(f"{name:<18} {(time.perf_counter() - t0) / 200 * 1e6:8.1f} us per 6000 altitudes")
@@ -0,0 +1,176 @@
+"""
+Exact, sparse partials for elementwise ODE components, without hand-written derivatives.
+
+Most Dymos ODEs are elementwise: output node i only depends on the inputs at node i
+(plus, possibly, parameters shared by all nodes). Their jacobian is node-diagonal, so
+complex-stepping one input at all nodes at once gives the derivatives of every node
+in a single compute() call. ElementwiseComponent does that:
+
+  - setup_partials() finds which outputs depend on which inputs with complex-step
+    probes at SPARSITY_POINTS independent random points, takes the union of the
+    patterns found at each, checks that the component is elementwise, and declares
+    only those partials (rows/cols of the node diagonal, full columns for inputs that
+    are not sized by num_nodes);
+  - compute_partials() calls compute() once per input column group with a complex
+    step of 1e-30, which gives derivatives exact to machine precision.
+
+The cost of a linearization is one complex compute() per (nodal) input that anything
+depends on, instead of one real compute() per input entry and node for
+method='fd'. compute() has to be complex-step safe (no abs, np.sign, .real or
+float() casts on input-dependent values) and may only read its inputs and options.
+
+The sparsity is detected once and then fixed, so which outputs depend on which
+inputs must not itself depend on the point: a derivative that is zero at every probe
+point is never computed again. Branches (np.where, clipping, tables) whose active
+side changes which inputs matter have to be written so that every input that can
+matter enters the result at every point, e.g. multiplied by a zero weight.
+
+    class BoosterODE(ElementwiseComponent):
+        def initialize(self):
+            self.options.declare('num_nodes', types=int)
+        def setup(self):
+            ...                                   # add_input/add_output, no declare_partials
+        def compute(self, inputs, outputs):
+            ...
+
+    python auto_partials.py                       # check_partials and timing of BoosterODE
+"""
+import numpy as np
+import openmdao.api as om
+
+CS_STEP = 1e-30
+# Independent random points whose dependency patterns are OR-ed at setup; a derivative
+# that vanishes at one of them by coincidence still shows up at the others
+SPARSITY_POINTS = 3
+
+
+class ElementwiseComponent(om.ExplicitComponent):
+    """
+    ExplicitComponent whose partials are derived from compute() by vectorized complex
+    step over its node-diagonal structure. Subclasses declare a num_nodes option and
+    implement setup() and compute() only. The sparsity pattern is the union of those
+    found at SPARSITY_POINTS random points; it has to be the same at every point.
+    """
+
+    def setup_partials(self):
+        nn = self.options['num_nodes']
+        inputs = self.get_io_metadata(iotypes='input', metadata_keys=['shape'])
+        outputs = self.get_io_metadata(iotypes='output', metadata_keys=['shape'])
+        self._auto_inputs = {name: meta['shape'] for name, meta in inputs.items() if not meta['discrete']}
+        self._auto_outputs = {name: meta['shape'] for name, meta in outputs.items() if not meta['discrete']}
+        for name, shape in self._auto_outputs.items():
+            if len(shape) == 0 or shape[0] != nn:
+                raise ValueError(f"{self.pathname or type(self).__name__}: output '{name}' of shape {shape} is not "
+                                 f"sized by num_nodes={nn}; the component is not elementwise")
+
+        # One probe per column group: a trailing component of a nodal input stepped at
+        # all nodes at once, or a single entry of an input shared by all nodes. Each is
+        # taken at several points, so an entry that happens to vanish at one is not lost
+        rng = np.random.default_rng(0)
+        points = [{name: rng.uniform(0.5, 1.5, shape) for name, shape in self._auto_inputs.items()}
+                  for _ in range(SPARSITY_POINTS)]
+        self._probes = []
+        pattern = {}
+        for wrt, shape in self._auto_inputs.items():
+            size = int(np.prod(shape))
+            nodal = len(shape) > 0 and shape[0] == nn
+            width = size // nn if nodal else size
+            for comp in range(width):
+                index = np.arange(comp, size, width) if nodal else np.array([comp])
+                derivs = [self._complex_step(point, wrt, index) for point in points]
+                if nodal and nn > 1:
+                    for point in points:
+                        self._check_elementwise(point, wrt, comp, width)
+                used = False
+                for of, d in derivs[0].items():
+                    # NaN counts as a dependency
+                    rows = np.flatnonzero(np.any([deriv[of] != 0.0 for deriv in derivs], axis=0))
+                    if rows.size:
+                        cols = index[rows // (d.size // nn)] if nodal else np.full(rows.size, comp)
+                        pattern.setdefault((of, wrt), []).append((len(self._probes), rows, cols))
+                        used = True
+                if used:
+                    self._probes.append((wrt, index))
+
+        # Declare each (of, wrt) pair with its entries sorted by column, and keep where
+        # each entry comes from: which probe, which output entry
+        self._auto_pairs = {}
+        for (of, wrt), blocks in pattern.items():
+            probe = np.concatenate([np.full(rows.size, k) for k, rows, _ in blocks])
+            rows = np.concatenate([rows for _, rows, _ in blocks])
+            cols = np.concatenate([cols for _, _, cols in blocks])
+            order = np.lexsort((rows, cols))
+            probe, rows, cols = probe[order], rows[order], cols[order]
+            self.declare_partials(of=of, wrt=wrt, rows=rows, cols=cols)
+            self._auto_pairs[of, wrt] = [(k, np.flatnonzero(probe == k), rows[probe == k])
+                                         for k in np.unique(probe)]
+
+    def compute_partials(self, inputs, partials):
+        point = {name: inputs[name] for name in self._auto_inputs}
+        derivs = [self._complex_step(point, wrt, index) for wrt, index in self._probes]
+        for (of, wrt), blocks in self._auto_pairs.items():
+            val = np.empty(sum(pos.size for _, pos, _ in blocks))
+            for k, pos, rows in blocks:
+                val[pos] = derivs[k][of][rows]
+            partials[of, wrt] = val
+
+    def _complex_step(self, point, wrt, index):
+        """Flat derivatives of all outputs for a unit step of the entries index of input wrt"""
+        inputs = {name: np.asarray(val, dtype=complex).reshape(self._auto_inputs[name])
+                  for name, val in point.items()}
+        inputs[wrt] = inputs[wrt].copy()
+        inputs[wrt].flat[index] += 1j * CS_STEP
+        outputs = {name: np.zeros(shape, dtype=complex) for name, shape in self._auto_outputs.items()}
+        self.compute(inputs, outputs)
+        return {name: np.broadcast_to(np.asarray(outputs[name]), shape).imag.ravel() / CS_STEP
+                for name, shape in self._auto_outputs.items()}
+
+    def _check_elementwise(self, point, wrt, comp, width):
+        """A step at the middle node alone must not move the outputs of any other node"""
+        nn = self.options['num_nodes']
+        node = nn // 2
+        single = self._complex_step(point, wrt, np.array([node * width + comp]))
+        for of, d in single.items():
+            d = d.reshape(nn, -1)
+            if np.any(np.delete(d, node, axis=0) != 0.0):
+                raise ValueError(f"{self.pathname or type(self).__name__}: output '{of}' at other nodes depends "
+                                 f"on input '{wrt}' at node {node}; the component is not elementwise")
+
+
+if __name__ == '__main__':
+    import time
+
+    from falcon9_trajectory_optimization import BoosterODE
+
+    nn = 60
+    p = om.Problem()
+    p.model.add_subsystem('ode', BoosterODE(num_nodes=nn, mass=25600.0, max_thrust=845e3), promotes=['*'])
+    p.setup(force_alloc_complex=True)
+    rng = np.random.default_rng(1)
+    p.set_val('h', rng.uniform(0.0, 5000.0, nn))
+    p.set_val('v', rng.uniform(-300.0, 0.0, nn))
+    p.set_val('throttle', rng.uniform(0.0, 1.0, nn))
+    p.run_model()
+    data = p.check_partials(method='cs', compact_print=True, show_only_incorrect=True, out_stream=None)
+    worst = max(np.max(np.abs(pair['J_fwd'] - pair['J_fd'])) for pair in data['ode'].values() if 'J_fwd' in pair)
+    nonzeros = sum(pos.size for blocks in p.model.ode._auto_pairs.values() for _, pos, _ in blocks)
+    print("="*60)
+    print(f"BoosterODE, {nn} nodes: {nonzeros} declared nonzeros of {2 * 3 * nn * nn} dense, "
+          f"max abs error vs check_partials(cs) {worst:.2e}")
+
+    class BoosterODEFD(BoosterODE):
+        def setup_partials(self):
+            self.declare_partials('*', '*', method='fd')
+
+        def compute_partials(self, inputs, partials):
+            pass
+
+    for label, ode_class in (('auto', BoosterODE), ('fd', BoosterODEFD)):
+        q = om.Problem()
+        q.model.add_subsystem('ode', ode_class(num_nodes=nn, mass=25600.0, max_thrust=845e3), promotes=['*'])
+        q.setup()
+        q.run_model()
+        t0 = time.perf_counter()
+        for _ in range(100):
+            q.model.run_linearize()
+        print(f"linearize ({label}): {(time.perf_counter() - t0) / 100 * 1e3:.3f} ms")
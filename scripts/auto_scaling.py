@@ -0,0 +1,331 @@
+"""
+Scaling of the landing problem (FalconLandingODE.build_landing_problem) derived from a
+reference trajectory instead of picked by hand.
+
+The reference is a converged solution (warm-start database) or, without one, the
+explicit simulation of the initial guess (trajectory_sim.py): a trajectory with the
+magnitudes of a real flight. From it:
+
+  - design variables (states, controls, duration) get ref = their largest magnitude
+    along the reference, so every scaled variable is of order one. A variable that
+    stays at zero in the reference (a gimbal angle of a planar flight) has no
+    magnitude; its ref makes its jacobian columns of order one instead;
+  - constraint groups (the collocation defects of every state, the control rate
+    continuity, the final x) and the objective get ref = the geometric mean of the
+    infinity norms of their jacobian rows, taken at the reference with the columns
+    scaled as above, so the rows of the scaled jacobian are of order one.
+
+One ref per state, control or constraint group, as Dymos takes them. The result has
+the layout of FalconLandingODE.LANDING_SCALING and is stored as JSON in
+scripts/landing_scaling.json (FALCON9_LANDING_SCALING to override), which
+build_landing_problem then uses by default.
+
+    python auto_scaling.py                        # derive from the reference, store, compare
+    python auto_scaling.py --benchmark            # iterations, hand vs derived scaling
+    python auto_scaling.py --clear                # back to the hand-picked scaling
+"""
+import argparse
+import json
+import os
+import re
+import time
+
+import numpy as np
+
+DEFAULT_SCALING_FILE = os.environ.get('FALCON9_LANDING_SCALING',
+                                      os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                   'landing_scaling.json'))
+
+# Fixed benchmark scenarios: entry conditions overriding FalconLandingODE.LANDING_INITIAL
+BENCHMARK_SCENARIOS = [
+    {},
+    {'h': 70000.0, 'vx': 5000.0, 'vh': -1200.0},
+    {'h': 60000.0, 'mass': 60000.0},
+    {'x': -150000.0, 'vx': 4500.0, 'mass': 65000.0},
+]
+
+# Driver names of the design variables and constraints to the LANDING_SCALING entry they scale
+_DESVAR_PATTERNS = [
+    (re.compile(r'\.t_duration$'), lambda m: ('duration', None)),
+    (re.compile(r'\.states:(\w+)$'), lambda m: ('states', m.group(1))),
+    (re.compile(r'\.controls:(\w+)$'), lambda m: ('controls', m.group(1))),
+]
+_RESPONSE_PATTERNS = [
+    (re.compile(r'\.defects:(\w+)$'), lambda m: ('states', m.group(1), 'defect_ref')),
+    (re.compile(r'\.defect_control_rates:(\w+)_rate$'), lambda m: ('controls', m.group(1), 'rate_continuity_ref')),
+    (re.compile(r'\.defect_controls:(\w+)$'), lambda m: ('controls', m.group(1), 'continuity_ref')),
+    (re.compile(r'\.(\w+)\[(?:initial|final)\]$'), lambda m: ('boundary_refs', m.group(1), None)),
+]
+
+# Variables whose largest magnitude is below this fraction of their bounds have none
+_ZERO_MAGNITUDE = 1e-6
+
+
+def load_scaling(path=DEFAULT_SCALING_FILE):
+    """The stored scaling dict, or None if none is stored"""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)['scaling']
+
+
+def save_scaling(scaling, path=DEFAULT_SCALING_FILE, reference=None):
+    """Store a scaling dict (written atomically), with a note of its reference"""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump({'created': time.strftime('%Y-%m-%d %H:%M:%S'), 'reference': reference, 'scaling': scaling},
+                  f, indent=1)
+    os.replace(tmp, path)
+
+
+def set_reference(p, phase, initial=None, source='auto'):
+    """
+    Load a reference trajectory into a set-up landing problem: 'database' seeds it
+    from the nearest converged solutions, 'simulation' integrates the initial guess
+    of set_landing_guess and takes the simulated states; 'auto' is 'database' when it
+    has solutions. Returns the source used.
+    """
+    from FalconLandingODE import set_landing_guess
+    from trajectory_sim import simulate_phase
+    from warm_start import SolutionDatabase, landing_boundary
+
+    if source in ('auto', 'database'):
+        if SolutionDatabase().seed(p, phase, landing_boundary(initial)):
+            return 'database'
+        if source == 'database':
+            raise ValueError("The warm-start database has no solutions to take the reference from")
+
+    set_landing_guess(p, phase, initial)
+    p.run_model()
+    sim = simulate_phase(p, phase)
+    for name, values in sim['states'].items():
+        p.set_val(f"traj.phase0.states:{name}",
+                  phase.interp(ys=values[:, 0], xs=sim['time'], nodes='state_input'))
+    return 'simulation'
+
+
+def derive_scaling(p, phase, phase_path='traj.phase0'):
+    """
+    Scaling dict of the landing problem p from the trajectory currently in it (see
+    set_reference): variable refs from magnitudes, constraint and objective refs from
+    jacobian row norms.
+    """
+    from FalconLandingODE import LANDING_SCALING
+
+    p.run_model()
+    series = f"{phase_path}.timeseries"
+    options = {'states': phase.state_options, 'controls': phase.control_options}
+    desvars = p.model.get_design_vars()
+    responses = {**p.model.get_constraints(), **p.model.get_objectives()}
+    objectives = set(p.model.get_objectives())
+
+    # Columns: magnitudes along the reference
+    columns = {}
+    for name, meta in desvars.items():
+        key = _match(_DESVAR_PATTERNS, name)
+        if key is None:
+            continue
+        if key[0] == 'duration':
+            magnitude = float(np.abs(p.get_val(f"{phase_path}.t_duration")).max())
+            bound = np.inf
+        else:
+            magnitude = float(np.abs(p.get_val(f"{series}.{key[1]}")).max())
+            lower, upper = options[key[0]][key[1]]['lower'], options[key[0]][key[1]]['upper']
+            bound = np.inf if lower is None or upper is None else max(abs(lower), abs(upper))
+        if magnitude > (_ZERO_MAGNITUDE * bound if np.isfinite(bound) else 0.0):
+            columns[name] = [key, meta['size'], magnitude, False]
+        else:
+            columns[name] = [key, meta['size'], bound if np.isfinite(bound) else 1.0, True]
+
+    rows = {}
+    for name, meta in responses.items():
+        key = ('objective', None, None) if name in objectives else _match(_RESPONSE_PATTERNS, name)
+        if key is not None:
+            rows[name] = [key, meta['size']]
+
+    jac = p.compute_totals(of=list(rows), wrt=list(columns), return_format='array', driver_scaling=False)
+    col_offsets = np.cumsum([0] + [size for _, size, _, _ in columns.values()])
+    row_offsets = np.cumsum([0] + [size for _, size in rows.values()])
+
+    # Variables without a magnitude start at their bound and are rescaled so that
+    # their scaled columns are of order one; that changes the row norms, so twice
+    col_ref = np.ones(jac.shape[1])
+    for (_, _, magnitude, _), start, end in zip(columns.values(), col_offsets[:-1], col_offsets[1:]):
+        col_ref[start:end] = magnitude
+    for _ in range(2):
+        row_ref = _row_refs(jac, col_ref, row_offsets)
+        scaled = np.abs(jac) * col_ref / row_ref[:, None]
+        for (_, _, _, from_columns), start, end in zip(columns.values(), col_offsets[:-1], col_offsets[1:]):
+            if from_columns:
+                col_ref[start:end] /= _group_norm(scaled[:, start:end].max(axis=0))
+    row_ref = _row_refs(jac, col_ref, row_offsets)
+
+    scaling = {'states': {}, 'controls': {}, 'duration_ref': LANDING_SCALING['duration_ref'],
+               'objective_ref': LANDING_SCALING['objective_ref'], 'boundary_refs': {}}
+    for (key, _, _, _), start in zip(columns.values(), col_offsets[:-1]):
+        if key[0] == 'duration':
+            scaling['duration_ref'] = _round(col_ref[start])
+        else:
+            scaling[key[0]].setdefault(key[1], {})['ref'] = _round(col_ref[start])
+    for name, (key, _), start in zip(rows, rows.values(), row_offsets[:-1]):
+        group, var, option = key
+        if group == 'objective':
+            scaling['objective_ref'] = _round(np.copysign(row_ref[start], LANDING_SCALING['objective_ref']))
+        elif group == 'boundary_refs':
+            scaling['boundary_refs'][var] = _round(row_ref[start])
+        else:
+            scaling[group].setdefault(var, {})[option] = _round(row_ref[start])
+
+    # Anything the problem does not have (e.g. a fixed variable) keeps its hand-picked scaling
+    for group in ('states', 'controls', 'boundary_refs'):
+        for var, refs in LANDING_SCALING[group].items():
+            if isinstance(refs, dict):
+                scaling[group][var] = {**refs, **scaling[group].get(var, {})}
+            else:
+                scaling[group].setdefault(var, refs)
+    return scaling
+
+
+def jacobian_condition(p):
+    """Ratio of the largest to the smallest nonzero row infinity norm of the driver-scaled jacobian"""
+    p.run_model()
+    desvars = p.model.get_design_vars()
+    responses = {**p.model.get_constraints(), **p.model.get_objectives()}
+    jac = np.abs(p.compute_totals(of=list(responses), wrt=list(desvars), return_format='array', driver_scaling=True))
+    norms = jac.max(axis=1)
+    norms = norms[norms > 0.0]
+    return float(norms.max() / norms.min())
+
+
+def run_benchmark(scalings, scenarios=BENCHMARK_SCENARIOS, num_segments=20, optimizer='IPOPT'):
+    """
+    Solve every scenario from the straight-line guess with every scaling
+    ({label: scaling dict}). Returns one row per (scaling, scenario).
+    """
+    from FalconLandingODE import build_landing_problem, set_landing_guess
+
+    rows = []
+    for label, scaling in scalings.items():
+        p, phase = build_landing_problem(num_segments=num_segments, optimizer=optimizer, print_level=0,
+                                         check=False, scaling=scaling, name=f"auto_scaling_{label}")
+        for option in ('disp', 'print_results'):
+            if option in p.driver.options:
+                p.driver.options[option] = False
+        for i, initial in enumerate(scenarios):
+            set_landing_guess(p, phase, initial)
+            p.final_setup()
+            condition = jacobian_condition(p)
+            t0 = time.perf_counter()
+            result = p.run_driver()
+            rows.append({
+                'scaling': label,
+                'scenario': i,
+                'converged': bool(result.success),
+                'iterations': int(result.iter_count),
+                'final_mass': float(p.get_val('traj.phase0.timeseries.mass')[-1, 0]),
+                'row_norm_ratio': condition,
+                'wall_time_s': time.perf_counter() - t0,
+            })
+    return rows
+
+
+def print_scaling(scalings):
+    """Side-by-side table of scaling dicts ({label: scaling})"""
+    labels = list(scalings)
+    entries = []
+    first = scalings[labels[0]]
+    for group in ('states', 'controls'):
+        for var in first[group]:
+            for option in sorted({o for s in scalings.values() for o in s[group].get(var, {})}):
+                entries.append((f"{var} {option}", [s[group].get(var, {}).get(option) for s in scalings.values()]))
+    entries.append(('duration_ref', [s['duration_ref'] for s in scalings.values()]))
+    entries.append(('objective_ref', [s['objective_ref'] for s in scalings.values()]))
+    for var in first['boundary_refs']:
+        entries.append((f"{var} boundary ref", [s['boundary_refs'].get(var) for s in scalings.values()]))
+
+    print(f"{'':<30}" + ''.join(f"{label:>14}" for label in labels))
+    for name, values in entries:
+        print(f"{name:<30}" + ''.join(f"{'-' if v is None else f'{v:.4g}':>14}" for v in values))
+
+
+def print_benchmark(rows):
+    print("="*60)
+    print("Landing benchmark: iterations from the straight-line guess")
+    print("="*60)
+    print(f"{'scaling':>8} {'scenario':>8} {'conv':>5} {'iters':>6} {'m_final':>9} {'row ratio':>10} {'wall_s':>7}")
+    for r in rows:
+        print(f"{r['scaling']:>8} {r['scenario']:>8d} {'yes' if r['converged'] else 'no':>5} {r['iterations']:>6d}"
+              f" {r['final_mass']:>9.1f} {r['row_norm_ratio']:>10.2e} {r['wall_time_s']:>7.2f}")
+    totals = {}
+    for r in rows:
+        total = totals.setdefault(r['scaling'], {'iterations': 0, 'converged': 0})
+        total['iterations'] += r['iterations']
+        total['converged'] += r['converged']
+    for label, total in totals.items():
+        print(f"{label}: {total['iterations']} iterations in total, {total['converged']} converged")
+    if len(totals) == 2:
+        (a, ta), (b, tb) = totals.items()
+        print(f"Iteration reduction {a} -> {b}: {100.0 * (1.0 - tb['iterations'] / ta['iterations']):.1f}%")
+
+
+def _match(patterns, name):
+    for pattern, key in patterns:
+        m = pattern.search(name)
+        if m:
+            return key(m)
+    return None
+
+
+def _row_refs(jac, col_ref, row_offsets):
+    """One ref per row group: the group norm of its rows with the columns scaled by col_ref"""
+    scaled = np.abs(jac) * col_ref
+    row_ref = np.ones(jac.shape[0])
+    for start, end in zip(row_offsets[:-1], row_offsets[1:]):
+        row_ref[start:end] = _group_norm(scaled[start:end].max(axis=1))
+    return row_ref
+
+
+def _group_norm(norms):
+    """Geometric mean of the nonzero norms of a group of rows or columns"""
+    norms = norms[norms > 0.0]
+    return float(np.exp(np.mean(np.log(norms)))) if norms.size else 1.0
+
+
+def _round(value, digits=3):
+    """A ref rounded to a few significant digits, as it would be written by hand"""
+    return float(f"{value:.{digits}g}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Derive the landing problem scaling from a reference trajectory')
+    parser.add_argument('--reference', choices=('auto', 'database', 'simulation'), default='auto')
+    parser.add_argument('--segments', type=int, default=20)
+    parser.add_argument('--optimizer', default='IPOPT')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='Solve the benchmark scenarios with the hand-picked and the derived scaling')
+    parser.add_argument('--clear', action='store_true', help='Remove the stored scaling')
+    args = parser.parse_args()
+
+    if args.clear:
+        if os.path.exists(DEFAULT_SCALING_FILE):
+            os.remove(DEFAULT_SCALING_FILE)
+        print(f"Removed {DEFAULT_SCALING_FILE}; build_landing_problem uses LANDING_SCALING")
+        raise SystemExit
+
+    os.environ['OPENMDAO_REPORTS'] = '0'
+    from FalconLandingODE import LANDING_SCALING, build_landing_problem
+
+    p, phase = build_landing_problem(num_segments=args.segments, optimizer=args.optimizer, print_level=0,
+                                     check=False, scaling=LANDING_SCALING, name='auto_scaling')
+    source = set_reference(p, phase, source=args.reference)
+    scaling = derive_scaling(p, phase)
+    save_scaling(scaling, reference=source)
+    print("="*60)
+    print(f"Scaling derived from the {source} reference, stored in {DEFAULT_SCALING_FILE}")
+    print("="*60)
+    print_scaling({'hand': LANDING_SCALING, 'derived': scaling})
+
+    if args.benchmark:
+        rows = run_benchmark({'hand': LANDING_SCALING, 'derived': scaling}, num_segments=args.segments,
+                             optimizer=args.optimizer)
+        print_benchmark(rows)
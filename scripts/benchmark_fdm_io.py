@@ -0,0 +1,67 @@
+"""
+Steps/sec of the JSBSim landing loop I/O: string-keyed fdm[...] lookups vs the
+bound property nodes of fdm_io.FdmIO.
+
+    python benchmark_fdm_io.py [--steps 20000] [--no-run]
+
+Both variants read STATE_PROPERTIES and write CONTROL_PROPERTIES once per step,
+as run_landing() does. With --no-run the fdm.run() call is left out, which measures
+the property I/O alone.
+"""
+import argparse
+import time
+
+from fdm_io import FdmIO
+from test_jsbsim import CONTROL_PROPERTIES, STATE_PROPERTIES, create_fdm, initialize
+
+
+def run_string_keyed(fdm, steps, state_properties, control_properties, run=True):
+    controls = [0.0] * len(control_properties)
+    t0 = time.perf_counter()
+    for _ in range(steps):
+        state = [fdm[prop] for prop in state_properties]
+        for prop, value in zip(control_properties, controls):
+            fdm[prop] = value
+        if run:
+            fdm.run()
+    return steps / (time.perf_counter() - t0), state
+
+
+def run_bound(fdm, steps, state_properties, control_properties, run=True):
+    io = FdmIO(fdm, state_properties, control_properties)
+    t0 = time.perf_counter()
+    for _ in range(steps):
+        state = io.read_state()
+        io.write_controls()
+        if run:
+            fdm.run()
+    return steps / (time.perf_counter() - t0), state
+
+
+def benchmark(fdm, steps=20000, state_properties=STATE_PROPERTIES,
+              control_properties=CONTROL_PROPERTIES, run=True):
+    """Returns {'string_keyed': steps/s, 'bound': steps/s}"""
+    rates = {}
+    for name, loop in (('string_keyed', run_string_keyed), ('bound', run_bound)):
+        loop(fdm, min(steps, 1000), state_properties, control_properties, run)  # warm up
+        rates[name], _ = loop(fdm, steps, state_properties, control_properties, run)
+    return rates
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark string-keyed vs bound JSBSim property I/O')
+    parser.add_argument('--steps', type=int, default=20000)
+    parser.add_argument('--no-run', action='store_true', help='Measure the property I/O without fdm.run()')
+    args = parser.parse_args()
+
+    fdm = create_fdm(debug_level=0)
+    initialize(fdm)
+    rates = benchmark(fdm, args.steps, run=not args.no_run)
+
+    print("="*60)
+    print(f"JSBSim loop I/O ({len(STATE_PROPERTIES)} reads, {len(CONTROL_PROPERTIES)} writes per step"
+          f"{', without fdm.run()' if args.no_run else ''})")
+    print("="*60)
+    print(f"fdm[...] lookups:  {rates['string_keyed']:10.0f} steps/s")
+    print(f"FdmIO bound nodes: {rates['bound']:10.0f} steps/s")
+    print(f"Speedup:           {rates['bound'] / rates['string_keyed']:10.2f}x")
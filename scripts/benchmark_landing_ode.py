@@ -0,0 +1,67 @@
+"""
+Node-count scaling of FalconLandingODE: time of one compute + compute_partials pass
+(what the driver pays per iteration) from 20 to 2000 transcription segments.
+
+    python benchmark_landing_ode.py [--segments 20 50 100 200 500 1000 2000]
+
+Each segment of the GaussLobatto(order=3) transcription in FalconLandingODE.py
+evaluates the ODE at 3 nodes. The pass is timed with the shared intermediate cache
+on and off (cache_intermediates option).
+"""
+import argparse
+import time
+
+import numpy as np
+import openmdao.api as om
+
+from FalconLandingODE import FalconLandingODE
+
+NODES_PER_SEGMENT = 3
+
+
+def build_ode_problem(num_nodes, cache_intermediates=True, seed=0):
+    """Standalone problem around one FalconLandingODE, with inputs spread over the landing envelope"""
+    p = om.Problem(reports=None)
+    p.model.add_subsystem('ode', FalconLandingODE(num_nodes=num_nodes, cache_intermediates=cache_intermediates),
+                          promotes=['*'])
+    p.setup()
+
+    rng = np.random.default_rng(seed)
+    p.set_val('h', rng.uniform(-100.0, 80000.0, num_nodes))
+    p.set_val('vx', rng.uniform(-100.0, 6000.0, num_nodes))
+    p.set_val('vh', rng.uniform(-2000.0, 100.0, num_nodes))
+    p.set_val('mass', rng.uniform(20000.0, 70000.0, num_nodes))
+    p.set_val('throttle', rng.uniform(0.0, 1.0, num_nodes))
+    p.set_val('gimbal_alpha', rng.uniform(-0.2, 0.2, num_nodes))
+    p.set_val('gimbal_beta', rng.uniform(-0.2, 0.2, num_nodes))
+    return p
+
+
+def time_pass(p, repeats=200):
+    """Best time (s) of run_model() followed by run_linearize()"""
+    p.run_model()
+    p.model.run_linearize()
+    best = np.inf
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        p.run_model()
+        p.model.run_linearize()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='FalconLandingODE node-count scaling benchmark')
+    parser.add_argument('--segments', type=int, nargs='+', default=[20, 50, 100, 200, 500, 1000, 2000])
+    parser.add_argument('--repeats', type=int, default=200)
+    args = parser.parse_args()
+
+    print("="*60)
+    print("FalconLandingODE compute + compute_partials")
+    print("="*60)
+    print(f"{'segments':>8} {'nodes':>7} {'no cache (ms)':>14} {'cache (ms)':>11} {'us/node':>8}")
+    for num_segments in args.segments:
+        nn = NODES_PER_SEGMENT * num_segments
+        uncached = time_pass(build_ode_problem(nn, cache_intermediates=False), args.repeats)
+        cached = time_pass(build_ode_problem(nn, cache_intermediates=True), args.repeats)
+        print(f"{num_segments:>8d} {nn:>7d} {uncached * 1e3:>14.3f} {cached * 1e3:>11.3f} {cached / nn * 1e6:>8.3f}")
@@ -0,0 +1,110 @@
+"""
+Convex powered-descent guidance (powered_descent.py) against the Dymos landing
+optimization (FalconLandingODE.py) on the same landing burn: fuel and wall time.
+
+    python benchmark_powered_descent.py [--segments 20] [--nodes 40] [--repeats 20]
+
+The convex formulation has no aerodynamic drag, so by default the Dymos ODE runs with
+area_ref=0 to compare like with like; --drag keeps the drag model in the Dymos run.
+Both solvers choose the flight time within --duration-bounds. The Dymos time is one
+run_driver() on a set-up problem (setup and coloring excluded); the convex time is the
+whole free-final-time search.
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+# Terminal landing burn: low altitude and speed, well inside the drag-free model's validity
+BURN_INITIAL = {'x': -500.0, 'h': 2500.0, 'vx': 50.0, 'vh': -150.0, 'mass': 30000.0}
+
+
+def run_dymos(initial, final, num_segments, duration_bounds, drag):
+    os.environ['OPENMDAO_REPORTS'] = '0'
+    from coloring_cache import save_coloring, use_cached_coloring
+    from FalconLandingODE import build_landing_problem, set_landing_guess
+
+    p, phase = build_landing_problem(num_segments=num_segments, ode_init_kwargs=None if drag else {'area_ref': 0.0},
+                                     print_level=0, check=False, name='benchmark_powered_descent',
+                                     duration_bounds=duration_bounds)
+    for option in ('disp', 'print_results'):
+        if option in p.driver.options:
+            p.driver.options[option] = False
+    set_landing_guess(p, phase, initial, final, duration=float(np.mean(duration_bounds)))
+    key = use_cached_coloring(p)
+    p.run_model()  # first evaluation and the dynamic coloring are not part of the solve time
+
+    t0 = time.perf_counter()
+    result = p.run_driver()
+    wall = time.perf_counter() - t0
+    save_coloring(p, key)
+    return {'final_mass': float(p.get_val('traj.phase0.timeseries.mass')[-1, 0]),
+            'duration': float(p.get_val('traj.phase0.t_duration')[0]),
+            'converged': bool(result.success), 'wall_time_s': wall}
+
+
+def run_convex(initial, final, num_nodes, duration_bounds, repeats):
+    from powered_descent import PoweredDescent
+
+    solver = PoweredDescent.from_landing_ode(num_nodes=num_nodes)
+    sol = solver.optimize(initial, final, duration_bounds)
+    best = np.inf
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        solver.optimize(initial, final, duration_bounds)
+        best = min(best, time.perf_counter() - t0)
+
+    # Fixed flight time, cold and warm-started from a neighbouring flight time
+    cold = solver.solve(initial, final, sol['duration'])
+    neighbour = solver.solve(initial, final, sol['duration'] * 1.05)
+    t_cold, t_warm = np.inf, np.inf
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        solver.solve(initial, final, sol['duration'])
+        t_cold = min(t_cold, time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        warm = solver.solve(initial, final, sol['duration'], warm=neighbour['socp'])
+        t_warm = min(t_warm, time.perf_counter() - t0)
+    # Only a warm start that converged by itself (no cold retry) counts as one
+    return {**sol, 'wall_time_s': best, 'fixed_cold_s': t_cold, 'fixed_cold_iterations': cold['iterations'],
+            'fixed_cold_converged': cold['converged'], 'fixed_warm_s': t_warm,
+            'fixed_warm_iterations': warm['iterations'], 'fixed_warm_converged': warm['converged'] and warm['warm_started']}
+
+
+if __name__ == '__main__':
+    from FalconLandingODE import LANDING_FINAL
+
+    parser = argparse.ArgumentParser(description='Convex powered descent vs Dymos landing optimization')
+    parser.add_argument('--segments', type=int, default=20, help='Dymos GaussLobatto segments')
+    parser.add_argument('--nodes', type=int, default=40, help='Convex solver control intervals')
+    parser.add_argument('--duration-bounds', type=float, nargs=2, default=[5.0, 60.0])
+    parser.add_argument('--repeats', type=int, default=20)
+    parser.add_argument('--drag', action='store_true', help='Keep aerodynamic drag in the Dymos ODE')
+    args = parser.parse_args()
+
+    convex = run_convex(BURN_INITIAL, LANDING_FINAL, args.nodes, args.duration_bounds, args.repeats)
+    dymos = run_dymos(BURN_INITIAL, LANDING_FINAL, args.segments, args.duration_bounds, args.drag)
+
+    m0 = BURN_INITIAL['mass']
+    print("="*60)
+    print(f"Landing burn from h={BURN_INITIAL['h']:.0f} m, vx={BURN_INITIAL['vx']:.0f} m/s, "
+          f"vh={BURN_INITIAL['vh']:.0f} m/s, m={m0:.0f} kg{' (Dymos with drag)' if args.drag else ''}")
+    print("="*60)
+    print(f"{'':<22} {'converged':>9} {'duration':>9} {'propellant':>11} {'wall time':>11}")
+    print(f"{'Dymos':<22} {str(dymos['converged']):>9} {dymos['duration']:>8.2f}s {m0 - dymos['final_mass']:>9.1f}kg "
+          f"{dymos['wall_time_s'] * 1e3:>9.1f}ms")
+    print(f"{'Convex (free time)':<22} {str(convex['converged']):>9} {convex['duration']:>8.2f}s "
+          f"{m0 - convex['final_mass']:>9.1f}kg {convex['wall_time_s'] * 1e3:>9.1f}ms")
+    if convex['fixed_cold_converged'] and convex['fixed_warm_converged']:
+        print(f"Convex fixed time: {convex['fixed_cold_s'] * 1e3:.1f} ms cold ({convex['fixed_cold_iterations']} "
+              f"iterations), {convex['fixed_warm_s'] * 1e3:.1f} ms warm-started ({convex['fixed_warm_iterations']} "
+              f"iterations), {convex['solves']} solves in the time search")
+    else:
+        print(f"Convex fixed time: cold {'converged' if convex['fixed_cold_converged'] else 'did not converge'}, "
+              f"warm start {'converged' if convex['fixed_warm_converged'] else 'did not converge'}; "
+              f"no warm-start speedup to report ({convex['solves']} solves in the time search)")
+    print(f"Relaxation gap max(sigma - ||u||)/max(sigma): {convex['relaxation_gap']:.1e}")
+    if dymos['converged'] and convex['converged']:
+        diff = (m0 - convex['final_mass']) - (m0 - dymos['final_mass'])
+        print(f"Propellant difference (convex - Dymos): {diff:+.1f} kg ({100 * diff / (m0 - dymos['final_mass']):+.2f}%)")
@@ -0,0 +1,80 @@
+"""
+Explicit re-integration of a solved landing (trajectory_sim.py) against Dymos'
+simulate (solve_ivp): wall time and final-state error, then batch throughput.
+
+    python benchmark_trajectory_sim.py [--segments 20] [--batch 1000] [--repeats 5]
+
+The landing solved is the terminal burn of benchmark_powered_descent.py, which
+converges with SLSQP as well. Dymos' time includes building its simulation problem,
+as it does inside dm.run_problem(simulate=True). Dymos interpolates the controls with
+a cubic spline by default, not with the segment polynomials of the solution, so its
+final state differs from the collocation solution by more than the integration error.
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from benchmark_powered_descent import BURN_INITIAL
+
+STATE_NAMES = ('x', 'h', 'vx', 'vh', 'mass')
+
+
+def best_time(fn, repeats):
+    best, result = np.inf, None
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Explicit trajectory simulation vs Dymos simulate')
+    parser.add_argument('--segments', type=int, default=20, help='Dymos GaussLobatto segments')
+    parser.add_argument('--times-per-seg', type=int, default=20, help='Dymos simulate output times / RK4 steps per segment')
+    parser.add_argument('--batch', type=int, default=1000, help='Dispersed trajectories in the batch run')
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    os.environ['OPENMDAO_REPORTS'] = '0'
+    from FalconLandingODE import LANDING_FINAL, build_landing_problem, set_landing_guess
+    from trajectory_sim import simulate_phase
+
+    p, phase = build_landing_problem(num_segments=args.segments, print_level=0, check=False,
+                                     name='benchmark_trajectory_sim', duration_bounds=(5.0, 60.0))
+    for option in ('disp', 'print_results'):
+        if option in p.driver.options:
+            p.driver.options[option] = False
+    set_landing_guess(p, phase, BURN_INITIAL, LANDING_FINAL, duration=30.0)
+    result = p.run_driver()
+
+    reference = {name: float(p.get_val(f'traj.phase0.timeseries.{name}')[-1, 0]) for name in STATE_NAMES}
+    t_dymos, sim_p = best_time(lambda: p.model.traj.simulate(times_per_seg=args.times_per_seg), args.repeats)
+    dymos_final = {name: float(sim_p.get_val(f'traj.phase0.timeseries.{name}')[-1, 0]) for name in STATE_NAMES}
+    t_rk4, rk4 = best_time(lambda: simulate_phase(p, phase, method='rk4', steps_per_seg=args.times_per_seg),
+                           args.repeats)
+    t_rk45, rk45 = best_time(lambda: simulate_phase(p, phase, method='rk45'), args.repeats)
+
+    rng = np.random.default_rng(0)
+    dispersed = {'h': rng.normal(BURN_INITIAL['h'], 20.0, args.batch),
+                 'vh': rng.normal(BURN_INITIAL['vh'], 2.0, args.batch)}
+    t_batch, batch = best_time(lambda: simulate_phase(p, phase, initial=dispersed, method='rk4',
+                                                      steps_per_seg=args.times_per_seg), 1)
+
+    print("="*60)
+    print(f"Landing burn, {args.segments} segments (optimizer converged: {bool(result.success)})")
+    print("="*60)
+    print(f"{'':<20} {'wall time':>10} " + ' '.join(f"{'d' + name:>9}" for name in STATE_NAMES))
+    rows = [('Dymos simulate', t_dymos, dymos_final),
+            (f"RK4 ({rk4['evaluations']} calls)", t_rk4, {n: rk4['final'][n][0] for n in STATE_NAMES}),
+            (f"RK45 ({rk45['evaluations']} calls)", t_rk45, {n: rk45['final'][n][0] for n in STATE_NAMES})]
+    for label, wall, final in rows:
+        print(f"{label:<20} {wall * 1e3:>8.1f}ms " + ' '.join(f"{final[n] - reference[n]:>9.3f}" for n in STATE_NAMES))
+    print("(final state minus the collocation solution)")
+    print(f"Batch of {args.batch} dispersed trajectories (RK4): {t_batch * 1e3:.1f} ms "
+          f"({t_batch / args.batch * 1e6:.1f} us per trajectory, {t_batch / t_rk4:.1f}x one trajectory)")
+    h_final, vh_final = batch['final']['h'], batch['final']['vh']
+    print(f"Open-loop final state over the batch: h {h_final.min():.1f} .. {h_final.max():.1f} m, "
+          f"vh {vh_final.min():.2f} .. {vh_final.max():.2f} m/s")
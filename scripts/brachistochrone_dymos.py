@@ -3,6 +3,9 @@ import openmdao.api as om
 import dymos as dm
 import matplotlib.pyplot as plt
 
+from coloring_cache import save_coloring, use_cached_coloring
+from trajectory_sim import print_simulation_error, simulate_phase
+
 # Ensure plots are shown if script is run in an environment that supports it
 # For non-interactive environments (like some CI systems), this might need adjustment
 # or plots saved to file instead of shown.
@@ -93,7 +96,6 @@ if __name__ == '__main__':
         p.driver.opt_settings['mu_init'] = 1e-3
         p.driver.opt_settings['print_level'] = 5 # IPOPT verbosity (0-12)
         # p.driver.opt_settings['nlp_scaling_method'] = 'gradient-based' # Can help with scaling
-        p.driver.declare_coloring() # Important for performance with sparse Jacobians
         print("--- Using pyOptSparseDriver with IPOPT ---")
     except ImportError:
         print("--- pyOptSparseDriver with IPOPT not available. Falling back to ScipyOptimizeDriver with SLSQP ---")
@@ -103,7 +105,6 @@ if __name__ == '__main__':
         p.driver.options['tol'] = 1e-7
         p.driver.options['maxiter'] = 300 # Note: 'maxiter' for ScipyOptimizeDriver
         p.driver.options['disp'] = True # Display convergence information for SLSQP
-        # Note: declare_coloring() is generally not used or as effective with ScipyOptimizeDriver
 
     # --- 4. Instantiate Dymos Trajectory and Phase ---
     traj = dm.Trajectory()
@@ -165,8 +166,12 @@ if __name__ == '__main__':
     # Control: Initial guess for theta (e.g., constant pi/4)
     p.set_val('traj.phase0.controls:theta', phase.interp(ys=[np.pi/4, np.pi/4], nodes='control_input'))
 
+    # Total coloring: important for performance with sparse Jacobians. Loaded from the
+    # shared cache when an earlier run had the same problem structure.
+    coloring_key = use_cached_coloring(p)
+
     # --- 8. Run the Optimization using dymos.run_problem ---
-    # dm.run_problem handles running the driver, simulating, and making plots
+    # dm.run_problem handles running the driver and making plots
     # Create output directory if it doesn't exist
     import os
     output_dir = 'brachistochrone_dymos_out'
@@ -174,11 +179,14 @@ if __name__ == '__main__':
         os.makedirs(output_dir)
     
     solution_file = os.path.join(output_dir, 'brachistochrone_solution.db')
-    simulation_file = os.path.join(output_dir, 'brachistochrone_simulation.db')
-    
-    dm.run_problem(p, simulate=True, solution_record_file=solution_file,
-                   simulation_record_file=simulation_file,
+
+    dm.run_problem(p, solution_record_file=solution_file,
                    make_plots=True, plot_dir=output_dir) # Save plots in the same output_dir
+    save_coloring(p, coloring_key)
+
+    # Re-integrate the optimal control explicitly as a check of the collocation solution
+    sim = simulate_phase(p, phase)
+    print_simulation_error(sim)
 
     # --- 9. Retrieve and Print Key Results (Optional, as make_plots handles some) ---
     final_time_opt = p.get_val('traj.phase0.timeseries.time')[-1]
@@ -201,8 +209,7 @@ if __name__ == '__main__':
 
     # Plot 1: Trajectory (x vs y)
     axs[0].plot(x_sol, y_sol, 'bo-', label='Optimized Trajectory')
-    # if 'time_sim' in locals(): # Check if simulation data exists
-    #     axs[0].plot(x_sim, y_sim, 'r.--', label='Simulated Trajectory')
+    axs[0].plot(sim['states']['x'], sim['states']['y'], 'r.--', label='Simulated Trajectory')
     axs[0].set_xlabel('Horizontal Position, x (m)')
     axs[0].set_ylabel('Vertical Position, y (m)')
     axs[0].set_title('Brachistochrone Path')
@@ -0,0 +1,73 @@
+"""
+Parity check of the headless 2D engine (falcon9_sim2d.py) against a trace recorded
+from the browser simulation with record_sim2d_trace.js.
+
+    node scripts/record_sim2d_trace.js
+    python scripts/check_sim2d_parity.py [telemetry/sim2d_reference_trace.csv]
+
+The same mission is flown as several identical trajectories in one batch, to check
+that batching does not change the result. The trace has to run to touchdown, and the
+port has to land at the same step. Exits non-zero if any channel drifts beyond its
+tolerance or the touchdown differs. test_sim2d_parity.py runs the same check under pytest.
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from falcon9_sim2d import PHASE_LANDED, Falcon9Sim2DBatch
+
+DEFAULT_TRACE = os.path.join(os.path.dirname(__file__), '..', 'telemetry', 'sim2d_reference_trace.csv')
+
+# Relative tolerance on each channel (scaled by the channel's peak magnitude)
+TOLERANCES = {
+    'x': 1e-9, 'y': 1e-9, 'vx': 1e-9, 'vy': 1e-9, 'angle': 1e-9,
+    'throttle': 1e-9, 'mass': 1e-12, 'fuel': 1e-12, 'max_q': 1e-9,
+}
+
+
+def check_parity(trace_file=DEFAULT_TRACE, batch_size=4):
+    trace = pd.read_csv(trace_file)
+    steps = trace['step'].to_numpy()
+    record_every = int(steps[1] - steps[0])
+    dt = float(trace['time'].iloc[1] / steps[1])
+
+    if trace['phase'].iloc[-1] != PHASE_LANDED or trace['y'].iloc[-1] != 0.0:
+        print(f"Reference trace ends in phase {trace['phase'].iloc[-1]} at y={trace['y'].iloc[-1]:.0f} m, before "
+              f"touchdown: record it with a longer --t-max")
+        return False
+
+    sim = Falcon9Sim2DBatch(batch_size, dt=dt)
+    # A step beyond the trace, so that a port landing later than the browser shows up
+    history = sim.run(t_max=(steps[-1] + 1) * dt, record_every=record_every)
+
+    summary = sim.summary()
+    landing_time = trace['time'].iloc[-1]
+    landed = summary['landed'].all() and np.allclose(summary['landing_time'], landing_time, rtol=0.0, atol=0.5 * dt)
+    ok = landed and history['time'].shape[0] == len(trace)
+    print(f"Touchdown: browser at t={landing_time:.3f} s, port at t={np.max(summary['landing_time']):.3f} s "
+          f"({history['time'].shape[0]} vs {len(trace)} samples)  {'ok' if ok else 'FAIL'}")
+
+    num = min(len(trace), history['time'].shape[0])
+    phase_mismatch = np.count_nonzero(history['phase'][:num].T != trace['phase'].to_numpy()[:num])
+    if phase_mismatch:
+        ok = False
+    print(f"{'channel':<10} {'max abs err':>14} {'max rel err':>14} {'tolerance':>10}")
+    print(f"{'phase':<10} {phase_mismatch:>14d}")
+    for channel, tol in TOLERANCES.items():
+        reference = trace[channel].to_numpy()[:num]
+        ported = history[channel][:num]
+        err = np.max(np.abs(ported - reference[:, None]))
+        rel = err / max(1.0, np.max(np.abs(reference)))
+        status = 'ok' if rel <= tol else 'FAIL'
+        ok &= rel <= tol
+        print(f"{channel:<10} {err:>14.3e} {rel:>14.3e} {tol:>10.0e}  {status}")
+    print(f"Compared {num} samples (dt={dt:.6f} s, {steps[-1]} steps) x {batch_size} trajectories: "
+          f"{'PARITY OK' if ok else 'PARITY FAILED'}")
+    return ok
+
+
+if __name__ == '__main__':
+    trace_file = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_TRACE
+    sys.exit(0 if check_parity(trace_file) else 1)
@@ -0,0 +1,221 @@
+"""
+Persistent cache of total-derivative colorings for the Dymos scripts.
+
+Computing a total coloring costs several full model linearizations before the optimizer
+starts. The coloring (which also carries the total jacobian sparsity) only depends on
+the structure of the problem, so it is stored under a hash of that structure: driver,
+transcription type and options, state/control/parameter options that shape the
+jacobian, the ODE class source, and the design variables and responses with their
+sizes. Bounds, scaling and initial values are not part of the key. A run with the same
+structure loads the stored coloring instead of recomputing it.
+
+    p.setup()
+    key = use_cached_coloring(p)          # before run_driver / dm.run_problem
+    dm.run_problem(p, ...)
+    save_coloring(p, key)                 # stores a freshly computed coloring
+
+compute_coloring(p, key) computes and stores a missing coloring right away, for timed
+runs that should not include it.
+
+The cache lives in scripts/coloring_cache (FALCON9_COLORING_CACHE to override) and is
+shared by FalconLandingODE.py, brachistochrone_dymos.py and
+falcon9_trajectory_optimization.py.
+
+    python coloring_cache.py              # list cached colorings
+    python coloring_cache.py --clear
+"""
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+DEFAULT_CACHE_DIR = os.environ.get('FALCON9_COLORING_CACHE',
+                                   os.path.join(os.path.dirname(os.path.abspath(__file__)), 'coloring_cache'))
+
+# Phase variable options that do not change the jacobian structure
+_VALUE_OPTIONS = {'lower', 'upper', 'ref', 'ref0', 'scaler', 'adder', 'defect_ref', 'defect_scaler',
+                  'continuity_scaler', 'continuity_ref', 'rate_continuity_scaler', 'rate_continuity_ref',
+                  'val', 'desc', 'units', 'initial_bounds', 'final_bounds', 'duration_bounds',
+                  'initial_ref', 'initial_ref0', 'initial_adder', 'initial_scaler',
+                  'duration_ref', 'duration_ref0', 'duration_adder', 'duration_scaler',
+                  'initial_val', 'duration_val', 'name'}
+
+
+def _canonical(value):
+    """JSON-friendly, deterministic form of an option value"""
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return {'shape': list(value.shape), 'data': value.ravel().tolist()}
+    if isinstance(value, (np.integer, np.floating, np.bool_)):
+        return value.item()
+    if inspect.isclass(value) or inspect.isfunction(value):
+        return class_version(value)
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return repr(value)
+
+
+def class_version(cls):
+    """Qualified name plus a hash of the source, so editing an ODE invalidates its colorings"""
+    try:
+        source = inspect.getsource(cls)
+    except (OSError, TypeError):
+        source = ''
+    return f"{cls.__module__}.{cls.__qualname__}:{hashlib.sha256(source.encode()).hexdigest()[:16]}"
+
+
+def _options(options, skip=()):
+    return {name: _canonical(options[name]) for name in options if name not in skip}
+
+
+def _phase_structure(phase):
+    tx = phase.options['transcription']
+    return {
+        'transcription': type(tx).__name__,
+        'transcription_options': _options(tx.options),
+        'ode_class': _canonical(phase.options['ode_class']),
+        'ode_init_kwargs': _canonical(phase.options['ode_init_kwargs']),
+        'time': _options(phase.time_options, _VALUE_OPTIONS),
+        'states': {name: _options(opts, _VALUE_OPTIONS) for name, opts in phase.state_options.items()},
+        'controls': {name: _options(opts, _VALUE_OPTIONS) for name, opts in phase.control_options.items()},
+        'parameters': {name: _options(opts, _VALUE_OPTIONS) for name, opts in phase.parameter_options.items()},
+    }
+
+
+def problem_structure(p):
+    """Everything the total coloring depends on, for a problem after setup()"""
+    import dymos as dm
+    import openmdao
+
+    def meta(entries, keys):
+        return {name: {k: _canonical(m.get(k)) for k in keys} for name, m in entries.items()}
+
+    phases = {}
+    for system in p.model.system_iter(recurse=True, include_self=True):
+        if isinstance(system, dm.Phase):
+            phases[system.pathname] = _phase_structure(system)
+
+    return {
+        'openmdao': openmdao.__version__,
+        'dymos': dm.__version__,
+        'driver': type(p.driver).__name__,
+        'optimizer': p.driver.options['optimizer'] if 'optimizer' in p.driver.options else None,
+        'phases': phases,
+        'design_vars': meta(p.model.get_design_vars(recurse=True, get_sizes=True),
+                            ('source', 'size', 'indices')),
+        'responses': meta(p.model.get_responses(recurse=True, get_sizes=True),
+                          ('source', 'type', 'size', 'indices', 'linear', 'equals')),
+    }
+
+
+def structure_key(p):
+    """Hash of problem_structure(p); equality constraint values only count as present/absent"""
+    structure = problem_structure(p)
+    for response in structure['responses'].values():
+        response['equals'] = response['equals'] is not None
+    text = json.dumps(structure, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode()).hexdigest()[:24]
+
+
+def use_cached_coloring(p, cache_dir=DEFAULT_CACHE_DIR, **coloring_kwargs):
+    """
+    Call after p.setup() and before running the driver. Points the driver at the stored
+    coloring when one matches the problem structure, otherwise declares a dynamic
+    coloring (coloring_kwargs go to declare_coloring). Returns the structure key.
+    """
+    p.final_setup()  # Dymos adds its constraints and objectives during final setup
+    key = structure_key(p)
+    path = os.path.join(cache_dir, f"{key}.pkl")
+    if os.path.exists(path):
+        print(f"Coloring cache hit: {key}")
+        p.driver.use_fixed_coloring(path)
+    else:
+        print(f"Coloring cache miss: {key}")
+        p.driver.declare_coloring(**coloring_kwargs)
+    return key
+
+
+def compute_coloring(p, key, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Compute the dynamic coloring declared by use_cached_coloring now, at the current
+    values of the model, instead of in the next run_driver, store it under key and
+    point the driver at it. For timed runs: no later run_driver computes a coloring.
+    Returns the cache path, or None if the coloring could not be computed.
+    """
+    path = os.path.join(cache_dir, f"{key}.pkl")
+    if os.path.exists(path):
+        return path  # the driver already uses the stored coloring
+    p.run_model()
+    p.get_total_coloring(run_model=False)
+    path = save_coloring(p, key, cache_dir)
+    if path is not None:
+        # a dynamic coloring is computed again by every run_driver
+        p.driver.use_fixed_coloring(path)
+    return path
+
+
+def save_coloring(p, key, cache_dir=DEFAULT_CACHE_DIR):
+    """Store the coloring computed during the last run under key; returns the cache path or None"""
+    path = os.path.join(cache_dir, f"{key}.pkl")
+    if os.path.exists(path):
+        return path
+    computed = p.driver.get_coloring_fname(mode='output')
+    if not os.path.exists(computed):
+        return None
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    shutil.copyfile(computed, tmp)
+    os.replace(tmp, path)  # atomic, so concurrent runs never see a partial file
+    with open(os.path.join(cache_dir, f"{key}.json"), 'w') as f:
+        json.dump({'created': time.strftime('%Y-%m-%d %H:%M:%S'), 'structure': problem_structure(p)},
+                  f, indent=1, sort_keys=True, default=str)
+    return path
+
+
+def _orders(order):
+    """Segment orders as stored by _canonical, shown compactly"""
+    if isinstance(order, dict):
+        order = sorted(set(order['data']))
+        return order[0] if len(order) == 1 else order
+    return order
+
+
+def list_cache(cache_dir=DEFAULT_CACHE_DIR):
+    """(key, created, phase summary) for each stored coloring"""
+    entries = []
+    if not os.path.isdir(cache_dir):
+        return entries
+    for name in sorted(os.listdir(cache_dir)):
+        if not name.endswith('.json'):
+            continue
+        with open(os.path.join(cache_dir, name)) as f:
+            info = json.load(f)
+        phases = ', '.join(f"{path} {ph['transcription']}(num_segments={ph['transcription_options'].get('num_segments')}, "
+                           f"order={_orders(ph['transcription_options'].get('order'))})"
+                           for path, ph in info['structure']['phases'].items())
+        entries.append((name[:-5], info['created'], phases))
+    return entries
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='List or clear the shared total coloring cache')
+    parser.add_argument('--dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--clear', action='store_true')
+    args = parser.parse_args()
+
+    if args.clear:
+        shutil.rmtree(args.dir, ignore_errors=True)
+        print(f"Cleared {args.dir}")
+    else:
+        entries = list_cache(args.dir)
+        print(f"{len(entries)} colorings in {args.dir}")
+        for key, created, phases in entries:
+            print(f"{key}  {created}  {phases}")
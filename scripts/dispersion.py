@@ -0,0 +1,244 @@
+"""
+Monte Carlo dispersion runner for the JSBSim Falcon 9 landing (test_jsbsim.py).
+
+Scenarios are sampled up front from configurable distributions with a seeded RNG,
+so a campaign is reproducible for a given seed. Each scenario flies in its own
+JSBSim instance on a process pool; every worker loads the Falcon9Booster model once
+and resets it between runs. Per-run summaries (touchdown speed, propellant left,
+outcome, and the exception of a run that failed) stream into a CSV as runs complete,
+and full traces can optionally be kept.
+
+    python dispersion.py --runs 2000 --workers 8 --seed 42 --out dispersion_out
+"""
+import argparse
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+
+class Fixed:
+    def __init__(self, value):
+        self.value = value
+
+    def sample(self, rng, n):
+        return np.full(n, float(self.value))
+
+
+class Normal:
+    def __init__(self, mean, std, low=-np.inf, high=np.inf):
+        self.mean, self.std, self.low, self.high = mean, std, low, high
+
+    def sample(self, rng, n):
+        return np.clip(rng.normal(self.mean, self.std, size=n), self.low, self.high)
+
+
+class Uniform:
+    def __init__(self, low, high):
+        self.low, self.high = low, high
+
+    def sample(self, rng, n):
+        return rng.uniform(self.low, self.high, size=n)
+
+
+# Dispersed parameters: JSBSim initial conditions ('ic/...'), tank contents
+# ('propulsion/...'), environment ('atmosphere/...') and controller gain scale
+# factors ('gain/<axis>/<term>', multiplying Falcon9Controller.DEFAULT_GAINS)
+DEFAULT_DISPERSIONS = {
+    'ic/h-sl-ft': Normal(70000, 3000, low=50000),
+    'ic/u-fps': Normal(-50, 15),
+    'ic/w-fps': Normal(-395, 30),
+    'ic/pitch-deg': Normal(-10, 2),
+    'atmosphere/wind-north-fps': Normal(0, 15),
+    'atmosphere/wind-east-fps': Normal(0, 15),
+    'propulsion/tank[0]/contents-lbs': Normal(50000, 2500, low=0),
+    'propulsion/tank[1]/contents-lbs': Normal(120000, 6000, low=0),
+    'gain/pitch/kp': Normal(1.0, 0.1, low=0),
+    'gain/pitch/kd': Normal(1.0, 0.1, low=0),
+    'gain/yaw/kp': Normal(1.0, 0.1, low=0),
+    'gain/roll/kp': Normal(1.0, 0.1, low=0),
+}
+
+SUMMARY_COLUMNS = ['run_id', 'outcome', 'touchdown_speed_fps', 'fuel_left_lbs',
+                   'oxidizer_left_lbs', 'flight_time_s', 'wall_time_s', 'error']
+
+
+def failed_result(outcome, error=''):
+    """A run_landing()-like result of a run that did not fly; error says why"""
+    nan = float('nan')
+    return {'outcome': outcome, 'touchdown_speed_fps': nan, 'time': nan,
+            'fuel_left_lbs': nan, 'oxidizer_left_lbs': nan, 'error': error}
+
+
+def make_summary(run_id, result, wall_time):
+    """One row of the summary table from a run_landing() result"""
+    return {
+        'run_id': run_id,
+        'outcome': result['outcome'],
+        'touchdown_speed_fps': result['touchdown_speed_fps'],
+        'fuel_left_lbs': result['fuel_left_lbs'],
+        'oxidizer_left_lbs': result['oxidizer_left_lbs'],
+        'flight_time_s': result['time'],
+        'wall_time_s': wall_time,
+        'error': result.get('error', ''),
+    }
+
+
+def sample_scenarios(num_runs, seed=0, dispersions=None):
+    """Draw num_runs scenarios; returns a list of {'run_id': i, <parameter>: value}"""
+    dispersions = DEFAULT_DISPERSIONS if dispersions is None else dispersions
+    rng = np.random.default_rng(seed)
+    # Sorted so that adding a parameter does not reshuffle the others for a given seed
+    columns = {name: dispersions[name].sample(rng, num_runs) for name in sorted(dispersions)}
+    return [{'run_id': i, **{name: float(values[i]) for name, values in columns.items()}}
+            for i in range(num_runs)]
+
+
+def split_scenario(scenario):
+    """Sort scenario parameters into the initialize() arguments and controller gains"""
+    initial_conditions, tank_contents, environment = {}, {}, {}
+    gains = {}
+    for name, value in scenario.items():
+        if name.startswith('ic/'):
+            initial_conditions[name] = value
+        elif name.startswith('propulsion/'):
+            tank_contents[name] = value
+        elif name.startswith('atmosphere/'):
+            environment[name] = value
+        elif name.startswith('gain/'):
+            _, axis, term = name.split('/')
+            gains.setdefault(axis, {})[term] = value
+    return initial_conditions, tank_contents, environment, gains
+
+
+# --- Worker process state: one JSBSim model per process, loaded by the pool initializer ---
+_worker_fdm = None
+_worker_fdm_used = False
+_worker_guidance = None
+
+
+def _init_worker(guidance_path=None):
+    global _worker_fdm, _worker_fdm_used, _worker_guidance
+    from test_jsbsim import create_fdm
+    _worker_fdm = create_fdm(debug_level=0)
+    _worker_fdm_used = False
+    if guidance_path is not None:
+        from guidance_table import GuidanceTable
+        _worker_guidance = GuidanceTable.load(guidance_path)
+
+
+def _run_scenario(scenario, max_time, keep_trace, trace_decimation=1):
+    global _worker_fdm_used
+    from test_jsbsim import Falcon9Controller, initialize, run_landing
+
+    initial_conditions, tank_contents, environment, gain_scales = split_scenario(scenario)
+    gains = {axis: {term: Falcon9Controller.DEFAULT_GAINS[axis][term] * scale for term, scale in terms.items()}
+             for axis, terms in gain_scales.items()}
+
+    t0 = time.perf_counter()
+    try:
+        initialize(_worker_fdm, initial_conditions, tank_contents, environment, reset=_worker_fdm_used)
+        _worker_fdm_used = True
+        controller = Falcon9Controller(gains, guidance=_worker_guidance)
+        result, telemetry = run_landing(_worker_fdm, controller, max_time=max_time,
+                                        verbose=False, decimation=trace_decimation)
+    except Exception as exc:
+        result, telemetry = failed_result('error', repr(exc)), None
+        # A failed IC leaves the model half-initialized; resetting it can abort the process, so reload
+        _init_worker()  # keeps the already loaded guidance table
+    summary = make_summary(scenario['run_id'], result, time.perf_counter() - t0)
+    trace = telemetry.data() if keep_trace and telemetry is not None else None
+    return summary, trace
+
+
+def run_dispersion(num_runs, seed=0, workers=None, dispersions=None, max_time=500,
+                   output_dir='dispersion_out', keep_traces=False, trace_decimation=1, guidance_path=None):
+    """
+    Run a Monte Carlo campaign, with the throttle from the guidance table at
+    guidance_path (guidance_table.py) if given. Writes scenarios.csv (sampled inputs), summary.csv
+    (streamed per-run results) and, with keep_traces, traces/run_<id>.npy holding
+    every trace_decimation-th step as a structured array (one field per channel).
+    Returns the summary rows ordered by run_id.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    scenarios = sample_scenarios(num_runs, seed, dispersions)
+
+    with open(os.path.join(output_dir, 'scenarios.csv'), 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(scenarios[0]))
+        writer.writeheader()
+        writer.writerows(scenarios)
+
+    trace_dir = os.path.join(output_dir, 'traces')
+    if keep_traces:
+        os.makedirs(trace_dir, exist_ok=True)
+
+    rows = []
+    t0 = time.perf_counter()
+    with open(os.path.join(output_dir, 'summary.csv'), 'w', newline='') as f, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(guidance_path,)) as pool:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_COLUMNS)
+        writer.writeheader()
+        futures = {pool.submit(_run_scenario, scenario, max_time, keep_traces, trace_decimation): scenario['run_id']
+                   for scenario in scenarios}
+        for done, future in enumerate(as_completed(futures), start=1):
+            try:
+                summary, trace = future.result()
+            except BrokenProcessPool as exc:
+                # A worker died inside JSBSim; the remaining runs cannot complete on this pool
+                summary, trace = make_summary(futures[future], failed_result('worker_crash', repr(exc)),
+                                              float('nan')), None
+            writer.writerow(summary)
+            f.flush()
+            rows.append(summary)
+            if trace is not None:
+                np.save(os.path.join(trace_dir, f"run_{summary['run_id']:05d}.npy"), trace)
+            if done % 100 == 0 or done == num_runs:
+                elapsed = time.perf_counter() - t0
+                print(f"{done}/{num_runs} runs ({done / elapsed:.1f} runs/s)")
+
+    rows.sort(key=lambda r: r['run_id'])
+    return rows
+
+
+def print_report(rows):
+    outcomes = {}
+    for row in rows:
+        outcomes[row['outcome']] = outcomes.get(row['outcome'], 0) + 1
+    print("="*60)
+    print(f"Dispersion results ({len(rows)} runs)")
+    print("="*60)
+    for outcome, count in sorted(outcomes.items()):
+        print(f"{outcome:<14} {count:6d}  ({100.0 * count / len(rows):5.1f}%)")
+    errors = {}
+    for row in rows:
+        if row['error']:
+            errors[row['error']] = errors.get(row['error'], 0) + 1
+    for error, count in sorted(errors.items(), key=lambda item: -item[1]):
+        print(f"  {count:6d} x {error}")
+    speeds = np.array([r['touchdown_speed_fps'] for r in rows], dtype=float)
+    fuel = np.array([r['fuel_left_lbs'] for r in rows], dtype=float)
+    if np.isfinite(speeds).any():
+        print(f"Touchdown speed (fps): mean={np.nanmean(speeds):.2f}  p95={np.nanpercentile(speeds, 95):.2f}  max={np.nanmax(speeds):.2f}")
+    if np.isfinite(fuel).any():
+        print(f"RP-1 left (lbs):       mean={np.nanmean(fuel):.0f}  p5={np.nanpercentile(fuel, 5):.0f}  min={np.nanmin(fuel):.0f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Monte Carlo dispersion runs of the JSBSim Falcon 9 landing')
+    parser.add_argument('--runs', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--max-time', type=float, default=500.0)
+    parser.add_argument('--out', default='dispersion_out')
+    parser.add_argument('--traces', action='store_true', help='Keep the full telemetry trace of every run')
+    parser.add_argument('--trace-decimation', type=int, default=1, help='Keep every n-th step of the traces')
+    parser.add_argument('--guidance', default=None, help='Guidance table for the throttle (guidance_table.py)')
+    args = parser.parse_args()
+
+    rows = run_dispersion(args.runs, seed=args.seed, workers=args.workers, max_time=args.max_time,
+                          output_dir=args.out, keep_traces=args.traces, trace_decimation=args.trace_decimation,
+                          guidance_path=args.guidance)
+    print_report(rows)
@@ -0,0 +1,344 @@
+"""
+Headless, vectorized port of the browser 2D mission simulation
+(webapp/static/js/simulation2d.js, Falcon9Simulation2D).
+
+The physics, phase sequencing and landing logic follow Falcon9Simulation2D.update,
+updatePhase and updateStage1Physics step for step, without any rendering. The state
+of many independent trajectories is kept as NumPy arrays (one array per quantity)
+and advanced together at a fixed time step, so thousands of mission profiles are
+flown in one batch. Each trajectory can have its own phase schedule, throttle levels,
+target attitudes and vehicle parameters for dispersion studies.
+
+Parity with the browser is checked by scripts/check_sim2d_parity.py against traces
+recorded with scripts/record_sim2d_trace.js. With atmosphere='us76' the browser's
+exponential density and troposphere-only speed of sound are replaced by the shared
+US Standard Atmosphere 1976 table (atmosphere.py); parity only holds for 'browser'.
+"""
+import time
+
+import numpy as np
+
+from atmosphere import US76
+
+# Mirrors webapp/static/js/constants.js
+F9_CONSTANTS = {
+    'G_SEA_LEVEL': 9.80665,
+    'EARTH_RADIUS': 6371000.0,
+    'SCALE_HEIGHT': 8500.0,
+    'SEA_LEVEL_DENSITY': 1.225,
+    'DRY_MASS': 25400.0,
+    'MAX_THRUST': 7607000.0,
+    'ISP_VACUUM': 311.0,
+    'ISP_SEA_LEVEL': 282.0,
+    'REF_AREA': 10.52,
+    'CD_SUBSONIC': 0.35,
+    'CD_TRANSONIC_PEAK': 0.80,
+    'CD_SUPERSONIC': 0.62,
+}
+
+# RP-1 + LOX combined, as used by the 2D sim
+FUEL_MASS_2D = 453593.0
+
+# (name, duration s, throttle, target angle rad) - Falcon9Simulation2D.phases
+PHASES = [
+    ('PRE-LAUNCH', 3.0, 0.0, 0.0),
+    ('LAUNCH & ASCENT', 60.0, 1.0, 0.0),
+    ('GRAVITY TURN', 90.0, 0.85, np.pi / 6),
+    ('STAGE SEPARATION', 3.0, 0.0, np.pi / 6),
+    ('BOOST-BACK BURN', 25.0, 0.7, -np.pi / 3),
+    ('COAST PHASE', 120.0, 0.0, -np.pi / 6),
+    ('RE-ENTRY BURN', 15.0, 0.5, 0.0),
+    ('AERODYNAMIC DESCENT', 40.0, 0.0, 0.0),
+    ('LANDING BURN', 25.0, 0.95, 0.0),
+    ('TOUCHDOWN', 0.0, 0.0, 0.0),
+    ('LANDED', 0.0, 0.0, 0.0),
+]
+PHASE_NAMES = [p[0] for p in PHASES]
+NUM_PHASES = len(PHASES)
+PHASE_SEPARATION = 3
+PHASE_BOOSTBACK = 4
+PHASE_AERO_DESCENT = 7
+PHASE_LANDING_BURN = 8
+PHASE_LANDED = 10
+
+# Breakpoints of the piecewise-linear Mach drag curve in getMachDrag
+_MACH_POINTS = np.array([0.8, 1.0, 1.2, 3.0])
+_CD_POINTS = np.array([F9_CONSTANTS['CD_SUBSONIC'], F9_CONSTANTS['CD_TRANSONIC_PEAK'], 0.72, F9_CONSTANTS['CD_SUPERSONIC']])
+
+STATE_CHANNELS = ('time', 'phase', 'x', 'y', 'vx', 'vy', 'angle', 'throttle', 'mass', 'fuel', 'max_q')
+
+
+def get_gravity(altitude):
+    """Inverse-square gravity, as getGravity"""
+    R = F9_CONSTANTS['EARTH_RADIUS']
+    return F9_CONSTANTS['G_SEA_LEVEL'] * (R / (R + np.maximum(0.0, altitude)))**2
+
+
+def get_isp(altitude):
+    """Linear sea-level to vacuum Isp blend up to 100 km, as getIsp"""
+    t = np.minimum(1.0, altitude / 100000.0)
+    return F9_CONSTANTS['ISP_SEA_LEVEL'] + t * (F9_CONSTANTS['ISP_VACUUM'] - F9_CONSTANTS['ISP_SEA_LEVEL'])
+
+
+def get_mach(velocity, altitude):
+    """Mach number with the troposphere temperature lapse used by getMachDrag"""
+    temp = 288.15 - 0.0065 * np.minimum(altitude, 11000.0)
+    speed_of_sound = np.sqrt(1.4 * 287.05 * np.maximum(temp, 216.65))
+    return velocity / speed_of_sound
+
+
+def get_mach_drag(mach):
+    """Drag coefficient vs Mach, as getMachDrag (the curve is piecewise linear, so np.interp is exact)"""
+    return np.interp(mach, _MACH_POINTS, _CD_POINTS)
+
+
+def get_air_density(altitude):
+    """Exponential atmosphere used for drag in updateStage1Physics"""
+    return np.maximum(0.0, F9_CONSTANTS['SEA_LEVEL_DENSITY'] * np.exp(-altitude / F9_CONSTANTS['SCALE_HEIGHT']))
+
+
+class Falcon9Sim2DBatch:
+    """
+    Fixed-step integrator for many independent 2D Falcon 9 missions.
+
+    Every vehicle or schedule parameter may be a scalar (shared by all trajectories) or an
+    array of length num_trajectories; the phase tables may be (NUM_PHASES,) or
+    (num_trajectories, NUM_PHASES). atmosphere is 'browser' (as the JS simulation) or
+    'us76' (atmosphere.US76 density and speed of sound).
+    """
+
+    def __init__(self, num_trajectories, dt=1.0 / 60.0, dry_mass=F9_CONSTANTS['DRY_MASS'],
+                 fuel_mass=FUEL_MASS_2D, max_thrust=F9_CONSTANTS['MAX_THRUST'],
+                 phase_durations=None, phase_throttles=None, phase_target_angles=None,
+                 atmosphere='browser'):
+        if atmosphere not in ('browser', 'us76'):
+            raise ValueError(f"atmosphere must be 'browser' or 'us76', not {atmosphere!r}")
+        n = int(num_trajectories)
+        self.n = n
+        self.dt = min(float(dt), 0.1)  # update() clamps the frame step to 0.1 s
+        self.atmosphere = atmosphere
+
+        self.dry_mass = np.broadcast_to(np.asarray(dry_mass, dtype=float), (n,)).copy()
+        self.fuel_mass = np.broadcast_to(np.asarray(fuel_mass, dtype=float), (n,)).copy()
+        self.max_thrust = np.broadcast_to(np.asarray(max_thrust, dtype=float), (n,)).copy()
+
+        def phase_table(values, column):
+            if values is None:
+                values = [p[column] for p in PHASES]
+            return np.broadcast_to(np.asarray(values, dtype=float), (n, NUM_PHASES)).copy()
+
+        self.phase_durations = phase_table(phase_durations, 1)
+        self.phase_throttles = phase_table(phase_throttles, 2)
+        self.phase_target_angles = phase_table(phase_target_angles, 3)
+
+        # Row offsets into the flattened phase tables: table.flat[_row_offsets + phase]
+        self._row_offsets = np.arange(n) * NUM_PHASES
+        self.reset()
+
+    def reset(self):
+        """Put every trajectory back on the pad, as Falcon9Simulation2D.reset"""
+        n = self.n
+        self.time = np.zeros(n)
+        self.phase = np.zeros(n, dtype=np.int64)
+        self.phase_start = np.zeros(n)
+        self.x = np.full(n, 100.0)
+        self.y = np.full(n, 100.0)
+        self.vx = np.zeros(n)
+        self.vy = np.zeros(n)
+        self.angle = np.zeros(n)
+        self.throttle = np.zeros(n)
+        self.fuel = self.fuel_mass.copy()
+        self.mass = self.dry_mass + self.fuel
+        self.max_q = np.zeros(n)
+        self.max_q_reached = np.zeros(n, dtype=bool)
+        self.max_q_time = np.zeros(n)
+        self.mach = np.zeros(n)
+        self.running = np.ones(n, dtype=bool)
+        self.failed = np.zeros(n, dtype=bool)
+        self.landing_speed = np.full(n, np.nan)
+        self.landing_time = np.full(n, np.nan)
+
+    def step(self):
+        """Advance every running trajectory by one fixed step (Falcon9Simulation2D.update)"""
+        running = self.running
+        if not running.any():
+            return
+        dt = self.dt
+        g0 = F9_CONSTANTS['G_SEA_LEVEL']
+        offsets = self._row_offsets
+
+        # Whole-array updates; stopped trajectories are masked out when the state is committed
+        time_ = self.time + dt
+
+        # --- updatePhase ---
+        phase = self.phase
+        advance = ((time_ - self.phase_start) >= self.phase_durations.take(offsets + phase)) & (phase < NUM_PHASES - 1)
+        phase = phase + advance
+        phase_start = np.where(advance, time_, self.phase_start)
+
+        fuel = self.fuel
+        dry_mass = self.dry_mass
+        # Stage separation: booster keeps its remaining propellant only
+        mass = np.where(advance & (phase == PHASE_SEPARATION), dry_mass + fuel, self.mass)
+
+        lookup = offsets + phase
+        throttle = self.phase_throttles.take(lookup)
+        target_angle = self.phase_target_angles.take(lookup)
+
+        # --- updateStage1Physics ---
+        vx, vy = self.vx, self.vy
+        angle = self.angle
+        max_thrust = self.max_thrust
+        y = self.y
+
+        # Suicide-burn throttle during the landing burn
+        required_decel = vy**2 / (2.0 * np.maximum(y, 100.0)) * 1.5
+        suicide_throttle = np.clip((required_decel + g0) / (max_thrust / mass), 0.3, 1.0)
+        throttle = np.where(phase == PHASE_LANDING_BURN, suicide_throttle, throttle)
+
+        thrust = max_thrust * throttle
+        gravity = get_gravity(y)
+
+        velocity = np.hypot(vx, vy)
+        moving = velocity > 0.1
+        if self.atmosphere == 'us76':
+            atm = US76.lookup(y, ('density', 'speed_of_sound'))
+            density = atm['density'][0]
+            mach = velocity / atm['speed_of_sound'][0]
+        else:
+            density = get_air_density(y)
+            mach = get_mach(velocity, y)
+        drag_coeff = np.where(moving, get_mach_drag(mach), F9_CONSTANTS['CD_SUBSONIC'])
+        dyn_pressure = 0.5 * density * velocity * velocity
+        # -drag / |v|, zero when the vehicle is at rest
+        drag_per_velocity = np.where(velocity > 0.0, -dyn_pressure * drag_coeff * F9_CONSTANTS['REF_AREA']
+                                     / np.where(velocity > 0.0, velocity, 1.0), 0.0)
+
+        # Max-Q tracking
+        max_q = self.max_q
+        new_max = dyn_pressure > max_q
+        passed = ~new_max & ~self.max_q_reached & (dyn_pressure < max_q * 0.98) & (max_q > 5000.0) & running
+
+        vx = vx + (thrust * np.sin(angle) + drag_per_velocity * vx) / mass * dt
+        vy = vy + (thrust * np.cos(angle) - mass * gravity + drag_per_velocity * vy) / mass * dt
+        x = self.x + vx * dt
+        y = y + vy * dt
+
+        # Held on the pad during pre-launch
+        on_pad = phase == 0
+        y = np.where(on_pad, 100.0, y)
+        vx = np.where(on_pad, 0.0, vx)
+        vy = np.where(on_pad, 0.0, vy)
+
+        # Ground contact after launch; any touchdown from re-entry on is a landing
+        ground = (phase > 1) & (y <= 0.0) & (vy <= 0.0)
+        landed = ground & (phase >= PHASE_AERO_DESCENT) & running
+        # Touchdown speed is taken before the velocity is zeroed (the browser reports it afterwards)
+        np.copyto(self.landing_speed, np.abs(vy), where=landed)
+        np.copyto(self.landing_time, time_, where=landed)
+        y = np.where(ground, 0.0, y)
+        vy = np.where(ground, 0.0, vy)
+        vx = np.where(landed, 0.0, vx)
+        throttle = np.where(landed, 0.0, throttle)
+        phase = np.where(landed, PHASE_LANDED, phase)
+
+        # Attitude slews towards the phase target; the boost-back flip takes the short way round
+        diff = target_angle - angle
+        flip = (phase == PHASE_BOOSTBACK) & (np.abs(diff) > np.pi)
+        angle = angle + np.where(flip & (diff > np.pi), 2.0 * np.pi, 0.0) - np.where(flip & (diff < -np.pi), 2.0 * np.pi, 0.0)
+        angle = angle + (target_angle - angle) * 0.5 * dt
+
+        # Fuel consumption with altitude-dependent Isp
+        burning = (throttle > 0.0) & (fuel > 0.0)
+        fuel_rate = (max_thrust / (get_isp(y) * g0)) * throttle
+        fuel = np.where(burning, np.maximum(0.0, fuel - fuel_rate * dt), fuel)
+        mass = np.where(burning, dry_mass + fuel, mass)
+
+        # The browser resets on NaN; in a batch the trajectory is flagged and stopped instead
+        bad = (np.isnan(x) | np.isnan(y)) & running
+
+        commit = None if running.all() else running
+        for name, value in (('time', time_), ('phase', phase), ('phase_start', phase_start),
+                            ('x', x), ('y', y), ('vx', vx), ('vy', vy), ('angle', angle),
+                            ('throttle', throttle), ('fuel', fuel), ('mass', mass)):
+            if commit is None:
+                setattr(self, name, value)
+            else:
+                np.copyto(getattr(self, name), value, where=commit)
+        np.copyto(self.mach, mach, where=running & moving)
+        np.copyto(self.max_q, dyn_pressure, where=running & new_max)
+        np.copyto(self.max_q_time, time_, where=passed)
+        self.max_q_reached |= passed
+        self.failed |= bad
+        self.running &= ~(landed | bad)
+
+    def state(self):
+        """Snapshot of the per-trajectory state as a dict of arrays"""
+        return {
+            'time': self.time.copy(), 'phase': self.phase.copy(),
+            'x': self.x.copy(), 'y': self.y.copy(), 'vx': self.vx.copy(), 'vy': self.vy.copy(),
+            'angle': self.angle.copy(), 'throttle': self.throttle.copy(),
+            'mass': self.mass.copy(), 'fuel': self.fuel.copy(), 'max_q': self.max_q.copy(),
+        }
+
+    def run(self, t_max, record_every=0):
+        """
+        Step until every trajectory has landed or t_max seconds have been flown.
+
+        With record_every > 0 the state is sampled every record_every steps (and after the
+        last step) and returned as a dict of (num_samples, num_trajectories) arrays.
+        """
+        num_steps = int(np.ceil(t_max / self.dt - 1e-9))
+        samples = []
+        if record_every:
+            samples.append(self.state())
+        i = 0
+        for i in range(1, num_steps + 1):
+            self.step()
+            if record_every and i % record_every == 0:
+                samples.append(self.state())
+            if not self.running.any():
+                break
+        if record_every and (i % record_every != 0):
+            samples.append(self.state())
+        if not record_every:
+            return None
+        return {key: np.stack([s[key] for s in samples]) for key in STATE_CHANNELS}
+
+    def summary(self):
+        """Per-trajectory mission outcome"""
+        return {
+            # The phase schedule alone reaches LANDED too; only a touchdown sets landing_time
+            'landed': ~np.isnan(self.landing_time),
+            'landing_time': self.landing_time,
+            'landing_speed': self.landing_speed,
+            'landing_offset': np.abs(self.x - 100.0),
+            'fuel_remaining': self.fuel / self.fuel_mass,
+            'max_q': self.max_q,
+            'failed': self.failed,
+        }
+
+
+if __name__ == '__main__':
+    # Throughput benchmark: dispersed mission profiles flown to touchdown in one batch, at
+    # the largest step the browser takes (update() clamps frames to 0.1 s). Phase durations
+    # and throttles are dispersed by 2%: at 10% a few lofted profiles take hours to come
+    # down, and the batch runs until its last trajectory has landed
+    rng = np.random.default_rng(0)
+    dt = 0.1
+    t_max = 5000.0
+    for n in (1, 100, 1000, 10000):
+        durations = np.array([p[1] for p in PHASES]) * rng.uniform(0.98, 1.02, size=(n, NUM_PHASES))
+        throttles = np.clip(np.array([p[2] for p in PHASES]) * rng.uniform(0.98, 1.02, size=(n, NUM_PHASES)), 0.0, 1.0)
+        sim = Falcon9Sim2DBatch(n, dt=dt, phase_durations=durations, phase_throttles=throttles,
+                                dry_mass=F9_CONSTANTS['DRY_MASS'] * rng.uniform(0.97, 1.03, size=n))
+        t0 = time.perf_counter()
+        sim.run(t_max)
+        elapsed = time.perf_counter() - t0
+        landed = sim.summary()['landed']
+        if not landed.all():
+            raise RuntimeError(f"{np.count_nonzero(~landed)} of {n} trajectories did not touch down "
+                               f"within {t_max:.0f} s")
+        steps = np.round(sim.landing_time / dt)
+        print(f"{n:6d} trajectories x {steps.mean():.0f} steps to touchdown: {elapsed:7.3f} s  "
+              f"({n / elapsed:9.1f} missions/s, {steps.sum() / elapsed / 1e6:6.2f} M trajectory-steps/s)")
@@ -5,6 +5,9 @@ import dymos as dm
 import numpy as np
 import matplotlib.pyplot as plt
 
+from auto_partials import ElementwiseComponent
+from coloring_cache import save_coloring, use_cached_coloring
+
 # Define the base directory where XML files are located
 BASE_DIR = r"C:\Users\cmodi.000\Falcon9Sim\aircraft\Falcon9Booster"
 
@@ -111,8 +114,8 @@ def load_booster_data(unit_system='imperial'):
     
     return booster_data
 
-# Define the ODE system for the booster
-class BoosterODE(om.ExplicitComponent):
+# Define the ODE system for the booster; its exact sparse partials come from ElementwiseComponent
+class BoosterODE(ElementwiseComponent):
     def initialize(self):
         self.options.declare('num_nodes', types=int)
         self.options.declare('g', types=float, default=9.81)
@@ -126,7 +129,6 @@ class BoosterODE(om.ExplicitComponent):
         self.add_input('throttle', shape=(nn,), units=None, desc='throttle setting')
         self.add_output('hdot', shape=(nn,), units='m/s', desc='altitude rate')
         self.add_output('vdot', shape=(nn,), units='m/s**2', desc='velocity rate')
-        self.declare_partials('*', '*', method='fd')
 
     def compute(self, inputs, outputs):
         v = inputs['v']
@@ -182,7 +184,6 @@ if __name__ == "__main__":
     
     # Set up the driver
     p.driver = om.ScipyOptimizeDriver()
-    p.driver.declare_coloring()
     
     # Final setup
     p.setup()
@@ -194,8 +195,10 @@ if __name__ == "__main__":
     p.set_val('traj.descent.states:v', phase.interpolate(ys=[-100, 0], nodes='state_input'))
     p.set_val('traj.descent.controls:throttle', 0.5)
     
-    # Run the optimization
+    # Run the optimization, with the total coloring from the shared cache when available
+    coloring_key = use_cached_coloring(p)
     p.run_driver()
+    save_coloring(p, coloring_key)
     
     # Extract results
     time = p.get_val('traj.descent.timeseries.time')
@@ -0,0 +1,62 @@
+"""
+Bound property I/O for JSBSim stepping loops.
+
+fdm['position/h-sl-ft'] resolves the property path on every call. FdmIO resolves a
+fixed list of state (read) and control (write) properties once, through the property
+manager, and keeps the bound node accessors. Each step is then one bulk read into a
+preallocated state vector and one bulk write from a preallocated control vector.
+
+    io = FdmIO(fdm, ['position/h-sl-ft', 'velocities/w-fps'], ['fcs/throttle-cmd-norm'])
+    altitude, w = io.read_state()
+    io.controls[0] = 0.8
+    io.write_controls()
+"""
+import numpy as np
+
+
+class FdmIO:
+    """
+    fdm: a loaded jsbsim.FGFDMExec
+    state_properties: properties read by read_state(), in state vector order
+    control_properties: properties written by write_controls(), in control vector order
+
+    State properties must exist when FdmIO is created (KeyError otherwise, as for
+    fdm[...]). Control properties are created if missing, as fdm[...] = value does.
+    """
+
+    def __init__(self, fdm, state_properties, control_properties=()):
+        self.fdm = fdm
+        self.state_properties = list(state_properties)
+        self.control_properties = list(control_properties)
+
+        manager = fdm.get_property_manager()
+        state_nodes = [manager.get_node(prop, False) for prop in self.state_properties]
+        missing = [prop for prop, node in zip(self.state_properties, state_nodes) if node is None]
+        if missing:
+            raise KeyError(f"No property named {', '.join(missing)}")
+        control_nodes = [manager.get_node(prop, True) for prop in self.control_properties]
+
+        self._getters = [node.get_double_value for node in state_nodes]
+        self._setters = [node.set_double_value for node in control_nodes]
+
+        self.state = np.zeros(len(self._getters))
+        self.controls = np.zeros(len(self._setters))
+        # Element stores through a memoryview avoid creating NumPy scalars
+        self._state_view = memoryview(self.state)
+
+    def index(self, prop):
+        """Position of a state property in the state vector"""
+        return self.state_properties.index(prop)
+
+    def read_state(self):
+        """Read every state property into self.state and return it"""
+        view = self._state_view
+        for i, get in enumerate(self._getters):
+            view[i] = get()
+        return self.state
+
+    def write_controls(self, values=None):
+        """Write self.controls (or values, in control order) to the control properties"""
+        values = self.controls if values is None else values
+        for set_value, value in zip(self._setters, values.tolist() if hasattr(values, 'tolist') else values):
+            set_value(value)
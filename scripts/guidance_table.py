@@ -0,0 +1,301 @@
+"""
+Precomputed fuel-optimal landing guidance for the JSBSim controller (test_jsbsim.py).
+
+Offline, the landing burn is solved from every point of a grid of altitude, vertical
+speed and mass with the convex powered-descent solver (powered_descent.py, free final
+time, no drag). The vehicle is the one the controller flies, read from the JSBSim
+model (aircraft/Falcon9Booster): dry and full mass, number of engines, and the
+sea-level thrust, Isp and minimum throttle of their engine file. The grid covers the
+altitudes below which the controller's altitude brackets start thrusting (25000 ft).
+The first control of each optimal trajectory is the optimal feedback
+for that state, so the grid of first controls is a guidance policy: throttle and
+thrust angle as functions of (h, vh, mass). States the solver cannot land from get
+full throttle. The grid is written as float32 arrays to a compressed .npz.
+
+Online, GuidanceTable.lookup() interpolates the policy multilinearly. It clamps to
+the table edges; contains() tells whether a state is inside the axes at all, and
+Falcon9Controller uses its altitude brackets for states that are not. The axes are
+uniform, so finding the cell is index arithmetic and every lookup touches the same
+2**3 corners whatever the table size; the scalar path is plain Python floats for the
+per-step controller call, lookup_many() is the NumPy version for arrays of states.
+
+    python guidance_table.py --h 0 7620 33 --vh -450 20 48 --mass 25401 102965 7 --workers 8
+    table = GuidanceTable.load('landing_guidance.npz')
+    throttle, gimbal_alpha, feasible = table.lookup(h, vh, mass)
+"""
+import argparse
+import itertools
+import os
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+DEFAULT_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'landing_guidance.npz')
+AIRCRAFT_XML = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'aircraft', 'Falcon9Booster',
+                            'Falcon9Booster.xml')
+
+# Table axes (SI: m, m/s, kg) and the policy fields stored at every grid point
+AXIS_NAMES = ('h', 'vh', 'mass')
+FIELD_NAMES = ('throttle', 'gimbal_alpha', 'feasible')
+
+# JSBSim reports feet, ft/s and pounds
+FT_TO_M = 0.3048
+LBS_TO_KG = 0.45359237
+_MASS_UNITS = {'LBS': LBS_TO_KG, 'KG': 1.0}
+
+
+def jsbsim_vehicle(path=AIRCRAFT_XML):
+    """
+    The vehicle of a JSBSim model: name, empty, dry (plus the tanks no engine feeds,
+    e.g. RCS) and full mass in kg, the engine file and the number of engines
+    """
+    root = ET.parse(path).getroot()
+
+    def mass(element):
+        return float(element.text) * _MASS_UNITS[element.get('unit', 'LBS').upper()]
+
+    empty = mass(root.find('mass_balance/emptywt'))
+    tanks = {int(tank.get('number', i)): mass(tank.find('capacity'))
+             for i, tank in enumerate(root.iter('tank'))}
+    engines = root.findall('propulsion/engine')
+    fed = {int(feed.text) for engine in engines for feed in engine.findall('feed')}
+    return {'name': root.get('name'), 'empty_mass': empty,
+            'dry_mass': empty + sum(c for number, c in tanks.items() if number not in fed),
+            'full_mass': empty + sum(tanks.values()),
+            'engine': engines[0].find('file').text, 'num_engines': len(engines)}
+
+
+JSBSIM_VEHICLE = jsbsim_vehicle()
+
+# Default grid: the terminal burn of the JSBSim booster, from where the altitude
+# brackets of Falcon9Controller start thrusting (25000 ft) down to touchdown, over
+# its whole mass range
+DEFAULT_AXES = {'h': (0.0, 25000.0 * FT_TO_M, 33), 'vh': (-450.0, 20.0, 48),
+                'mass': (JSBSIM_VEHICLE['empty_mass'], JSBSIM_VEHICLE['full_mass'], 7)}
+
+
+def jsbsim_solver(num_nodes=30, vehicle=None):
+    """
+    Convex powered-descent solver for the JSBSim vehicle: sea-level thrust and Isp of
+    all its engines, throttle between the engine's minimum and full, and its dry mass
+    as the lower mass bound
+    """
+    from FalconLandingODE import LANDING_GIMBAL_LIMIT
+    from powered_descent import PoweredDescent
+    from propulsion import load_engine
+
+    vehicle = vehicle or JSBSIM_VEHICLE
+    engine = load_engine(vehicle['engine'])
+    max_thrust, isp = engine.sea_level()
+    return PoweredDescent(max_thrust * vehicle['num_engines'], isp, throttle_bounds=(engine.min_throttle, 1.0),
+                          gimbal_limit=LANDING_GIMBAL_LIMIT, min_mass=vehicle['dry_mass'], num_nodes=num_nodes)
+
+
+class GuidanceTable:
+    """
+    Policy fields on a uniform grid. axes: {name: (start, stop, num)} in AXIS_NAMES
+    order; values: (n_h, n_vh, n_mass, len(fields)) array; vehicle: name of the JSBSim
+    model the policy was solved for.
+    """
+
+    def __init__(self, axes, values, fields=FIELD_NAMES, vehicle=None):
+        self.axes = {name: (float(start), float(stop), int(num)) for name, (start, stop, num) in axes.items()}
+        self.fields = tuple(fields)
+        self.vehicle = vehicle
+        self.values = np.asarray(values, dtype=np.float32)
+        shape = tuple(num for _, _, num in self.axes.values()) + (len(self.fields),)
+        if self.values.shape != shape:
+            raise ValueError(f"values have shape {self.values.shape}, axes and fields need {shape}")
+        if any(num < 2 for _, _, num in self.axes.values()):
+            raise ValueError("every axis needs at least 2 points")
+
+        # (start, 1/step, last cell, stride) per axis and the flat offsets of the 2**d cell corners,
+        # so a lookup is index arithmetic on a flat list of Python floats
+        nf = len(self.fields)
+        strides = [int(np.prod(shape[i + 1:-1], dtype=int)) * nf for i in range(len(self.axes))]
+        self._axes = [(start, (num - 1) / (stop - start), num - 2, stride)
+                      for (start, stop, num), stride in zip(self.axes.values(), strides)]
+        self._corners = [(sum(bit * stride for bit, stride in zip(bits, strides)), bits)
+                         for bits in itertools.product((0, 1), repeat=len(self.axes))]
+        self._flat = self.values.ravel().astype(float).tolist()
+
+    def grid(self, name):
+        start, stop, num = self.axes[name]
+        return np.linspace(start, stop, num)
+
+    def contains(self, *point):
+        """Whether a point (AXIS_NAMES order) lies within the table axes"""
+        return all(start <= value <= stop for value, (start, stop, _) in zip(point, self.axes.values()))
+
+    def lookup(self, *point):
+        """Interpolated fields at one point (AXIS_NAMES order), clamped to the table edges"""
+        base, fractions = 0, []
+        for value, (start, inv_step, last, stride) in zip(point, self._axes):
+            u = (value - start) * inv_step
+            if u <= 0.0:
+                i, f = 0, 0.0
+            elif u >= last + 1:
+                i, f = last, 1.0
+            else:
+                i = int(u)
+                f = u - i
+            base += i * stride
+            fractions.append(f)
+
+        out = [0.0] * len(self.fields)
+        flat = self._flat
+        for offset, bits in self._corners:
+            w = 1.0
+            for bit, f in zip(bits, fractions):
+                w *= f if bit else 1.0 - f
+            if w:
+                index = base + offset
+                for k in range(len(out)):
+                    out[k] += w * flat[index + k]
+        return tuple(out)
+
+    def lookup_many(self, points):
+        """lookup() for an (n, len(AXIS_NAMES)) array of points; returns (n, len(fields))"""
+        points = np.atleast_2d(np.asarray(points, dtype=float))
+        index, fractions = [], []
+        for column, (start, inv_step, last, _) in zip(points.T, self._axes):
+            u = np.clip((column - start) * inv_step, 0.0, last + 1.0)
+            i = np.minimum(u.astype(int), last)
+            index.append(i)
+            fractions.append(u - i)
+
+        out = np.zeros((len(points), len(self.fields)))
+        for _, bits in self._corners:
+            w = np.ones(len(points))
+            for bit, f in zip(bits, fractions):
+                w *= f if bit else 1.0 - f
+            out += w[:, None] * self.values[tuple(i + bit for i, bit in zip(index, bits))]
+        return out
+
+    def save(self, path):
+        """Compressed .npz: float32 values plus the axis definitions"""
+        np.savez_compressed(path, values=self.values, fields=np.array(self.fields),
+                            axis_names=np.array(list(self.axes)), vehicle=np.array(self.vehicle or ''),
+                            axes=np.array([[start, stop, num] for start, stop, num in self.axes.values()]))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as f:
+            axes = {str(name): (start, stop, int(num)) for name, (start, stop, num) in zip(f['axis_names'], f['axes'])}
+            # Tables from before the vehicle was recorded were solved for FalconLandingODE
+            vehicle = str(f['vehicle']) if 'vehicle' in f.files else ''
+            return cls(axes, f['values'], fields=[str(name) for name in f['fields']], vehicle=vehicle or None)
+
+
+# --- Offline pipeline: solve the landing from every grid point on a process pool ---
+_worker = {}
+
+
+def _init_worker(num_nodes, duration_bounds, horizontal):
+    from FalconLandingODE import LANDING_FINAL
+
+    _worker.update(solver=jsbsim_solver(num_nodes), final=LANDING_FINAL,
+                   duration_bounds=duration_bounds, horizontal=horizontal)
+
+
+def _solve_slab(i, h, vh_grid, mass_grid):
+    """Policy at every (vh, mass) for one altitude; returns (i, (n_vh, n_mass, fields) array)"""
+    solver, final = _worker['solver'], _worker['final']
+    slab = np.zeros((len(vh_grid), len(mass_grid), len(FIELD_NAMES)))
+    for j, vh in enumerate(vh_grid):
+        for k, mass in enumerate(mass_grid):
+            initial = {**_worker['horizontal'], 'h': h, 'vh': vh, 'mass': mass}
+            sol = solver.optimize(initial, final, _worker['duration_bounds'])
+            if sol['converged']:
+                slab[j, k] = (sol['throttle'][0], sol['gimbal_alpha'][0], 1.0)
+            else:
+                slab[j, k] = (1.0, 0.0, 0.0)  # cannot land from here: brake as hard as possible
+    return i, slab
+
+
+def build_table(axes=None, workers=None, num_nodes=30, duration_bounds=(1.0, 90.0), x=0.0, vx=0.0):
+    """
+    Solve the landing of the JSBSim vehicle from every grid point of axes
+    ({name: (start, stop, num)}, defaults DEFAULT_AXES) and return the GuidanceTable. x, vx: the horizontal state, held fixed
+    (x relative to the target).
+    """
+    from FalconLandingODE import LANDING_FINAL
+
+    axes = {**DEFAULT_AXES, **(axes or {})}
+    table = GuidanceTable(axes, np.zeros(tuple(num for _, _, num in axes.values()) + (len(FIELD_NAMES),)))
+    h_grid, vh_grid, mass_grid = (table.grid(name) for name in AXIS_NAMES)
+    horizontal = {'x': LANDING_FINAL['x'] + x, 'vx': vx}
+
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(num_nodes, tuple(duration_bounds), horizontal)) as pool:
+        futures = [pool.submit(_solve_slab, i, h, vh_grid, mass_grid) for i, h in enumerate(h_grid)]
+        for done, future in enumerate(as_completed(futures), start=1):
+            i, slab = future.result()
+            table.values[i] = slab
+            print(f"{done}/{len(h_grid)} altitudes ({time.perf_counter() - t0:.1f} s)")
+    return GuidanceTable(axes, table.values, vehicle=JSBSIM_VEHICLE['name'])
+
+
+def check_table(table, samples=50, seed=0, num_nodes=30, duration_bounds=(1.0, 90.0), x=0.0, vx=0.0):
+    """Throttle error of the interpolated policy against direct solves at random off-grid states"""
+    from FalconLandingODE import LANDING_FINAL
+
+    rng = np.random.default_rng(seed)
+    points = np.column_stack([rng.uniform(start, stop, samples) for start, stop, _ in table.axes.values()])
+    solver = jsbsim_solver(num_nodes)
+    errors = []
+    for point in points:
+        sol = solver.optimize({'x': LANDING_FINAL['x'] + x, 'vx': vx, **dict(zip(AXIS_NAMES, point))},
+                              LANDING_FINAL, duration_bounds)
+        if sol['converged']:
+            errors.append(abs(table.lookup(*point)[0] - sol['throttle'][0]))
+    return np.array(errors)
+
+
+def print_report(table, errors, path):
+    n = table.values[..., 0].size
+    feasible = int(np.sum(table.values[..., FIELD_NAMES.index('feasible')] > 0.5))
+    print("="*60)
+    print(f"Landing guidance table for {table.vehicle}: {path} ({os.path.getsize(path) / 1024:.1f} KiB)")
+    print("="*60)
+    for name, (start, stop, num) in table.axes.items():
+        print(f"{name:>5}: {start:>9.1f} .. {stop:>9.1f}  ({num} points)")
+    print(f"Feasible grid points: {feasible}/{n}")
+
+    point = [0.5 * (start + stop) for start, stop, _ in table.axes.values()]
+    calls = 100000
+    t0 = time.perf_counter()
+    for _ in range(calls):
+        table.lookup(*point)
+    print(f"Lookup: {(time.perf_counter() - t0) / calls * 1e6:.2f} us per call")
+    if len(errors):
+        print(f"Throttle error vs direct solve ({len(errors)} random states): "
+              f"mean={errors.mean():.3f}  95%={np.percentile(errors, 95):.3f}  max={errors.max():.3f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build the landing guidance lookup table for the JSBSim controller')
+    for name in AXIS_NAMES:
+        start, stop, num = DEFAULT_AXES[name]
+        parser.add_argument(f'--{name}', type=float, nargs=3, metavar=('START', 'STOP', 'NUM'),
+                            default=[start, stop, num], help=f'{name} grid (SI units)')
+    parser.add_argument('--x', type=float, default=0.0, help='Fixed horizontal offset from the target (m)')
+    parser.add_argument('--vx', type=float, default=0.0, help='Fixed horizontal velocity (m/s)')
+    parser.add_argument('--nodes', type=int, default=30, help='Convex solver control intervals')
+    parser.add_argument('--duration-bounds', type=float, nargs=2, default=[1.0, 90.0])
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--check', type=int, default=50, help='Random states to check the table against')
+    parser.add_argument('--out', default=DEFAULT_TABLE_PATH)
+    args = parser.parse_args()
+
+    axes = {name: (start, stop, int(num)) for name, (start, stop, num) in
+            ((name, getattr(args, name)) for name in AXIS_NAMES)}
+    table = build_table(axes, workers=args.workers, num_nodes=args.nodes, duration_bounds=args.duration_bounds,
+                        x=args.x, vx=args.vx)
+    table.save(args.out)
+    errors = check_table(table, samples=args.check, num_nodes=args.nodes, duration_bounds=args.duration_bounds,
+                         x=args.x, vx=args.vx)
+    print_report(table, errors, args.out)
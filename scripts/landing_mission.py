@@ -0,0 +1,194 @@
+"""
+Multi-phase Falcon 9 return: coast, entry burn, descent and landing burn as separate
+Dymos phases of one trajectory, linked in time and state.
+
+FalconLandingODE.py flies the whole return as a single phase with one engine count.
+Here every arc has its own ODE options (three engines for the entry burn, one for the
+landing burn, none while coasting) and its own transcription density. Unpowered
+phases hold throttle and gimbal as fixed parameters instead of free controls.
+
+The phases sit in the trajectory's ParallelGroup (dm.Trajectory(parallel_phases=True)),
+so under MPI each phase's ODE evaluation and linearization runs on its own
+processes. Without MPI, or with --serial, the phases run one after the other in a
+plain Group. --benchmark N runs N optimizer iterations from the initial guess and
+reports the wall time per iteration, split into model and derivative evaluations:
+
+    python landing_mission.py                                  # optimize
+    python landing_mission.py --benchmark 20 --serial
+    mpirun -n 4 python landing_mission.py --benchmark 20       # one phase per process
+"""
+import argparse
+import os
+
+import numpy as np
+import openmdao.api as om
+import dymos as dm
+from openmdao.utils.mpi import MPI
+
+from coloring_cache import save_coloring, use_cached_coloring
+from propulsion import load_engine
+from FalconLandingODE import (LANDING_FINAL, LANDING_INITIAL, LANDING_ODE_KWARGS, FalconLandingODE,
+                              add_landing_controls, add_landing_states, configure_driver)
+
+# Mission arcs in flight order. num_engines=0 is an unpowered arc; duration is the initial guess
+MISSION_PHASES = [
+    {'name': 'coast', 'num_engines': 0, 'num_segments': 8, 'order': 3,
+     'duration_bounds': (5.0, 200.0), 'duration': 40.0},
+    {'name': 'entry_burn', 'num_engines': 3, 'num_segments': 10, 'order': 3,
+     'duration_bounds': (5.0, 60.0), 'duration': 20.0},
+    {'name': 'descent', 'num_engines': 0, 'num_segments': 12, 'order': 3,
+     'duration_bounds': (5.0, 300.0), 'duration': 60.0},
+    {'name': 'landing_burn', 'num_engines': 1, 'num_segments': 15, 'order': 3,
+     'duration_bounds': (5.0, 90.0), 'duration': 30.0},
+]
+
+def build_mission_problem(phases=MISSION_PHASES, ode_init_kwargs=None, optimizer='IPOPT', print_level=5,
+                          parallel=True, check=True, name=None):
+    """
+    Set up the multi-phase landing (trajectory 'traj', one phase per entry of phases).
+    Returns (p, {phase name: phase}); initial values still have to be set
+    (set_mission_guess).
+    """
+    p = om.Problem(model=om.Group(), name=name)
+    configure_driver(p, optimizer, print_level)
+
+    traj = dm.Trajectory(parallel_phases=parallel)
+    p.model.add_subsystem('traj', traj)
+
+    ode_kwargs = {**LANDING_ODE_KWARGS, **(ode_init_kwargs or {})}
+    # Engines stay lit through a powered arc, so its throttle cannot go below the engine's minimum
+    min_throttle = load_engine(ode_kwargs['engine']).min_throttle if ode_kwargs.get('engine') else 0.0
+
+    dymos_phases = {}
+    for i, spec in enumerate(phases):
+        first, last = i == 0, i == len(phases) - 1
+        powered = spec['num_engines'] > 0
+        tx = dm.GaussLobatto(num_segments=spec['num_segments'], order=spec['order'], compressed=True)
+        phase = dm.Phase(ode_class=FalconLandingODE, transcription=tx,
+                         ode_init_kwargs={**ode_kwargs, 'num_engines': spec['num_engines']})
+        traj.add_phase(spec['name'], phase)
+
+        time_options = {} if first else {'initial_bounds': (0.0, 1000.0), 'initial_ref': 100.0}
+        phase.set_time_options(fix_initial=first, duration_bounds=spec['duration_bounds'], units='s',
+                               duration_ref=100.0, **time_options)
+        add_landing_states(phase, fix_initial=first, fix_final=last)
+        if powered:
+            add_landing_controls(phase, throttle_bounds=(min_throttle, 1.0))
+        else:
+            for control in ('throttle', 'gimbal_alpha', 'gimbal_beta'):
+                phase.add_parameter(control, val=0.0, opt=False, static_target=False,
+                                    units=None if control == 'throttle' else 'rad')
+        dymos_phases[spec['name']] = phase
+
+    # Continuous time and states from one arc to the next (linkage constraints, so the
+    # phases stay independent for parallel evaluation)
+    traj.link_phases([spec['name'] for spec in phases], vars=['*'])
+
+    landing = dymos_phases[phases[-1]['name']]
+    landing.add_objective('mass', loc='final', scaler=-1.0/70000.0)
+    landing.add_boundary_constraint('x', loc='final', equals=0, units='m', scaler=1.0/200000.0)
+
+    p.setup(check=check, force_alloc_complex=True)
+    return p, dymos_phases
+
+
+def set_mission_guess(p, dymos_phases, phases=MISSION_PHASES, initial=None, final=None):
+    """
+    Linear guess from the entry to the touchdown conditions over the whole mission,
+    split at the guessed phase durations. Mass only drops in the powered arcs.
+    """
+    initial = {**LANDING_INITIAL, **(initial or {})}
+    final = {**LANDING_FINAL, **(final or {})}
+    durations = np.array([spec['duration'] for spec in phases])
+    bounds = np.concatenate([[0.0], np.cumsum(durations)])
+    frac = bounds / bounds[-1]
+
+    burn = np.array([spec['duration'] if spec['num_engines'] > 0 else 0.0 for spec in phases])
+    mass_frac = np.concatenate([[0.0], np.cumsum(burn)]) / burn.sum()
+    final_mass = 0.5 * initial['mass']
+
+    for i, spec in enumerate(phases):
+        path, phase = f"traj.{spec['name']}", dymos_phases[spec['name']]
+        p.set_val(f"{path}.t_initial", bounds[i])
+        p.set_val(f"{path}.t_duration", durations[i])
+        for state in ('x', 'h', 'vx', 'vh'):
+            ys = [initial[state] + (final[state] - initial[state]) * f for f in frac[i:i + 2]]
+            p.set_val(f"{path}.states:{state}", phase.interp(ys=ys, nodes='state_input'))
+        ys = [initial['mass'] + (final_mass - initial['mass']) * f for f in mass_frac[i:i + 2]]
+        p.set_val(f"{path}.states:mass", phase.interp(ys=ys, nodes='state_input'))
+        if spec['num_engines'] > 0:
+            p.set_val(f"{path}.controls:throttle", phase.interp(ys=[0.8, 0.8], nodes='control_input'))
+            p.set_val(f"{path}.controls:gimbal_alpha", phase.interp(ys=[0.0, 0.0], nodes='control_input'))
+            p.set_val(f"{path}.controls:gimbal_beta", phase.interp(ys=[0.0, 0.0], nodes='control_input'))
+
+
+def set_max_iterations(p, iterations):
+    if 'maxiter' in p.driver.options:
+        p.driver.options['maxiter'] = iterations  # ScipyOptimizeDriver
+    else:
+        p.driver.opt_settings['max_iter'] = iterations  # IPOPT
+
+
+def time_iterations(p, dymos_phases, iterations=20):
+    """
+    Run the driver for a fixed number of iterations from the initial guess and return
+    its DriverResult (runtime, model_time, deriv_time and their counts). The total
+    coloring is computed or loaded by a one-iteration run first, so it is not timed.
+    """
+    key = use_cached_coloring(p)
+    set_max_iterations(p, 1)
+    p.run_driver()
+    if not MPI or MPI.COMM_WORLD.rank == 0:
+        save_coloring(p, key)
+
+    set_mission_guess(p, dymos_phases)
+    set_max_iterations(p, iterations)
+    return p.run_driver()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Multi-phase Falcon 9 landing trajectory')
+    parser.add_argument('--serial', action='store_true', help='Phases in a plain Group instead of a ParallelGroup')
+    parser.add_argument('--benchmark', type=int, default=0, metavar='N',
+                        help='Time N optimizer iterations instead of optimizing')
+    parser.add_argument('--optimizer', default='IPOPT')
+    args = parser.parse_args()
+
+    rank = MPI.COMM_WORLD.rank if MPI else 0
+    procs = MPI.COMM_WORLD.size if MPI else 1
+    if args.benchmark:
+        os.environ['OPENMDAO_REPORTS'] = '0'
+
+    p, dymos_phases = build_mission_problem(optimizer=args.optimizer, parallel=not args.serial,
+                                            check=not args.benchmark, name='landing_mission',
+                                            print_level=0 if args.benchmark else 5)
+    set_mission_guess(p, dymos_phases)
+
+    if args.benchmark:
+        for option in ('disp', 'print_results'):
+            if option in p.driver.options:
+                p.driver.options[option] = False
+        result = time_iterations(p, dymos_phases, args.benchmark)
+        if rank == 0:
+            nodes = sum(spec['num_segments'] * spec['order'] for spec in MISSION_PHASES)
+            iterations = max(result.iter_count, 1)
+            print("="*60)
+            print(f"Multi-phase landing: {len(MISSION_PHASES)} phases, {nodes} nodes, "
+                  f"{'Group' if args.serial else 'ParallelGroup'} on {procs} process(es)")
+            print("="*60)
+            print(f"{result.iter_count} iterations in {result.runtime:.2f} s: "
+                  f"{result.runtime / iterations * 1e3:.1f} ms per iteration")
+            print(f"Model evaluations:      {result.model_evals:4d} x {result.model_time / max(result.model_evals, 1) * 1e3:7.2f} ms")
+            print(f"Derivative evaluations: {result.deriv_evals:4d} x {result.deriv_time / max(result.deriv_evals, 1) * 1e3:7.2f} ms")
+    else:
+        coloring_key = use_cached_coloring(p)
+        result = dm.run_problem(p)
+        if rank == 0:
+            save_coloring(p, coloring_key)
+            print(f"\nConverged: {result.success}")
+            for spec in MISSION_PHASES:
+                path = f"traj.{spec['name']}.timeseries"
+                t = p.get_val(f"{path}.time")
+                mass = p.get_val(f"{path}.mass")
+                print(f"{spec['name']:<14} t={t[0, 0]:7.1f}..{t[-1, 0]:7.1f} s  "
+                      f"h={p.get_val(f'{path}.h')[-1, 0]:9.1f} m  mass={mass[0, 0]:8.1f} -> {mass[-1, 0]:8.1f} kg")
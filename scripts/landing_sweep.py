@@ -0,0 +1,182 @@
+"""
+Parameter sweep of the fuel-optimal landing (FalconLandingODE.py) over a grid of
+entry conditions.
+
+Every worker process builds and sets up the landing problem once (pool initializer),
+then solves its share of the grid on that same Problem: for each point it writes the
+new entry conditions and initial guess into the existing model and re-runs the
+driver. Setup, the total coloring and the ODE allocation are paid once per worker
+instead of once per point. Nothing is plotted and matplotlib is never imported.
+Per-point results (final mass, duration, convergence, the exception of a point that
+raised) stream into a CSV as points complete.
+
+    python landing_sweep.py --h 60000 70000 80000 --vx 5000 6000 --mass 60000 70000 \\
+        --workers 4 --segments 20 --out sweep_out
+"""
+import argparse
+import csv
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+# Swept entry conditions; anything not swept keeps its FalconLandingODE.LANDING_INITIAL value
+SWEEP_NAMES = ('x', 'h', 'vx', 'vh', 'mass')
+
+RESULT_COLUMNS = ['point_id', 'x', 'h', 'vx', 'vh', 'mass', 'converged', 'final_mass',
+                  'propellant_used', 'duration', 'iterations', 'wall_time_s', 'error']
+
+
+def sweep_points(grid):
+    """Cartesian product of {name: values}; returns [{'point_id': i, name: value}]"""
+    names = [name for name in SWEEP_NAMES if name in grid]
+    unknown = set(grid) - set(SWEEP_NAMES)
+    if unknown:
+        raise ValueError(f"Cannot sweep {', '.join(sorted(unknown))}; sweepable: {', '.join(SWEEP_NAMES)}")
+    return [{'point_id': i, **dict(zip(names, map(float, values)))}
+            for i, values in enumerate(itertools.product(*(grid[name] for name in names)))]
+
+
+def failed_result(point, error, wall_time=float('nan')):
+    """Result row of a point that could not be solved; error says why"""
+    nan = float('nan')
+    return {**point, 'converged': False, 'final_mass': nan, 'propellant_used': nan,
+            'duration': nan, 'iterations': 0, 'wall_time_s': wall_time, 'error': error}
+
+
+# --- Worker process state: one set-up landing problem per process, built by the pool initializer ---
+_worker = {}
+
+
+def _init_worker(num_segments, order, optimizer, warm_start, output_dir):
+    os.environ['OPENMDAO_REPORTS'] = '0'  # no per-run report pages in batch mode
+    os.chdir(output_dir)  # each worker's problem output directory lands next to the results
+    from coloring_cache import use_cached_coloring
+    from FalconLandingODE import build_landing_problem, set_landing_guess
+
+    p, phase = build_landing_problem(num_segments=num_segments, order=order, optimizer=optimizer,
+                                     print_level=0, check=False, name=f"landing_sweep_{os.getpid()}")
+    for option in ('disp', 'print_results'):
+        if option in p.driver.options:
+            p.driver.options[option] = False
+    set_landing_guess(p, phase)
+    _worker.update(p=p, phase=phase, coloring_key=use_cached_coloring(p), coloring_saved=False,
+                   solution_db=None)
+    if warm_start:
+        from warm_start import SolutionDatabase
+        _worker['solution_db'] = SolutionDatabase()
+
+
+def _solve_point(point):
+    from coloring_cache import save_coloring
+    from FalconLandingODE import set_landing_guess
+    from warm_start import landing_boundary
+
+    p, phase = _worker['p'], _worker['phase']
+    initial = {name: point[name] for name in SWEEP_NAMES if name in point}
+
+    t0 = time.perf_counter()
+    try:
+        # Every point starts from the same kind of guess, so results do not depend on
+        # which worker solved which points before
+        solution_db = _worker['solution_db']
+        if solution_db is None or not solution_db.seed(p, phase, landing_boundary(initial)):
+            set_landing_guess(p, phase, initial)
+        result = p.run_driver()
+    except Exception as exc:
+        return failed_result(point, repr(exc), time.perf_counter() - t0)
+    wall_time = time.perf_counter() - t0
+
+    if not _worker['coloring_saved']:
+        _worker['coloring_saved'] = save_coloring(p, _worker['coloring_key']) is not None
+
+    mass = p.get_val('traj.phase0.timeseries.mass')
+    return {
+        **point,
+        'converged': bool(result.success),
+        'final_mass': float(mass[-1, 0]),
+        'propellant_used': float(mass[0, 0] - mass[-1, 0]),
+        'duration': float(p.get_val('traj.phase0.t_duration')[0]),
+        'iterations': int(result.iter_count),
+        'wall_time_s': wall_time,
+        'error': '',
+    }
+
+
+def run_sweep(grid, workers=None, num_segments=20, order=3, optimizer='IPOPT', warm_start=False,
+              output_dir='sweep_out'):
+    """
+    Solve the landing problem at every point of grid ({name: values} over SWEEP_NAMES).
+    Writes points.csv and results.csv (streamed) to output_dir; returns the result
+    rows ordered by point_id.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    points = sweep_points(grid)
+
+    with open(os.path.join(output_dir, 'points.csv'), 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(points[0]))
+        writer.writeheader()
+        writer.writerows(points)
+
+    rows = []
+    t0 = time.perf_counter()
+    with open(os.path.join(output_dir, 'results.csv'), 'w', newline='') as f, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                initargs=(num_segments, order, optimizer, warm_start,
+                                          os.path.abspath(output_dir))) as pool:
+        writer = csv.DictWriter(f, fieldnames=RESULT_COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        futures = {pool.submit(_solve_point, point): point for point in points}
+        for done, future in enumerate(as_completed(futures), start=1):
+            try:
+                row = future.result()
+            except BrokenProcessPool as exc:
+                row = failed_result(futures[future], repr(exc))
+            writer.writerow(row)
+            f.flush()
+            rows.append(row)
+            elapsed = time.perf_counter() - t0
+            status = 'converged' if row['converged'] else 'FAILED' + (f": {row['error']}" if row['error'] else '')
+            print(f"{done}/{len(points)} points ({elapsed:.1f} s, {status})")
+
+    rows.sort(key=lambda r: r['point_id'])
+    return rows
+
+
+def print_report(rows, columns=SWEEP_NAMES):
+    swept = [name for name in columns if name in rows[0]]
+    converged = sum(r['converged'] for r in rows)
+    print("="*60)
+    print(f"Landing sweep results ({converged}/{len(rows)} converged)")
+    print("="*60)
+    print(' '.join(f"{name:>9}" for name in swept) + f" {'conv':>5} {'m_final':>9} {'duration':>9} {'iters':>6} {'wall_s':>7}")
+    for r in rows:
+        print(' '.join(f"{r[name]:>9.0f}" for name in swept)
+              + f" {'yes' if r['converged'] else 'no':>5} {r['final_mass']:>9.1f} {r['duration']:>9.2f}"
+              f" {r['iterations']:>6d} {r['wall_time_s']:>7.2f}")
+    wall = np.array([r['wall_time_s'] for r in rows], dtype=float)
+    if np.isfinite(wall).any():
+        print(f"Solve time per point (s): mean={np.nanmean(wall):.2f}  max={np.nanmax(wall):.2f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Sweep the Falcon 9 landing optimization over entry conditions')
+    for name in SWEEP_NAMES:
+        parser.add_argument(f'--{name}', type=float, nargs='+', help=f'Entry {name} values')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--segments', type=int, default=20)
+    parser.add_argument('--order', type=int, default=3)
+    parser.add_argument('--optimizer', default='IPOPT')
+    parser.add_argument('--warm-start', action='store_true', help='Seed points from the warm-start database')
+    parser.add_argument('--out', default='sweep_out')
+    args = parser.parse_args()
+
+    grid = {name: getattr(args, name) for name in SWEEP_NAMES if getattr(args, name)}
+    if not grid:
+        parser.error('give at least one of ' + ', '.join(f'--{name}' for name in SWEEP_NAMES))
+    rows = run_sweep(grid, workers=args.workers, num_segments=args.segments, order=args.order,
+                     optimizer=args.optimizer, warm_start=args.warm_start, output_dir=args.out)
+    print_report(rows)
@@ -0,0 +1,512 @@
+"""
+Convex powered-descent guidance (lossless convexification) for the landing burn.
+
+The landing problem of FalconLandingODE.py without aerodynamic drag, solved as a
+second-order cone program (SOCP) instead of a nonlinear transcription. With the
+change of variables z = ln(m), u = T/m, sigma = Gamma/m (Acikmese & Ploen), the
+dynamics are linear and the thrust magnitude bounds become convex:
+
+    r'' = u + g,   z' = -sigma / (Isp g0)
+    ||u|| <= sigma                                  (lossless relaxation of ||T|| = Gamma)
+    u_h >= cos(gimbal_limit) sigma                  (thrust within gimbal_limit of vertical)
+    rho1 e^-z0 (1 - dz + dz**2/2) <= sigma <= rho2 e^-z0 (1 - dz)     (dz = z - z0(t))
+
+and minimizing propellant is maximizing z(tf), a linear objective. The controls are
+held constant over each of num_nodes intervals; the states are then exact affine
+functions of the controls, so the SOCP has only the 3 * num_nodes control variables.
+
+solve_socp() is a self-contained primal-dual interior-point method (Nesterov-Todd
+scaling, Mehrotra predictor-corrector) for the linear and 3-dimensional second-order
+cones that appear here. A solve takes 10-15 iterations of about a millisecond each.
+It can be warm-started from a previous solution, but on the landing SOCPs that saves
+only a few iterations away from the shortest feasible flight time and fails near it,
+where the fuel optimum lies; PoweredDescent.optimize() therefore solves every flight
+time cold.
+
+    solver = PoweredDescent.from_landing_ode()
+    sol = solver.optimize(initial, final, duration_bounds=(5.0, 60.0))
+    sol['final_mass'], sol['duration'], sol['throttle'], sol['gimbal_alpha']
+"""
+import numpy as np
+from scipy.linalg import lu_factor, lu_solve
+
+G0 = 9.80665  # m/s**2, for Isp
+
+_SOC_DIM = 3
+_J = np.array([1.0, -1.0, -1.0])
+_JMAT = np.diag(_J)
+
+
+# === Second-order cone program solver ===
+
+def _min_eig(v, l):
+    """Smallest cone 'eigenvalue' of v: min of the linear part and of u0 - ||u1|| per cone"""
+    soc = v[l:].reshape(-1, _SOC_DIM)
+    eig = np.concatenate([v[:l], soc[:, 0] - np.linalg.norm(soc[:, 1:], axis=1)])
+    return eig.min() if eig.size else np.inf
+
+
+def _shift_interior(v, l, margin):
+    """v + t e with t making the smallest eigenvalue at least margin"""
+    t = margin - _min_eig(v, l)
+    if t <= 0.0:
+        return v
+    v = v.copy()
+    v[:l] += t
+    v[l::_SOC_DIM] += t
+    return v
+
+
+def _max_step(v, dv, l):
+    """Largest step a (possibly inf) with v + a dv still in the cone"""
+    step = np.inf
+    lin, dlin = v[:l], dv[:l]
+    neg = dlin < 0.0
+    if neg.any():
+        step = np.min(-lin[neg] / dlin[neg])
+
+    u, du = v[l:].reshape(-1, _SOC_DIM), dv[l:].reshape(-1, _SOC_DIM)
+    if len(u):
+        # (u0 + a du0)**2 - ||u1 + a du1||**2 = qa a**2 + qb a + qc, with qc > 0: first positive root
+        qa = du[:, 0]**2 - np.sum(du[:, 1:]**2, axis=1)
+        qb = 2.0 * (u[:, 0] * du[:, 0] - np.sum(u[:, 1:] * du[:, 1:], axis=1))
+        qc = u[:, 0]**2 - np.sum(u[:, 1:]**2, axis=1)
+        disc = qb * qb - 4.0 * qa * qc
+        with np.errstate(divide='ignore', invalid='ignore'):
+            root = np.sqrt(np.maximum(disc, 0.0))
+            qq = -0.5 * (qb + np.where(qb >= 0.0, root, -root))
+            roots = np.stack([qq / qa, qc / qq])
+        roots = np.where((roots > 0.0) & np.isfinite(roots) & (disc >= 0.0), roots, np.inf)
+        step = min(step, roots.min())
+    return step
+
+
+def _jprod(u, v, l):
+    """Jordan product u o v"""
+    out = np.empty_like(u)
+    out[:l] = u[:l] * v[:l]
+    uq, vq, oq = u[l:].reshape(-1, _SOC_DIM), v[l:].reshape(-1, _SOC_DIM), out[l:].reshape(-1, _SOC_DIM)
+    oq[:, 0] = np.sum(uq * vq, axis=1)
+    oq[:, 1:] = uq[:, :1] * vq[:, 1:] + vq[:, :1] * uq[:, 1:]
+    return out
+
+
+def _jdiv(lam, d, l):
+    """x with lam o x = d"""
+    out = np.empty_like(d)
+    out[:l] = d[:l] / lam[:l]
+    lq, dq, oq = lam[l:].reshape(-1, _SOC_DIM), d[l:].reshape(-1, _SOC_DIM), out[l:].reshape(-1, _SOC_DIM)
+    det = lq[:, 0]**2 - np.sum(lq[:, 1:]**2, axis=1)
+    oq[:, 0] = (lq[:, 0] * dq[:, 0] - np.sum(lq[:, 1:] * dq[:, 1:], axis=1)) / det
+    oq[:, 1:] = (dq[:, 1:] - oq[:, :1] * lq[:, 1:]) / lq[:, :1]
+    return out
+
+
+def _identity(m, l):
+    e = np.zeros(m)
+    e[:l] = 1.0
+    e[l::_SOC_DIM] = 1.0
+    return e
+
+
+class _NTScaling:
+    """Nesterov-Todd scaling W (symmetric) with W z = W^-1 s = lam"""
+
+    def __init__(self, s, z, l):
+        self.l = l
+        self.w = np.sqrt(s[:l] / z[:l])
+        S, Z = s[l:].reshape(-1, _SOC_DIM), z[l:].reshape(-1, _SOC_DIM)
+        s_det = np.maximum(S[:, 0]**2 - np.sum(S[:, 1:]**2, axis=1), 1e-300)
+        z_det = np.maximum(Z[:, 0]**2 - np.sum(Z[:, 1:]**2, axis=1), 1e-300)
+        sn, zn = S / np.sqrt(s_det)[:, None], Z / np.sqrt(z_det)[:, None]
+        gamma = np.sqrt(0.5 * (1.0 + np.sum(sn * zn, axis=1)))
+        # wbar maps zn to sn; W = beta (2 v v' - J) with v half-way between e and wbar
+        wbar = (sn + zn * _J) / (2.0 * gamma)[:, None]
+        v = wbar.copy()
+        v[:, 0] += 1.0
+        v /= np.sqrt(2.0 * (wbar[:, 0] + 1.0))[:, None]
+        beta = (s_det / z_det) ** 0.25
+        jv = v * _J
+        self.W = beta[:, None, None] * (2.0 * v[:, :, None] * v[:, None, :] - _JMAT)
+        self.W_inv = (2.0 * jv[:, :, None] * jv[:, None, :] - _JMAT) / beta[:, None, None]
+        self.W2 = self.W @ self.W
+        self.W2_inv = self.W_inv @ self.W_inv
+        self.lam = self.apply(z)
+
+    def _blocks(self, v, lin, soc):
+        out = np.empty_like(v)
+        out[:self.l] = lin * v[:self.l]
+        out[self.l:] = np.einsum('kij,kj->ki', soc, v[self.l:].reshape(-1, _SOC_DIM)).ravel()
+        return out
+
+    def apply(self, v):
+        return self._blocks(v, self.w, self.W)
+
+    def apply_inv(self, v):
+        return self._blocks(v, 1.0 / self.w, self.W_inv)
+
+    def apply_sq(self, v):
+        return self._blocks(v, self.w**2, self.W2)
+
+    def apply_sq_inv(self, v):
+        return self._blocks(v, self.w**-2, self.W2_inv)
+
+    def hessian(self, G):
+        """G' W^-2 G"""
+        l = self.l
+        Gl, Gq = G[:l], G[l:].reshape(-1, _SOC_DIM, G.shape[1])
+        H = Gl.T @ (Gl * self.w[:, None]**-2)
+        if len(Gq):
+            H += Gq.reshape(-1, G.shape[1]).T @ (self.W2_inv @ Gq).reshape(-1, G.shape[1])
+        return H
+
+
+def solve_socp(c, G, h, l, A=None, b=None, warm=None, max_iter=60, feastol=1e-7, reltol=1e-6, abstol=1e-9):
+    """
+    minimize c'x  subject to  G x + s = h,  A x = b,  s in K
+
+    K is the nonnegative orthant for the first l rows of G, followed by 3-dimensional
+    second-order cones {(u0, u1) : u0 >= ||u1||} for the rest. Dense data.
+
+    warm: a previous result of the same shape; its iterates are pushed back into the
+    cone interior and used as the starting point.
+
+    Returns a dict with x, y, s, z, status ('optimal', 'infeasible', 'max_iter' or
+    'numerical_error' when the iterates stop being finite), iterations,
+    primal_objective and the final residuals. Unless optimal, x, y, s and z are the
+    best iterate seen.
+    """
+    c, G, h = np.asarray(c, float), np.asarray(G, float), np.asarray(h, float)
+    m, n = G.shape
+    if (m - l) % _SOC_DIM:
+        raise ValueError(f"{m - l} cone rows do not split into {_SOC_DIM}-dimensional second-order cones")
+    A = np.zeros((0, n)) if A is None else np.asarray(A, float)
+    b = np.zeros(0) if b is None else np.asarray(b, float)
+    p = A.shape[0]
+    e = _identity(m, l)
+    num_cones = l + (m - l) // _SOC_DIM
+
+    def kkt_factor(H):
+        K = np.zeros((n + p, n + p))
+        K[:n, :n] = H
+        K[:n, n:] = A.T
+        K[n:, :n] = A
+        return lu_factor(K, check_finite=False)
+
+    if warm is None:
+        # Least-norm primal and dual points, shifted into the cone (as in CVXOPT)
+        factor = kkt_factor(G.T @ G)
+        xy = lu_solve(factor, np.concatenate([G.T @ h, b]), check_finite=False)
+        x, s = xy[:n], h - G @ xy[:n]
+        wy = lu_solve(factor, np.concatenate([c, np.zeros(p)]), check_finite=False)
+        z, y = -G @ wy[:n], -wy[n:]
+        s, z = _shift_interior(s, l, 1.0), _shift_interior(z, l, 1.0)
+    else:
+        x, y = warm['x'].copy(), warm['y'].copy()
+        s = h - G @ x
+        z = warm['z']
+        # A converged point sits on the cone boundary; moving it a fixed distance inside
+        # recovers centrality and still saves iterations (0.1 was best on the landing SOCPs)
+        s, z = _shift_interior(s, l, 0.1), _shift_interior(z, l, 0.1)
+
+    res_x0, res_y0, res_z0 = max(1.0, np.linalg.norm(c)), max(1.0, np.linalg.norm(b)), max(1.0, np.linalg.norm(h))
+    status, best = 'max_iter', None
+    # Iterates of a problem that is infeasible (or nearly so) can grow without bound;
+    # that is detected below as a non-finite merit, not reported as overflow warnings
+    with np.errstate(over='ignore', divide='ignore', invalid='ignore'):
+        for iteration in range(max_iter + 1):
+            rx = c + A.T @ y + G.T @ z
+            ry = A @ x - b
+            rz = G @ x + s - h
+            gap = s @ z
+            pcost, dcost = c @ x, -(h @ z) - (b @ y)
+            pres = max(np.linalg.norm(ry) / res_y0, np.linalg.norm(rz) / res_z0)
+            dres = np.linalg.norm(rx) / res_x0
+            relgap = gap / max(abs(pcost), abs(dcost), 1e-12)
+            current = (x, y, s, z, pres, dres, gap)
+            if pres <= feastol and dres <= feastol and (gap <= abstol or relgap <= reltol):
+                status = 'optimal'
+                break
+            # Near the cone boundary rounding can undo progress; remember the best iterate
+            merit = max(pres, dres, min(relgap, gap))
+            if not np.isfinite(merit):
+                status = 'numerical_error'
+                break
+            if best is None or merit < best[0]:
+                best = (merit, current)
+            # Certificate of primal infeasibility: G'z + A'y ~ 0 with h'z + b'y < 0 (as in CVXOPT)
+            hz_by = -dcost
+            if hz_by < 0.0 and np.linalg.norm(rx - c) / res_x0 <= feastol * -hz_by:
+                status = 'infeasible'
+                break
+            if iteration == max_iter:
+                break
+
+            mu = gap / num_cones
+            W = _NTScaling(s, z, l)
+            lam = W.lam
+            factor = kkt_factor(W.hessian(G))
+
+            def newton(bx, by, bz, bs):
+                t = _jdiv(lam, bs, l)
+                bz2 = bz - W.apply(t)
+                dxy = lu_solve(factor, np.concatenate([bx + G.T @ W.apply_sq_inv(bz2), by]), check_finite=False)
+                dx, dy = dxy[:n], dxy[n:]
+                dz = W.apply_sq_inv(G @ dx - bz2)
+                ds = bz - G @ dx  # = W t - W**2 dz, but keeps G x + s - h exact near the cone boundary
+                return dx, dy, dz, ds
+
+            # Predictor (affine scaling) step
+            dx, dy, dz, ds = newton(-rx, -ry, -rz, -_jprod(lam, lam, l))
+            step = min(1.0, _max_step(s, ds, l), _max_step(z, dz, l))
+            sigma = (1.0 - step) ** 3
+
+            # Corrector with centring and the second-order term
+            bs = -_jprod(lam, lam, l) - _jprod(W.apply_inv(ds), W.apply(dz), l) + sigma * mu * e
+            dx, dy, dz, ds = newton(-rx, -ry, -rz, bs)
+            step = min(1.0, 0.99 * min(_max_step(s, ds, l), _max_step(z, dz, l)))
+
+            x, y, z, s = x + step * dx, y + step * dy, z + step * dz, s + step * ds
+
+    if status in ('max_iter', 'numerical_error') and best is not None:
+        current = best[1]
+    x, y, s, z, pres, dres, gap = current
+    return {'x': x, 'y': y, 's': s, 'z': z, 'status': status, 'iterations': iteration,
+            'primal_objective': c @ x, 'primal_residual': pres, 'dual_residual': dres, 'gap': gap}
+
+
+# === Powered-descent transcription ===
+
+class PoweredDescent:
+    """
+    Fuel-optimal 2D (x, h) powered descent without drag, as a sequence of SOCPs.
+
+    max_thrust: N at full throttle; isp: s; g: m/s**2
+    throttle_bounds: (min, max) throttle; a positive minimum is the nonconvex bound the
+        lossless convexification handles
+    gimbal_limit: rad, largest thrust angle from vertical
+    min_mass: kg, lower bound on the mass (dry mass plus reserve)
+    num_nodes: control intervals
+    glide_slope: rad above the horizontal at the target, or None for h >= 0 only
+    """
+
+    def __init__(self, max_thrust, isp, g=9.80665, throttle_bounds=(0.0, 1.0), gimbal_limit=0.2,
+                 min_mass=20000.0, num_nodes=40, glide_slope=None):
+        self.max_thrust = float(max_thrust)
+        self.alpha = 1.0 / (isp * G0)
+        self.g = float(g)
+        self.rho1 = self.max_thrust * throttle_bounds[0]
+        self.rho2 = self.max_thrust * throttle_bounds[1]
+        self.gimbal_limit = float(gimbal_limit)
+        self.min_mass = float(min_mass)
+        self.num_nodes = int(num_nodes)
+        self.glide_slope = glide_slope
+
+    @classmethod
+    def from_landing_ode(cls, ode_init_kwargs=None, **kwargs):
+        """Solver with the vehicle and limits of FalconLandingODE.build_landing_problem"""
+        from FalconLandingODE import (LANDING_GIMBAL_LIMIT, LANDING_MIN_MASS, LANDING_ODE_KWARGS,
+                                      LANDING_THROTTLE_BOUNDS)
+
+        ode = {**LANDING_ODE_KWARGS, **(ode_init_kwargs or {})}
+        options = {'throttle_bounds': LANDING_THROTTLE_BOUNDS, 'gimbal_limit': LANDING_GIMBAL_LIMIT,
+                   'min_mass': LANDING_MIN_MASS, **kwargs}
+        if ode.get('engine'):
+            # The convex problem has constant engine parameters: those at sea level, where the burn ends
+            from propulsion import load_engine
+            max_thrust, isp = load_engine(ode['engine']).sea_level()
+        else:
+            max_thrust, isp = ode['max_thrust_vac'], ode['Isp']
+        return cls(max_thrust * ode['num_engines'], isp, ode['g_approx'], **options)
+
+    def transcribe(self, initial, final, duration):
+        """SOCP data (c, G, h, l, A, b) and the affine state maps for one flight time"""
+        N, dt = self.num_nodes, duration / self.num_nodes
+        n = 3 * N
+        ux, uh, sg = np.arange(N), N + np.arange(N), 2 * N + np.arange(N)
+        k = np.arange(N + 1)
+
+        # States at nodes 0..N as const + M @ controls (controls constant over each interval)
+        j_lt_k = k[:, None] > np.arange(N)[None, :]
+        Mv = dt * j_lt_k
+        Mr = dt * dt * np.where(j_lt_k, k[:, None] - np.arange(N)[None, :] - 0.5, 0.0)
+        t = k * dt
+        x_const = initial['x'] + t * initial['vx']
+        h_const = initial['h'] + t * initial['vh'] - 0.5 * self.g * t * t
+        vx_const = np.full(N + 1, float(initial['vx']))
+        vh_const = initial['vh'] - self.g * t
+        z_init = np.log(initial['mass'])
+        Mz = -self.alpha * dt * j_lt_k
+
+        def rows(block, M):
+            out = np.zeros((M.shape[0], n))
+            out[:, block] = M
+            return out
+
+        X, Hh = rows(ux, Mr), rows(uh, Mr)
+        VX, VH = rows(ux, Mv), rows(uh, Mv)
+        Z = rows(sg, Mz)
+
+        # Terminal conditions
+        A = np.vstack([X[N], Hh[N], VX[N], VH[N]])
+        b = np.array([final['x'] - x_const[N], final['h'] - h_const[N],
+                      final['vx'] - vx_const[N], final['vh'] - vh_const[N]])
+
+        # Linear inequalities, as G y <= h
+        G_rows, h_rows = [], []
+
+        def leq(row, rhs):
+            G_rows.append(np.atleast_2d(row))
+            h_rows.append(np.atleast_1d(rhs))
+
+        # Thrust within gimbal_limit of vertical: cos(limit) sigma - u_h <= 0
+        pointing = np.zeros((N, n))
+        pointing[np.arange(N), sg] = np.cos(self.gimbal_limit)
+        pointing[np.arange(N), uh] = -1.0
+        leq(pointing, np.zeros(N))
+
+        # Upper thrust bound about the lightest reachable mass z0(t):
+        # sigma <= rho2 e^-z0 (1 - (z - z0))
+        z0 = np.log(np.maximum(initial['mass'] - self.alpha * self.rho2 * t[:N], self.min_mass))
+        a = self.rho2 * np.exp(-z0)
+        upper = np.zeros((N, n))
+        upper[np.arange(N), sg] = 1.0
+        upper += a[:, None] * Z[:N]
+        leq(upper, a * (1.0 - (z_init - z0)))
+
+        # Altitude: h >= 0, or within the glide slope cone h >= tan(slope) |x - x_f|
+        if self.glide_slope is None:
+            leq(-Hh[1:N], h_const[1:N])
+        else:
+            tan_slope = np.tan(self.glide_slope)
+            for sign in (1.0, -1.0):
+                leq(-Hh[1:N] + sign * tan_slope * X[1:N],
+                    h_const[1:N] - sign * tan_slope * (x_const[1:N] - final['x']))
+
+        # Final mass above min_mass: -z_N <= -ln(min_mass)
+        leq(-Z[N], z_init - np.log(self.min_mass))
+
+        G_lin, h_lin = np.vstack(G_rows), np.concatenate(h_rows)
+        scale = np.maximum(np.abs(G_lin).max(axis=1), 1e-12)
+        G_lin, h_lin = G_lin / scale[:, None], h_lin / scale
+
+        # Second-order cones: (sigma, u_x, u_h) and, for a positive minimum throttle, the
+        # lower thrust bound sigma >= rho1 e^-z0 (1 - dz + dz**2/2) as a rotated cone
+        # x**2 <= y with y = sigma - b + b dz, x = sqrt(b/2) dz, i.e. ||(y - 1, 2x)|| <= y + 1
+        cones = np.zeros((N, _SOC_DIM, n))
+        cones[:, 0, :][np.arange(N), sg] = -1.0
+        cones[:, 1, :][np.arange(N), ux] = -1.0
+        cones[:, 2, :][np.arange(N), uh] = -1.0
+        cone_h = np.zeros((N, _SOC_DIM))
+        if self.rho1 > 0.0:
+            bk = self.rho1 * np.exp(-z0)
+            dz_M = Z[:N]
+            dz_c = z_init - z0
+            y_M = bk[:, None] * dz_M
+            y_M[np.arange(N), sg] += 1.0
+            y_c = bk * dz_c - bk
+            x_M, x_c = np.sqrt(bk / 2)[:, None] * dz_M, np.sqrt(bk / 2) * dz_c
+            lower = np.stack([y_M, y_M, 2.0 * x_M], axis=1)
+            lower_h = np.stack([y_c + 1.0, y_c - 1.0, 2.0 * x_c], axis=1)
+            cones = np.concatenate([cones, -lower])
+            cone_h = np.concatenate([cone_h, lower_h])
+
+        G = np.vstack([G_lin, cones.reshape(-1, n)])
+        h = np.concatenate([h_lin, cone_h.ravel()])
+
+        # Propellant used is alpha dt sum(sigma) (times the mass); minimize sum(sigma)
+        c = np.zeros(n)
+        c[sg] = 1.0
+
+        eq_scale = np.maximum(np.abs(A).max(axis=1), 1e-12)
+        maps = {'x': (x_const, X), 'h': (h_const, Hh), 'vx': (vx_const, VX), 'vh': (vh_const, VH),
+                'z': (np.full(N + 1, z_init), Z)}
+        return (c, G, h, len(h_lin), A / eq_scale[:, None], b / eq_scale), maps
+
+    def solve(self, initial, final, duration, warm=None, **socp_options):
+        """
+        Fuel-optimal descent with a fixed flight time. initial: x, h, vx, vh, mass;
+        final: x, h, vx, vh. Returns a dict of node times and states (num_nodes + 1),
+        per-interval controls (throttle, gimbal_alpha, thrust), final_mass and the
+        solver status; 'socp' is the raw solution for warm-starting the next solve.
+        A warm start that does not end optimal or infeasible is retried cold;
+        'warm_started' tells whether the result is the warm-started one, and
+        'iterations' counts both solves.
+        """
+        (c, G, h, l, A, b), maps = self.transcribe(initial, final, duration)
+        socp = solve_socp(c, G, h, l, A, b, warm=warm, **socp_options)
+        warm_started = warm is not None
+        if warm_started and socp['status'] in ('max_iter', 'numerical_error'):
+            # Near the shortest feasible flight time a neighbour's solution can be a poor
+            # start, from which the iterates stall or diverge; the cold start does not
+            warm_iterations = socp['iterations']
+            socp = solve_socp(c, G, h, l, A, b, **socp_options)
+            socp['iterations'] += warm_iterations
+            warm_started = False
+        y = socp['x']
+        N = self.num_nodes
+
+        sol = {name: const + M @ y for name, (const, M) in maps.items()}
+        mass = np.exp(sol.pop('z'))
+        ux, uh, sigma = y[:N], y[N:2 * N], y[2 * N:]
+        thrust = sigma * mass[:N]
+        sol.update({
+            'time': np.linspace(0.0, duration, N + 1),
+            # Lossless convexification: ||u|| = sigma at the optimum, so this should be ~0
+            'relaxation_gap': float(np.max(sigma - np.hypot(ux, uh)) / max(sigma.max(), 1e-12)),
+            'mass': mass,
+            'thrust': thrust,
+            'throttle': thrust / self.max_thrust,
+            'gimbal_alpha': np.arctan2(ux, uh),
+            'duration': float(duration),
+            'final_mass': float(mass[-1]),
+            'converged': socp['status'] == 'optimal',
+            'warm_started': warm_started,
+            'iterations': socp['iterations'],
+            'socp': socp,
+        })
+        return sol
+
+    def optimize(self, initial, final, duration_bounds, scan=8, tol=0.05, **socp_options):
+        """
+        Free final time: scan the duration range, then golden-section search around the
+        best feasible duration. Every solve is a cold start: warm starts from the closest
+        previous duration took as many iterations in total (the optimum is near the
+        shortest feasible flight time, where they fail and are retried cold).
+        Returns the best solution with 'solves' and 'total_iterations' added.
+        """
+        best, solves, iterations = None, 0, 0
+        evaluated = {}
+
+        def evaluate(duration):
+            nonlocal best, solves, iterations
+            sol = self.solve(initial, final, duration, **socp_options)
+            solves += 1
+            iterations += sol['iterations']
+            fuel = -sol['final_mass'] if sol['converged'] else np.inf
+            evaluated[duration] = (fuel, sol)
+            if sol['converged'] and (best is None or fuel < -best['final_mass']):
+                best = sol
+            return fuel
+
+        grid = np.linspace(duration_bounds[0], duration_bounds[1], scan)
+        for duration in grid:
+            evaluate(duration)
+        if best is None:
+            return {'converged': False, 'solves': solves, 'total_iterations': iterations}
+
+        i = int(np.argmin([evaluated[d][0] for d in grid]))
+        lo, hi = grid[max(i - 1, 0)], grid[min(i + 1, scan - 1)]
+        ratio = (np.sqrt(5.0) - 1.0) / 2.0
+        t1, t2 = hi - ratio * (hi - lo), lo + ratio * (hi - lo)
+        f1, f2 = evaluate(t1), evaluate(t2)
+        while hi - lo > tol:
+            if f1 <= f2:
+                hi, t2, f2 = t2, t1, f1
+                t1 = hi - ratio * (hi - lo)
+                f1 = evaluate(t1)
+            else:
+                lo, t1, f1 = t1, t2, f2
+                t2 = lo + ratio * (hi - lo)
+                f2 = evaluate(t2)
+        return {**best, 'solves': solves, 'total_iterations': iterations}
@@ -0,0 +1,199 @@
+"""
+Rocket engine performance compiled from a JSBSim engine definition
+(aircraft/Falcon9Booster/Merlin1D.xml), for the trajectory ODEs.
+
+The XML gives vacuum thrust and Isp, the propellant flow at full thrust, the minimum
+throttle, and altitude tables (ft above ground) of the thrust and Isp factors. The
+tables are compiled once into per-interval cubic coefficients of a monotone (PCHIP)
+interpolant through the same breakpoints JSBSim interpolates linearly: values agree
+at the breakpoints, the factors stay monotone, and the slope is continuous, so the
+analytic altitude derivatives an optimizer sees do not jump at the breakpoints.
+Lookups are an O(1) bucketed interval search over all nodes at once, shared by both
+tables, plus a Horner evaluation.
+
+    engine = load_engine('Merlin1D')
+    perf = engine.performance(h, num_engines=3)   # throttle-independent, per unit throttle
+    thrust = throttle * perf['thrust']            # N
+    mdot = throttle * perf['mdot']                # kg/s
+    dthrust_dh = throttle * perf['dthrust_dh']
+
+    python propulsion.py [Merlin1D]               # table summary and timing
+"""
+import functools
+import os
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+G0 = 9.80665  # m/s**2, for Isp
+
+ENGINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'aircraft', 'Falcon9Booster')
+
+# JSBSim units to SI
+_UNITS = {'LBS': 4.4482216152605, 'N': 1.0, 'LBS/SEC': 0.45359237, 'KG/SEC': 1.0, 'SEC': 1.0}
+_FT = 0.3048
+
+
+class AltitudeTable:
+    """
+    One-dimensional table of a factor vs altitude (m) as a monotone cubic interpolant.
+    Altitudes outside the breakpoints are clamped (end value, zero slope).
+    """
+
+    def __init__(self, altitudes, values):
+        from scipy.interpolate import PchipInterpolator
+
+        self.altitudes = np.asarray(altitudes, dtype=float)
+        self.values = np.asarray(values, dtype=float)
+        pchip = PchipInterpolator(self.altitudes, self.values)
+        # Per-interval f(t) = c0 t**3 + c1 t**2 + c2 t + c3 with t = h - h_k, and f'(t)
+        self._value_coeffs = tuple(pchip.c)
+        self._slope_coeffs = (3.0 * pchip.c[0], 2.0 * pchip.c[1], pchip.c[2])
+
+        # O(1) interval search: uniform buckets no wider than the smallest interval hold
+        # at most one breakpoint, so the interval is the bucket's first one or the next
+        self._bucket = np.min(np.diff(self.altitudes))
+        num = int(np.ceil((self.altitudes[-1] - self.altitudes[0]) / self._bucket)) + 1
+        starts = self.altitudes[0] + self._bucket * np.arange(num)
+        self._bucket_interval = np.clip(np.searchsorted(self.altitudes, starts, side='right') - 1,
+                                        0, len(self.altitudes) - 2)
+        self._next_breakpoint = np.append(self.altitudes[1:-1], np.inf)
+
+    def locate(self, h):
+        """Interval index and offset of real altitudes h, shared by tables with the same breakpoints"""
+        h = np.asarray(h, dtype=float)
+        hc = np.clip(h, self.altitudes[0], self.altitudes[-1])
+        k = np.take(self._bucket_interval, ((hc - self.altitudes[0]) * (1.0 / self._bucket)).astype(np.intp))
+        k += hc >= np.take(self._next_breakpoint, k)
+        outside = None
+        if h.size and (h.min() < self.altitudes[0] or h.max() > self.altitudes[-1]):
+            outside = (h < self.altitudes[0]) | (h > self.altitudes[-1])
+        return k, hc - np.take(self.altitudes, k), outside
+
+    def evaluate(self, location):
+        """(value, d/dh) at a location from locate()"""
+        k, t, outside = location
+        value = _horner(self._value_coeffs, k, t)
+        slope = _horner(self._slope_coeffs, k, t)
+        if outside is not None:
+            slope = np.where(outside, 0.0, slope)
+        return value, slope
+
+    def __call__(self, h):
+        """(value, d/dh) at altitudes h (m); complex h is complex-step safe"""
+        h = np.asarray(h)
+        if np.iscomplexobj(h):
+            value, slope = self(h.real)
+            return value + 1j * h.imag * slope, slope
+        return self.evaluate(self.locate(h))
+
+
+class EngineModel:
+    """Thrust and propellant flow of one engine vs altitude, linear in throttle"""
+
+    def __init__(self, name, max_thrust_vac, isp_vac, mdot_max, min_throttle, thrust_factor, isp_factor):
+        self.name = name
+        self.max_thrust_vac = float(max_thrust_vac)  # N
+        self.isp_vac = float(isp_vac)                # s
+        self.mdot_max = float(mdot_max)              # kg/s, full throttle in vacuum
+        self.min_throttle = float(min_throttle)
+        self.thrust_factor = thrust_factor           # AltitudeTable
+        self.isp_factor = isp_factor                 # AltitudeTable
+
+    @classmethod
+    def from_xml(cls, path):
+        root = ET.parse(path).getroot()
+
+        def scalar(tag, default=None):
+            element = root.find(tag)
+            if element is None:
+                if default is None:
+                    raise ValueError(f"{path}: no <{tag}>")
+                return default
+            return float(element.text) * _UNITS[element.get('unit', 'N').upper()]
+
+        def table(tag, name):
+            for element in root.iter(tag):
+                if element.get('name') == name:
+                    data = np.array(element.find('tableData').text.split(), dtype=float).reshape(-1, 2)
+                    return AltitudeTable(data[:, 0] * _FT, data[:, 1])
+            return AltitudeTable([0.0, 1.0], [1.0, 1.0])  # no table: vacuum performance
+
+        max_thrust = scalar('maxthrust')
+        isp = scalar('isp')
+        return cls(root.get('name', os.path.splitext(os.path.basename(path))[0]), max_thrust, isp,
+                   scalar('propellant_flow_rate', max_thrust / (isp * G0)), scalar('minthrottle', 0.0),
+                   table('thrust_table', 'altitude_thrust_factor'), table('isp_table', 'altitude_isp_factor'))
+
+    def performance(self, h, num_engines=1):
+        """
+        Full-throttle thrust (N) and propellant flow (kg/s) of num_engines engines at
+        altitudes h (m), with their altitude derivatives. Both scale linearly with
+        throttle; the flow is the XML's full-thrust flow scaled by thrust factor over
+        Isp factor, i.e. thrust / (Isp(h) g0).
+        """
+        h = np.asarray(h)
+        if np.array_equal(self.thrust_factor.altitudes, self.isp_factor.altitudes) and not np.iscomplexobj(h):
+            location = self.thrust_factor.locate(h)
+            (ft, dft), (fi, dfi) = self.thrust_factor.evaluate(location), self.isp_factor.evaluate(location)
+        else:
+            (ft, dft), (fi, dfi) = self.thrust_factor(h), self.isp_factor(h)
+        thrust = num_engines * self.max_thrust_vac
+        mdot = num_engines * self.mdot_max
+        ratio = ft / fi
+        return {
+            'thrust': thrust * ft,
+            'dthrust_dh': thrust * dft,
+            'mdot': mdot * ratio,
+            'dmdot_dh': mdot * (dft - ratio * dfi) / fi,
+        }
+
+    def sea_level(self):
+        """(thrust [N], Isp [s]) of one engine at full throttle on the ground"""
+        return self.max_thrust_vac * float(self.thrust_factor(0.0)[0]), self.isp_vac * float(self.isp_factor(0.0)[0])
+
+
+@functools.lru_cache(maxsize=None)
+def load_engine(engine='Merlin1D'):
+    """Compiled EngineModel of an engine XML file, or of <name>.xml in ENGINE_DIR; loaded once per process"""
+    path = engine if engine.endswith('.xml') else os.path.join(ENGINE_DIR, f"{engine}.xml")
+    return EngineModel.from_xml(path)
+
+
+def _horner(coeffs, index, t):
+    """Evaluate the per-interval polynomial (highest power first) gathered at index"""
+    out = np.take(coeffs[0], index)
+    for c in coeffs[1:]:
+        out *= t
+        out += np.take(c, index)
+    return out
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Summary of a compiled engine model')
+    parser.add_argument('engine', nargs='?', default='Merlin1D')
+    args = parser.parse_args()
+
+    engine = load_engine(args.engine)
+    thrust_sl, isp_sl = engine.sea_level()
+    print("="*60)
+    print(f"{engine.name}: {engine.max_thrust_vac / 1e3:.1f} kN / {engine.isp_vac:.1f} s vacuum, "
+          f"{thrust_sl / 1e3:.1f} kN / {isp_sl:.1f} s sea level")
+    print(f"Full-thrust flow {engine.mdot_max:.1f} kg/s (thrust / Isp g0: "
+          f"{engine.max_thrust_vac / (engine.isp_vac * G0):.1f} kg/s), min throttle {engine.min_throttle:.2f}")
+    print("="*60)
+    for label, table in (('thrust factor', engine.thrust_factor), ('Isp factor', engine.isp_factor)):
+        h = np.linspace(table.altitudes[0], table.altitudes[-1], 20001)
+        linear = np.interp(h, table.altitudes, table.values)
+        print(f"{label:<14} {len(table.altitudes)} breakpoints to {table.altitudes[-1] / 1000:.1f} km, "
+              f"max difference to linear (JSBSim) {np.max(np.abs(table(h)[0] - linear)):.4f}")
+
+    h = np.random.default_rng(0).uniform(0.0, 80000.0, 6000)
+    engine.performance(h)
+    t0 = time.perf_counter()
+    for _ in range(200):
+        engine.performance(h)
+    print(f"performance(): {(time.perf_counter() - t0) / 200 * 1e6:.1f} us per 6000 altitudes")
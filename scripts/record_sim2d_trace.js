@@ -0,0 +1,78 @@
+// Record a reference trajectory from the browser 2D simulation (webapp/static/js/simulation2d.js)
+// The real Falcon9Simulation2D class is loaded with a stubbed DOM/canvas and stepped at a fixed dt,
+// so the trace can be used to check the headless Python port (scripts/falcon9_sim2d.py) for parity.
+//
+// The mission is flown to touchdown (about 1490 s with the default phases); --t-max only guards
+// against a mission that never comes down.
+//
+//   node scripts/record_sim2d_trace.js [--dt 0.0166666667] [--every 60] [--t-max 3000] [--out telemetry/sim2d_reference_trace.csv]
+
+const fs = require('fs');
+const path = require('path');
+const vm = require('vm');
+
+const args = process.argv.slice(2);
+function option(name, fallback) {
+    const i = args.indexOf(`--${name}`);
+    return i >= 0 ? args[i + 1] : fallback;
+}
+
+const repoRoot = path.resolve(__dirname, '..');
+const dt = parseFloat(option('dt', String(1 / 60)));
+const every = parseInt(option('every', '60'), 10);
+const tMax = parseFloat(option('t-max', '3000'));
+const outFile = path.resolve(repoRoot, option('out', 'telemetry/sim2d_reference_trace.csv'));
+
+// Anything the renderer touches: every property is a callable stub returning another stub
+function stub() {
+    const target = function () { return stub(); };
+    return new Proxy(target, {
+        get: (t, prop) => {
+            if (prop === Symbol.toPrimitive) return () => 0;
+            if (prop === 'length') return 0;
+            if (prop in t) return t[prop];
+            return stub();
+        },
+        set: (t, prop, value) => { t[prop] = value; return true; },
+        apply: () => stub(),
+    });
+}
+
+const canvas = { width: 1280, height: 720, offsetWidth: 1280, offsetHeight: 720, getContext: () => stub() };
+const context = {
+    console: { log: () => {}, warn: () => {}, error: console.error },
+    Math,
+    window: { addEventListener: () => {}, innerWidth: 1280, innerHeight: 720 },
+    document: { getElementById: () => stub(), addEventListener: () => {}, createElement: () => stub() },
+    Image: class { constructor() { this.complete = false; } },
+    requestAnimationFrame: () => {},
+};
+vm.createContext(context);
+
+const jsDir = path.join(repoRoot, 'webapp', 'static', 'js');
+vm.runInContext(fs.readFileSync(path.join(jsDir, 'constants.js'), 'utf8'), context);
+vm.runInContext(fs.readFileSync(path.join(jsDir, 'simulation2d.js'), 'utf8') +
+    '\nthis.Falcon9Simulation2D = Falcon9Simulation2D;', context);
+
+const sim = new context.Falcon9Simulation2D(canvas);
+sim.render = () => {};  // drawing does not affect the physics
+sim.start();
+
+const columns = ['step', 'time', 'phase', 'x', 'y', 'vx', 'vy', 'angle', 'throttle', 'mass', 'fuel', 'max_q'];
+const rows = [columns.join(',')];
+function record(step) {
+    const s = sim.stage1;
+    rows.push([step, sim.time, sim.currentPhase, s.position.x, s.position.y, s.velocity.x, s.velocity.y,
+        s.angle, s.throttle, s.mass, s.fuel, sim.maxDynPressure].map(v => typeof v === 'number' && !Number.isInteger(v) ? v.toPrecision(17) : v).join(','));
+}
+
+let step = 0;
+record(step);
+while (sim.isRunning && sim.time < tMax) {
+    sim.update(dt);
+    step++;
+    if (step % every === 0 || !sim.isRunning) record(step);
+}
+
+fs.writeFileSync(outFile, rows.join('\n') + '\n');
+console.log(`Recorded ${rows.length - 1} samples (${step} steps, dt=${dt}, t=${sim.time.toFixed(2)}s, phase ${sim.currentPhase}) to ${outFile}`);
@@ -0,0 +1,313 @@
+"""
+Race of optimizer and transcription settings for the landing optimization
+(FalconLandingODE.build_landing_problem), by successive halving.
+
+Every configuration of a grid (transcription, num_segments, order, optimizer and
+IPOPT options) solves the first scenario of a fixed scenario set
+(auto_scaling.BENCHMARK_SCENARIOS) from the straight-line guess. Configurations are
+ranked by success rate, then mean wall time, then mean iterations; the better
+1/eta go on to twice as many scenarios, until the survivors have solved all of them.
+Losers stop after a scenario or two instead of running the whole set. The runs of a
+round are spread over a process pool; each worker sets up a configuration's problem
+once and reuses it for every scenario it solves with it. Total colorings come from
+coloring_cache.py and are computed, when missing, as a worker sets up a configuration,
+so they are not part of any run's wall time. A worker that crashes takes down the
+pool; its runs are repeated one at a time on fresh workers, and a run that crashes
+again ranks last.
+
+The leaderboard (every configuration, the scenarios it ran, success rate, wall time,
+iterations, the round it was cut in) and the winning configuration are written to
+scripts/landing_settings.json (FALCON9_LANDING_SETTINGS to override).
+FalconLandingODE.py builds its problem with the winner when the file exists. A race in
+which no configuration solved a single scenario has no winner, and a winner raced with
+SciPy SLSQP (no pyOptSparse) is not applied where pyOptSparse is installed, or the
+other way round.
+
+    python settings_race.py --workers 4
+    python settings_race.py --transcription radau --segments 10 20 30 --order 3 5
+    python settings_race.py --show                # stored leaderboard
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+DEFAULT_SETTINGS_FILE = os.environ.get('FALCON9_LANDING_SETTINGS',
+                                       os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                    'landing_settings.json'))
+
+# Default grid; opt_settings are overrides of FalconLandingODE.LANDING_IPOPT_SETTINGS
+RACE_GRID = {
+    'transcription': ['gauss-lobatto', 'radau'],
+    'num_segments': [10, 20],
+    'order': [3, 5],
+    'optimizer': ['IPOPT'],
+    'opt_settings': [
+        {},
+        {'mu_strategy': 'monotone', 'mu_init': 1e-1},
+        {'nlp_scaling_method': 'none'},
+        {'mu_init': 1e-1},
+    ],
+}
+
+# Settings of build_landing_problem a configuration consists of
+CONFIG_NAMES = ('transcription', 'num_segments', 'order', 'optimizer', 'opt_settings')
+
+
+def pyoptsparse_available():
+    """Whether configure_driver gets pyOptSparse; without it every optimizer is SciPy SLSQP"""
+    import openmdao.api as om
+
+    try:
+        om.pyOptSparseDriver()
+    except ImportError:
+        return False
+    return True
+
+
+def race_configs(grid=RACE_GRID):
+    """
+    Configurations of the cartesian product of grid. Without pyOptSparse the
+    optimizer settings cannot change anything, so they collapse to one.
+    """
+    grid = dict(grid)
+    if not pyoptsparse_available():
+        grid['optimizer'], grid['opt_settings'] = ['SLSQP'], [{}]
+    configs = [dict(zip(CONFIG_NAMES, values)) for values in itertools.product(*(grid[n] for n in CONFIG_NAMES))]
+    # GaussLobatto needs an odd order
+    return [c for c in configs if c['transcription'] != 'gauss-lobatto' or c['order'] % 2 == 1]
+
+
+def config_label(config):
+    tx = {'gauss-lobatto': 'GL', 'radau': 'Radau'}.get(config['transcription'], config['transcription'])
+    settings = ','.join(f"{k}={v}" for k, v in sorted(config['opt_settings'].items()))
+    return f"{tx} {config['num_segments']}x{config['order']} {config['optimizer']}" + (f" [{settings}]" if settings else '')
+
+
+# --- Worker process state: set-up problems by configuration index ---
+_worker = {}
+
+
+def _init_worker(configs, output_dir):
+    os.environ['OPENMDAO_REPORTS'] = '0'  # no per-run report pages in batch mode
+    os.chdir(output_dir)
+    _worker.update(configs=configs, problems={})
+
+
+def _solve(config_index, scenario_index, scenario):
+    from coloring_cache import compute_coloring, use_cached_coloring
+    from FalconLandingODE import build_landing_problem, set_landing_guess
+
+    result_row = {'config': config_index, 'scenario': scenario_index}
+    problems = _worker['problems']
+    if config_index not in problems:
+        config = _worker['configs'][config_index]
+        p, phase = build_landing_problem(print_level=0, check=False, name=f"race_{config_index}_{os.getpid()}",
+                                         **config)
+        for option in ('disp', 'print_results'):
+            if option in p.driver.options:
+                p.driver.options[option] = False
+        set_landing_guess(p, phase)
+        # A missing coloring is computed here, so that no run's wall time includes it
+        compute_coloring(p, use_cached_coloring(p))
+        problems[config_index] = (p, phase)
+    p, phase = problems[config_index]
+
+    t0 = time.perf_counter()
+    try:
+        set_landing_guess(p, phase, scenario)
+        result = p.run_driver()
+    except Exception:
+        return {**result_row, 'converged': False, 'iterations': 0, 'wall_time_s': time.perf_counter() - t0,
+                'final_mass': float('nan')}
+    wall_time = time.perf_counter() - t0
+    return {**result_row, 'converged': bool(result.success), 'iterations': int(result.iter_count),
+            'wall_time_s': wall_time, 'final_mass': float(p.get_val('traj.phase0.timeseries.mass')[-1, 0])}
+
+
+def _new_pool(configs, output_dir, workers):
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                               initargs=(configs, os.path.abspath(output_dir)))
+
+
+def _run_tasks(pool, tasks, scenarios, runs):
+    """Solve (config, scenario) tasks on pool into runs; returns the tasks lost to a broken pool"""
+    futures, lost = {}, []
+    for c, s in tasks:
+        try:
+            futures[pool.submit(_solve, c, s, scenarios[s])] = (c, s)
+        except BrokenProcessPool:
+            lost.append((c, s))
+    for future in as_completed(futures):
+        try:
+            runs[futures[future]] = future.result()
+        except BrokenProcessPool:
+            lost.append(futures[future])
+    return lost
+
+
+def score(runs):
+    """Sort key of a configuration's runs: success rate first, then wall time, then iterations"""
+    return (-np.mean([r['converged'] for r in runs]), np.mean([r['wall_time_s'] for r in runs]),
+            np.mean([r['iterations'] for r in runs]))
+
+
+def race(configs, scenarios=None, eta=2, workers=None, output_dir='race_out'):
+    """
+    Successive halving of configs over scenarios (default
+    auto_scaling.BENCHMARK_SCENARIOS). Returns the leaderboard: one entry per
+    configuration, best first.
+    """
+    if scenarios is None:
+        from auto_scaling import BENCHMARK_SCENARIOS
+        scenarios = BENCHMARK_SCENARIOS
+    os.makedirs(output_dir, exist_ok=True)
+
+    runs = {}  # (config index, scenario index) -> result row
+    eliminated = {}
+    survivors = list(range(len(configs)))
+    budget = 1
+    t0 = time.perf_counter()
+    pool = None
+    try:
+        for round_index in itertools.count():
+            n = min(budget, len(scenarios))
+            tasks = [(c, s) for c in survivors for s in range(n) if (c, s) not in runs]
+            if pool is None:
+                pool = _new_pool(configs, output_dir, workers)
+            lost = _run_tasks(pool, tasks, scenarios, runs)
+            if lost:
+                # A worker died and took the pool, and every run still in it, down. Run
+                # those again one per fresh single-worker pool: only the run that kills
+                # its own worker again counts as crashed.
+                pool.shutdown(wait=False, cancel_futures=True)
+                pool = None
+                for c, s in lost:
+                    isolated = _new_pool(configs, output_dir, 1)
+                    if _run_tasks(isolated, [(c, s)], scenarios, runs):
+                        # ranks last: a NaN wall time would make the ranking undefined
+                        runs[c, s] = {'config': c, 'scenario': s, 'converged': False, 'iterations': 0,
+                                      'wall_time_s': float('inf'), 'final_mass': float('nan')}
+                    isolated.shutdown(wait=False, cancel_futures=True)
+            survivors.sort(key=lambda c: score([runs[c, s] for s in range(n)]))
+            print(f"Round {round_index}: {len(survivors)} configurations x {n} scenarios "
+                  f"({len(tasks)} runs, {time.perf_counter() - t0:.1f} s)")
+            if n == len(scenarios):
+                break
+            keep = max(1, math.ceil(len(survivors) / eta))
+            for c in survivors[keep:]:
+                eliminated[c] = round_index
+            survivors = survivors[:keep]
+            budget *= eta
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    leaderboard = []
+    for c, config in enumerate(configs):
+        config_runs = [r for (rc, _), r in sorted(runs.items()) if rc == c]
+        leaderboard.append({
+            'config': config,
+            'label': config_label(config),
+            'scenarios': len(config_runs),
+            'success_rate': float(np.mean([r['converged'] for r in config_runs])),
+            'mean_wall_time_s': float(np.mean([r['wall_time_s'] for r in config_runs])),
+            'mean_iterations': float(np.mean([r['iterations'] for r in config_runs])),
+            'eliminated_in_round': eliminated.get(c),
+            'runs': config_runs,
+            '_score': score(config_runs),
+        })
+    # Finalists first, then by how long a configuration lasted; within a group by score
+    leaderboard.sort(key=lambda e: (-(math.inf if e['eliminated_in_round'] is None else e['eliminated_in_round']),
+                                    e['_score']))
+    for rank, entry in enumerate(leaderboard, start=1):
+        entry['rank'] = rank
+        del entry['_score']
+    return leaderboard
+
+
+def save_leaderboard(leaderboard, scenarios, path=DEFAULT_SETTINGS_FILE):
+    """
+    Write the leaderboard and its winning configuration (atomically). The winner is only
+    stored if it solved at least one scenario; the fastest failure is no default.
+    """
+    best = leaderboard[0]['config'] if leaderboard and leaderboard[0]['success_rate'] > 0 else None
+    if best is None:
+        print("--- No configuration solved any scenario: no best settings stored ---")
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump({'created': time.strftime('%Y-%m-%d %H:%M:%S'), 'scenarios': scenarios,
+                   'pyoptsparse': pyoptsparse_available(), 'best': best, 'leaderboard': leaderboard}, f, indent=1)
+    os.replace(tmp, path)
+
+
+def load_best_settings(path=DEFAULT_SETTINGS_FILE):
+    """
+    build_landing_problem keyword arguments of the stored winner, or None if there is
+    none or it was raced with other optimizers than this machine has
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        stored = json.load(f)
+    if stored.get('best') is None:
+        return None
+    if stored.get('pyoptsparse') != pyoptsparse_available():
+        raced = 'pyOptSparse' if stored.get('pyoptsparse') else 'SciPy SLSQP only'
+        print(f"--- Stored landing settings were raced with {raced}; not applied here ({path}) ---")
+        return None
+    return stored['best']
+
+
+def print_leaderboard(leaderboard, top=None):
+    print("="*60)
+    print("Landing settings leaderboard")
+    print("="*60)
+    print(f"{'rank':>4} {'scen':>4} {'success':>7} {'wall_s':>7} {'iters':>6} {'cut':>4}  configuration")
+    for entry in leaderboard[:top]:
+        cut = '-' if entry['eliminated_in_round'] is None else str(entry['eliminated_in_round'])
+        print(f"{entry['rank']:>4d} {entry['scenarios']:>4d} {100 * entry['success_rate']:>6.0f}%"
+              f" {entry['mean_wall_time_s']:>7.2f} {entry['mean_iterations']:>6.1f} {cut:>4}  {entry['label']}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Race optimizer and transcription settings of the landing problem')
+    parser.add_argument('--transcription', nargs='+', choices=('gauss-lobatto', 'radau'),
+                        default=RACE_GRID['transcription'])
+    parser.add_argument('--segments', type=int, nargs='+', default=RACE_GRID['num_segments'])
+    parser.add_argument('--order', type=int, nargs='+', default=RACE_GRID['order'])
+    parser.add_argument('--eta', type=int, default=2, help='Keep the best 1/eta configurations each round')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--out', default='race_out', help='Output directory of the worker problems')
+    parser.add_argument('--top', type=int, default=None, help='Print only the best N configurations')
+    parser.add_argument('--show', action='store_true', help='Print the stored leaderboard and exit')
+    args = parser.parse_args()
+
+    if args.show:
+        with open(DEFAULT_SETTINGS_FILE) as f:
+            stored = json.load(f)
+        print(f"{DEFAULT_SETTINGS_FILE} ({stored['created']}, {len(stored['scenarios'])} scenarios, "
+              f"{'pyOptSparse' if stored.get('pyoptsparse') else 'SciPy SLSQP only'})")
+        print_leaderboard(stored['leaderboard'], args.top)
+        if stored.get('best') is None:
+            print("No configuration solved any scenario: there is no best configuration")
+        raise SystemExit
+
+    from auto_scaling import BENCHMARK_SCENARIOS
+
+    configs = race_configs({**RACE_GRID, 'transcription': args.transcription, 'num_segments': args.segments,
+                            'order': args.order})
+    if not pyoptsparse_available():
+        print("--- pyOptSparse not available: racing transcriptions with SciPy SLSQP only ---")
+    print(f"Racing {len(configs)} configurations over {len(BENCHMARK_SCENARIOS)} scenarios (eta={args.eta})")
+    leaderboard = race(configs, BENCHMARK_SCENARIOS, eta=args.eta, workers=args.workers, output_dir=args.out)
+    save_leaderboard(leaderboard, BENCHMARK_SCENARIOS)
+    print_leaderboard(leaderboard, args.top)
+    stored = 'Leaderboard and best configuration' if leaderboard[0]['success_rate'] > 0 else 'Leaderboard'
+    print(f"{stored} stored in {DEFAULT_SETTINGS_FILE}")
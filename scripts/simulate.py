@@ -1,10 +1,11 @@
 import jsbsim
 import numpy as np
-import pandas as pd
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 import os
 
+from telemetry_recorder import TelemetryRecorder
+
 # Initialize JSBSim with custom paths
 fdm = jsbsim.FGFDMExec(None)
 fdm.set_aircraft_path('C:/Users/cmodi.000/Falcon9Sim/aircraft')
@@ -31,7 +32,9 @@ fdm['atmosphere/density-slugft3'] = 0.002377
 fdm.set_dt(0.01)
 t_max = 120
 t = np.arange(0, t_max, fdm.get_delta_t())
-telemetry = []
+telemetry = TelemetryRecorder(['time_s', 'x_m', 'y_m', 'z_m', 'vx_mps', 'vy_mps', 'vz_mps',
+                               'pitch_deg', 'yaw_deg', 'roll_deg', 'thrust_N', 'gridfin_deg'],
+                              chunk_size=len(t))
 
 # Control logic
 def control_logic(t):
@@ -50,24 +53,24 @@ for i, t_i in enumerate(t):
     fdm['propulsion/engine/throttle'] = controls['throttle']
     fdm['fcs/gridfin-cmd-norm'] = controls['gridfin']
     fdm.run()
-    telemetry.append({
-        'time_s': t_i,
-        'x_m': fdm['position/x-gc-m'],
-        'y_m': fdm['position/y-gc-m'],
-        'z_m': fdm['position/h-sl-m'],
-        'vx_mps': fdm['velocities/vc-mps'],
-        'vy_mps': fdm['velocities/vn-mps'],
-        'vz_mps': fdm['velocities/vd-mps'],
-        'pitch_deg': fdm['attitude/pitch-deg'],
-        'yaw_deg': fdm['attitude/heading-deg'],
-        'roll_deg': fdm['attitude/roll-deg'],
-        'thrust_N': fdm['propulsion/engine/thrust-lbs'] * 4.44822,
-        'gridfin_deg': fdm['fcs/gridfin-angle-deg']
-    })
+    telemetry.record((
+        t_i,
+        fdm['position/x-gc-m'],
+        fdm['position/y-gc-m'],
+        fdm['position/h-sl-m'],
+        fdm['velocities/vc-mps'],
+        fdm['velocities/vn-mps'],
+        fdm['velocities/vd-mps'],
+        fdm['attitude/pitch-deg'],
+        fdm['attitude/heading-deg'],
+        fdm['attitude/roll-deg'],
+        fdm['propulsion/engine/thrust-lbs'] * 4.44822,
+        fdm['fcs/gridfin-angle-deg']
+    ))
 
 # Save telemetry
-df = pd.DataFrame(telemetry)
-df.to_csv('output/telemetry.csv', index=False)
+telemetry.to_csv('output/telemetry.csv')
+df = telemetry.columns()
 
 # Plot 3D trajectory
 fig = plt.figure()
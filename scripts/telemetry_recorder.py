@@ -0,0 +1,127 @@
+"""
+Preallocated telemetry recorder for the JSBSim stepping loops.
+
+Channels are declared once; samples go into a structured NumPy buffer, so recording
+a step is a single row store instead of building a Python list or dict per step.
+The buffer either grows in fixed-size chunks (no copying of recorded data) or acts
+as a bounded ring that keeps only the most recent samples. Decimation records every
+n-th step. Recordings are written straight to the telemetry CSV layout used in
+telemetry/ (one labelled column per channel) or to a columnar .npz file.
+
+    recorder = TelemetryRecorder([('time', 'Time (s)'), ('altitude', 'Altitude (ft)')], decimation=4)
+    for step in range(steps):
+        recorder.record((t, h))
+    recorder.to_csv('telemetry/run.csv')
+"""
+import numpy as np
+
+
+class TelemetryRecorder:
+    """
+    channels: sequence of channel names, or (name, csv header) pairs
+    chunk_size: samples allocated per chunk ('grow') or ring capacity ('ring')
+    mode: 'grow' keeps every sample, 'ring' keeps the last chunk_size samples
+    decimation: record every n-th call to record()
+    """
+
+    def __init__(self, channels, chunk_size=8192, mode='grow', decimation=1, dtype=np.float64):
+        if mode not in ('grow', 'ring'):
+            raise ValueError(f"mode must be 'grow' or 'ring', not {mode!r}")
+        if decimation < 1:
+            raise ValueError("decimation must be >= 1")
+
+        self.names = []
+        self.headers = []
+        for channel in channels:
+            name, header = (channel, channel) if isinstance(channel, str) else channel
+            self.names.append(name)
+            self.headers.append(header)
+
+        self.dtype = np.dtype([(name, dtype) for name in self.names])
+        self.chunk_size = int(chunk_size)
+        self.mode = mode
+        self.decimation = int(decimation)
+        self.clear()
+
+    def clear(self):
+        """Drop all samples, keeping the first chunk allocated"""
+        first = self._chunks[0] if getattr(self, '_chunks', None) else np.empty(self.chunk_size, dtype=self.dtype)
+        self._chunks = [first]
+        self._buffer = first
+        self._index = 0
+        self._skip = 0
+        self._wrapped = False
+
+    def record(self, values):
+        """Store one sample (a tuple in channel order), subject to decimation"""
+        if self._skip:
+            self._skip -= 1
+            return
+        self._skip = self.decimation - 1
+        index = self._index
+        if index == self.chunk_size:
+            self._next_chunk()
+            index = 0
+        self._buffer[index] = values
+        self._index = index + 1
+
+    def _next_chunk(self):
+        if self.mode == 'ring':
+            self._wrapped = True
+        else:
+            self._buffer = np.empty(self.chunk_size, dtype=self.dtype)
+            self._chunks.append(self._buffer)
+        self._index = 0
+
+    def __len__(self):
+        if self.mode == 'ring':
+            return self.chunk_size if self._wrapped else self._index
+        return (len(self._chunks) - 1) * self.chunk_size + self._index
+
+    def data(self):
+        """
+        All retained samples in chronological order, as one structured array.
+        While everything fits in one chunk this is a view of the buffer, not a copy.
+        """
+        if self.mode == 'ring' and self._wrapped:
+            return np.concatenate((self._buffer[self._index:], self._buffer[:self._index]))
+        if len(self._chunks) == 1:
+            return self._buffer[:self._index]
+        return np.concatenate(self._chunks[:-1] + [self._buffer[:self._index]])
+
+    def columns(self):
+        """Dict of channel name -> 1D array"""
+        data = self.data()
+        return {name: data[name] for name in self.names}
+
+    def last(self):
+        """Most recent sample, or None if nothing was recorded"""
+        if len(self) == 0:
+            return None
+        index = self._index - 1 if self._index else self.chunk_size - 1
+        return self._buffer[index]
+
+    def to_dataframe(self):
+        import pandas as pd
+        return pd.DataFrame(self.columns())
+
+    def to_csv(self, path, use_headers=True):
+        """Write one labelled column per channel, as the telemetry/*.csv files"""
+        data = self.data()
+        header = ','.join(_csv_quote(h) for h in (self.headers if use_headers else self.names))
+        table = np.column_stack([data[name] for name in self.names]) if len(data) else np.empty((0, len(self.names)))
+        np.savetxt(path, table, delimiter=',', header=header, comments='', fmt='%.17g')
+
+    def save(self, path):
+        """Columnar .npz: one array per channel, plus the CSV headers"""
+        np.savez(path, **self.columns(), _headers=np.array(self.headers))
+
+    @staticmethod
+    def load(path):
+        """Read a recording written by save() back as a dict of columns"""
+        with np.load(path) as f:
+            return {name: f[name] for name in f.files if name != '_headers'}
+
+
+def _csv_quote(text):
+    return f'"{text}"' if ',' in text else text
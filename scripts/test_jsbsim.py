@@ -3,68 +3,133 @@ import os
 import jsbsim
 import numpy as np
 import matplotlib.pyplot as plt
-import csv
 import math
 
+from fdm_io import FdmIO
+from guidance_table import DEFAULT_TABLE_PATH, FT_TO_M, JSBSIM_VEHICLE, LBS_TO_KG, GuidanceTable
+from telemetry_recorder import TelemetryRecorder
+
 # === Paths ===
-aircraft_path = os.path.abspath("C:/Users/cmodi.000/Falcon9Sim/aircraft")
-engine_path = os.path.abspath("C:/Users/cmodi.000/Falcon9Sim/aircraft/Falcon9Booster")
-systems_path = os.path.abspath("C:/Python313/Lib/site-packages/jsbsim/systems")
-telemetry_dir = os.path.abspath("C:/Users/cmodi.000/Falcon9Sim/telemetry")
-os.makedirs(telemetry_dir, exist_ok=True)
-
-# === Initialize JSBSim ===
-fdm = jsbsim.FGFDMExec(None)
-fdm.set_debug_level(3)
-fdm.set_aircraft_path(aircraft_path)
-fdm.set_engine_path(engine_path)
-fdm.set_systems_path(systems_path)
-
-# Load model and check if successful
-try:
-    fdm.load_model('Falcon9Booster')
-    print(f"Model loaded successfully. JSBSim version: {jsbsim.__version__}")
-except Exception as e:
-    print(f"Error loading model: {e}")
-    exit(1)
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+aircraft_path = os.path.join(REPO_DIR, "aircraft")
+engine_path = os.path.join(REPO_DIR, "aircraft", "Falcon9Booster")
+systems_path = os.path.join(jsbsim.get_default_root_dir(), "systems")
+telemetry_dir = os.path.join(REPO_DIR, "telemetry")
 
 # === Enhanced Initial Conditions ===
 # More realistic Falcon 9 entry conditions
-fdm['ic/h-sl-ft'] = 70000      # Entry altitude (feet) - reduced for more realistic scenario
-fdm['ic/vc-fps'] = -400        # Initial downward velocity (fps) - more realistic entry speed
-fdm['ic/pitch-deg'] = -10      # Slight nose down for controlled descent
-fdm['ic/psi-true-deg'] = 0     # Heading (degrees)
-fdm['ic/phi-deg'] = 0          # Roll (degrees)
-fdm['ic/long-gc-deg'] = -80.6  # Cape Canaveral longitude
-fdm['ic/lat-gc-deg'] = 28.6    # Cape Canaveral latitude
-
-# Set velocity components more realistically
-fdm['ic/u-fps'] = -50          # Small forward velocity component
-fdm['ic/v-fps'] = 0            # No lateral velocity
-fdm['ic/w-fps'] = -395         # Primarily downward velocity
+DEFAULT_INITIAL_CONDITIONS = {
+    'ic/h-sl-ft': 70000,       # Entry altitude (feet) - reduced for more realistic scenario
+    'ic/vc-fps': -400,         # Initial downward velocity (fps) - more realistic entry speed
+    'ic/pitch-deg': -10,       # Slight nose down for controlled descent
+    'ic/psi-true-deg': 0,      # Heading (degrees)
+    'ic/phi-deg': 0,           # Roll (degrees)
+    'ic/long-gc-deg': -80.6,   # Cape Canaveral longitude
+    'ic/lat-gc-deg': 28.6,     # Cape Canaveral latitude
+    # Set velocity components more realistically
+    'ic/u-fps': -50,           # Small forward velocity component
+    'ic/v-fps': 0,             # No lateral velocity
+    'ic/w-fps': -395,          # Primarily downward velocity
+}
 
 # Initialize fuel state (partially depleted after ascent)
-fdm['propulsion/tank[0]/contents-lbs'] = 50000  # Remaining RP-1
-fdm['propulsion/tank[1]/contents-lbs'] = 120000 # Remaining LOX
+DEFAULT_TANK_CONTENTS = {
+    'propulsion/tank[0]/contents-lbs': 50000,   # Remaining RP-1
+    'propulsion/tank[1]/contents-lbs': 120000,  # Remaining LOX
+}
+
+
+# Properties read each step by run_landing() (FdmIO state vector order) ...
+STATE_PROPERTIES = [
+    'position/h-sl-ft',
+    'attitude/pitch-deg',
+    'attitude/psi-true-deg',
+    'attitude/phi-deg',
+    'velocities/u-fps',
+    'velocities/v-fps',
+    'velocities/w-fps',
+    'propulsion/tank[0]/contents-lbs',
+    'inertia/weight-lbs',
+]
 
-# Deploy landing legs initially
-fdm['gear/gear-cmd-norm'] = 1.0
+# ... and written by Falcon9Controller.update_control() (control vector order)
+CONTROL_PROPERTIES = [
+    'fcs/pitch-control',
+    'fcs/yaw-control',
+    'fcs/roll-control',
+    'propulsion/engine[0]/set-throttle',
+    'fcs/gridfin-cmd-norm',
+]
+
+# Logged per step by run_landing(): (recorder channel, CSV header)
+TELEMETRY_CHANNELS = [
+    ('time', "Time (s)"),
+    ('altitude', "Altitude (ft)"),
+    ('vvert', "Vertical Speed (fps)"),
+    ('pitch', "Pitch (deg)"),
+    ('yaw', "Yaw (deg)"),
+    ('roll', "Roll (deg)"),
+    ('throttle', "Throttle"),
+    ('fuel_mass', "Fuel Mass (lbs)"),
+    ('lateral_vel', "Lateral Vel (fps)"),
+    ('gridfin_cmd', "GridFin Cmd"),
+    ('pitch_control', "Pitch Control"),
+    ('yaw_control', "Yaw Control"),
+    ('roll_control', "Roll Control"),
+]
+
+
+def create_fdm(debug_level=3):
+    """Create a JSBSim instance with the Falcon9Booster model loaded"""
+    fdm = jsbsim.FGFDMExec(None)
+    fdm.set_debug_level(debug_level)
+    fdm.set_aircraft_path(aircraft_path)
+    fdm.set_engine_path(engine_path)
+    fdm.set_systems_path(systems_path)
+    fdm.load_model('Falcon9Booster')
+    return fdm
 
-fdm.run_ic()
 
-# === Enhanced Simulation Parameters ===
-dt = fdm.get_delta_t()
-max_time = 500                 # Extended simulation time
-steps = int(max_time / dt)
-telemetry = []
+def initialize(fdm, initial_conditions=None, tank_contents=None, environment=None, reset=False):
+    """
+    Apply entry conditions and run the IC. With reset=True an already used FDM is
+    returned to t=0 first, so one loaded model can fly many scenarios.
+    """
+    for prop, value in {**DEFAULT_INITIAL_CONDITIONS, **(initial_conditions or {})}.items():
+        fdm[prop] = value
+    if reset:
+        fdm.reset_to_initial_conditions(0)
+    # Tank contents and environment are plain properties, set after any reset
+    for prop, value in {**DEFAULT_TANK_CONTENTS, **(tank_contents or {})}.items():
+        fdm[prop] = value
+    for prop, value in (environment or {}).items():
+        fdm[prop] = value
+
+    # Deploy landing legs initially
+    fdm['gear/gear-cmd-norm'] = 1.0
+
+    fdm.run_ic()
 
 # === Enhanced Control System ===
 class Falcon9Controller:
-    def __init__(self):
-        # PID gains for attitude control (tuned for Falcon 9)
-        self.pid_pitch = {'kp': 0.8, 'ki': 0.02, 'kd': 0.15}
-        self.pid_yaw = {'kp': 0.6, 'ki': 0.015, 'kd': 0.12}
-        self.pid_roll = {'kp': 0.4, 'ki': 0.01, 'kd': 0.08}
+    # PID gains for attitude control (tuned for Falcon 9)
+    DEFAULT_GAINS = {
+        'pitch': {'kp': 0.8, 'ki': 0.02, 'kd': 0.15},
+        'yaw': {'kp': 0.6, 'ki': 0.015, 'kd': 0.12},
+        'roll': {'kp': 0.4, 'ki': 0.01, 'kd': 0.08},
+    }
+
+    def __init__(self, gains=None, guidance=None):
+        gains = gains or {}
+        # Precomputed optimal throttle policy (guidance_table.GuidanceTable) for states
+        # inside its axes; None uses the altitude brackets of calculate_throttle()
+        if guidance is not None and guidance.vehicle != JSBSIM_VEHICLE['name']:
+            raise ValueError(f"Guidance table solved for {guidance.vehicle or 'FalconLandingODE'}, "
+                             f"not the JSBSim {JSBSIM_VEHICLE['name']}; rebuild it with guidance_table.py")
+        self.guidance = guidance
+        self.pid_pitch = {**self.DEFAULT_GAINS['pitch'], **gains.get('pitch', {})}
+        self.pid_yaw = {**self.DEFAULT_GAINS['yaw'], **gains.get('yaw', {})}
+        self.pid_roll = {**self.DEFAULT_GAINS['roll'], **gains.get('roll', {})}
         
         # Error terms
         self.pitch_integral = 0
@@ -102,19 +167,16 @@ class Falcon9Controller:
         
         return desired_pitch, desired_yaw, desired_roll
     
-    def update_control(self, fdm, dt):
-        """Main control update function"""
+    def update_control(self, state, dt, controls):
+        """
+        Main control update function. state is the FdmIO state vector (STATE_PROPERTIES
+        order); the commands are stored into controls (CONTROL_PROPERTIES order).
+        """
         # Get current state
-        altitude = fdm['position/h-sl-ft']
-        pitch = fdm['attitude/pitch-deg']
-        yaw = fdm['attitude/psi-true-deg']
-        roll = fdm['attitude/phi-deg']
-        vvert = -fdm['velocities/w-fps']  # Upward positive
+        altitude, pitch, yaw, roll, u, v, w, _, weight = state.tolist()
+        vvert = -w  # Upward positive
         
         # Get velocity vector
-        u = fdm['velocities/u-fps']
-        v = fdm['velocities/v-fps']  
-        w = fdm['velocities/w-fps']
         velocity_vector = np.array([u, v, w])
         
         # Calculate desired attitudes
@@ -158,22 +220,18 @@ class Falcon9Controller:
         yaw_control = np.clip(yaw_control, -1.0, 1.0)
         roll_control = np.clip(roll_control, -1.0, 1.0)
         
-        # Apply controls
-        fdm['fcs/pitch-control'] = pitch_control
-        fdm['fcs/yaw-control'] = yaw_control
-        fdm['fcs/roll-control'] = roll_control
-        
         # Engine throttle control
-        throttle = self.calculate_throttle(altitude, vvert)
-        fdm['propulsion/engine[0]/set-throttle'] = throttle
+        throttle = self.calculate_throttle(altitude, vvert, weight)
         
         # Grid fin control for atmospheric flight
         if altitude > 1000:  # Only use grid fins in atmosphere
-            lateral_vel = fdm['velocities/v-fps']
+            lateral_vel = v
             gridfin_cmd = np.clip(-0.1 * lateral_vel - 0.05 * yaw_error, -1.0, 1.0)
-            fdm['fcs/gridfin-cmd-norm'] = gridfin_cmd
         else:
-            fdm['fcs/gridfin-cmd-norm'] = 0.0
+            gridfin_cmd = 0.0
+        
+        # Apply controls
+        controls[:] = (pitch_control, yaw_control, roll_control, throttle, gridfin_cmd)
         
         # Store previous errors
         self.prev_pitch_error = pitch_error
@@ -185,11 +243,18 @@ class Falcon9Controller:
             'pitch_control': pitch_control,
             'yaw_control': yaw_control,
             'roll_control': roll_control,
-            'gridfin_cmd': fdm['fcs/gridfin-cmd-norm'] if altitude > 1000 else 0.0
+            'gridfin_cmd': gridfin_cmd
         }
     
-    def calculate_throttle(self, altitude, vvert):
+    def calculate_throttle(self, altitude, vvert, weight=None):
         """Calculate engine throttle based on altitude and vertical velocity"""
+        if self.guidance is not None and weight is not None:
+            # Optimal policy lookup within the table (m, m/s and kg); outside it, the brackets below
+            state = (altitude * FT_TO_M, vvert * FT_TO_M, weight * LBS_TO_KG)
+            if self.guidance.contains(*state):
+                throttle = self.guidance.lookup(*state)[0]
+                return min(max(throttle, 0.0), 1.0)
+
         if altitude > 25000:
             # High altitude - no thrust
             return 0.0
@@ -234,131 +299,185 @@ class Falcon9Controller:
             angle += 360
         return angle
 
-# === Main Simulation Loop ===
-controller = Falcon9Controller()
-landed = False
+def classify_landing(landing_velocity):
+    """Touchdown outcome from the vertical speed at ground contact (fps)"""
+    if landing_velocity < 10:  # 10 fps = ~6.8 mph
+        return 'success'
+    elif landing_velocity < 20:
+        return 'hard'
+    return 'crash'
 
-print("Starting Falcon 9 landing simulation...")
-print(f"Initial conditions: Alt={fdm['position/h-sl-ft']:.0f}ft, VVel={-fdm['velocities/w-fps']:.1f}fps")
 
-for step in range(steps):
-    time = step * dt
-    
-    # Get current state
-    altitude = fdm['position/h-sl-ft']
-    vvert = -fdm['velocities/w-fps']
-    pitch = fdm['attitude/pitch-deg']
-    yaw = fdm['attitude/psi-true-deg']
-    roll = fdm['attitude/phi-deg']
-    fuel_mass = fdm['propulsion/tank[0]/contents-lbs']
-    
-    # Update controller
-    control_outputs = controller.update_control(fdm, dt)
-    
-    # Run simulation step
+def run_landing(fdm, controller, max_time=500, verbose=True, decimation=1):
+    """
+    Fly one landing with the controller until touchdown or max_time.
+    Returns (result, telemetry) where result summarizes the outcome and telemetry
+    is a TelemetryRecorder holding every decimation-th step.
+    """
+    dt = fdm.get_delta_t()
+    steps = int(max_time / dt)
+    telemetry = TelemetryRecorder(TELEMETRY_CHANNELS, chunk_size=steps // decimation + 1, decimation=decimation)
+    io = FdmIO(fdm, STATE_PROPERTIES, CONTROL_PROPERTIES)
+    lateral_vel_node = fdm.get_property_manager().get_node('velocities/v-fps', False)
+    result = {'outcome': 'timeout', 'touchdown_speed_fps': float('nan'), 'time': 0.0}
+    time = 0.0
+
+    if verbose:
+        print("Starting Falcon 9 landing simulation...")
+        print(f"Initial conditions: Alt={fdm['position/h-sl-ft']:.0f}ft, VVel={-fdm['velocities/w-fps']:.1f}fps")
+
+    for step in range(steps):
+        time = step * dt
+
+        # Get current state
+        state = io.read_state()
+        altitude, pitch, yaw, roll, _, _, w, fuel_mass, _ = state.tolist()
+        vvert = -w
+
+        # Update controller
+        control_outputs = controller.update_control(state, dt, io.controls)
+        io.write_controls()
+
+        # Run simulation step
+        try:
+            fdm.run()
+        except Exception as e:
+            if verbose:
+                print(f"Simulation error at t={time:.1f}s: {e}")
+            result['outcome'] = 'error'
+            break
+
+        # Log telemetry
+        telemetry.record((
+            time, altitude, vvert, pitch, yaw, roll,
+            control_outputs['throttle'], fuel_mass,
+            lateral_vel_node.get_double_value(),  # lateral velocity
+            control_outputs.get('gridfin_cmd', 0.0),
+            control_outputs['pitch_control'],
+            control_outputs['yaw_control'],
+            control_outputs['roll_control']
+        ))
+
+        # Progress reporting
+        if verbose and step % 1000 == 0:
+            print(f"t={time:.1f}s: Alt={altitude:.0f}ft, VVel={vvert:.1f}fps, Throttle={control_outputs['throttle']:.2f}")
+
+        # Check for landing or crash
+        if altitude <= 0.0:
+            landing_velocity = abs(vvert)
+            result['outcome'] = classify_landing(landing_velocity)
+            result['touchdown_speed_fps'] = landing_velocity
+            if verbose:
+                if result['outcome'] == 'success':
+                    print(f"🎉 SUCCESSFUL LANDING! Touchdown velocity: {landing_velocity:.2f} fps ({landing_velocity*0.682:.1f} mph)")
+                elif result['outcome'] == 'hard':
+                    print(f"⚠️  HARD LANDING! Touchdown velocity: {landing_velocity:.2f} fps ({landing_velocity*0.682:.1f} mph)")
+                else:
+                    print(f"💥 CRASH! Touchdown velocity: {landing_velocity:.2f} fps ({landing_velocity*0.682:.1f} mph)")
+            break
+
+        # Safety check - stop if simulation goes too long or something goes wrong
+        if time > max_time or altitude > 100000:
+            if verbose:
+                print("Simulation stopped - exceeded limits")
+            result['outcome'] = 'out_of_bounds' if altitude > 100000 else 'timeout'
+            break
+
+    result['time'] = time
+    result['fuel_left_lbs'] = fdm['propulsion/tank[0]/contents-lbs']
+    result['oxidizer_left_lbs'] = fdm['propulsion/tank[1]/contents-lbs']
+    return result, telemetry
+
+
+if __name__ == '__main__':
+    os.makedirs(telemetry_dir, exist_ok=True)
+
+    # === Initialize JSBSim ===
+    # Load model and check if successful
     try:
-        fdm.run()
+        fdm = create_fdm()
+        print(f"Model loaded successfully. JSBSim version: {jsbsim.__version__}")
     except Exception as e:
-        print(f"Simulation error at t={time:.1f}s: {e}")
-        break
-    
-    # Log telemetry
-    telemetry.append([
-        time, altitude, vvert, pitch, yaw, roll,
-        control_outputs['throttle'], fuel_mass,
-        fdm['velocities/v-fps'],  # lateral velocity
-        control_outputs.get('gridfin_cmd', 0.0),
-        control_outputs['pitch_control'],
-        control_outputs['yaw_control'],
-        control_outputs['roll_control']
-    ])
-    
-    # Progress reporting
-    if step % 1000 == 0:
-        print(f"t={time:.1f}s: Alt={altitude:.0f}ft, VVel={vvert:.1f}fps, Throttle={control_outputs['throttle']:.2f}")
-    
-    # Check for landing or crash
-    if altitude <= 0.0:
-        landing_velocity = abs(vvert)
-        if landing_velocity < 10:  # 10 fps = ~6.8 mph
-            print(f"🎉 SUCCESSFUL LANDING! Touchdown velocity: {landing_velocity:.2f} fps ({landing_velocity*0.682:.1f} mph)")
-        elif landing_velocity < 20:
-            print(f"⚠️  HARD LANDING! Touchdown velocity: {landing_velocity:.2f} fps ({landing_velocity*0.682:.1f} mph)")
+        print(f"Error loading model: {e}")
+        exit(1)
+
+    initialize(fdm)
+
+    # === Enhanced Simulation Parameters ===
+    max_time = 500                 # Extended simulation time
+
+    # === Main Simulation Loop ===
+    # Optimal guidance table if one has been built (python guidance_table.py)
+    guidance = None
+    if os.path.exists(DEFAULT_TABLE_PATH):
+        guidance = GuidanceTable.load(DEFAULT_TABLE_PATH)
+        if guidance.vehicle == JSBSIM_VEHICLE['name']:
+            print(f"Throttle from guidance table {DEFAULT_TABLE_PATH} inside its axes")
         else:
-            print(f"💥 CRASH! Touchdown velocity: {landing_velocity:.2f} fps ({landing_velocity*0.682:.1f} mph)")
-        
-        landed = True
-        break
-    
-    # Safety check - stop if simulation goes too long or something goes wrong
-    if time > max_time or altitude > 100000:
-        print("Simulation stopped - exceeded limits")
-        break
-
-# === Enhanced Data Analysis and Visualization ===
-print(f"Simulation completed. Total time: {time:.1f}s")
-
-# Save telemetry
-telemetry_file = os.path.join(telemetry_dir, "falcon9_landing_telemetry.csv")
-with open(telemetry_file, "w", newline="") as csvfile:
-    writer = csv.writer(csvfile)
-    writer.writerow([
-        "Time (s)", "Altitude (ft)", "Vertical Speed (fps)", "Pitch (deg)", 
-        "Yaw (deg)", "Roll (deg)", "Throttle", "Fuel Mass (lbs)", 
-        "Lateral Vel (fps)", "GridFin Cmd", "Pitch Control", "Yaw Control", "Roll Control"
-    ])
-    writer.writerows(telemetry)
-
-print(f"Telemetry saved to: {telemetry_file}")
-
-# Enhanced plotting
-if telemetry:
-    data = np.array(telemetry)
-    time_data = data[:, 0]
-    alt_data = data[:, 1]
-    vvert_data = data[:, 2]
-    throttle_data = data[:, 6]
-    pitch_data = data[:, 3]
-    
-    # Create comprehensive plots
-    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 10))
-    
-    # Altitude and velocity profile
-    ax1.plot(time_data, alt_data, 'b-', label='Altitude (ft)', linewidth=2)
-    ax1_twin = ax1.twinx()
-    ax1_twin.plot(time_data, vvert_data, 'r-', label='Vertical Speed (fps)', linewidth=2)
-    ax1.set_xlabel('Time (s)')
-    ax1.set_ylabel('Altitude (ft)', color='b')
-    ax1_twin.set_ylabel('Vertical Speed (fps)', color='r')
-    ax1.set_title('Altitude and Vertical Speed vs Time')
-    ax1.grid(True, alpha=0.3)
-    
-    # Engine throttle
-    ax2.plot(time_data, throttle_data * 100, 'g-', label='Engine Throttle (%)', linewidth=2)
-    ax2.set_xlabel('Time (s)')
-    ax2.set_ylabel('Throttle (%)')
-    ax2.set_title('Engine Throttle vs Time')
-    ax2.grid(True, alpha=0.3)
-    ax2.set_ylim(0, 100)
-    
-    # Attitude
-    ax3.plot(time_data, pitch_data, 'purple', label='Pitch (deg)', linewidth=2)
-    ax3.set_xlabel('Time (s)')
-    ax3.set_ylabel('Pitch Angle (deg)')
-    ax3.set_title('Pitch Attitude vs Time')
-    ax3.grid(True, alpha=0.3)
-    
-    # Trajectory (altitude vs vertical speed)
-    ax4.plot(vvert_data, alt_data, 'orange', linewidth=2)
-    ax4.set_xlabel('Vertical Speed (fps)')
-    ax4.set_ylabel('Altitude (ft)')
-    ax4.set_title('Descent Trajectory')
-    ax4.grid(True, alpha=0.3)
-    
-    plt.tight_layout()
-    plot_path = os.path.join(telemetry_dir, "falcon9_landing_analysis.png")
-    plt.savefig(plot_path, dpi=300, bbox_inches='tight')
-    print(f"Analysis plots saved to: {plot_path}")
-    plt.show()
+            print(f"Guidance table {DEFAULT_TABLE_PATH} is not for {JSBSIM_VEHICLE['name']}; "
+                  f"rebuild it with guidance_table.py. Using the altitude brackets")
+            guidance = None
+    controller = Falcon9Controller(guidance=guidance)
+    result, telemetry = run_landing(fdm, controller, max_time=max_time)
+    time = result['time']
+
+    # === Enhanced Data Analysis and Visualization ===
+    print(f"Simulation completed. Total time: {time:.1f}s")
+
+    # Save telemetry
+    telemetry_file = os.path.join(telemetry_dir, "falcon9_landing_telemetry.csv")
+    telemetry.to_csv(telemetry_file)
+
+    print(f"Telemetry saved to: {telemetry_file}")
+
+    # Enhanced plotting
+    if len(telemetry):
+        data = telemetry.columns()
+        time_data = data['time']
+        alt_data = data['altitude']
+        vvert_data = data['vvert']
+        throttle_data = data['throttle']
+        pitch_data = data['pitch']
+
+        # Create comprehensive plots
+        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 10))
+
+        # Altitude and velocity profile
+        ax1.plot(time_data, alt_data, 'b-', label='Altitude (ft)', linewidth=2)
+        ax1_twin = ax1.twinx()
+        ax1_twin.plot(time_data, vvert_data, 'r-', label='Vertical Speed (fps)', linewidth=2)
+        ax1.set_xlabel('Time (s)')
+        ax1.set_ylabel('Altitude (ft)', color='b')
+        ax1_twin.set_ylabel('Vertical Speed (fps)', color='r')
+        ax1.set_title('Altitude and Vertical Speed vs Time')
+        ax1.grid(True, alpha=0.3)
+
+        # Engine throttle
+        ax2.plot(time_data, throttle_data * 100, 'g-', label='Engine Throttle (%)', linewidth=2)
+        ax2.set_xlabel('Time (s)')
+        ax2.set_ylabel('Throttle (%)')
+        ax2.set_title('Engine Throttle vs Time')
+        ax2.grid(True, alpha=0.3)
+        ax2.set_ylim(0, 100)
+
+        # Attitude
+        ax3.plot(time_data, pitch_data, 'purple', label='Pitch (deg)', linewidth=2)
+        ax3.set_xlabel('Time (s)')
+        ax3.set_ylabel('Pitch Angle (deg)')
+        ax3.set_title('Pitch Attitude vs Time')
+        ax3.grid(True, alpha=0.3)
+
+        # Trajectory (altitude vs vertical speed)
+        ax4.plot(vvert_data, alt_data, 'orange', linewidth=2)
+        ax4.set_xlabel('Vertical Speed (fps)')
+        ax4.set_ylabel('Altitude (ft)')
+        ax4.set_title('Descent Trajectory')
+        ax4.grid(True, alpha=0.3)
+
+        plt.tight_layout()
+        plot_path = os.path.join(telemetry_dir, "falcon9_landing_analysis.png")
+        plt.savefig(plot_path, dpi=300, bbox_inches='tight')
+        print(f"Analysis plots saved to: {plot_path}")
+        plt.show()
 
-print("Simulation complete!")
\ No newline at end of file
+    print("Simulation complete!")
@@ -0,0 +1,21 @@
+"""
+pytest check of the headless 2D engine (falcon9_sim2d.py) against the trace recorded
+from the browser simulation (check_sim2d_parity.py), through touchdown.
+
+    pytest scripts/test_sim2d_parity.py
+"""
+import pandas as pd
+
+from check_sim2d_parity import DEFAULT_TRACE, check_parity
+from falcon9_sim2d import PHASE_LANDED
+
+
+def test_reference_trace_touches_down():
+    trace = pd.read_csv(DEFAULT_TRACE)
+    assert trace['phase'].iloc[-1] == PHASE_LANDED
+    assert trace['y'].iloc[-1] == 0.0
+    assert (trace['vy'] < 0.0).any()
+
+
+def test_parity_through_touchdown():
+    assert check_parity(DEFAULT_TRACE, batch_size=4)
@@ -0,0 +1,183 @@
+"""
+Compact binary store for Dymos timeseries output, in place of the SQLite case
+recorder of dm.run_problem.
+
+OpenMDAO's SqliteRecorder pickles every recorded variable of every case, and reading
+a timeseries back means unpickling whole cases. Here only the declared timeseries
+outputs of a phase are kept (time, states, controls, path constraints), each as one
+raw typed array file that cases are appended to. index.json holds the dtype, row
+shape and units of every variable and the row range of every case. Reading maps the
+variable file into memory (np.memmap) and slices out the case, so loading one
+variable of one case reads only those bytes.
+
+Several processes may append to one store: an append holds an exclusive lock on the
+directory (fcntl, where available), merges the index other writers left on disk, and
+takes the row offset of every variable from the size of its file, not from the rows
+this instance last saw.
+
+    store = TimeseriesStore('falcon_landing_dymos_out/timeseries')
+    store.record_phase(p, phase, case='solution')
+    store.append('simulation', {'time': t, 'h': h})
+    h = store.read('h', case='solution')          # memory-mapped, no copy
+    series = store.read_case('solution')          # {name: array}
+
+    python timeseries_store.py <directory>        # list cases and variables
+"""
+import argparse
+from contextlib import contextmanager
+import json
+import os
+import re
+import time
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are not locked
+    fcntl = None
+
+
+class TimeseriesStore:
+    """Appendable per-variable arrays on disk; cases are row ranges of those arrays"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._index_path = os.path.join(directory, 'index.json')
+        self.variables, self.cases = {}, {}
+        self._load_index()
+
+    def __contains__(self, case):
+        return case in self.cases
+
+    def append(self, case, values, units=None):
+        """
+        Add a case: values is {name: (rows, ...) array}, units optionally {name: units}.
+        Every variable keeps the dtype and row shape it was first recorded with.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        with self._locked():
+            # Other processes may have appended since this store was opened
+            self._load_index()
+            if case in self.cases:
+                raise ValueError(f"Case {case!r} is already in {self.directory}")
+            self._append(case, values, units)
+            self._write_index()
+
+    def _append(self, case, values, units):
+        ranges = {}
+        for name, value in values.items():
+            value = np.asarray(value)
+            if value.ndim == 0:
+                value = value.reshape(1)
+            var = self.variables.get(name)
+            if var is None:
+                var = self.variables[name] = {
+                    'file': _file_name(name, self.variables),
+                    'dtype': value.dtype.str,
+                    'shape': list(value.shape[1:]),
+                    'units': (units or {}).get(name),
+                    'rows': 0,
+                }
+            elif list(value.shape[1:]) != var['shape']:
+                raise ValueError(f"{name}: rows of shape {value.shape[1:]}, recorded as {tuple(var['shape'])}")
+
+            row_bytes = np.dtype(var['dtype']).itemsize * int(np.prod(var['shape']))
+            with open(os.path.join(self.directory, var['file']), 'ab') as f:
+                # The file, not the index, says where this case starts; a partial row left by
+                # an interrupted append is cut off
+                start = os.fstat(f.fileno()).st_size // row_bytes
+                f.truncate(start * row_bytes)
+                f.write(np.ascontiguousarray(value, dtype=var['dtype']).tobytes())
+            ranges[name] = [start, len(value)]
+            var['rows'] = start + len(value)
+
+        self.cases[case] = {'variables': ranges, 'created': time.strftime('%Y-%m-%d %H:%M:%S')}
+
+    def record_phase(self, p, phase, case='solution', phase_path='traj.phase0'):
+        """Add the timeseries of a phase (time, states, controls, path constraints) as a case"""
+        series = f"{phase_path}.timeseries"
+        units = {'time': phase.time_options['units']}
+        units.update({name: options['units'] for name, options in phase.state_options.items()})
+        units.update({name: options['units'] for name, options in phase.control_options.items()})
+        names = ['time', *phase.state_options, *phase.control_options]
+        for constraint in phase._path_constraints:
+            name = constraint.get('constraint_name') or constraint['name'].rpartition('.')[2]
+            if name not in names:
+                names.append(name)
+        self.append(case, {name: p.get_val(f"{series}.{name}") for name in names},
+                    {name: unit for name, unit in units.items() if isinstance(unit, str)})
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive lock on the store for the duration of an append"""
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.directory, '.lock'), 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _load_index(self):
+        if os.path.exists(self._index_path):
+            with open(self._index_path) as f:
+                index = json.load(f)
+            self.variables, self.cases = index['variables'], index['cases']
+
+    def _write_index(self):
+        tmp = f"{self._index_path}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({'variables': self.variables, 'cases': self.cases}, f, indent=1)
+        os.replace(tmp, self._index_path)  # atomic, so a reader never sees a partial index
+
+    def read(self, name, case=None):
+        """
+        Memory-mapped rows of one variable: those of case, or every recorded row.
+        Only the pages that are used get read from disk.
+        """
+        var = self.variables[name]
+        data = np.memmap(os.path.join(self.directory, var['file']), dtype=np.dtype(var['dtype']), mode='r',
+                         shape=(var['rows'], *var['shape']))
+        if case is None:
+            return data
+        if name not in self.cases[case]['variables']:
+            raise KeyError(f"{name} was not recorded in case {case!r}")
+        start, rows = self.cases[case]['variables'][name]
+        return data[start:start + rows]
+
+    def read_case(self, case, names=None):
+        """{name: memory-mapped rows} of the variables of case (all, or names)"""
+        recorded = self.cases[case]['variables']
+        return {name: self.read(name, case) for name in (names or recorded)}
+
+    def units(self, name):
+        return self.variables[name]['units']
+
+
+def _file_name(name, variables):
+    """File for a variable name; names like 'states:x' are made filesystem safe and unique"""
+    base = re.sub(r'[^A-Za-z0-9_]+', '_', name) or 'var'
+    taken = {var['file'] for var in variables.values()}
+    candidate, i = f"{base}.bin", 1
+    while candidate in taken:
+        candidate, i = f"{base}_{i}.bin", i + 1
+    return candidate
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='List the cases and variables of a timeseries store')
+    parser.add_argument('directory')
+    args = parser.parse_args()
+
+    store = TimeseriesStore(args.directory)
+    size = sum(os.path.getsize(os.path.join(args.directory, v['file'])) for v in store.variables.values())
+    print(f"{len(store.cases)} cases, {len(store.variables)} variables, {size / 1024:.1f} KiB in {args.directory}")
+    for name, var in store.variables.items():
+        print(f"  {name:<16} {np.dtype(var['dtype']).name:<8} row shape {tuple(var['shape'])!s:<8} "
+              f"{var['rows']:>8} rows  {var['units'] or ''}")
+    for case, meta in store.cases.items():
+        rows = max(rows for _, rows in meta['variables'].values())
+        print(f"  case {case:<20} {len(meta['variables'])} variables, {rows} rows, {meta['created']}")
@@ -0,0 +1,256 @@
+"""
+Vectorized explicit simulation of a solved Dymos phase, as a check of the collocation
+solution.
+
+dm.run_problem(..., simulate=True) builds a second OpenMDAO problem and re-integrates
+the optimal controls with SciPy's adaptive solve_ivp, one segment and one trajectory
+at a time. Here the ODE component's compute() is called directly on NumPy arrays (no
+OpenMDAO problem in the loop) and many trajectories are integrated at once: every
+state is an array with one entry per trajectory, so a dispersion check of thousands
+of initial states costs about as many ODE calls as a single trajectory.
+
+The controls are the phase's control polynomials, rebuilt per segment from the
+timeseries nodes (barycentric Lagrange interpolation). Integration is classical RK4
+with steps_per_seg fixed steps in every segment, or Dormand-Prince RK45 with error
+control (one step size for the whole batch). Neither steps across a segment boundary,
+where the control polynomial changes.
+
+Works for FalconLandingODE-style ODEs: a single ExplicitComponent with a num_nodes
+option whose compute() only reads its inputs and options, scalar states and controls,
+and timeseries units equal to the ODE input units.
+
+    sim = simulate_phase(p, phase)
+    print_simulation_error(sim)           # final state vs the collocation solution
+    batch = simulate_phase(p, phase, initial={'h': rng.normal(2500, 50, 1000)}, method='rk4')
+"""
+import numpy as np
+
+# Dormand-Prince 5(4) tableau
+_DP_C = np.array([0.0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0, 1.0])
+_DP_A = [
+    [],
+    [1 / 5],
+    [3 / 40, 9 / 40],
+    [44 / 45, -56 / 15, 32 / 9],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+    [35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84],
+]
+_DP_B = np.array([35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0.0])
+_DP_E = _DP_B - np.array([5179 / 57600, 0.0, 7571 / 16695, 393 / 640, -92097 / 339200, 187 / 2100, 1 / 40])
+
+
+class ControlInterpolant:
+    """
+    Piecewise polynomial controls through the timeseries nodes of each segment.
+    times: (n,) node times; values: {name: (n,) or (n, num_trajectories)};
+    segment_indices: (num_segments, 2) [start, stop) node ranges.
+    """
+
+    def __init__(self, times, values, segment_indices):
+        self.segments = []
+        for start, stop in segment_indices:
+            t = np.asarray(times[start:stop], dtype=float)
+            # Barycentric weights of the segment nodes
+            diff = t[:, None] - t[None, :]
+            np.fill_diagonal(diff, 1.0)
+            weights = 1.0 / diff.prod(axis=1)
+            self.segments.append((t, weights, {name: np.asarray(v[start:stop], dtype=float)
+                                               for name, v in values.items()}))
+        self.breaks = np.array([seg[0][0] for seg in self.segments] + [self.segments[-1][0][-1]])
+
+    def segment_of(self, t):
+        return int(np.clip(np.searchsorted(self.breaks, t, side='right') - 1, 0, len(self.segments) - 1))
+
+    def __call__(self, t, segment=None):
+        """Control values at time t, from the polynomial of segment (default: the one containing t)"""
+        nodes, weights, values = self.segments[self.segment_of(t) if segment is None else segment]
+        d = t - nodes
+        exact = np.flatnonzero(d == 0.0)
+        if exact.size:
+            return {name: v[exact[0]] for name, v in values.items()}
+        c = weights / d
+        c /= c.sum()
+        return {name: c @ v for name, v in values.items()}
+
+
+class _Outputs(dict):
+    """ODE output buffers, allocated on first use (compute() may write in place with out=)"""
+
+    def __init__(self, n):
+        super().__init__()
+        self.n = n
+
+    def __missing__(self, name):
+        self[name] = buffer = np.zeros(self.n)
+        return buffer
+
+
+class PhaseODE:
+    """
+    State rates of a phase's ODE for num_trajectories trajectories at once.
+    states / controls: {name: {'rate_source': ..., 'targets': [...]}} (controls need only targets);
+    static_inputs: {ODE input: value} for inputs fed by neither (parameters).
+    """
+
+    def __init__(self, ode_class, ode_init_kwargs, states, controls, num_trajectories, static_inputs=None):
+        self.ode = ode_class(num_nodes=num_trajectories, **(ode_init_kwargs or {}))
+        self.n = num_trajectories
+        self.states = states
+        self.state_names = list(states)
+        self.controls = controls
+        self.static_inputs = {name: np.broadcast_to(np.asarray(value, dtype=float), (self.n,)).copy()
+                              for name, value in (static_inputs or {}).items()}
+        self.evaluations = 0
+
+    def __call__(self, t, y, control_values):
+        """y: (num_states, num_trajectories); returns dy/dt with the same shape"""
+        inputs = dict(self.static_inputs)
+        for name, row in zip(self.state_names, y):
+            for target in self.states[name]['targets']:
+                inputs[target] = row
+        controls = {name: np.broadcast_to(value, (self.n,)) for name, value in control_values.items()}
+        for name, options in self.controls.items():
+            for target in options['targets']:
+                inputs[target] = controls[name]
+        outputs = _Outputs(self.n)
+        self.ode.compute(inputs, outputs)
+        self.evaluations += 1
+
+        rates = np.empty_like(y)
+        for i, name in enumerate(self.state_names):
+            source = self.states[name]['rate_source']
+            if source == 'time':
+                rates[i] = 1.0
+            elif source in self.states:
+                rates[i] = y[self.state_names.index(source)]
+            elif source in controls:
+                rates[i] = controls[source]
+            else:
+                rates[i] = outputs[source]
+        return rates
+
+
+def rk4(f, controls, y0, steps_per_seg=20):
+    """Classical RK4 with steps_per_seg equal steps in every control segment"""
+    times, history = [controls.breaks[0]], [y0]
+    y = y0
+    for seg in range(len(controls.segments)):
+        grid = np.linspace(controls.breaks[seg], controls.breaks[seg + 1], steps_per_seg + 1)
+        for t, t_next in zip(grid[:-1], grid[1:]):
+            h = t_next - t
+            u0, u_mid, u1 = controls(t, seg), controls(t + 0.5 * h, seg), controls(t_next, seg)
+            k1 = f(t, y, u0)
+            k2 = f(t + 0.5 * h, y + 0.5 * h * k1, u_mid)
+            k3 = f(t + 0.5 * h, y + 0.5 * h * k2, u_mid)
+            k4 = f(t_next, y + h * k3, u1)
+            y = y + (h / 6.0) * (k1 + 2.0 * k2 + 2.0 * k3 + k4)
+            times.append(t_next)
+            history.append(y)
+    return np.array(times), np.array(history)
+
+
+def rk45(f, controls, y0, rtol=1e-8, atol=1e-8, first_step=None, max_steps=100000):
+    """
+    Dormand-Prince RK45 with one adaptive step size for the whole batch (the largest
+    error of any trajectory decides), stopping at every control segment boundary.
+    """
+    t, y = controls.breaks[0], y0
+    times, history = [t], [y0]
+    h = first_step or (controls.breaks[1] - controls.breaks[0]) / 4.0
+    seg, k1 = 0, None
+    for _ in range(max_steps):
+        if seg == len(controls.segments):
+            break
+        t_end = controls.breaks[seg + 1]
+        h = min(h, t_end - t)
+        if k1 is None:
+            k1 = f(t, y, controls(t, seg))
+        k = [k1]
+        for c, a in zip(_DP_C[1:], _DP_A[1:]):
+            y_stage = y + h * sum(ai * ki for ai, ki in zip(a, k) if ai)
+            k.append(f(t + c * h, y_stage, controls(t + c * h, seg)))
+        y_new = y + h * sum(b * ki for b, ki in zip(_DP_B, k) if b)
+        error = h * sum(e * ki for e, ki in zip(_DP_E, k) if e)
+        scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+        err = float(np.max(np.sqrt(np.mean((error / scale)**2, axis=0))))
+
+        if err <= 1.0:
+            t, y = t + h, y_new
+            times.append(t)
+            history.append(y)
+            k1 = k[-1]  # first same as last
+            if t >= t_end - 1e-12 * max(1.0, abs(t_end)):
+                t, seg, k1 = t_end, seg + 1, None  # the next segment has a new control polynomial
+        h *= min(5.0, max(0.2, 0.9 * (err + 1e-16)**-0.2))
+    else:
+        raise RuntimeError(f"rk45 did not reach the end of the phase in {max_steps} steps")
+    return np.array(times), np.array(history)
+
+
+def simulate_phase(p, phase, phase_path='traj.phase0', initial=None, method='rk45', steps_per_seg=20,
+                   rtol=1e-8, atol=1e-8, static_inputs=None):
+    """
+    Integrate the solved phase with its optimal controls. initial: {state: scalar or
+    (num_trajectories,) array} overriding the initial states of the solution; every
+    trajectory flies the same control history. Returns a dict with 'time' (n_out,),
+    'states' {name: (n_out, num_trajectories)}, 'final' and 'error' {name:
+    (num_trajectories,)} (final state minus the collocation final state), 'reference'
+    (collocation final states), 'evaluations' (ODE calls) and 'method'.
+    """
+    series = f"{phase_path}.timeseries"
+    times = p.get_val(f"{series}.time").ravel()
+    segment_indices = phase.options['transcription'].grid_data.segment_indices
+
+    states = {name: {'rate_source': options['rate_source'], 'targets': options['targets'] or []}
+              for name, options in phase.state_options.items()}
+    controls = {name: {'targets': options['targets'] or []} for name, options in phase.control_options.items()}
+    solution = {name: p.get_val(f"{series}.{name}").ravel() for name in states}
+    control_values = {name: p.get_val(f"{series}.{name}").ravel() for name in controls}
+
+    static_inputs = dict(static_inputs or {})
+    for name, options in phase.parameter_options.items():
+        for target in options['targets'] or [name]:
+            static_inputs.setdefault(target, p.get_val(f"{phase_path}.parameter_vals:{name}").ravel()[0])
+
+    initial = {name: np.atleast_1d(np.asarray(value, dtype=float)) for name, value in (initial or {}).items()}
+    n = int(np.broadcast_shapes(*(v.shape for v in initial.values()), (1,))[0])
+    y0 = np.array([np.broadcast_to(initial.get(name, solution[name][0]), (n,)) for name in states], dtype=float)
+
+    f = PhaseODE(phase.options['ode_class'], phase.options['ode_init_kwargs'], states, controls, n,
+                 static_inputs)
+    interpolant = ControlInterpolant(times, control_values, segment_indices)
+    if method == 'rk4':
+        t, history = rk4(f, interpolant, y0, steps_per_seg)
+    elif method == 'rk45':
+        t, history = rk45(f, interpolant, y0, rtol=rtol, atol=atol)
+    else:
+        raise ValueError(f"Unknown method {method!r}; use 'rk4' or 'rk45'")
+
+    names = list(states)
+    final = {name: history[-1, i] for i, name in enumerate(names)}
+    reference = {name: solution[name][-1] for name in names}
+    return {
+        'time': t,
+        'states': {name: history[:, i] for i, name in enumerate(names)},
+        'final': final,
+        'reference': reference,
+        'error': {name: final[name] - reference[name] for name in names},
+        'evaluations': f.evaluations,
+        'method': method,
+    }
+
+
+def print_simulation_error(sim):
+    """Final-state error of a simulate_phase() result against the collocation solution"""
+    n = len(next(iter(sim['final'].values())))
+    print("="*60)
+    print(f"Explicit simulation ({sim['method']}, {n} trajectories, {sim['evaluations']} ODE calls)")
+    print("="*60)
+    print(f"{'state':<10} {'collocation':>14} {'simulated':>14} {'max |error|':>12}")
+    for name, error in sim['error'].items():
+        final = sim['final'][name]
+        simulated = f"{final[0]:>14.4f}" if n == 1 else f"{np.mean(final):>13.4f}*"
+        print(f"{name:<10} {sim['reference'][name]:>14.4f} {simulated} {np.max(np.abs(error)):>12.3e}")
+    if n > 1:
+        print("* mean over the trajectories")
@@ -0,0 +1,231 @@
+"""
+Warm-start database of converged landing trajectories.
+
+Every converged solution of the landing problem (FalconLandingODE.build_landing_problem)
+is stored with its boundary conditions: entry altitude, horizontal and vertical
+velocity, entry mass and the downrange distance to the target x. A new problem is
+seeded from the nearest stored solutions instead of the straight-line guess of
+set_landing_guess: their states and controls are blended in normalized time
+(inverse-distance weights), shifted so the states start at the new entry
+conditions, and interpolated onto the new transcription grid. The duration is blended
+the same way, so the grid of the new problem does not have to match the stored one.
+
+    db = SolutionDatabase()
+    boundary = landing_boundary(initial)
+    if not db.seed(p, phase, boundary):
+        set_landing_guess(p, phase, initial)
+    result = dm.run_problem(p, ...)
+    if result.success:
+        db.add_problem(p, boundary)
+
+The database lives in scripts/landing_solutions (FALCON9_SOLUTION_DB to override): one
+.npz per solution plus index.json with the boundary conditions.
+
+    python warm_start.py                  # list stored solutions
+    python warm_start.py --clear
+"""
+import argparse
+import json
+import os
+import shutil
+import time
+import uuid
+
+import numpy as np
+
+DEFAULT_DB_DIR = os.environ.get('FALCON9_SOLUTION_DB',
+                                os.path.join(os.path.dirname(os.path.abspath(__file__)), 'landing_solutions'))
+
+# Boundary conditions a solution is indexed by, and the scales their distances are measured in
+BOUNDARY_NAMES = ('h', 'vx', 'vh', 'mass', 'downrange')
+BOUNDARY_SCALES = np.array([80000.0, 6000.0, 1500.0, 70000.0, 200000.0])
+
+STATE_NAMES = ('x', 'h', 'vx', 'vh', 'mass')
+CONTROL_NAMES = ('throttle', 'gimbal_alpha', 'gimbal_beta')
+
+
+def landing_boundary(initial=None, target_x=None):
+    """Boundary condition dict of a landing problem (defaults from FalconLandingODE)"""
+    from FalconLandingODE import LANDING_FINAL, LANDING_INITIAL
+
+    initial = {**LANDING_INITIAL, **(initial or {})}
+    target_x = LANDING_FINAL['x'] if target_x is None else target_x
+    return {'h': initial['h'], 'vx': initial['vx'], 'vh': initial['vh'], 'mass': initial['mass'],
+            'downrange': target_x - initial['x']}
+
+
+def _boundary_vector(boundary):
+    return np.array([float(boundary[name]) for name in BOUNDARY_NAMES])
+
+
+def _unique_nodes(tau, *arrays):
+    """Drop the repeated segment-boundary nodes of a timeseries (same tau twice)"""
+    tau, index = np.unique(tau, return_index=True)
+    return (tau,) + tuple(a[index] for a in arrays)
+
+
+class SolutionDatabase:
+    """
+    Converged landing trajectories on disk, indexed by boundary conditions.
+    Trajectories are kept in normalized time tau = (t - t0) / duration, with x relative
+    to the target.
+    """
+
+    def __init__(self, directory=DEFAULT_DB_DIR):
+        self.directory = directory
+        self._index_path = os.path.join(directory, 'index.json')
+        self.entries = []
+        if os.path.exists(self._index_path):
+            with open(self._index_path) as f:
+                self.entries = json.load(f)
+        self._vectors = np.array([_boundary_vector(e['boundary']) for e in self.entries]).reshape(-1, len(BOUNDARY_NAMES))
+        self._loaded = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, boundary, times, states, controls, final_mass=None):
+        """
+        Store one solution. times: (n,) node times; states / controls: dicts of (n,) arrays
+        keyed by STATE_NAMES / CONTROL_NAMES. Returns the solution id.
+        """
+        times = np.asarray(times, dtype=float).ravel()
+        duration = times[-1] - times[0]
+        tau, *values = _unique_nodes((times - times[0]) / duration,
+                                     *[np.asarray(states[n], dtype=float).ravel() for n in STATE_NAMES],
+                                     *[np.asarray(controls[n], dtype=float).ravel() for n in CONTROL_NAMES])
+        arrays = dict(zip(STATE_NAMES + CONTROL_NAMES, values))
+        final_mass = arrays['mass'][-1] if final_mass is None else final_mass
+        arrays['x'] = arrays['x'] - arrays['x'][-1]  # stored relative to the target
+
+        solution_id = uuid.uuid4().hex[:12]
+        os.makedirs(self.directory, exist_ok=True)
+        np.savez(os.path.join(self.directory, f"{solution_id}.npz"), tau=tau, **arrays)
+
+        entry = {
+            'id': solution_id,
+            'boundary': {name: float(boundary[name]) for name in BOUNDARY_NAMES},
+            'duration': float(duration),
+            'final_mass': float(final_mass),
+            'nodes': int(len(tau)),
+            'created': time_stamp(),
+        }
+        self.entries.append(entry)
+        self._vectors = np.vstack([self._vectors, _boundary_vector(entry['boundary'])])
+        self._write_index()
+        return solution_id
+
+    def add_problem(self, p, boundary, phase_path='traj.phase0'):
+        """Store the current solution of a landing problem"""
+        series = f"{phase_path}.timeseries"
+        return self.add(boundary, p.get_val(f"{series}.time"),
+                        {name: p.get_val(f"{series}.{name}") for name in STATE_NAMES},
+                        {name: p.get_val(f"{series}.{name}") for name in CONTROL_NAMES})
+
+    def _write_index(self):
+        tmp = f"{self._index_path}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(self.entries, f, indent=1)
+        os.replace(tmp, self._index_path)  # atomic, so a reader never sees a partial index
+
+    def load(self, solution_id):
+        """tau and the state/control arrays of one stored solution"""
+        if solution_id not in self._loaded:
+            with np.load(os.path.join(self.directory, f"{solution_id}.npz")) as data:
+                self._loaded[solution_id] = {name: data[name] for name in data.files}
+        return self._loaded[solution_id]
+
+    def nearest(self, boundary, k=3):
+        """[(scaled distance, entry)] of the k stored solutions closest to boundary"""
+        if not self.entries:
+            return []
+        distance = np.linalg.norm((self._vectors - _boundary_vector(boundary)) / BOUNDARY_SCALES, axis=1)
+        order = np.argsort(distance)[:k]
+        return [(float(distance[i]), self.entries[i]) for i in order]
+
+    def guess(self, boundary, tau, k=3):
+        """
+        Blended guess at normalized times tau from the k nearest solutions. Returns
+        (duration, {name: values at tau}), or None when the database is empty.
+        """
+        neighbours = self.nearest(boundary, k)
+        if not neighbours:
+            return None
+        distances = np.array([d for d, _ in neighbours])
+        if distances[0] < 1e-12:
+            weights = (distances < 1e-12).astype(float)
+        else:
+            weights = 1.0 / distances**2
+        weights /= weights.sum()
+
+        target = _boundary_vector(boundary)
+        duration = 0.0
+        values = {name: np.zeros_like(tau) for name in STATE_NAMES + CONTROL_NAMES}
+        for w, (_, entry) in zip(weights, neighbours):
+            data = self.load(entry['id'])
+            duration += w * entry['duration']
+            shift = dict(zip(BOUNDARY_NAMES, target - _boundary_vector(entry['boundary'])))
+            for name in values:
+                v = np.interp(tau, data['tau'], data[name])
+                # Move the state history to the new entry conditions, fading out towards
+                # touchdown where the final conditions are the same for every solution
+                if name in ('h', 'vx', 'vh'):
+                    v = v + shift[name] * (1.0 - tau)
+                elif name == 'x':
+                    v = v - shift['downrange'] * (1.0 - tau)
+                elif name == 'mass':
+                    v = v + shift['mass']
+                values[name] += w * v
+        return duration, values
+
+    def seed(self, p, phase, boundary, target_x=None, k=3, phase_path='traj.phase0'):
+        """
+        Set the initial values of a set-up landing problem from the nearest stored
+        solutions. Returns False (problem untouched) when the database is empty.
+        """
+        from FalconLandingODE import LANDING_FINAL
+
+        tau = np.linspace(0.0, 1.0, 101)
+        blended = self.guess(boundary, tau, k)
+        if blended is None:
+            return False
+        duration, values = blended
+
+        values['x'] += LANDING_FINAL['x'] if target_x is None else target_x
+
+        p.set_val(f"{phase_path}.t_initial", 0.0)
+        p.set_val(f"{phase_path}.t_duration", duration)
+        xs = tau * duration
+        for name in STATE_NAMES:
+            p.set_val(f"{phase_path}.states:{name}", phase.interp(ys=values[name], xs=xs, nodes='state_input'))
+        for name in CONTROL_NAMES:
+            p.set_val(f"{phase_path}.controls:{name}", phase.interp(ys=values[name], xs=xs, nodes='control_input'))
+        return True
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.entries = []
+        self._vectors = np.zeros((0, len(BOUNDARY_NAMES)))
+        self._loaded = {}
+
+
+def time_stamp():
+    return time.strftime('%Y-%m-%d %H:%M:%S')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='List or clear the landing warm-start database')
+    parser.add_argument('--dir', default=DEFAULT_DB_DIR)
+    parser.add_argument('--clear', action='store_true')
+    args = parser.parse_args()
+
+    db = SolutionDatabase(args.dir)
+    if args.clear:
+        db.clear()
+        print(f"Cleared {args.dir}")
+    else:
+        print(f"{len(db)} solutions in {args.dir}")
+        print(f"{'id':<13} " + ' '.join(f"{name:>10}" for name in BOUNDARY_NAMES) + f" {'duration':>9} {'m_final':>9}")
+        for e in db.entries:
+            print(f"{e['id']:<13} " + ' '.join(f"{e['boundary'][name]:>10.1f}" for name in BOUNDARY_NAMES)
+                  + f" {e['duration']:>9.2f} {e['final_mass']:>9.1f}")
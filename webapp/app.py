@@ -9,14 +9,21 @@ import sys
 import pandas as pd
 import json
 
-DEBUG = os.environ.get('FLASK_ENV') == 'development'
-
-# Add parent directory to path for imports
+# Add parent directory to path for imports, and this directory for assets.py when the
+# app is imported from elsewhere (e.g. gunicorn webapp.app:app from the repo root)
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from assets import init_assets
+
+DEBUG = os.environ.get('FLASK_ENV') == 'development'
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'falcon9-simulation-key'
 
+# Fingerprinted static URLs, far-future caching and gzip variants
+asset_manifest = init_assets(app)
+
 # Paths
 TELEMETRY_DIR = os.path.join(os.path.dirname(__file__), '..', 'telemetry')
 UTILS_DIR = os.path.join(os.path.dirname(__file__), '..', 'utils')
@@ -189,6 +196,7 @@ if __name__ == '__main__':
     print(f"Application will be available at: http://localhost:5000")
     print(f"Telemetry directory: {TELEMETRY_DIR}")
     print(f"Aircraft directory: {AIRCRAFT_DIR}")
+    print("For production serving use: python serve.py --workers 4")
     print("="*60)
     
     # Run the Flask server
@@ -0,0 +1,106 @@
+"""
+Static asset pipeline for the Falcon 9 web application
+Fingerprints every file under static/, keeps gzip variants of the text
+assets in memory and serves them with long-lived cache headers
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+
+from flask import request, send_from_directory, Response
+
+# One year - fingerprinted URLs change whenever the file content changes
+FAR_FUTURE_MAX_AGE = 31536000
+
+# Sprites and pad photos are already compressed, only text assets benefit from gzip
+COMPRESSIBLE_EXTENSIONS = ('.js', '.css', '.html', '.json', '.svg', '.txt')
+MIN_COMPRESS_SIZE = 1024
+
+
+class AssetManifest:
+    """Content hashes and precompressed variants for the files in a static folder"""
+
+    def __init__(self, static_folder, static_url_path='/static'):
+        self.static_folder = static_folder
+        self.static_url_path = static_url_path
+        self.hashes = {}
+        self.gzipped = {}
+        self.build()
+
+    def build(self):
+        """Hash every static file and gzip the compressible ones"""
+        self.hashes = {}
+        self.gzipped = {}
+        for root, _dirs, files in os.walk(self.static_folder):
+            for name in files:
+                path = os.path.join(root, name)
+                filename = os.path.relpath(path, self.static_folder).replace(os.sep, '/')
+                with open(path, 'rb') as f:
+                    content = f.read()
+                self.hashes[filename] = hashlib.sha256(content).hexdigest()[:12]
+                if name.endswith(COMPRESSIBLE_EXTENSIONS) and len(content) >= MIN_COMPRESS_SIZE:
+                    compressed = gzip.compress(content, compresslevel=9, mtime=0)
+                    if len(compressed) < len(content):
+                        self.gzipped[filename] = compressed
+
+    def version(self, filename):
+        """Return the content hash used as the fingerprint for a static file"""
+        return self.hashes.get(filename)
+
+    def url(self, filename):
+        """Return the fingerprinted URL of a static file"""
+        version = self.version(filename)
+        url = f"{self.static_url_path}/{filename}"
+        return f"{url}?v={version}" if version else url
+
+    def urls(self, prefix=''):
+        """Map plain static URLs to fingerprinted ones, for use by client-side code"""
+        return {
+            f"{self.static_url_path}/{filename}": self.url(filename)
+            for filename in sorted(self.hashes)
+            if filename.startswith(prefix)
+        }
+
+
+def init_assets(app):
+    """Install fingerprinted static URLs and the caching static file view on an app"""
+    manifest = AssetManifest(app.static_folder, app.static_url_path)
+    app.extensions['asset_manifest'] = manifest
+
+    @app.url_defaults
+    def add_static_version(endpoint, values):
+        if endpoint == 'static' and 'filename' in values and 'v' not in values:
+            version = manifest.version(values['filename'])
+            if version:
+                values['v'] = version
+
+    @app.context_processor
+    def inject_asset_urls():
+        return {'asset_urls': manifest.urls(prefix='images/')}
+
+    def serve_static(filename):
+        fingerprinted = request.args.get('v') is not None and request.args.get('v') == manifest.version(filename)
+        compressed = manifest.gzipped.get(filename)
+
+        if compressed is not None and 'gzip' in request.accept_encodings:
+            mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+            response = Response(compressed, mimetype=mimetype)
+            response.headers['Content-Encoding'] = 'gzip'
+            response.set_etag(f"{manifest.version(filename)}-gz")
+            response.make_conditional(request)
+        else:
+            response = send_from_directory(app.static_folder, filename, max_age=0)
+
+        if compressed is not None:
+            response.vary.add('Accept-Encoding')
+        if fingerprinted:
+            response.headers['Cache-Control'] = f"public, max-age={FAR_FUTURE_MAX_AGE}, immutable"
+        else:
+            # Unversioned URLs (e.g. sprite paths hard-coded in scripts) must revalidate
+            response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    app.view_functions['static'] = serve_static
+    return manifest
@@ -0,0 +1,116 @@
+"""
+Falcon 9 Simulation Web Application - Load Test
+Measures requests/sec for the API and static routes of a running server
+
+    python serve.py --workers 4 &
+    python load_test.py --url http://localhost:5000 --concurrency 32 --duration 10
+"""
+
+import argparse
+import http.client
+import re
+import threading
+import time
+from urllib.parse import urlsplit
+
+API_ROUTES = [
+    '/health',
+    '/api/mission-parameters',
+    '/api/simulation-status',
+    '/api/telemetry',
+]
+
+STATIC_ROUTES = [
+    '/static/js/constants.js',
+    '/static/js/simulation2d.js',
+    '/static/images/falcon9_phase0.png',
+    '/static/images/landingpad.jpg',
+]
+
+
+def discover_fingerprinted_routes(host, port):
+    """Pick the fingerprinted static URLs the index page actually references"""
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    conn.request('GET', '/')
+    body = conn.getresponse().read().decode('utf-8', errors='replace')
+    conn.close()
+    return sorted(set(re.findall(r'(?:src|href)="(/static/[^"]+\?v=[0-9a-f]+)"', body)))
+
+
+def run_route(host, port, path, concurrency, duration, gzip):
+    """Hammer one route with keep-alive connections and return (count, errors, bytes, latencies)"""
+    headers = {'Accept-Encoding': 'gzip'} if gzip else {}
+    lock = threading.Lock()
+    totals = {'count': 0, 'errors': 0, 'bytes': 0}
+    latencies = []
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        conn = http.client.HTTPConnection(host, port, timeout=30)
+        count = errors = nbytes = 0
+        local_latencies = []
+        while time.perf_counter() < deadline:
+            t0 = time.perf_counter()
+            try:
+                conn.request('GET', path, headers=headers)
+                response = conn.getresponse()
+                payload = response.read()
+                if response.status != 200:
+                    errors += 1
+                nbytes += len(payload)
+            except (OSError, http.client.HTTPException):
+                errors += 1
+                conn.close()
+                conn = http.client.HTTPConnection(host, port, timeout=30)
+            count += 1
+            local_latencies.append(time.perf_counter() - t0)
+        conn.close()
+        with lock:
+            totals['count'] += count
+            totals['errors'] += errors
+            totals['bytes'] += nbytes
+            latencies.extend(local_latencies)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    latencies.sort()
+    return totals['count'], totals['errors'], totals['bytes'], latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the Falcon 9 simulation web app')
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=5.0, help='Seconds per route')
+    parser.add_argument('--no-gzip', action='store_true', help='Do not send Accept-Encoding: gzip')
+    args = parser.parse_args()
+
+    parts = urlsplit(args.url)
+    host, port = parts.hostname, parts.port or 80
+
+    routes = [('api', r) for r in API_ROUTES] + [('static', r) for r in STATIC_ROUTES]
+    routes += [('static-fp', r) for r in discover_fingerprinted_routes(host, port)]
+
+    print("="*96)
+    print(f"Load test: {args.url}  concurrency={args.concurrency}  duration={args.duration:.0f}s/route")
+    print("="*96)
+    print(f"{'kind':<10} {'route':<52} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'KB/req':>8} {'err':>5}")
+
+    for kind, path in routes:
+        count, errors, nbytes, latencies = run_route(host, port, path, args.concurrency, args.duration,
+                                                     gzip=not args.no_gzip)
+        if not latencies:
+            print(f"{kind:<10} {path:<52} {'-':>9}")
+            continue
+        p50 = latencies[len(latencies) // 2] * 1000
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+        shown = path if len(path) <= 52 else path[:49] + '...'
+        print(f"{kind:<10} {shown:<52} {count / args.duration:>9.1f} {p50:>8.2f} {p99:>8.2f} "
+              f"{nbytes / count / 1024:>8.1f} {errors:>5}")
+
+
+if __name__ == '__main__':
+    main()
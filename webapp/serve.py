@@ -0,0 +1,102 @@
+"""
+Falcon 9 Simulation Web Application - Production Server
+Runs the Flask app behind a multi-worker WSGI server instead of the dev server
+
+    python serve.py                                # waitress, 8 threads (Windows/Linux/macOS)
+    python serve.py --server gunicorn --workers 4  # gunicorn pre-fork workers (Linux/macOS)
+
+Every option can also be set through FALCON9_* environment variables.
+"""
+
+import argparse
+import multiprocessing
+import os
+
+from app import app, asset_manifest, TELEMETRY_DIR, AIRCRAFT_DIR
+
+
+def default_workers():
+    """Number of worker processes recommended by gunicorn: 2 x cores + 1"""
+    return multiprocessing.cpu_count() * 2 + 1
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Serve the Falcon 9 simulation web app in production mode')
+    parser.add_argument('--server', choices=['waitress', 'gunicorn'],
+                        default=os.environ.get('FALCON9_SERVER', 'gunicorn' if os.name == 'posix' else 'waitress'),
+                        help='WSGI server to use (gunicorn is not available on Windows)')
+    parser.add_argument('--host', default=os.environ.get('FALCON9_HOST', '0.0.0.0'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('FALCON9_PORT', 5000)))
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('FALCON9_WORKERS', default_workers())),
+                        help='Worker processes (gunicorn only)')
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('FALCON9_THREADS', 8)),
+                        help='Threads per worker')
+    return parser.parse_args(argv)
+
+
+def run_waitress(args):
+    try:
+        from waitress import serve
+    except ImportError:
+        raise SystemExit("waitress is not installed. Run: pip install -r requirements.txt")
+
+    serve(app, host=args.host, port=args.port, threads=args.threads)
+
+
+def run_gunicorn(args):
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        raise SystemExit("gunicorn is not installed (Linux/macOS only). Run: pip install gunicorn, or use --server waitress")
+
+    class StandaloneApplication(BaseApplication):
+        def __init__(self, application, options):
+            self.application = application
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return self.application
+
+    options = {
+        'bind': f"{args.host}:{args.port}",
+        'workers': args.workers,
+        'threads': args.threads,
+        'worker_class': 'gthread',
+        # The app (and the asset manifest) is built once in the master and forked into workers
+        'preload_app': True,
+        'keepalive': 5,
+        'accesslog': '-',
+    }
+    StandaloneApplication(app, options).run()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    print("="*60)
+    print("Falcon 9 Simulation Web Application (production)")
+    print("="*60)
+    print(f"Server: {args.server}")
+    if args.server == 'gunicorn':
+        print(f"Workers: {args.workers} x {args.threads} threads")
+    else:
+        print(f"Threads: {args.threads}")
+    print(f"Application will be available at: http://localhost:{args.port}")
+    print(f"Static assets fingerprinted: {len(asset_manifest.hashes)} ({len(asset_manifest.gzipped)} precompressed)")
+    print(f"Telemetry directory: {TELEMETRY_DIR}")
+    print(f"Aircraft directory: {AIRCRAFT_DIR}")
+    print("="*60)
+
+    if args.server == 'gunicorn':
+        run_gunicorn(args)
+    else:
+        run_waitress(args)
+
+
+if __name__ == '__main__':
+    main()
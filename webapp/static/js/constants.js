@@ -34,3 +34,10 @@ const F9_CONSTANTS = {
 };
 
 window.F9_CONSTANTS = F9_CONSTANTS;
+
+// Resolve a static path to its fingerprinted URL (manifest injected by the server)
+function assetUrl(path) {
+    return (window.F9_ASSETS && window.F9_ASSETS[path]) || path;
+}
+
+window.assetUrl = assetUrl;
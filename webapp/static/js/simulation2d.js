@@ -113,23 +113,23 @@ class Falcon9Simulation2D {
             phaseRocketsLoaded: false
         };
         
-        this.sprites.full.src = '/static/images/falcon9_full.png';
-        this.sprites.stage1.src = '/static/images/falcon9_stage1.png';
-        this.sprites.stage2.src = '/static/images/falcon9_stage2.png';
-        this.sprites.launchpad.src = '/static/images/launchpad.jpg';
-        this.sprites.landingpad.src = '/static/images/landingpad.jpg';
+        this.sprites.full.src = assetUrl('/static/images/falcon9_full.png');
+        this.sprites.stage1.src = assetUrl('/static/images/falcon9_stage1.png');
+        this.sprites.stage2.src = assetUrl('/static/images/falcon9_stage2.png');
+        this.sprites.launchpad.src = assetUrl('/static/images/launchpad.jpg');
+        this.sprites.landingpad.src = assetUrl('/static/images/landingpad.jpg');
         
         // Phase-specific rocket sprites
-        this.sprites.rocket_phase0.src = '/static/images/falcon9_phase0.png';
-        this.sprites.rocket_phase1.src = '/static/images/falcon9_phase1.png';
-        this.sprites.rocket_phase2.src = '/static/images/falcon9_phase2.png';
-        this.sprites.rocket_phase3.src = '/static/images/falcon9_phase3.png';
-        this.sprites.rocket_phase4.src = '/static/images/falcon9_phase4.png';
-        this.sprites.rocket_phase5.src = '/static/images/falcon9_phase5.png';
-        this.sprites.rocket_phase6.src = '/static/images/falcon9_phase6.png';
-        this.sprites.rocket_phase7.src = '/static/images/falcon9_phase7.png';
-        this.sprites.rocket_phase8.src = '/static/images/falcon9_phase8.png';
-        this.sprites.rocket_phase9.src = '/static/images/falcon9_phase9.png';
+        this.sprites.rocket_phase0.src = assetUrl('/static/images/falcon9_phase0.png');
+        this.sprites.rocket_phase1.src = assetUrl('/static/images/falcon9_phase1.png');
+        this.sprites.rocket_phase2.src = assetUrl('/static/images/falcon9_phase2.png');
+        this.sprites.rocket_phase3.src = assetUrl('/static/images/falcon9_phase3.png');
+        this.sprites.rocket_phase4.src = assetUrl('/static/images/falcon9_phase4.png');
+        this.sprites.rocket_phase5.src = assetUrl('/static/images/falcon9_phase5.png');
+        this.sprites.rocket_phase6.src = assetUrl('/static/images/falcon9_phase6.png');
+        this.sprites.rocket_phase7.src = assetUrl('/static/images/falcon9_phase7.png');
+        this.sprites.rocket_phase8.src = assetUrl('/static/images/falcon9_phase8.png');
+        this.sprites.rocket_phase9.src = assetUrl('/static/images/falcon9_phase9.png');
         
         // Wait for all images to load
         let loadedCount = 0;